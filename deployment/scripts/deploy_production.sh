@@ -36,6 +36,8 @@ PROJECT_DIR="/var/www/${PROJECT_NAME}"
 REPO_URL="https://github.com/thsteixeira/precatorios.git"
 NGINX_SITE_NAME="${PROJECT_NAME}_production"
 GUNICORN_SERVICE_NAME="gunicorn_${PROJECT_NAME}_production"
+EXPORT_WORKER_SERVICE_NAME="export_worker_${PROJECT_NAME}_production"
+IMPORT_WORKER_SERVICE_NAME="import_worker_${PROJECT_NAME}_production"
 
 # Production server configuration (update these with your actual production values)
 PRODUCTION_IP="44.242.204.124"  # From .env.production
@@ -240,6 +242,69 @@ else
     exit 1
 fi
 
+
+# Configure background export worker (Excel exports run outside the gunicorn timeout)
+print_status "Configuring export worker service..."
+sudo tee /etc/systemd/system/${EXPORT_WORKER_SERVICE_NAME}.service > /dev/null << EOF
+[Unit]
+Description=Excel export worker for Django ${PROJECT_NAME} PRODUCTION environment
+After=network.target
+
+[Service]
+User=$USER
+Group=www-data
+WorkingDirectory=${PROJECT_DIR}
+Environment="PATH=/home/$USER/.local/bin:/usr/local/bin:/usr/bin:/bin"
+ExecStart=/usr/bin/python3 manage.py process_export_jobs --interval 5
+Restart=always
+RestartSec=5
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
+sudo systemctl daemon-reload
+sudo systemctl restart ${EXPORT_WORKER_SERVICE_NAME}
+sudo systemctl enable ${EXPORT_WORKER_SERVICE_NAME}
+
+if sudo systemctl is-active --quiet ${EXPORT_WORKER_SERVICE_NAME}; then
+    print_success "Export worker service started successfully"
+else
+    print_error "Export worker service failed to start"
+    sudo systemctl status ${EXPORT_WORKER_SERVICE_NAME}
+fi
+
+# Configure background import worker (uploaded spreadsheets are imported outside the gunicorn timeout)
+print_status "Configuring import worker service..."
+sudo tee /etc/systemd/system/${IMPORT_WORKER_SERVICE_NAME}.service > /dev/null << EOF
+[Unit]
+Description=Excel import worker for Django ${PROJECT_NAME} PRODUCTION environment
+After=network.target
+
+[Service]
+User=$USER
+Group=www-data
+WorkingDirectory=${PROJECT_DIR}
+Environment="PATH=/home/$USER/.local/bin:/usr/local/bin:/usr/bin:/bin"
+ExecStart=/usr/bin/python3 manage.py process_import_jobs --interval 5
+Restart=always
+RestartSec=5
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
+sudo systemctl daemon-reload
+sudo systemctl restart ${IMPORT_WORKER_SERVICE_NAME}
+sudo systemctl enable ${IMPORT_WORKER_SERVICE_NAME}
+
+if sudo systemctl is-active --quiet ${IMPORT_WORKER_SERVICE_NAME}; then
+    print_success "Import worker service started successfully"
+else
+    print_error "Import worker service failed to start"
+    sudo systemctl status ${IMPORT_WORKER_SERVICE_NAME}
+fi
+
 # 16. Configure Nginx
 print_status "Configuring Nginx..."
 
@@ -495,7 +560,7 @@ sudo chmod +x /usr/local/bin/backup_${PROJECT_NAME}.sh
 print_status "Running final system checks..."
 
 # Check services status
-services=("nginx" "${GUNICORN_SERVICE_NAME}" "fail2ban")
+services=("nginx" "${GUNICORN_SERVICE_NAME}" "${EXPORT_WORKER_SERVICE_NAME}" "${IMPORT_WORKER_SERVICE_NAME}" "fail2ban")
 for service in "${services[@]}"; do
     if sudo systemctl is-active --quiet $service; then
         print_success "$service is running"
@@ -543,6 +608,8 @@ echo "   • Backups: Scheduled daily at 2 AM"
 echo ""
 echo "🔧 Service Management Commands:"
 echo "   • Restart Gunicorn: sudo systemctl restart ${GUNICORN_SERVICE_NAME}"
+echo "   • Restart export worker: sudo systemctl restart ${EXPORT_WORKER_SERVICE_NAME}"
+echo "   • Restart import worker: sudo systemctl restart ${IMPORT_WORKER_SERVICE_NAME}"
 echo "   • Restart Nginx: sudo systemctl restart nginx"
 echo "   • View logs: sudo journalctl -u ${GUNICORN_SERVICE_NAME} -f"
 echo "   • Check status: sudo systemctl status ${GUNICORN_SERVICE_NAME}"
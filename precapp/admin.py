@@ -8,7 +8,7 @@ from django.http import HttpResponseRedirect
 from .models import (
     Precatorio, Cliente, Alvara, Requerimento, Fase, Tipo,
     FaseHonorariosContratuais, FaseHonorariosSucumbenciais, TipoDiligencia, Diligencias, PedidoRequerimento,
-    ContaBancaria, Recebimentos
+    ContaBancaria, Recebimentos, ExportJob, ImportCheckpoint, ImportJob, PrecatorioResumo
 )
 from .forms import CustomFileWidget
 
@@ -827,6 +827,78 @@ class RecebimentosAdmin(admin.ModelAdmin):
     valor_formatado.short_description = 'Valor'
 
 
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """Read-only admin for background export jobs and their run metrics"""
+
+    list_display = (
+        'id', 'tipo', 'status', 'solicitado_por', 'criado_em',
+        'duracao_segundos', 'total_linhas', 'pico_memoria_kb'
+    )
+    list_filter = ('tipo', 'status', 'criado_em')
+    readonly_fields = (
+        'tipo', 'status', 'solicitado_por', 'arquivo', 'nome_arquivo',
+        'criado_em', 'iniciado_em', 'concluido_em', 'duracao_segundos',
+        'total_linhas', 'linhas_por_planilha', 'pico_memoria_kb', 'mensagem_erro'
+    )
+    ordering = ('-criado_em',)
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ImportCheckpoint)
+class ImportCheckpointAdmin(admin.ModelAdmin):
+    """Read-only admin for the progress of chunked Excel imports"""
+
+    list_display = ('nome_arquivo', 'planilha', 'status', 'ultima_linha', 'total_linhas', 'atualizado_em')
+    list_filter = ('status', 'atualizado_em')
+    search_fields = ('nome_arquivo', 'arquivo_hash')
+    readonly_fields = (
+        'arquivo_hash', 'planilha', 'nome_arquivo', 'status', 'ultima_linha',
+        'total_linhas', 'totais', 'criado_em', 'atualizado_em'
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    """Read-only admin for background Excel imports and their progress"""
+
+    list_display = (
+        'id', 'nome_arquivo', 'status', 'solicitado_por', 'criado_em',
+        'linhas_processadas', 'total_linhas', 'linhas_com_erro', 'linhas_por_segundo'
+    )
+    list_filter = ('status', 'criado_em')
+    readonly_fields = (
+        'arquivo', 'nome_arquivo', 'status', 'solicitado_por', 'criado_em', 'iniciado_em',
+        'atualizado_em', 'concluido_em', 'total_linhas', 'linhas_processadas', 'linhas_com_erro',
+        'linhas_por_segundo', 'resultado', 'erros', 'mensagem_erro'
+    )
+    ordering = ('-criado_em',)
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(PrecatorioResumo)
+class PrecatorioResumoAdmin(admin.ModelAdmin):
+    """Read-only admin for the materialized precatório summaries"""
+
+    list_display = (
+        'precatorio', 'total_principal', 'total_contratuais', 'total_sucumbenciais', 'total_recebido',
+        'quantidade_alvaras', 'quantidade_requerimentos', 'quantidade_clientes', 'atualizado_em'
+    )
+    search_fields = ('precatorio__cnj',)
+    readonly_fields = list_display
+
+    def has_add_permission(self, request):
+        return False
+
+
 # Customize admin site header and title
 admin.site.site_header = "Controle de Precatórios - Admin"
 admin.site.site_title = "Precatórios Admin"
@@ -0,0 +1,24 @@
+"""
+Benchmark package for Django Precatorios application
+
+This package measures the application at production-like volumes:
+- Deterministic synthetic datasets (10k, 100k precatórios) built with bulk inserts
+- Timed list views, detail views, Excel exports and Excel imports
+- JSON results comparable across commits
+"""
+
+from .dataset import SCALES, resolve_scale, generate_dataset, clear_dataset
+from .suite import CASES, run_benchmarks, compare_results
+
+__all__ = [
+    # Dataset
+    'SCALES',
+    'resolve_scale',
+    'generate_dataset',
+    'clear_dataset',
+    
+    # Benchmarks
+    'CASES',
+    'run_benchmarks',
+    'compare_results',
+]
@@ -0,0 +1,362 @@
+"""
+Synthetic dataset generator
+
+Fills the database with realistic-looking precatórios, clientes, alvarás,
+requerimentos, diligências and recebimentos so the views, exports and
+imports can be timed at production-like volumes (10k, 100k precatórios).
+
+Records are generated chunk by chunk with bulk_create, one transaction per
+chunk, so memory stays flat whatever the scale. bulk_create skips save(),
+so the *_busca search columns and the PrecatorioResumo summaries are filled
+explicitly, as the bulk Excel import does.
+
+Generated records are recognizable, so a dataset can be removed or grown
+without touching real data:
+- precatório CNJs use tribunal 99 and origin 9999 (SYNTHETIC_CNJ_SUFFIX);
+- clientes and precatórios carry SYNTHETIC_MARKER in observacao;
+- recebimentos are numbered with the SYNTHETIC_RECEBIMENTO_PREFIX.
+
+The same seed and ratios always produce the same dataset.
+"""
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+
+from ..dashboard import invalidate_dashboard_statistics
+from ..models import (
+    Alvara, Cliente, ContaBancaria, Diligencias, Fase, FaseHonorariosContratuais, FaseHonorariosSucumbenciais,
+    PedidoRequerimento, Precatorio, PrecatorioResumo, Recebimentos, Requerimento, Tipo, TipoDiligencia
+)
+from ..search import normalize_search_text
+
+
+SYNTHETIC_MARKER = 'Registro sintético (generate_synthetic_data)'
+SYNTHETIC_CNJ_SUFFIX = '.8.99.9999'
+SYNTHETIC_RECEBIMENTO_PREFIX = 'SINT-'
+SYNTHETIC_CPF_BASE = 990000000  # Nine-digit CPF base of the first synthetic cliente
+
+# Named scales accepted by --scale, in precatórios
+SCALES = {
+    'small': 1000,
+    '10k': 10000,
+    '100k': 100000,
+}
+
+DEFAULT_RATIOS = {
+    'clientes_por_precatorio': 1.5,
+    'alvaras_por_precatorio': 0.8,
+    'requerimentos_por_precatorio': 0.5,
+    'diligencias_por_cliente': 0.6,
+    'recebimentos_por_alvara': 1.0,
+}
+
+PRIMEIROS_NOMES = [
+    'João', 'Maria', 'José', 'Ana', 'Antônio', 'Francisca', 'Carlos', 'Antônia', 'Paulo', 'Adriana',
+    'Pedro', 'Juliana', 'Lucas', 'Márcia', 'Luís', 'Fernanda', 'Marcos', 'Patrícia', 'Luiz', 'Aline',
+    'Sebastião', 'Conceição', 'Raimundo', 'Lúcia', 'Benedito', 'Vitória', 'André', 'Cecília', 'Otávio', 'Irene',
+]
+SOBRENOMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima', 'Gomes',
+    'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Araújo', 'Melo', 'Barbosa', 'Gonçalves', 'Conceição', 'Simões',
+    'Assunção', 'Brandão', 'Magalhães', 'Estevão', 'Falcão',
+]
+ORIGENS = [
+    'Vara da Fazenda Pública de São Paulo', '1ª Vara Cível de Campinas', 'Vara de Execuções Fiscais de Santos',
+    '2ª Vara da Fazenda Pública de Ribeirão Preto', 'Vara Única de São José do Rio Preto',
+    'Juizado Especial da Fazenda Pública de Sorocaba', '3ª Vara Federal de Bauru', 'Vara do Trabalho de Jundiaí',
+]
+TIPOS_ALVARA = ['ordem cronológica', 'prioridade', 'acordo']
+STATUS_PAGAMENTO = ['pendente', 'pendente', 'pendente', 'parcial', 'quitado', 'vendido']
+
+
+def resolve_scale(scale):
+    """Number of precatórios for a named scale ('10k') or a plain number ('2500')."""
+    if scale in SCALES:
+        return SCALES[scale]
+    try:
+        precatorios = int(scale)
+    except (TypeError, ValueError):
+        raise ValueError(f"Escala inválida: {scale} (use {', '.join(SCALES)} ou um número)")
+    if precatorios < 1:
+        raise ValueError('A escala deve ser de pelo menos 1 precatório')
+    return precatorios
+
+
+def synthetic_cpf(index):
+    """Valid CPF (digits only) of the index-th synthetic cliente."""
+    base = str(SYNTHETIC_CPF_BASE + index).zfill(9)
+    digits = [int(d) for d in base]
+    for length in (9, 10):
+        remainder = sum(d * w for d, w in zip(digits, range(length + 1, 1, -1))) % 11
+        digits.append(0 if remainder < 2 else 11 - remainder)
+    return ''.join(map(str, digits))
+
+
+def synthetic_cnj(index):
+    """CNJ (NNNNNNN-DD.AAAA.8.99.9999, with valid mod-97 check digits) of the index-th precatório."""
+    sequencial = index % 10 ** 7
+    ano = 2005 + index % 20
+    check = 98 - int(f'{sequencial:07d}{ano}{SYNTHETIC_CNJ_SUFFIX}'.replace('.', '') + '00') % 97
+    return f'{sequencial:07d}-{check:02d}.{ano}{SYNTHETIC_CNJ_SUFFIX}'
+
+
+def synthetic_precatorios():
+    return Precatorio.objects.filter(cnj__endswith=SYNTHETIC_CNJ_SUFFIX)
+
+
+def synthetic_clientes():
+    return Cliente.objects.filter(observacao=SYNTHETIC_MARKER)
+
+
+def load_catalogs():
+    """
+    Catalog rows the generated records point to.
+
+    Runs setup_customization first when a catalog the generator needs is
+    empty (a fresh database).
+    """
+    def read():
+        return {
+            'fases_alvara': list(Fase.objects.filter(ativa=True, tipo__in=['alvara', 'ambos'])),
+            'fases_requerimento': list(Fase.objects.filter(ativa=True, tipo__in=['requerimento', 'ambos'])),
+            'fases_contratuais': list(FaseHonorariosContratuais.objects.filter(ativa=True)),
+            'fases_sucumbenciais': list(FaseHonorariosSucumbenciais.objects.filter(ativa=True)),
+            'tipos': list(Tipo.objects.filter(ativa=True)),
+            'pedidos': list(PedidoRequerimento.objects.filter(ativo=True)),
+            'tipos_diligencia': list(TipoDiligencia.objects.filter(ativo=True)),
+            'contas': list(ContaBancaria.objects.all()),
+        }
+
+    catalogs = read()
+    if not all(catalogs.values()):
+        call_command('setup_customization', stdout=StringIO())
+        catalogs = read()
+    missing = [name for name, rows in catalogs.items() if not rows]
+    if missing:
+        raise ValueError(f"Catálogos vazios após setup_customization: {', '.join(missing)}")
+    return catalogs
+
+
+def _count(rng, ratio):
+    """Integer number of children averaging ratio."""
+    whole = int(ratio)
+    return whole + (1 if rng.random() < ratio - whole else 0)
+
+
+def _nome(rng):
+    return f'{rng.choice(PRIMEIROS_NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}'
+
+
+def _build_clientes(rng, first_index, count, today):
+    clientes = []
+    for index in range(first_index, first_index + count):
+        nome = _nome(rng)
+        idade = rng.randint(18, 95)
+        nascimento = today - timedelta(days=idade * 365 + rng.randint(0, 364))
+        clientes.append(Cliente(
+            cpf=synthetic_cpf(index),
+            nome=nome,
+            nome_busca=normalize_search_text(nome),
+            nascimento=nascimento if rng.random() < 0.9 else None,
+            prioridade=idade >= 60 and rng.random() < 0.7,
+            falecido=rng.random() < 0.03,
+            observacao=SYNTHETIC_MARKER,
+        ))
+    return clientes
+
+
+def _build_precatorio(rng, index, catalogs, today):
+    origem = rng.choice(ORIGENS)
+    valor = round(rng.lognormvariate(11, 1.2), 2)
+    return Precatorio(
+        cnj=synthetic_cnj(index),
+        orcamento=rng.randint(2010, today.year + 1),
+        origem=origem,
+        origem_busca=normalize_search_text(origem),
+        credito_principal=rng.choice(STATUS_PAGAMENTO),
+        honorarios_contratuais=rng.choice(STATUS_PAGAMENTO),
+        honorarios_sucumbenciais=rng.choice(STATUS_PAGAMENTO),
+        valor_de_face=valor,
+        ultima_atualizacao=round(valor * rng.uniform(1.0, 1.6), 2),
+        data_ultima_atualizacao=today - timedelta(days=rng.randint(0, 900)),
+        percentual_contratuais_assinado=rng.choice([10.0, 15.0, 20.0, 30.0]),
+        percentual_contratuais_apartado=rng.choice([0.0, 5.0, 10.0]),
+        percentual_sucumbenciais=rng.choice([0.0, 10.0, 15.0]),
+        tipo=rng.choice(catalogs['tipos']) if rng.random() < 0.9 else None,
+        observacao=SYNTHETIC_MARKER,
+    )
+
+
+def _generate_chunk(rng, first_precatorio, count, first_cliente, ratios, catalogs, batch_size, today):
+    """Create one chunk of precatórios with their clientes and dependent records."""
+    clientes = _build_clientes(
+        rng, first_cliente, max(1, round(count * ratios['clientes_por_precatorio'])), today
+    )
+    precatorios = [_build_precatorio(rng, index, catalogs, today) for index in range(first_precatorio, first_precatorio + count)]
+
+    # Each precatório gets one to three clientes of the chunk, drawn
+    # independently, so some clientes hold several precatórios and some none
+    links = {}
+    for precatorio in precatorios:
+        titulares = rng.sample(clientes, min(len(clientes), rng.choice([1, 1, 1, 2, 3])))
+        links[precatorio.cnj] = titulares
+
+    alvaras = []
+    requerimentos = []
+    for precatorio in precatorios:
+        titulares = links[precatorio.cnj]
+        for _ in range(_count(rng, ratios['alvaras_por_precatorio'])):
+            principal = round(precatorio.valor_de_face * rng.uniform(0.2, 1.0), 2)
+            alvaras.append(Alvara(
+                precatorio=precatorio,
+                cliente=rng.choice(titulares),
+                valor_principal=principal,
+                honorarios_contratuais=round(principal * (precatorio.percentual_contratuais_assinado or 0) / 100, 2),
+                honorarios_sucumbenciais=round(principal * (precatorio.percentual_sucumbenciais or 0) / 100, 2),
+                tipo=rng.choice(TIPOS_ALVARA),
+                fase=rng.choice(catalogs['fases_alvara']),
+                fase_honorarios_contratuais=rng.choice(catalogs['fases_contratuais']),
+                fase_honorarios_sucumbenciais=rng.choice(catalogs['fases_sucumbenciais']),
+            ))
+        for _ in range(_count(rng, ratios['requerimentos_por_precatorio'])):
+            requerimentos.append(Requerimento(
+                precatorio=precatorio,
+                cliente=rng.choice(titulares),
+                valor=round(precatorio.valor_de_face * rng.uniform(0.1, 1.0), 2),
+                desagio=rng.choice([0.0, 10.0, 20.0, 30.0, 40.0]),
+                pedido=rng.choice(catalogs['pedidos']),
+                fase=rng.choice(catalogs['fases_requerimento']),
+            ))
+
+    diligencias = []
+    for cliente in clientes:
+        for _ in range(_count(rng, ratios['diligencias_por_cliente'])):
+            concluida = rng.random() < 0.4
+            diligencias.append(Diligencias(
+                cliente=cliente,
+                tipo=rng.choice(catalogs['tipos_diligencia']),
+                data_final=today + timedelta(days=rng.randint(-60, 90)),
+                urgencia=rng.choice(['baixa', 'media', 'media', 'alta']),
+                criado_por='Gerador sintético',
+                concluida=concluida,
+                concluido_por='Gerador sintético' if concluida else None,
+            ))
+
+    Cliente.objects.bulk_create(clientes, batch_size=batch_size)
+    Precatorio.objects.bulk_create(precatorios, batch_size=batch_size)
+    PrecatorioClientes = Precatorio.clientes.through
+    PrecatorioClientes.objects.bulk_create(
+        [
+            PrecatorioClientes(precatorio_id=cnj, cliente_id=cliente.cpf)
+            for cnj, titulares in links.items() for cliente in titulares
+        ],
+        batch_size=batch_size,
+    )
+    Alvara.objects.bulk_create(alvaras, batch_size=batch_size)
+    Requerimento.objects.bulk_create(requerimentos, batch_size=batch_size)
+    Diligencias.objects.bulk_create(diligencias, batch_size=batch_size)
+
+    # bulk_create does not return primary keys on every backend: read them back
+    recebimentos = []
+    cnjs = [precatorio.cnj for precatorio in precatorios]
+    for alvara_id, contratuais, sucumbenciais in Alvara.objects.filter(precatorio_id__in=cnjs).values_list(
+        'pk', 'honorarios_contratuais', 'honorarios_sucumbenciais'
+    ).order_by('pk'):
+        for numero in range(_count(rng, ratios['recebimentos_por_alvara'])):
+            tipo, honorarios = rng.choice([('Hon. contratuais', contratuais), ('Hon. sucumbenciais', sucumbenciais)])
+            recebimentos.append(Recebimentos(
+                numero_documento=f'{SYNTHETIC_RECEBIMENTO_PREFIX}{alvara_id}-{numero + 1}',
+                alvara_id=alvara_id,
+                data=today - timedelta(days=rng.randint(0, 720)),
+                conta_bancaria=rng.choice(catalogs['contas']),
+                valor=Decimal(str(max(0.01, round((honorarios or 100.0) * rng.uniform(0.3, 1.0), 2)))),
+                tipo=tipo,
+                criado_por='Gerador sintético',
+            ))
+    Recebimentos.objects.bulk_create(recebimentos, batch_size=batch_size)
+    PrecatorioResumo.rebuild(cnjs=cnjs, batch_size=batch_size)
+
+    return {
+        'precatorios': len(precatorios),
+        'clientes': len(clientes),
+        'alvaras': len(alvaras),
+        'requerimentos': len(requerimentos),
+        'diligencias': len(diligencias),
+        'recebimentos': len(recebimentos),
+    }
+
+
+def generate_dataset(precatorios, seed=42, ratios=None, batch_size=1000, progress=None):
+    """
+    Add a synthetic dataset of the given size.
+
+    Numbering continues after the synthetic records already present, so
+    running the generator twice grows the dataset.
+
+    Args:
+        precatorios (int): Number of precatórios to create
+        seed (int): Random seed; the same seed and ratios give the same data
+        ratios (dict|None): Overrides of DEFAULT_RATIOS
+        batch_size (int): Precatórios per chunk (one transaction each)
+        progress (callable|None): Called with (precatorios_done, total) after every chunk
+
+    Returns:
+        dict: Records created per model
+    """
+    ratios = {**DEFAULT_RATIOS, **(ratios or {})}
+    rng = random.Random(seed)
+    today = date.today()
+    catalogs = load_catalogs()
+
+    first_precatorio = synthetic_precatorios().count()
+    first_cliente = synthetic_clientes().count()
+    created = dict.fromkeys(
+        ['precatorios', 'clientes', 'alvaras', 'requerimentos', 'diligencias', 'recebimentos'], 0
+    )
+
+    done = 0
+    while done < precatorios:
+        count = min(batch_size, precatorios - done)
+        with transaction.atomic():
+            chunk = _generate_chunk(
+                rng, first_precatorio + done, count, first_cliente + created['clientes'],
+                ratios, catalogs, batch_size, today
+            )
+        for model, value in chunk.items():
+            created[model] += value
+        done += count
+        if progress:
+            progress(done, precatorios)
+
+    invalidate_dashboard_statistics()  # bulk_create skips the receivers that do it
+    return created
+
+
+def clear_dataset():
+    """
+    Delete every synthetic record (and only those).
+
+    Returns:
+        dict: Records deleted per model
+    """
+    with transaction.atomic():
+        cnjs = synthetic_precatorios().values('cnj')
+        cpfs = synthetic_clientes().values('cpf')
+        deleted = {
+            # Recebimentos protect their alvarás and are removed first
+            'recebimentos': Recebimentos.objects.filter(
+                numero_documento__startswith=SYNTHETIC_RECEBIMENTO_PREFIX
+            ).delete()[0],
+            'alvaras': Alvara.objects.filter(precatorio_id__in=cnjs).delete()[0],
+            'requerimentos': Requerimento.objects.filter(precatorio_id__in=cnjs).delete()[0],
+            'diligencias': Diligencias.objects.filter(cliente_id__in=cpfs).delete()[0],
+        }
+        deleted['precatorios'] = synthetic_precatorios().delete()[1].get(Precatorio._meta.label, 0)
+        deleted['clientes'] = synthetic_clientes().delete()[1].get(Cliente._meta.label, 0)
+    invalidate_dashboard_statistics()
+    return deleted
@@ -0,0 +1,275 @@
+"""
+Benchmark suite
+
+Times the list views, detail views, Excel exports and the Excel import
+against whatever data is in the database (see dataset.py to generate it)
+and returns the results as a JSON-serializable dict. The results record the
+dataset size, database and code revision, so runs of different commits at
+the same scale can be compared with compare_results().
+
+Views are requested through the Django test client with a staff user, so
+middleware, template rendering and every query are included. Each case runs
+`warmup` untimed times (filling the catalog and dashboard caches, as in a
+warm worker) and then `repeat` timed times; the query count and response
+size come from the last run. Imports run inside a transaction that is
+rolled back, so the benchmark leaves the database as it found it.
+"""
+
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from io import StringIO
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import Workbook
+
+from ..models import Alvara, Cliente, Diligencias, Precatorio, Recebimentos, Requerimento
+from .dataset import synthetic_cpf, synthetic_cnj
+
+
+RESULTS_SCHEMA = 1
+BENCHMARK_USERNAME = 'benchmark'
+IMPORT_FIRST_INDEX = 9000000  # Row numbering of the import workbook, far from the generated records
+
+# Case name -> (kind, URL name) for the views
+VIEW_CASES = {
+    'home': ('list', 'home'),
+    'precatorios': ('list', 'precatorios'),
+    'clientes': ('list', 'clientes'),
+    'alvaras': ('list', 'alvaras'),
+    'requerimentos': ('list', 'requerimentos'),
+    'diligencias': ('list', 'diligencias_list'),
+    'precatorio_detalhe': ('detail', 'precatorio_detalhe'),
+    'cliente_detail': ('detail', 'cliente_detail'),
+}
+OTHER_CASES = {
+    'export_precatorios': 'export',
+    'export_clientes': 'export',
+    'import_excel': 'import',
+    'import_excel_bulk': 'import',
+}
+CASES = [*VIEW_CASES, *OTHER_CASES]
+
+
+def get_benchmark_user():
+    """Superuser the views are requested as (created without a usable password)."""
+    user, created = User.objects.get_or_create(
+        username=BENCHMARK_USERNAME, defaults={'is_staff': True, 'is_superuser': True}
+    )
+    if created:
+        user.set_unusable_password()
+        user.save()
+    return user
+
+
+def dataset_counts():
+    return {
+        'precatorios': Precatorio.objects.count(),
+        'clientes': Cliente.objects.count(),
+        'alvaras': Alvara.objects.count(),
+        'requerimentos': Requerimento.objects.count(),
+        'diligencias': Diligencias.objects.count(),
+        'recebimentos': Recebimentos.objects.count(),
+    }
+
+
+def git_revision():
+    """Commit of the code being measured, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _detail_args(url_name):
+    """The busiest record of a detail page: the one with the most related rows."""
+    if url_name == 'precatorio_detalhe':
+        cnj = Precatorio.objects.annotate(n=Count('alvara')).order_by('-n', 'cnj').values_list('cnj', flat=True).first()
+        return [cnj] if cnj else None
+    cpf = Cliente.objects.annotate(n=Count('precatorios')).order_by('-n', 'cpf').values_list('cpf', flat=True).first()
+    return [cpf] if cpf else None
+
+
+def write_import_workbook(rows, path):
+    """Write a workbook in the current import format with rows new precatórios."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Benchmark')
+    sheet.append(['Precatórios benchmark'])
+    sheet.append(['Origem', 'Tipo', 'CNJ', 'Orçamento', 'Destacado', 'Autor', 'CPF', 'Nascimento', 'Valor de Face'])
+    for offset in range(rows):
+        index = IMPORT_FIRST_INDEX + offset
+        sheet.append([
+            'Vara da Fazenda Pública de São Paulo', None, synthetic_cnj(index), 2024, 0,
+            f'Autor Benchmark {offset}', synthetic_cpf(index), datetime(1950 + offset % 50, 1, 1),
+            1000.0 + offset,
+        ])
+    workbook.save(path)
+
+
+def _measure(run, repeat, warmup):
+    """Time run() and return the timings with the query count and result of the last run."""
+    for _ in range(warmup):
+        run()
+    timings = []
+    for position in range(repeat):
+        if position == repeat - 1:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                result = run()
+                timings.append(time.perf_counter() - start)
+        else:
+            start = time.perf_counter()
+            result = run()
+            timings.append(time.perf_counter() - start)
+    timings_ms = sorted(t * 1000 for t in timings)
+    return {
+        'median_ms': round(statistics.median(timings_ms), 2),
+        'min_ms': round(timings_ms[0], 2),
+        'max_ms': round(timings_ms[-1], 2),
+        'queries': len(queries.captured_queries),
+    }, result
+
+
+def _view_case(client, url_name, kind, repeat, warmup):
+    args = _detail_args(url_name) if kind == 'detail' else None
+    if kind == 'detail' and args is None:
+        return {'kind': kind, 'skipped': 'sem registros'}
+    url = reverse(url_name, args=args)
+    result, response = _measure(lambda: client.get(url), repeat, warmup)
+    result.update({
+        'kind': kind,
+        'url': url,
+        'status': response.status_code,
+        'bytes': len(response.content),
+    })
+    return result
+
+
+def _export_case(name, user, repeat, warmup):
+    from ..exports import build_clientes_report, build_precatorios_report
+
+    builder = build_precatorios_report if name == 'export_precatorios' else build_clientes_report
+
+    def run():
+        workbook = builder(user)
+        spool = workbook.save()
+        try:
+            spool.seek(0, os.SEEK_END)
+            return workbook.total_rows, spool.tell()
+        finally:
+            spool.close()
+
+    result, (rows, size) = _measure(run, repeat, warmup)
+    result.update({'kind': 'export', 'rows': rows, 'bytes': size})
+    return result
+
+
+def _import_case(name, path, rows, repeat, warmup):
+    arguments = ['--file', path, '--reader', 'streaming']
+    if name == 'import_excel_bulk':
+        arguments.append('--bulk')
+
+    def run():
+        with transaction.atomic():
+            call_command('import_excel', *arguments, stdout=StringIO(), stderr=StringIO())
+            transaction.set_rollback(True)
+
+    result, _ = _measure(run, repeat, warmup)
+    result.update({'kind': 'import', 'rows': rows})
+    return result
+
+
+def run_benchmarks(cases=None, repeat=5, warmup=1, import_rows=1000, progress=None):
+    """
+    Run the benchmark cases and collect the results.
+
+    Args:
+        cases (list|None): Names from CASES to run (default: all)
+        repeat (int): Timed runs per case
+        warmup (int): Untimed runs per case before timing
+        import_rows (int): Rows of the workbook the import cases read
+        progress (callable|None): Called with (case name, result) after each case
+
+    Returns:
+        dict: Metadata (revision, database, dataset counts) and a result per case
+    """
+    cases = list(cases or CASES)
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        raise ValueError(f"Casos desconhecidos: {', '.join(unknown)}")
+
+    user = get_benchmark_user()
+    client = Client()
+    client.force_login(user)
+
+    import_path = None
+    if any(OTHER_CASES.get(name) == 'import' for name in cases):
+        handle, import_path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(handle)
+        write_import_workbook(import_rows, import_path)
+
+    results = {}
+    try:
+        # The test client's host is not in a production ALLOWED_HOSTS
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for name in cases:
+                if name in VIEW_CASES:
+                    kind, url_name = VIEW_CASES[name]
+                    result = _view_case(client, url_name, kind, repeat, warmup)
+                elif OTHER_CASES[name] == 'export':
+                    result = _export_case(name, user, repeat, warmup)
+                else:
+                    result = _import_case(name, import_path, import_rows, repeat, warmup)
+                results[name] = result
+                if progress:
+                    progress(name, result)
+    finally:
+        if import_path:
+            os.remove(import_path)
+
+    return {
+        'schema': RESULTS_SCHEMA,
+        'created_at': timezone.now().isoformat(),
+        'revision': git_revision(),
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'repeat': repeat,
+        'warmup': warmup,
+        'dataset': dataset_counts(),
+        'results': results,
+    }
+
+
+def compare_results(baseline, current):
+    """
+    Median of each case in two result sets.
+
+    Returns:
+        list: (case, baseline median ms, current median ms, ratio) for the
+              cases timed in both, ratio > 1 meaning slower than the baseline
+    """
+    rows = []
+    for name, result in current['results'].items():
+        before = baseline.get('results', {}).get(name, {}).get('median_ms')
+        after = result.get('median_ms')
+        if before is None or after is None:
+            continue
+        rows.append((name, before, after, round(after / before, 2) if before else None))
+    return rows
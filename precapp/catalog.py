@@ -0,0 +1,162 @@
+"""
+Process-local cache of the configuration catalogs
+
+Fases, tipos de precatório, tipos de pedido and tipos de diligência are small
+tables that change a few times a year but feed the dropdowns and badges of
+almost every page. Each process keeps a snapshot of them in memory and serves
+the lists from there, without querying the database.
+
+The snapshots are validated against a version token stored in the shared
+cache (CATALOG_CACHE_ALIAS, a cache every worker process sees). Saving or
+deleting any catalog record stores a new token (see models.py), so every
+worker drops its snapshot and reloads it on next use. A process checks the
+token at most once every CATALOG_VERSION_CHECK_SECONDS; the process that made
+the change drops its snapshot immediately.
+
+Writes that skip signals (QuerySet.update, bulk_create, raw SQL) are not
+seen until the next catalog save: call invalidate_catalog() after them.
+
+The returned lists and instances are shared by every request of the process
+and must be treated as read-only. Code that needs a QuerySet (form fields,
+further filtering, validation) keeps using the model classmethods such as
+Fase.get_fases_for_alvara().
+"""
+
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from . import metrics
+from .models import (
+    Fase, FaseHonorariosContratuais, FaseHonorariosSucumbenciais, PedidoRequerimento, Tipo, TipoDiligencia
+)
+
+
+CATALOG_VERSION_KEY = 'precapp:catalog:version'
+
+# Snapshot name -> model; every row is loaded, in the model's default ordering
+CATALOG_MODELS = {
+    'fases': Fase,
+    'fases_honorarios_contratuais': FaseHonorariosContratuais,
+    'fases_honorarios_sucumbenciais': FaseHonorariosSucumbenciais,
+    'tipos': Tipo,
+    'pedidos': PedidoRequerimento,
+    'tipos_diligencia': TipoDiligencia,
+}
+
+_lock = threading.Lock()
+_state = {'version': None, 'checked_at': None, 'snapshots': {}}
+
+
+def get_catalog_cache():
+    """The shared cache holding the version token."""
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def get_version_check_seconds():
+    """How long a process trusts its snapshots without reading the token (0 checks on every use)."""
+    return getattr(settings, 'CATALOG_VERSION_CHECK_SECONDS', 1)
+
+
+def _shared_version():
+    cache = get_catalog_cache()
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # First use, or the shared cache was cleared: start a new version so
+        # that no process keeps serving a snapshot taken before
+        cache.add(CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def get_snapshot(name):
+    """
+    Return every row of a catalog, from this process' snapshot when current.
+
+    Args:
+        name (str): One of CATALOG_MODELS
+
+    Returns:
+        list: Model instances in the model's default ordering
+    """
+    now = time.monotonic()
+    with _lock:
+        if _state['checked_at'] is None or now - _state['checked_at'] >= get_version_check_seconds():
+            version = _shared_version()
+            if version != _state['version']:
+                _state['version'] = version
+                _state['snapshots'] = {}
+            _state['checked_at'] = now
+
+        snapshot = _state['snapshots'].get(name)
+        hit = snapshot is not None
+        if not hit:
+            snapshot = list(CATALOG_MODELS[name].objects.all())
+            _state['snapshots'][name] = snapshot
+    metrics.record_cache_lookup('catalog', hit)
+    return snapshot
+
+
+def invalidate_catalog():
+    """
+    Make every process reload its snapshots.
+
+    The token is replaced right away (so this process and the requests that
+    follow see the change) and again when the surrounding transaction
+    commits, so that a worker reloading in between does not keep the
+    pre-commit rows.
+    """
+    def bump():
+        get_catalog_cache().set(CATALOG_VERSION_KEY, uuid.uuid4().hex, None)
+        with _lock:
+            _state['version'] = None
+            _state['checked_at'] = None
+            _state['snapshots'] = {}
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def fases_for_alvara():
+    """Active fases with tipo 'alvara' or 'ambos' (cached Fase.get_fases_for_alvara)."""
+    return [fase for fase in get_snapshot('fases') if fase.ativa and fase.tipo in ('alvara', 'ambos')]
+
+
+def fases_for_requerimento():
+    """Active fases with tipo 'requerimento' or 'ambos' (cached Fase.get_fases_for_requerimento)."""
+    return [fase for fase in get_snapshot('fases') if fase.ativa and fase.tipo in ('requerimento', 'ambos')]
+
+
+def fases_honorarios_contratuais(active_only=True):
+    """Fases of honorários contratuais, only the active ones by default."""
+    return [fase for fase in get_snapshot('fases_honorarios_contratuais') if fase.ativa or not active_only]
+
+
+def fases_honorarios_sucumbenciais(active_only=True):
+    """Fases of honorários sucumbenciais, only the active ones by default."""
+    return [fase for fase in get_snapshot('fases_honorarios_sucumbenciais') if fase.ativa or not active_only]
+
+
+def tipos_ativos():
+    """Active tipos de precatório (cached Tipo.get_tipos_ativos)."""
+    return [tipo for tipo in get_snapshot('tipos') if tipo.ativa]
+
+
+def pedidos_ativos():
+    """Active tipos de pedido (cached PedidoRequerimento.get_ativos)."""
+    return [pedido for pedido in get_snapshot('pedidos') if pedido.ativo]
+
+
+def tipos_diligencia_ativos():
+    """Active tipos de diligência (cached TipoDiligencia.get_ativos)."""
+    return [tipo for tipo in get_snapshot('tipos_diligencia') if tipo.ativo]
+
+
+def pedido_names_containing(text):
+    """Names of the active tipos de pedido containing text (case insensitive)."""
+    text = text.lower()
+    return [pedido.nome for pedido in pedidos_ativos() if text in pedido.nome.lower()]
@@ -0,0 +1,132 @@
+"""
+Dashboard statistics
+
+The home page shows counters and totals over every main table. Computed
+naively that is one COUNT or SUM per figure (thirteen queries per page
+view); here each table is read by a single aggregate query and the result
+is cached for DASHBOARD_CACHE_SECONDS.
+
+The cache is cleared by post_save/post_delete receivers (see models.py)
+whenever a record that feeds the counters changes, so the dashboard
+reflects edits made through the application immediately. Writes that skip
+signals (QuerySet.update, bulk_create) are covered by the short TTL and,
+for Excel imports, by an explicit invalidation when the import finishes.
+The counters live in the shared cache (DASHBOARD_CACHE_ALIAS, a cache every
+worker process sees), so an invalidation made by one process - a web worker
+or the import worker - reaches all of them.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from . import metrics
+from .models import Alvara, Cliente, Diligencias, Precatorio, Requerimento, TipoDiligencia
+
+
+DASHBOARD_CACHE_KEY = 'precapp:dashboard:statistics'
+
+
+def get_dashboard_cache():
+    """The shared cache holding the counters."""
+    return caches[getattr(settings, 'DASHBOARD_CACHE_ALIAS', 'default')]
+
+
+def _cache_key():
+    return f'{DASHBOARD_CACHE_KEY}:{timezone.now().date().isoformat()}'
+
+
+def get_dashboard_cache_seconds():
+    """How long the dashboard statistics are cached (0 disables the cache)."""
+    return getattr(settings, 'DASHBOARD_CACHE_SECONDS', 60)
+
+
+def compute_dashboard_statistics():
+    """
+    Compute the dashboard counters with one aggregate query per table.
+
+    Returns:
+        dict: Counts and financial totals keyed by the names used in the
+              home.html template (six queries in total)
+    """
+    today = timezone.now().date()
+
+    precatorios = Precatorio.objects.aggregate(
+        total=Count('pk'),
+        valor=Sum('valor_de_face')
+    )
+    alvaras = Alvara.objects.aggregate(
+        total=Count('pk'),
+        principal=Sum('valor_principal'),
+        contratuais=Sum('honorarios_contratuais'),
+        sucumbenciais=Sum('honorarios_sucumbenciais')
+    )
+    requerimentos = Requerimento.objects.aggregate(
+        total=Count('pk'),
+        valor=Sum('valor')
+    )
+    diligencias = Diligencias.objects.aggregate(
+        total=Count('pk'),
+        pendentes=Count('pk', filter=Q(concluida=False)),
+        concluidas=Count('pk', filter=Q(concluida=True)),
+        atrasadas=Count('pk', filter=Q(concluida=False, data_final__lt=today)),
+        urgentes=Count('pk', filter=Q(concluida=False, urgencia='alta'))
+    )
+
+    return {
+        'total_precatorios': precatorios['total'],
+        'total_clientes': Cliente.objects.count(),
+        'total_alvaras': alvaras['total'],
+        'total_requerimentos': requerimentos['total'],
+        'total_diligencias': diligencias['total'],
+        'total_tipos_diligencia': TipoDiligencia.objects.filter(ativo=True).count(),
+        'total_valor_precatorios': precatorios['valor'] or 0,
+        'valor_alvaras': (
+            (alvaras['principal'] or 0) +
+            (alvaras['contratuais'] or 0) +
+            (alvaras['sucumbenciais'] or 0)
+        ),
+        'total_valor_requerimentos': requerimentos['valor'] or 0,
+        'diligencias_pendentes': diligencias['pendentes'],
+        'diligencias_concluidas': diligencias['concluidas'],
+        'diligencias_atrasadas': diligencias['atrasadas'],
+        'diligencias_urgentes': diligencias['urgentes'],
+    }
+
+
+def get_dashboard_statistics():
+    """
+    Return the dashboard counters, from the cache when available.
+
+    The cache key includes the current date because the overdue diligências
+    counter changes at midnight without any record being saved.
+    """
+    timeout = get_dashboard_cache_seconds()
+    if not timeout:
+        return compute_dashboard_statistics()
+
+    cache = get_dashboard_cache()
+    key = _cache_key()
+    statistics = cache.get(key)
+    metrics.record_cache_lookup('dashboard', statistics is not None)
+    if statistics is None:
+        statistics = compute_dashboard_statistics()
+        cache.set(key, statistics, timeout)
+    return statistics
+
+
+def invalidate_dashboard_statistics():
+    """
+    Drop the cached counters so the next home page view recomputes them.
+
+    The key is deleted right away and again when the surrounding transaction
+    commits, so that a worker recomputing in between does not keep the
+    pre-commit counters.
+    """
+    def drop():
+        get_dashboard_cache().delete(_cache_key())
+
+    drop()
+    transaction.on_commit(drop)
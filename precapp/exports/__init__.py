@@ -0,0 +1,36 @@
+"""
+Excel export package for Django Precatorios application
+
+This package provides the export engine used by the Excel download views:
+- Write-only workbook writer with shared named styles
+- Chunked queryset iteration to keep memory flat on large tables
+- Database-side aggregation for the report statistics sheets
+- Report builders for the complete system and client reports
+- Database-backed background jobs that store finished reports
+"""
+
+from .writer import StreamingWorkbook, iter_chunked, XLSX_CONTENT_TYPE
+from .stats import get_system_statistics
+from .reports import build_precatorios_report, build_clientes_report
+from .jobs import enqueue_export, claim_next_job, fail_stale_jobs, run_export_job, process_pending_jobs
+
+__all__ = [
+    # Writer
+    'StreamingWorkbook',
+    'iter_chunked',
+    'XLSX_CONTENT_TYPE',
+    
+    # Statistics
+    'get_system_statistics',
+    
+    # Reports
+    'build_precatorios_report',
+    'build_clientes_report',
+    
+    # Background jobs
+    'enqueue_export',
+    'claim_next_job',
+    'fail_stale_jobs',
+    'run_export_job',
+    'process_pending_jobs',
+]
@@ -0,0 +1,180 @@
+"""
+Background export jobs
+
+Export requests are stored as ExportJob rows and processed outside the web
+request by the process_export_jobs management command, so large reports are
+not bound by the gunicorn worker timeout. The database table is the queue: a
+worker claims the oldest pending job with a conditional UPDATE, builds the
+workbook, saves it to the default storage backend and records duration, row
+counts and the worker's peak resident memory on the job.
+
+A worker that dies mid-export (OOM kill, deploy restart) leaves its job in
+'processando'. Jobs started more than EXPORT_JOB_STALE_SECONDS ago are
+marked as failed before the next claim, so the user can request the report
+again instead of polling a job that will never finish. The result of a run
+is only stored while its job is still 'processando', so a run that outlives
+the limit cannot turn a failed job back into a finished one.
+"""
+
+import logging
+import resource
+import sys
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from .. import jobqueue, metrics
+from ..models import ExportJob
+from .reports import build_clientes_report, build_precatorios_report
+
+logger = logging.getLogger(__name__)
+
+REPORT_BUILDERS = {
+    'precatorios': (build_precatorios_report, 'relatorio_completo_sistema'),
+    'clientes': (build_clientes_report, 'relatorio_clientes'),
+}
+
+
+def get_stale_seconds():
+    """How long a job may stay in 'processando' before its worker is presumed dead."""
+    return getattr(settings, 'EXPORT_JOB_STALE_SECONDS', 60 * 60)
+
+
+def fail_stale_jobs():
+    """
+    Mark the jobs abandoned by a dead worker as failed.
+
+    Returns:
+        int: Number of jobs marked as failed
+    """
+    now = timezone.now()
+    failed = ExportJob.objects.filter(
+        status=ExportJob.STATUS_PROCESSANDO, iniciado_em__lt=now - timedelta(seconds=get_stale_seconds())
+    ).update(
+        status=ExportJob.STATUS_ERRO,
+        mensagem_erro='A exportação foi interrompida. Solicite o relatório novamente.',
+        concluido_em=now,
+    )
+    if failed:
+        logger.warning(f"Marked {failed} stale export job(s) as failed")
+    return failed
+
+
+def enqueue_export(tipo, user):
+    """
+    Create a pending export job.
+
+    Args:
+        tipo: Report key ('precatorios' or 'clientes')
+        user: User requesting the export
+
+    Returns:
+        ExportJob: The newly created job
+    """
+    if tipo not in REPORT_BUILDERS:
+        raise ValueError(f'Tipo de exportação inválido: {tipo}')
+    return ExportJob.objects.create(tipo=tipo, solicitado_por=user)
+
+
+def claim_next_job():
+    """
+    Atomically claim the oldest pending job.
+
+    Stale jobs are failed first (see fail_stale_jobs); the claim itself is
+    jobqueue.claim_next_job.
+
+    Returns:
+        ExportJob or None: The claimed job, or None when the queue is empty
+    """
+    fail_stale_jobs()
+    return jobqueue.claim_next_job(ExportJob)
+
+
+def get_peak_memory_kb():
+    """
+    Return the worker process's peak resident memory in KB.
+
+    This is the high-water mark of the whole process, not of a single export,
+    but it is free to read, unlike tracing every Python allocation.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_export_job(job):
+    """
+    Generate the workbook for a claimed job and store it.
+
+    Failures are recorded on the job instead of being raised, so a bad job
+    never stops the worker loop.
+
+    Args:
+        job: ExportJob in the 'processando' state
+
+    Returns:
+        ExportJob: The job updated with its final status and metrics
+    """
+    builder, prefix = REPORT_BUILDERS[job.tipo]
+    started = time.monotonic()
+    try:
+        workbook = builder(job.solicitado_por)
+        spool = workbook.save()
+        try:
+            timestamp = timezone.localtime().strftime('%Y%m%d_%H%M%S')
+            job.nome_arquivo = f'{prefix}_{timestamp}.xlsx'
+            job.arquivo.save(job.nome_arquivo, File(spool), save=False)
+        finally:
+            spool.close()
+        job.status = ExportJob.STATUS_CONCLUIDO
+        job.total_linhas = workbook.total_rows
+        job.linhas_por_planilha = workbook.row_counts
+    except Exception as e:
+        logger.exception(f"Export job {job.pk} failed")
+        job.status = ExportJob.STATUS_ERRO
+        job.mensagem_erro = str(e)
+
+    job.pico_memoria_kb = get_peak_memory_kb()
+    job.duracao_segundos = round(time.monotonic() - started, 3)
+    job.concluido_em = timezone.now()
+    if not _save_result(job):
+        # fail_stale_jobs gave up on this run meanwhile; its verdict stands
+        logger.warning(f"Export job {job.pk} finished after being marked as stale, result discarded")
+        if job.arquivo:
+            job.arquivo.delete(save=False)
+        job.refresh_from_db()
+        return job
+    metrics.observe('precatorios_export_job_duration_seconds', job.duracao_segundos, tipo=job.tipo, status=job.status)
+    metrics.flush()
+    logger.info(
+        f"Export job {job.pk} ({job.tipo}) finished as {job.status} in {job.duracao_segundos}s, "
+        f"{job.total_linhas} rows, peak {job.pico_memoria_kb} KB"
+    )
+    return job
+
+
+def _save_result(job):
+    """Store the outcome of a run unless the job stopped being 'processando'."""
+    fields = [
+        'status', 'nome_arquivo', 'total_linhas', 'linhas_por_planilha', 'mensagem_erro',
+        'pico_memoria_kb', 'duracao_segundos', 'concluido_em',
+    ]
+    return ExportJob.objects.filter(pk=job.pk, status=ExportJob.STATUS_PROCESSANDO).update(
+        arquivo=job.arquivo.name, **{field: getattr(job, field) for field in fields}
+    )
+
+
+def process_pending_jobs(limit=None):
+    """
+    Claim and run pending jobs until the queue is empty.
+
+    Args:
+        limit: Optional maximum number of jobs to process
+
+    Returns:
+        list: Processed ExportJob instances
+    """
+    return jobqueue.process_pending_jobs(claim_next_job, run_export_job, limit)
@@ -0,0 +1,613 @@
+"""
+Excel report builders
+
+Each builder fills a StreamingWorkbook with the sheets of one report. They do
+not depend on the request, so the same code can serve a direct download or be
+run outside the request/response cycle.
+"""
+
+from datetime import date
+
+from django.utils import timezone
+
+from ..models import Alvara, Cliente, Diligencias, Precatorio, Recebimentos, Requerimento
+from .stats import get_system_statistics
+from .writer import StreamingWorkbook, iter_chunked
+
+# Fill colors shared by the report sheets
+COLOR_SUCCESS = "D4EDDA"
+COLOR_WARNING = "FFF3CD"
+COLOR_DANGER = "F8D7DA"
+COLOR_INFO = "E3F2FD"
+COLOR_PURPLE = "F3E5F5"
+COLOR_STATS_HEADER = "4A90E2"
+
+
+def _user_display_name(user):
+    return user.get_full_name() or user.username
+
+
+def build_precatorios_report(user):
+    """
+    Build the complete system report (export_precatorios_excel).
+
+    Worksheets:
+        1. Precatórios: Main documents with client associations
+        2. Clientes: Client summaries with aggregated data
+        3. Diligências: Legal tasks with completion tracking
+        4. Requerimentos: Legal requests with financial analysis
+        5. Alvarás: Payment authorizations with fee breakdown
+        6. Recebimentos: Receipts registered for the alvarás
+        7. Estatísticas: System-wide statistics and report metadata
+
+    Args:
+        user: User requesting the report (shown in the statistics sheet)
+
+    Returns:
+        StreamingWorkbook: Workbook ready to be saved or streamed
+    """
+    workbook = StreamingWorkbook()
+    currency = workbook.style(currency=True)
+    fill_success = workbook.style(fill=COLOR_SUCCESS)
+    fill_warning = workbook.style(fill=COLOR_WARNING)
+    fill_danger = workbook.style(fill=COLOR_DANGER)
+
+    # ==================== PRECATORIOS SHEET ====================
+    ws_precatorios = workbook.create_sheet(
+        "Precatórios",
+        [
+            'CNJ', 'Origem', 'Valor de Face', 'Última Atualização', 'Data Última Atualização',
+            'Crédito Principal', 'Honorários Contratuais', 'Honorários Sucumbenciais',
+            'Cliente Nome', 'Cliente CPF', 'Cliente Nascimento', 'Cliente Prioritário',
+            'Tipo Precatório', 'Orçamento'
+        ],
+        header_color="366092",
+        width=15,
+    )
+
+    precatorios = Precatorio.objects.prefetch_related('clientes').select_related('tipo').order_by('cnj')
+
+    for precatorio in iter_chunked(precatorios):
+        # Clients come from the prefetch cache; pick the lowest pk like .first() would
+        clientes = precatorio.clientes.all()
+        primeiro_cliente = min(clientes, key=lambda c: c.pk) if clientes else None
+
+        workbook.append(ws_precatorios, [
+            precatorio.cnj,
+            precatorio.origem,
+            precatorio.valor_de_face,
+            precatorio.ultima_atualizacao,
+            precatorio.data_ultima_atualizacao.strftime('%d/%m/%Y') if precatorio.data_ultima_atualizacao else '',
+            precatorio.get_credito_principal_display(),
+            precatorio.get_honorarios_contratuais_display(),
+            precatorio.get_honorarios_sucumbenciais_display(),
+            primeiro_cliente.nome if primeiro_cliente else 'Não vinculado',
+            primeiro_cliente.cpf if primeiro_cliente else '',
+            primeiro_cliente.nascimento.strftime('%d/%m/%Y') if primeiro_cliente and primeiro_cliente.nascimento else '',
+            'Sim' if primeiro_cliente and primeiro_cliente.prioridade else 'Não',
+            precatorio.tipo.nome if precatorio.tipo else 'Não especificado',
+            precatorio.orcamento
+        ], styles={3: currency, 4: currency})
+
+    # ==================== CLIENTES SHEET ====================
+    ws_clientes = workbook.create_sheet(
+        "Clientes",
+        [
+            'Nome', 'CPF', 'Data Nascimento', 'Prioritário',
+            'Total Precatórios', 'Valor Total Precatórios', 'Total Diligências',
+            'Diligências Pendentes', 'Diligências Concluídas'
+        ],
+        header_color="2E7D32",
+        width=18,
+    )
+
+    clientes = Cliente.objects.with_resumo().order_by('nome', 'cpf')
+
+    for cliente in iter_chunked(clientes):
+        styles = {6: currency}
+        if cliente.prioridade:
+            styles[4] = fill_warning
+
+        workbook.append(ws_clientes, [
+            cliente.nome,
+            cliente.cpf,
+            cliente.nascimento.strftime('%d/%m/%Y') if cliente.nascimento else '',
+            'Sim' if cliente.prioridade else 'Não',
+            cliente.total_precatorios,
+            cliente.valor_total_precatorios,
+            cliente.total_diligencias,
+            cliente.diligencias_pendentes,
+            cliente.diligencias_concluidas
+        ], styles=styles)
+
+    # ==================== DILIGENCIAS SHEET ====================
+    ws_diligencias = workbook.create_sheet(
+        "Diligências",
+        [
+            'Cliente Nome', 'Cliente CPF', 'Tipo Diligência', 'Descrição',
+            'Data Final', 'Urgência', 'Status', 'Data Conclusão',
+            'Responsável', 'Criado Por', 'Concluído Por', 'Data Criação'
+        ],
+        header_color="D32F2F",
+        width=20,
+    )
+
+    diligencias = Diligencias.objects.select_related(
+        'cliente', 'tipo', 'responsavel'
+    ).order_by('cliente__nome', 'data_final')
+
+    urgencia_styles = {'alta': fill_danger, 'media': fill_warning}
+
+    for diligencia in diligencias.iterator():
+        styles = {7: fill_success if diligencia.concluida else fill_warning}
+        if diligencia.urgencia in urgencia_styles:
+            styles[6] = urgencia_styles[diligencia.urgencia]
+
+        workbook.append(ws_diligencias, [
+            diligencia.cliente.nome,
+            diligencia.cliente.cpf,
+            diligencia.tipo.nome,
+            diligencia.descricao[:100] + '...' if len(diligencia.descricao or '') > 100 else diligencia.descricao,
+            diligencia.data_final.strftime('%d/%m/%Y') if diligencia.data_final else '',
+            diligencia.get_urgencia_display(),
+            'Concluída' if diligencia.concluida else 'Pendente',
+            diligencia.data_conclusao.strftime('%d/%m/%Y %H:%M') if diligencia.data_conclusao else '',
+            diligencia.responsavel.get_full_name() if diligencia.responsavel else 'Não atribuído',
+            diligencia.criado_por or '',
+            diligencia.concluido_por or '',
+            diligencia.criado_em.strftime('%d/%m/%Y %H:%M') if diligencia.criado_em else ''
+        ], styles=styles)
+
+    # ==================== REQUERIMENTOS SHEET ====================
+    ws_requerimentos = workbook.create_sheet(
+        "Requerimentos",
+        [
+            'Cliente Nome', 'Cliente CPF', 'Precatório CNJ', 'Tipo Pedido',
+            'Valor', 'Deságio (%)', 'Fase Atual', 'Data Criação',
+            'Status da Fase', 'Valor com Deságio'
+        ],
+        header_color="FF6F00",
+        width=18,
+    )
+
+    requerimentos = Requerimento.objects.select_related(
+        'cliente', 'precatorio', 'pedido', 'fase'
+    ).order_by('cliente__nome', 'precatorio__cnj')
+
+    for requerimento in requerimentos.iterator():
+        # Calculate valor com deságio - ensure safe calculation
+        try:
+            if requerimento.valor and requerimento.desagio:
+                valor_com_desagio = requerimento.valor * (1 - requerimento.desagio / 100)
+            else:
+                valor_com_desagio = requerimento.valor or 0
+        except (TypeError, ZeroDivisionError):
+            valor_com_desagio = requerimento.valor or 0
+
+        valor = requerimento.valor or 0
+        desagio = requerimento.desagio or 0
+        status_fase = 'Ativa' if requerimento.fase and requerimento.fase.ativa else 'Inativa' if requerimento.fase else 'N/A'
+
+        styles = {}
+        if valor:
+            styles[5] = currency
+        if valor_com_desagio:
+            styles[10] = currency
+        if status_fase == 'Ativa':
+            styles[9] = fill_success
+        elif status_fase == 'Inativa':
+            styles[9] = fill_danger
+
+        workbook.append(ws_requerimentos, [
+            requerimento.cliente.nome if requerimento.cliente else 'Não vinculado',
+            requerimento.cliente.cpf if requerimento.cliente else '',
+            requerimento.precatorio.cnj if requerimento.precatorio else '',
+            requerimento.pedido.nome if requerimento.pedido else 'Não especificado',
+            valor,
+            # Deságio is shown with an explicit % sign
+            f"{desagio}%" if desagio else 0,
+            requerimento.fase.nome if requerimento.fase else 'Sem fase',
+            requerimento.precatorio.data_ultima_atualizacao.strftime('%d/%m/%Y') if requerimento.precatorio and requerimento.precatorio.data_ultima_atualizacao else '',
+            status_fase,
+            valor_com_desagio
+        ], styles=styles)
+
+    # ==================== ALVARÁS SHEET ====================
+    ws_alvaras = workbook.create_sheet(
+        "Alvarás",
+        [
+            'Cliente Nome', 'Cliente CPF', 'Precatório CNJ', 'Valor Principal',
+            'Honorários Contratuais', 'Honorários Sucumbenciais', 'Valor Total',
+            'Tipo Alvará', 'Fase Principal', 'Fase Honorários', 'Status Geral'
+        ],
+        header_color="7B1FA2",
+        width=18,
+    )
+
+    alvaras = Alvara.objects.select_related(
+        'cliente', 'precatorio', 'fase', 'fase_honorarios_contratuais'
+    ).order_by('cliente__nome', 'precatorio__cnj')
+
+    for alvara in alvaras.iterator():
+        valor_total = (alvara.valor_principal or 0) + (alvara.honorarios_contratuais or 0) + (alvara.honorarios_sucumbenciais or 0)
+
+        # Determine overall status
+        status_geral = 'N/A'
+        if alvara.fase and alvara.fase_honorarios_contratuais:
+            if alvara.fase.ativa and alvara.fase_honorarios_contratuais.ativa:
+                status_geral = 'Ambas Ativas'
+            elif not alvara.fase.ativa and not alvara.fase_honorarios_contratuais.ativa:
+                status_geral = 'Ambas Inativas'
+            else:
+                status_geral = 'Misto'
+        elif alvara.fase:
+            status_geral = 'Ativa' if alvara.fase.ativa else 'Inativa'
+        elif alvara.fase_honorarios_contratuais:
+            status_geral = 'Hon. Ativa' if alvara.fase_honorarios_contratuais.ativa else 'Hon. Inativa'
+
+        styles = {4: currency, 5: currency, 6: currency, 7: currency}
+        if 'Ativa' in status_geral and 'Inativa' not in status_geral:
+            styles[11] = fill_success
+        elif 'Inativa' in status_geral and 'Ativa' not in status_geral:
+            styles[11] = fill_danger
+        elif 'Misto' in status_geral:
+            styles[11] = fill_warning
+
+        workbook.append(ws_alvaras, [
+            alvara.cliente.nome,
+            alvara.cliente.cpf,
+            alvara.precatorio.cnj,
+            alvara.valor_principal,
+            alvara.honorarios_contratuais,
+            alvara.honorarios_sucumbenciais,
+            valor_total,
+            alvara.tipo,
+            alvara.fase.nome if alvara.fase else 'Sem fase',
+            alvara.fase_honorarios_contratuais.nome if alvara.fase_honorarios_contratuais else 'Sem fase',
+            status_geral
+        ], styles=styles)
+
+    # ==================== RECEBIMENTOS SHEET ====================
+    ws_recebimentos = workbook.create_sheet(
+        "Recebimentos",
+        [
+            'Número Documento', 'Alvará ID', 'Data', 'Conta Bancária',
+            'Valor', 'Tipo', 'Cliente Nome', 'Cliente CPF',
+            'Precatório CNJ', 'Criado Em', 'Criado Por'
+        ],
+        header_color="795548",
+        width=15,
+    )
+
+    recebimentos = Recebimentos.objects.select_related(
+        'alvara', 'alvara__cliente', 'alvara__precatorio', 'conta_bancaria'
+    ).order_by('-data', 'numero_documento')
+
+    tipo_styles = {
+        'Hon. contratuais': workbook.style(fill=COLOR_INFO),
+        'Hon. sucumbenciais': workbook.style(fill=COLOR_PURPLE),
+    }
+
+    for recebimento in recebimentos.iterator():
+        valor = float(recebimento.valor) if recebimento.valor else 0
+
+        styles = {}
+        if valor:
+            styles[5] = currency
+        if recebimento.tipo in tipo_styles:
+            styles[6] = tipo_styles[recebimento.tipo]
+
+        workbook.append(ws_recebimentos, [
+            recebimento.numero_documento,
+            f"ALV-{recebimento.alvara.id}" if recebimento.alvara else '',
+            recebimento.data.strftime('%d/%m/%Y') if recebimento.data else '',
+            f"{recebimento.conta_bancaria.banco} - {recebimento.conta_bancaria.agencia}/{recebimento.conta_bancaria.conta}" if recebimento.conta_bancaria else '',
+            valor,
+            recebimento.get_tipo_display(),
+            recebimento.alvara.cliente.nome if recebimento.alvara and recebimento.alvara.cliente else '',
+            recebimento.alvara.cliente.cpf if recebimento.alvara and recebimento.alvara.cliente else '',
+            recebimento.alvara.precatorio.cnj if recebimento.alvara and recebimento.alvara.precatorio else '',
+            recebimento.criado_em.strftime('%d/%m/%Y %H:%M') if recebimento.criado_em else '',
+            recebimento.criado_por or ''
+        ], styles=styles)
+
+    # ==================== STATISTICS SHEET ====================
+    ws_stats = workbook.create_sheet("Estatísticas", width={'A': 25, 'B': 20})
+
+    stats = get_system_statistics()
+
+    stats_data = [
+        ['Estatística', 'Valor'],
+        ['', ''],
+        ['### DOCUMENTOS ###', ''],
+        ['Total de Precatórios', stats['total_precatorios']],
+        ['Total de Requerimentos', stats['total_requerimentos']],
+        ['Total de Alvarás', stats['total_alvaras']],
+        ['Total de Recebimentos', stats['total_recebimentos']],
+        ['', ''],
+        ['### CLIENTES ###', ''],
+        ['Total de Clientes', stats['total_clientes']],
+        ['Clientes Prioritários', stats['clientes_prioritarios']],
+        ['', ''],
+        ['### DILIGÊNCIAS ###', ''],
+        ['Total de Diligências', stats['total_diligencias']],
+        ['Diligências Pendentes', stats['diligencias_pendentes']],
+        ['Diligências Concluídas', stats['diligencias_concluidas']],
+        ['', ''],
+        ['### REQUERIMENTOS ###', ''],
+        ['Requerimentos com Fase', stats['requerimentos_com_fase']],
+        ['Requerimentos sem Fase', stats['requerimentos_sem_fase']],
+        ['', ''],
+        ['### ALVARÁS ###', ''],
+        ['Alvarás - Aguardando Depósito', stats['alvaras_aguardando_deposito']],
+        ['Alvarás - Depósito Judicial', stats['alvaras_deposito_judicial']],
+        ['Alvarás - Recebido pelo Cliente', stats['alvaras_recebido_cliente']],
+        ['', ''],
+        ['### RECEBIMENTOS ###', ''],
+        ['Recebimentos - Hon. Contratuais', stats['recebimentos_contratuais']],
+        ['Recebimentos - Hon. Sucumbenciais', stats['recebimentos_sucumbenciais']],
+        ['', ''],
+        ['### VALORES FINANCEIROS ###', ''],
+        ['Valor Total dos Precatórios', stats['valor_total_precatorios']],
+        ['Valor Total dos Requerimentos', stats['valor_total_requerimentos']],
+        ['Valor Total dos Alvarás', stats['valor_total_alvaras']],
+        ['Valor Total dos Recebimentos', stats['valor_total_recebimentos']],
+        ['Valor Recebimentos Contratuais', stats['valor_recebimentos_contratuais']],
+        ['Valor Recebimentos Sucumbenciais', stats['valor_recebimentos_sucumbenciais']],
+        ['', ''],
+        ['### RELATÓRIO ###', ''],
+        ['Data do Relatório', timezone.now().strftime('%d/%m/%Y %H:%M')],
+        ['Gerado por', _user_display_name(user)]
+    ]
+
+    label_style = workbook.style(bold=True)
+    header_style = workbook.style(fill=COLOR_STATS_HEADER, bold=True, font_color='FFFFFF')
+    section_label_style = workbook.style(fill="E0E0E0", bold=True, font_color='000000')
+    section_value_style = workbook.style(fill="E0E0E0")
+
+    for row, (label, value) in enumerate(stats_data, 1):
+        # Ensure values are safe for Excel
+        safe_label = str(label) if label is not None else ''
+        safe_value = value if value is not None else ''
+
+        if row == 1:
+            styles = {1: header_style, 2: header_style}
+        elif safe_label.startswith('###'):
+            styles = {1: section_label_style, 2: section_value_style}
+        else:
+            styles = {1: label_style}
+            if 'Valor Total' in safe_label and isinstance(safe_value, (int, float)) and safe_value > 0:
+                styles[2] = currency
+
+        workbook.append(ws_stats, [safe_label, safe_value], styles=styles)
+
+    return workbook
+
+
+def build_clientes_report(user):
+    """
+    Build the client-focused report (export_clientes_excel).
+
+    Worksheets:
+        1. Clientes Detalhado: Client data with precatórios and diligências summary
+        2. Resumo por Prioridade: Totals split by priority status
+        3. Estatísticas Detalhadas: System-wide statistics and report metadata
+        4. Diligências: All diligências with status color coding
+
+    Args:
+        user: User requesting the report (shown in the statistics sheet)
+
+    Returns:
+        StreamingWorkbook: Workbook ready to be saved or streamed
+    """
+    workbook = StreamingWorkbook()
+    currency = workbook.style(currency=True)
+    fill_warning = workbook.style(fill=COLOR_WARNING)
+    fill_danger = workbook.style(fill=COLOR_DANGER)
+    today = date.today()
+
+    # ==================== CLIENTES DETALHADO SHEET ====================
+    cliente_headers = [
+        'CPF/CNPJ', 'Nome Completo', 'Data Nascimento', 'Idade', 'Cliente Prioritário',
+        'Total Precatórios', 'CNJ Precatórios', 'Valor Total Precatórios',
+        'Total Diligências', 'Diligências Pendentes', 'Diligências Concluídas',
+        'Diligências Atrasadas', 'Última Diligência', 'Próximo Vencimento'
+    ]
+    ws_clientes = workbook.create_sheet(
+        "Clientes Detalhado", cliente_headers, header_color="2E7D32", width=20
+    )
+
+    # Counters, values and diligência summaries come from SQL annotations;
+    # only the CNJ list needs the related precatórios
+    clientes = Cliente.objects.with_resumo(today).prefetch_related('precatorios').order_by('nome', 'cpf')
+
+    # Priority totals are accumulated while streaming the detailed sheet
+    totals = {
+        True: {'clientes': 0, 'valor': 0},
+        False: {'clientes': 0, 'valor': 0},
+    }
+
+    priority_currency = workbook.style(fill=COLOR_WARNING, currency=True)
+
+    for cliente in iter_chunked(clientes):
+        cnjs = [p.cnj for p in cliente.precatorios.all()]
+        cnj_list = ', '.join(cnjs[:3])  # Show first 3 CNJs
+        if len(cnjs) > 3:
+            cnj_list += f' (e mais {len(cnjs) - 3})'
+
+        total_valor = cliente.valor_atual_precatorios
+
+        totals[bool(cliente.prioridade)]['clientes'] += 1
+        totals[bool(cliente.prioridade)]['valor'] += total_valor
+
+        ultima_diligencia = ''
+        if cliente.ultima_diligencia_tipo is not None:
+            ultima_diligencia = f"{cliente.ultima_diligencia_tipo} - {(cliente.ultima_diligencia_descricao or '')[:30]}..."
+
+        proximo_vencimento = ''
+        if cliente.proximo_vencimento:
+            proximo_vencimento = cliente.proximo_vencimento.strftime('%d/%m/%Y')
+
+        idade = ''
+        if cliente.nascimento:
+            idade_anos = (today - cliente.nascimento).days // 365
+            idade = f"{idade_anos} anos"
+
+        # Priority clients get the whole row highlighted
+        if cliente.prioridade:
+            row_style = fill_warning
+            styles = {8: priority_currency}
+        else:
+            row_style = None
+            styles = {8: currency}
+        if cliente.diligencias_atrasadas > 0:
+            styles[12] = fill_danger
+
+        workbook.append(ws_clientes, [
+            cliente.cpf,
+            cliente.nome,
+            cliente.nascimento.strftime('%d/%m/%Y') if cliente.nascimento else '',
+            idade,
+            'Sim' if cliente.prioridade else 'Não',
+            cliente.total_precatorios,
+            cnj_list if cnj_list else 'Nenhum',
+            total_valor,
+            cliente.total_diligencias,
+            cliente.diligencias_pendentes,
+            cliente.diligencias_concluidas,
+            cliente.diligencias_atrasadas,
+            ultima_diligencia if ultima_diligencia else 'Nenhuma',
+            proximo_vencimento if proximo_vencimento else 'Nenhum'
+        ], styles=styles, row_style=row_style)
+
+    # ==================== RESUMO POR PRIORIDADE SHEET ====================
+    ws_resumo = workbook.create_sheet(
+        "Resumo por Prioridade", width={letter: 25 for letter in 'ABCDE'}
+    )
+
+    total_prioritarios = totals[True]['clientes']
+    total_normais = totals[False]['clientes']
+    total_clientes = total_prioritarios + total_normais
+    valor_prioritarios = totals[True]['valor']
+    valor_normais = totals[False]['valor']
+
+    resumo_data = [
+        ['Categoria', 'Quantidade Clientes', 'Percentual', 'Valor Total Precatórios', 'Valor Médio por Cliente'],
+        ['Clientes Prioritários', total_prioritarios, f"{(total_prioritarios/total_clientes*100):.1f}%" if total_clientes > 0 else "0%", valor_prioritarios, valor_prioritarios/total_prioritarios if total_prioritarios > 0 else 0],
+        ['Clientes Normais', total_normais, f"{(total_normais/total_clientes*100):.1f}%" if total_clientes > 0 else "0%", valor_normais, valor_normais/total_normais if total_normais > 0 else 0],
+        ['', '', '', '', ''],
+        ['TOTAL GERAL', total_clientes, '100%', valor_prioritarios + valor_normais, (valor_prioritarios + valor_normais)/total_clientes if total_clientes > 0 else 0]
+    ]
+
+    resumo_row_styles = {
+        1: workbook.header_style(COLOR_STATS_HEADER),
+        2: fill_warning,
+        5: workbook.style(fill="E9ECEF", bold=True),
+    }
+    resumo_currency_styles = {
+        2: workbook.style(fill=COLOR_WARNING, currency=True),
+        5: workbook.style(fill="E9ECEF", bold=True, currency=True),
+    }
+
+    for row, data_row in enumerate(resumo_data, 1):
+        row_style = resumo_row_styles.get(row)
+        styles = {}
+        if row > 1:
+            row_currency = resumo_currency_styles.get(row, currency)
+            for col in (4, 5):
+                if isinstance(data_row[col - 1], (int, float)):
+                    styles[col] = row_currency
+        workbook.append(ws_resumo, data_row, styles=styles, row_style=row_style)
+
+    # ==================== ESTATÍSTICAS DETALHADAS SHEET ====================
+    ws_stats = workbook.create_sheet("Estatísticas Detalhadas", width={'A': 30, 'B': 25})
+
+    stats = get_system_statistics()
+    total_diligencias_sistema = stats['total_diligencias']
+    diligencias_concluidas_sistema = stats['diligencias_concluidas']
+    total_precatorios_sistema = stats['total_precatorios']
+    valor_total_sistema = stats['valor_atual_precatorios']
+
+    stats_data = [
+        ['Estatística', 'Valor'],
+        ['### CLIENTES ###', ''],
+        ['Total de Clientes', total_clientes],
+        ['Clientes Prioritários', total_prioritarios],
+        ['Clientes Normais', total_normais],
+        ['Percentual Prioritários', f"{(total_prioritarios/total_clientes*100):.1f}%" if total_clientes > 0 else "0%"],
+        ['', ''],
+        ['### PRECATÓRIOS ###', ''],
+        ['Total de Precatórios no Sistema', total_precatorios_sistema],
+        ['Valor Total dos Precatórios', valor_total_sistema],
+        ['Valor Médio por Precatório', valor_total_sistema/total_precatorios_sistema if total_precatorios_sistema > 0 else 0],
+        ['', ''],
+        ['### DILIGÊNCIAS ###', ''],
+        ['Total de Diligências no Sistema', total_diligencias_sistema],
+        ['Diligências Pendentes', stats['diligencias_pendentes']],
+        ['Diligências Concluídas', diligencias_concluidas_sistema],
+        ['Diligências Atrasadas', stats['diligencias_atrasadas']],
+        ['Taxa de Conclusão', f"{(diligencias_concluidas_sistema/total_diligencias_sistema*100):.1f}%" if total_diligencias_sistema > 0 else "0%"],
+        ['', ''],
+        ['### RELATÓRIO ###', ''],
+        ['Data do Relatório', timezone.now().strftime('%d/%m/%Y %H:%M')],
+        ['Gerado por', _user_display_name(user)],
+        ['Tipo de Relatório', 'Exportação de Clientes']
+    ]
+
+    stats_header = workbook.style(fill=COLOR_STATS_HEADER, bold=True, font_color='FFFFFF')
+
+    for row, (label, value) in enumerate(stats_data, 1):
+        if row == 1:
+            styles = {1: stats_header, 2: stats_header}
+        else:
+            styles = {}
+            if 'Valor' in str(label) and 'Valor' != str(label) and isinstance(value, (int, float)):
+                styles[2] = currency
+        workbook.append(ws_stats, [label, value], styles=styles)
+
+    # ==================== DILIGENCIAS SHEET ====================
+    ws_diligencias = workbook.create_sheet(
+        "Diligências",
+        [
+            'Cliente Nome', 'Cliente CPF', 'Tipo Diligência', 'Descrição',
+            'Data Final', 'Urgência', 'Status', 'Data Conclusão',
+            'Responsável', 'Criado Por', 'Data Criação', 'Observações'
+        ],
+        header_color="D32F2F",
+        width=18,
+    )
+
+    all_diligencias = Diligencias.objects.select_related(
+        'cliente', 'tipo', 'responsavel'
+    ).order_by('cliente__nome', 'data_final')
+
+    fill_success = workbook.style(fill=COLOR_SUCCESS)
+    fill_info = workbook.style(fill=COLOR_INFO)
+
+    for diligencia in all_diligencias.iterator():
+        if diligencia.concluida:
+            styles = {7: fill_success}
+        elif diligencia.data_final and diligencia.data_final < today:
+            styles = {7: fill_danger}
+        else:
+            styles = {7: fill_warning}
+        if diligencia.cliente.prioridade:
+            styles[1] = fill_info
+
+        workbook.append(ws_diligencias, [
+            diligencia.cliente.nome,
+            diligencia.cliente.cpf,
+            diligencia.tipo.nome,
+            diligencia.descricao[:100] + '...' if diligencia.descricao and len(diligencia.descricao) > 100 else diligencia.descricao or '',
+            diligencia.data_final.strftime('%d/%m/%Y') if diligencia.data_final else '',
+            diligencia.get_urgencia_display() if diligencia.urgencia else 'Normal',
+            'Concluída' if diligencia.concluida else 'Pendente',
+            diligencia.data_conclusao.strftime('%d/%m/%Y %H:%M') if diligencia.data_conclusao else '',
+            diligencia.responsavel.get_full_name() if diligencia.responsavel else '',
+            diligencia.criado_por or '',
+            diligencia.criado_em.strftime('%d/%m/%Y %H:%M') if diligencia.criado_em else '',
+            # Diligencias has no observacoes field; the column is kept for layout compatibility
+            ''
+        ], styles=styles)
+
+    return workbook
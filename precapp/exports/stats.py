@@ -0,0 +1,90 @@
+"""
+Database-side statistics for the Excel reports
+
+All figures of the statistics sheets are computed with one conditional
+aggregate query per model (Count/Sum with filter=), so producing the summary
+never materializes whole tables in Python.
+"""
+
+from django.db.models import Count, FloatField, Q, Sum, Value
+from django.db.models.functions import Coalesce, NullIf
+from django.utils import timezone
+
+from ..models import Alvara, Cliente, Diligencias, Precatorio, Recebimentos, Requerimento
+
+
+def _zero():
+    return Value(0.0, output_field=FloatField())
+
+
+def get_system_statistics():
+    """
+    Compute the system-wide statistics shown in the export reports.
+
+    Runs six aggregate queries (one per model) regardless of table size.
+
+    Returns:
+        dict: Counters and monetary totals keyed by statistic name. Monetary
+              totals are floats and default to 0 on empty tables.
+    """
+    today = timezone.now().date()
+
+    precatorios = Precatorio.objects.aggregate(
+        total_precatorios=Count('cnj'),
+        valor_total_precatorios=Sum('ultima_atualizacao'),
+        # Current value: ultima_atualizacao when set and non-zero, otherwise valor_de_face
+        valor_atual_precatorios=Sum(
+            Coalesce(NullIf('ultima_atualizacao', _zero()), 'valor_de_face', _zero())
+        ),
+    )
+
+    clientes = Cliente.objects.aggregate(
+        total_clientes=Count('cpf'),
+        clientes_prioritarios=Count('cpf', filter=Q(prioridade=True)),
+    )
+
+    diligencias = Diligencias.objects.aggregate(
+        total_diligencias=Count('id'),
+        diligencias_pendentes=Count('id', filter=Q(concluida=False)),
+        diligencias_concluidas=Count('id', filter=Q(concluida=True)),
+        diligencias_atrasadas=Count('id', filter=Q(concluida=False, data_final__lt=today)),
+    )
+
+    requerimentos = Requerimento.objects.aggregate(
+        total_requerimentos=Count('id'),
+        requerimentos_com_fase=Count('id', filter=Q(fase__isnull=False)),
+        valor_total_requerimentos=Sum('valor'),
+    )
+
+    alvaras = Alvara.objects.aggregate(
+        total_alvaras=Count('id'),
+        alvaras_aguardando_deposito=Count('id', filter=Q(tipo__icontains='aguardando')),
+        alvaras_deposito_judicial=Count('id', filter=Q(tipo__icontains='depósito')),
+        alvaras_recebido_cliente=Count('id', filter=Q(tipo__icontains='recebido')),
+        valor_total_alvaras=Sum(
+            Coalesce('valor_principal', _zero())
+            + Coalesce('honorarios_contratuais', _zero())
+            + Coalesce('honorarios_sucumbenciais', _zero())
+        ),
+    )
+
+    recebimentos = Recebimentos.objects.aggregate(
+        total_recebimentos=Count('numero_documento'),
+        recebimentos_contratuais=Count('numero_documento', filter=Q(tipo='Hon. contratuais')),
+        recebimentos_sucumbenciais=Count('numero_documento', filter=Q(tipo='Hon. sucumbenciais')),
+        valor_total_recebimentos=Sum('valor'),
+        valor_recebimentos_contratuais=Sum('valor', filter=Q(tipo='Hon. contratuais')),
+        valor_recebimentos_sucumbenciais=Sum('valor', filter=Q(tipo='Hon. sucumbenciais')),
+    )
+
+    stats = {}
+    for result in (precatorios, clientes, diligencias, requerimentos, alvaras, recebimentos):
+        stats.update(result)
+
+    # Sums are NULL on empty tables; Decimal sums (recebimentos) become floats
+    for key, value in stats.items():
+        if key.startswith('valor_'):
+            stats[key] = float(value or 0)
+
+    stats['requerimentos_sem_fase'] = stats['total_requerimentos'] - stats['requerimentos_com_fase']
+    return stats
@@ -0,0 +1,187 @@
+"""
+Streaming Excel writer used by the export views
+
+Wraps an openpyxl write-only workbook so rows are flushed to disk as they are
+appended instead of being kept as Cell objects in memory. Cell formatting is
+done through named styles registered once per workbook, so every cell shares
+the same style record instead of allocating its own Font/Border/Fill objects.
+"""
+
+import tempfile
+
+from django.conf import settings
+from django.http import FileResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CURRENCY_FORMAT = 'R$ #,##0.00'
+
+
+def get_export_chunk_size():
+    """Number of rows fetched from the database per query while exporting."""
+    return getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+
+def iter_chunked(queryset, chunk_size=None):
+    """
+    Iterate over a queryset in fixed-size chunks of primary keys.
+
+    The primary keys are read first, in queryset order, with one light
+    query; each chunk is then fetched with pk__in, so every query is an index
+    lookup instead of an OFFSET that skips all the rows before it (which gets
+    slower the further the export goes). Each chunk is evaluated separately,
+    so prefetch_related lookups are resolved per chunk and only one chunk of
+    objects is alive at a time (QuerySet.iterator() ignores prefetch_related
+    on Django 3.2).
+
+    Args:
+        queryset: Ordered QuerySet to iterate
+        chunk_size: Rows per query (defaults to EXPORT_CHUNK_SIZE)
+
+    Yields:
+        Model instances in queryset order
+    """
+    chunk_size = chunk_size or get_export_chunk_size()
+    keys = list(queryset.values_list('pk', flat=True))
+    for start in range(0, len(keys), chunk_size):
+        chunk_keys = keys[start:start + chunk_size]
+        objects = {obj.pk: obj for obj in queryset.filter(pk__in=chunk_keys)}
+        # A row deleted since the keys were read is skipped
+        yield from (objects[key] for key in chunk_keys if key in objects)
+
+
+class StreamingWorkbook:
+    """
+    Write-only workbook with shared named styles.
+
+    Usage:
+        workbook = StreamingWorkbook()
+        ws = workbook.create_sheet("Precatórios", headers, header_color="366092", width=15)
+        workbook.append(ws, [cnj, origem, valor], styles={3: workbook.style(currency=True)})
+        return workbook.as_response('relatorio.xlsx')
+    """
+
+    def __init__(self):
+        self.wb = Workbook(write_only=True)
+        self.row_counts = {}
+        self._styles = {}
+        self._thin_border = Border(
+            left=Side(style='thin'), right=Side(style='thin'),
+            top=Side(style='thin'), bottom=Side(style='thin')
+        )
+        self.default_style = self.style()
+
+    def style(self, fill=None, bold=False, font_color=None, currency=False, center=False):
+        """
+        Return the name of a bordered named style, registering it on first use.
+
+        Args:
+            fill: Optional solid fill color (hex without '#')
+            bold: Whether the font is bold
+            font_color: Optional font color (hex without '#')
+            currency: Whether to apply the Brazilian currency number format
+            center: Whether to center the cell content
+
+        Returns:
+            str: Named style to assign to WriteOnlyCell.style
+        """
+        key = (fill, bold, font_color, currency, center)
+        name = self._styles.get(key)
+        if name is None:
+            name = f'export_{len(self._styles)}'
+            named_style = NamedStyle(name=name, border=self._thin_border)
+            if fill:
+                named_style.fill = PatternFill(start_color=fill, end_color=fill, fill_type='solid')
+            if bold or font_color:
+                named_style.font = Font(bold=bold, color=font_color)
+            if currency:
+                named_style.number_format = CURRENCY_FORMAT
+            if center:
+                named_style.alignment = Alignment(horizontal='center', vertical='center')
+            self.wb.add_named_style(named_style)
+            self._styles[key] = name
+        return name
+
+    def header_style(self, color):
+        """Named style for a header cell: bold white text on a solid color."""
+        return self.style(fill=color, bold=True, font_color='FFFFFF', center=True)
+
+    def create_sheet(self, title, headers=None, header_color=None, width=None):
+        """
+        Create a worksheet, set its column widths and write the header row.
+
+        Column widths must be set before any row is appended in write-only mode.
+
+        Args:
+            title: Worksheet title
+            headers: Optional list of header labels
+            header_color: Fill color for the header row
+            width: Column width applied to every header column, or a dict
+                   mapping column letters to widths
+
+        Returns:
+            WriteOnlyWorksheet
+        """
+        ws = self.wb.create_sheet(title=title)
+        self.row_counts[title] = 0
+        if isinstance(width, dict):
+            for letter, letter_width in width.items():
+                ws.column_dimensions[letter].width = letter_width
+        elif width and headers:
+            for col in range(1, len(headers) + 1):
+                ws.column_dimensions[get_column_letter(col)].width = width
+        if headers:
+            self._write_row(ws, headers, {}, self.header_style(header_color))
+        return ws
+
+    def append(self, ws, values, styles=None, row_style=None):
+        """
+        Append one row to a worksheet.
+
+        Args:
+            ws: Worksheet returned by create_sheet
+            values: Cell values in column order
+            styles: Optional dict mapping 1-based column numbers to style names
+            row_style: Style for columns not listed in styles (defaults to a bordered cell)
+        """
+        self._write_row(ws, values, styles or {}, row_style or self.default_style)
+        self.row_counts[ws.title] += 1
+
+    @property
+    def total_rows(self):
+        """Number of rows appended to all sheets, header rows excluded."""
+        return sum(self.row_counts.values())
+
+    def _write_row(self, ws, values, styles, row_style):
+        cells = []
+        for col, value in enumerate(values, 1):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = styles.get(col, row_style)
+            cells.append(cell)
+        ws.append(cells)
+
+    def save(self):
+        """
+        Save the workbook into an anonymous temporary file.
+
+        Returns:
+            File object positioned at the beginning of the saved workbook
+        """
+        spool = tempfile.TemporaryFile(suffix='.xlsx')
+        self.wb.save(spool)
+        spool.seek(0)
+        return spool
+
+    def as_response(self, filename):
+        """
+        Build a streaming download response for the workbook.
+
+        The workbook is spooled to a temporary file and streamed back in
+        chunks; the file is closed (and removed) when the response is closed.
+        """
+        response = FileResponse(self.save(), content_type=XLSX_CONTENT_TYPE)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -5,6 +5,8 @@ from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.forms.widgets import ClearableFileInput
 import re
+from django.forms.models import ModelChoiceIterator
+from . import catalog
 from .models import Precatorio, Cliente, Alvara, Requerimento, Fase, FaseHonorariosContratuais, FaseHonorariosSucumbenciais, Diligencias, TipoDiligencia, Tipo, PedidoRequerimento, ContaBancaria, Recebimentos
 
 
@@ -329,6 +331,42 @@ def validate_currency(value):
     return value
 
 
+class CatalogChoiceIterator(ModelChoiceIterator):
+    """Yield the options of a CatalogChoiceField from the catalog cache."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for obj in self.field.catalog():
+            yield self.choice(obj)
+
+    def __len__(self):
+        return len(self.field.catalog()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.catalog())
+
+
+class CatalogChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField whose options come from the catalog cache (catalog.py).
+    
+    Rendering the field evaluates no queryset: the options are built from the
+    process' catalog snapshot. Submitted ids are still validated against the
+    queryset, so a value is only accepted if the record exists and matches
+    the queryset's filters when the form is validated.
+    
+    Args:
+        catalog (callable): Returns the instances to offer, e.g. catalog.fases_for_alvara
+        queryset (QuerySet): The same records as a QuerySet, used for validation
+    """
+    iterator = CatalogChoiceIterator
+
+    def __init__(self, catalog, queryset, **kwargs):
+        self.catalog = catalog
+        super().__init__(queryset, **kwargs)
+
+
 class PrecatorioForm(forms.ModelForm):
     """
     Comprehensive form for creating and editing precatorios in the legal system.
@@ -1559,7 +1597,8 @@ class RequerimentoForm(forms.ModelForm):
         })
     )
     
-    pedido = forms.ModelChoiceField(
+    pedido = CatalogChoiceField(
+        catalog=catalog.pedidos_ativos,
         queryset=None,  # Will be set in __init__
         empty_label='Selecione o tipo de pedido',
         label='Tipo de Pedido',
@@ -1569,7 +1608,8 @@ class RequerimentoForm(forms.ModelForm):
         })
     )
     
-    fase = forms.ModelChoiceField(
+    fase = CatalogChoiceField(
+        catalog=catalog.fases_for_requerimento,
         queryset=None,  # Will be set in __init__
         empty_label='Selecione a fase',
         label='Fase',
@@ -1595,8 +1635,8 @@ class RequerimentoForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         self.precatorio = kwargs.pop('precatorio', None)
         super().__init__(*args, **kwargs)
+        # Options come from the catalog cache; the querysets (lazy) validate submitted ids
         # Set queryset to only show phases for Requerimento
-        from .models import Fase
         self.fields['fase'].queryset = Fase.get_fases_for_requerimento()
         # Set queryset to only show active pedido types
         self.fields['pedido'].queryset = PedidoRequerimento.get_ativos()
@@ -1879,7 +1919,8 @@ class AlvaraSimpleForm(forms.ModelForm):
         })
     )
     
-    fase = forms.ModelChoiceField(
+    fase = CatalogChoiceField(
+        catalog=catalog.fases_for_alvara,
         queryset=None,  # Will be set in __init__
         empty_label='Selecione a fase',
         label='Fase Principal',
@@ -1889,7 +1930,8 @@ class AlvaraSimpleForm(forms.ModelForm):
         })
     )
     
-    fase_honorarios_contratuais = forms.ModelChoiceField(
+    fase_honorarios_contratuais = CatalogChoiceField(
+        catalog=catalog.fases_honorarios_contratuais,
         queryset=None,  # Will be set in __init__
         empty_label='Selecione a fase (opcional)',
         label='Fase Honorários Contratuais',
@@ -1900,7 +1942,8 @@ class AlvaraSimpleForm(forms.ModelForm):
         })
     )
     
-    fase_honorarios_sucumbenciais = forms.ModelChoiceField(
+    fase_honorarios_sucumbenciais = CatalogChoiceField(
+        catalog=catalog.fases_honorarios_sucumbenciais,
         queryset=None,  # Will be set in __init__
         empty_label='Selecione a fase (opcional)',
         label='Fase Honorários Sucumbenciais',
@@ -1953,8 +1996,8 @@ class AlvaraSimpleForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         self.precatorio = kwargs.pop('precatorio', None)
         super().__init__(*args, **kwargs)
+        # Options come from the catalog cache; the querysets (lazy) validate submitted ids
         # Set queryset to only show phases for Alvará
-        from .models import Fase, FaseHonorariosContratuais, FaseHonorariosSucumbenciais
         self.fields['fase'].queryset = Fase.get_fases_for_alvara()
         self.fields['fase_honorarios_contratuais'].queryset = FaseHonorariosContratuais.get_fases_ativas()
         self.fields['fase_honorarios_sucumbenciais'].queryset = FaseHonorariosSucumbenciais.get_fases_ativas()
@@ -0,0 +1,19 @@
+"""
+Excel import package for Django Precatorios application
+
+This package runs the import_excel engine outside the web request:
+- Database-backed background jobs for uploaded workbooks
+- Progress (rows processed, errors, rows/s) persisted after every chunk
+- Structured results instead of parsing the command output
+"""
+
+from .jobs import enqueue_import, claim_next_job, requeue_stale_jobs, run_import_job, process_pending_jobs
+
+__all__ = [
+    # Background jobs
+    'enqueue_import',
+    'claim_next_job',
+    'requeue_stale_jobs',
+    'run_import_job',
+    'process_pending_jobs',
+]
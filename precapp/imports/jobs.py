@@ -0,0 +1,196 @@
+"""
+Background import jobs
+
+Uploaded workbooks are stored with an ImportJob row and imported by the
+process_import_jobs management command, so large files are not bound by the
+gunicorn worker timeout. A worker claims the oldest pending job with a
+conditional UPDATE and runs import_excel in chunked mode; after every
+committed chunk the progress is written to the job, which the upload page
+polls through a JSON endpoint.
+
+A worker that dies mid-import (OOM kill, deploy restart) leaves its job in
+'processando'. The worker bumps the job's atualizado_em heartbeat when it
+claims the job and after every committed chunk; jobs with no heartbeat for
+IMPORT_JOB_STALE_SECONDS are put back in the queue before the next claim.
+The rows they had committed are recorded in the file's ImportCheckpoint, so
+the rerun resumes after them. A long import that keeps committing chunks is
+never requeued, however long it runs.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db.models import Q
+from django.utils import timezone
+
+from .. import jobqueue, metrics
+from ..management.commands.import_excel import Command as ImportExcelCommand
+from ..models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+
+def get_import_chunk_size():
+    """Number of rows committed per transaction by web imports."""
+    return getattr(settings, 'IMPORT_CHUNK_SIZE', 1000)
+
+
+def get_stale_seconds():
+    """How long a job may go without progress before its worker is presumed dead."""
+    return getattr(settings, 'IMPORT_JOB_STALE_SECONDS', 30 * 60)
+
+
+def requeue_stale_jobs():
+    """
+    Put the jobs abandoned by a dead worker back in the queue.
+
+    Their progress is kept: run_import_job resumes a job that already
+    committed rows from the file's checkpoint.
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    limit = timezone.now() - timedelta(seconds=get_stale_seconds())
+    # Jobs claimed before the heartbeat existed only have iniciado_em
+    requeued = ImportJob.objects.filter(
+        Q(atualizado_em__lt=limit) | Q(atualizado_em__isnull=True, iniciado_em__lt=limit),
+        status=ImportJob.STATUS_PROCESSANDO,
+    ).update(status=ImportJob.STATUS_PENDENTE)
+    if requeued:
+        logger.warning(f"Requeued {requeued} stale import job(s)")
+    return requeued
+
+
+def enqueue_import(uploaded_file, user):
+    """
+    Store an uploaded workbook and create a pending import job.
+
+    Args:
+        uploaded_file: UploadedFile from request.FILES
+        user: User uploading the file
+
+    Returns:
+        ImportJob: The newly created job
+    """
+    job = ImportJob(nome_arquivo=uploaded_file.name, solicitado_por=user)
+    job.arquivo.save(uploaded_file.name, uploaded_file, save=False)
+    job.save()
+    return job
+
+
+def claim_next_job():
+    """
+    Atomically claim the oldest pending job.
+
+    Stale jobs are requeued first (see requeue_stale_jobs); the claim itself
+    is jobqueue.claim_next_job, which also starts the heartbeat.
+
+    Returns:
+        ImportJob or None: The claimed job, or None when the queue is empty
+    """
+    requeue_stale_jobs()
+    return jobqueue.claim_next_job(ImportJob, timestamp_fields=('iniciado_em', 'atualizado_em'))
+
+
+def run_import_job(job):
+    """
+    Import the workbook of a claimed job, recording progress as it goes.
+
+    The file is copied from the storage backend to a local temporary file
+    (the readers need a path) and imported with import_excel --chunk-size,
+    streaming .xlsx files in read-only mode. The command's progress callback
+    persists the committed rows, rejected rows and throughput after every
+    chunk; the final counts come from the command's structured result.
+    Failures are recorded on the job instead of being raised, so a bad file
+    never stops the worker loop.
+
+    A requeued job that had committed rows runs with --resume and continues
+    after the last committed chunk; its counts are added to the earlier ones.
+
+    Args:
+        job: ImportJob in the 'processando' state
+
+    Returns:
+        ImportJob: The job updated with its final status and result
+    """
+    started = time.monotonic()
+    resume = job.linhas_processadas > 0
+    resumed_rows = job.linhas_processadas if resume else 0
+    earlier_errors = job.linhas_com_erro if resume else 0
+    earlier = dict(job.resultado) if resume else {}
+    earlier_messages = list(job.erros) if resume else []
+
+    def totals(imported):
+        return {key: earlier.get(key, 0) + imported.get(key, 0) for key in {*earlier, *imported}}
+
+    def save_progress(rows_done, total_rows, imported, errors):
+        elapsed = time.monotonic() - started
+        job.total_linhas = total_rows
+        job.linhas_processadas = rows_done
+        job.linhas_com_erro = earlier_errors + errors
+        job.linhas_por_segundo = round((rows_done - resumed_rows) / elapsed, 1) if elapsed > 0 else None
+        job.resultado = totals(imported)
+        job.atualizado_em = timezone.now()
+        job.save(update_fields=[
+            'total_linhas', 'linhas_processadas', 'linhas_com_erro', 'linhas_por_segundo', 'resultado',
+            'atualizado_em'
+        ])
+
+    command = ImportExcelCommand(stdout=StringIO(), stderr=StringIO())
+    command.progress_callback = save_progress
+    suffix = os.path.splitext(job.nome_arquivo)[1] or '.xlsx'
+
+    try:
+        handle, temp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(handle, 'wb') as temp_file, job.arquivo.open('rb') as source:
+                for chunk in source.chunks():
+                    temp_file.write(chunk)
+            # .xlsx uploads are streamed; openpyxl cannot read legacy .xls files
+            reader = 'streaming' if suffix.lower() == '.xlsx' else 'pandas'
+            arguments = ['--file', temp_path, '--chunk-size', str(get_import_chunk_size()), '--reader', reader]
+            if resume:
+                arguments.append('--resume')
+            call_command(command, *arguments)
+        finally:
+            # Also covers a copy that failed halfway (missing upload, full disk)
+            os.unlink(temp_path)
+        job.status = ImportJob.STATUS_CONCLUIDO
+        job.total_linhas = command.result['total_rows']
+        job.resultado = totals(command.result['imported'])
+    except Exception as e:
+        logger.exception(f"Import job {job.pk} failed")
+        job.status = ImportJob.STATUS_ERRO
+        job.mensagem_erro = str(e)
+
+    job.linhas_com_erro = earlier_errors + command.row_errors
+    job.erros = (earlier_messages + command.error_messages)[:ImportExcelCommand.MAX_ERROR_MESSAGES]
+    job.concluido_em = job.atualizado_em = timezone.now()
+    job.save()
+    metrics.observe('precatorios_import_job_duration_seconds', time.monotonic() - started, status=job.status)
+    metrics.flush()
+    logger.info(
+        f"Import job {job.pk} ({job.nome_arquivo}) finished as {job.status}: "
+        f"{job.linhas_processadas}/{job.total_linhas} rows, {job.linhas_com_erro} errors, "
+        f"{job.linhas_por_segundo} rows/s"
+    )
+    return job
+
+
+def process_pending_jobs(limit=None):
+    """
+    Claim and run pending jobs until the queue is empty.
+
+    Args:
+        limit: Optional maximum number of jobs to process
+
+    Returns:
+        list: Processed ImportJob instances
+    """
+    return jobqueue.process_pending_jobs(claim_next_job, run_import_job, limit)
@@ -0,0 +1,355 @@
+"""
+Per-request performance instrumentation
+
+InstrumentationMiddleware (see middleware.py) measures every request while
+INSTRUMENTATION_ENABLED is on (MetricsMiddleware reads the same measurement,
+see measure_request):
+- the SQL queries run, through a connection execute wrapper: count, total
+  database time and the statements repeated within the request (the same
+  statement with different parameters is an N+1 pattern);
+- the time spent rendering templates (Django template backend);
+- the total time and the response size.
+
+Requests slower than INSTRUMENTATION_SLOW_REQUEST_MS, or running more than
+INSTRUMENTATION_SLOW_QUERY_COUNT queries or repeating a statement
+INSTRUMENTATION_DUPLICATE_QUERY_THRESHOLD times, are logged with their
+measurements.
+
+The measurements are aggregated per view (URL name) in memory, keeping the
+last INSTRUMENTATION_SAMPLES_PER_VIEW requests of each view. Every
+INSTRUMENTATION_FLUSH_SECONDS a process copies its samples to the shared
+cache under its own key, so the staff page (instrumentation_view) can merge
+the samples of every worker process. Resetting the samples bumps a generation
+number in the shared cache; each process compares it with the one it last
+saw when it flushes and drops its own samples when it changed.
+"""
+
+import contextvars
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_KEY = 'precapp:instrumentation:processes'
+PROCESS_KEY = 'precapp:instrumentation:process:{}'
+GENERATION_KEY = 'precapp:instrumentation:generation'
+PROCESS_TTL = 24 * 60 * 60  # Samples of a worker that stopped flushing expire after a day
+UNRESOLVED_VIEW = 'unresolved'  # Label of the requests that matched no URL pattern
+
+_current = contextvars.ContextVar('precapp_instrumentation', default=None)
+
+# Collapse "IN (%s, %s, ...)" so batches of any size share a fingerprint
+_IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)')
+_SPACES = re.compile(r'\s+')
+
+
+def get_setting(name, default):
+    return getattr(settings, f'INSTRUMENTATION_{name}', default)
+
+
+def is_enabled():
+    return get_setting('ENABLED', False)
+
+
+def fingerprint(sql):
+    """Statement with its parameters left out, used to spot repeated queries."""
+    return _IN_LIST.sub('IN (...)', _SPACES.sub(' ', sql).strip())
+
+
+class RequestStats:
+    """Measurements of one request; filled by the middleware and the hooks below."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.statements = Counter()
+        self.duration = None
+        self.size = None
+
+    def record_query(self, sql, elapsed):
+        self.queries += 1
+        self.db_time += elapsed
+        self.statements[sql] += 1
+
+    def duplicates(self):
+        """(fingerprint, count) of the statements run more than once, most repeated first."""
+        fingerprints = Counter()
+        for sql, count in self.statements.items():
+            fingerprints[fingerprint(sql)] += count
+        return [(sql, count) for sql, count in fingerprints.most_common() if count > 1]
+
+    def finish(self, response):
+        self.duration = time.perf_counter() - self.started
+        if not getattr(response, 'streaming', False):
+            self.size = len(response.content)
+
+    def as_sample(self):
+        duplicates = self.duplicates()
+        return {
+            'duration_ms': self.duration * 1000,
+            'queries': self.queries,
+            'db_ms': self.db_time * 1000,
+            'render_ms': self.render_time * 1000,
+            'size': self.size,
+            'duplicated_queries': sum(count - 1 for sql, count in duplicates),
+            'top_duplicate': duplicates[0] if duplicates else None,
+        }
+
+
+def start_request():
+    """Start measuring the current request; returns the stats and the context token."""
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+@contextmanager
+def measure_request():
+    """
+    Measure the request being handled; yields its RequestStats.
+
+    The outermost call starts the measurement and wraps every database
+    connection with query_wrapper; nested calls (one middleware inside
+    another) reuse the same stats, so the queries are counted once.
+    """
+    stats = _current.get()
+    if stats is not None:
+        yield stats
+        return
+
+    stats, token = start_request()
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_wrapper))
+            yield stats
+    finally:
+        end_request(token)
+
+
+def view_name(request):
+    """URL name of the view that handled the request, the label of its measurements."""
+    resolver_match = getattr(request, 'resolver_match', None)
+    return resolver_match.view_name if resolver_match else UNRESOLVED_VIEW
+
+
+def query_wrapper(execute, sql, params, many, context):
+    """connection.execute_wrapper hook recording the queries of the current request."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record_query(sql, time.perf_counter() - start)
+
+
+_render_patch_lock = threading.Lock()
+_render_patched = False
+
+
+def install_render_timer():
+    """
+    Time template rendering.
+
+    Wraps the render method of the Django template backend, the entry point
+    of render(), render_to_string() and TemplateResponse; templates included
+    from a template are rendered inside it and are not counted twice.
+    """
+    global _render_patched
+    from django.template.backends.django import Template
+
+    with _render_patch_lock:
+        if _render_patched:
+            return
+        original = Template.render
+
+        def render(self, context=None, request=None):
+            stats = _current.get()
+            if stats is None:
+                return original(self, context, request)
+            start = time.perf_counter()
+            try:
+                return original(self, context, request)
+            finally:
+                stats.render_time += time.perf_counter() - start
+
+        Template.render = render
+        _render_patched = True
+
+
+def log_if_slow(view_name, stats):
+    """Log the request when it crosses one of the thresholds."""
+    duplicates = stats.duplicates()
+    reasons = []
+    if stats.duration * 1000 >= get_setting('SLOW_REQUEST_MS', 1000):
+        reasons.append('slow')
+    if stats.queries >= get_setting('SLOW_QUERY_COUNT', 50):
+        reasons.append('many queries')
+    if duplicates and duplicates[0][1] >= get_setting('DUPLICATE_QUERY_THRESHOLD', 5):
+        reasons.append('repeated query (N+1)')
+    if not reasons:
+        return False
+
+    reasons = ', '.join(reasons)
+    message = (
+        f"{reasons[0].upper()}{reasons[1:]}: {view_name} took {stats.duration * 1000:.0f} ms, "
+        f"{stats.queries} queries in {stats.db_time * 1000:.0f} ms, "
+        f"rendering {stats.render_time * 1000:.0f} ms, {stats.size if stats.size is not None else '?'} bytes"
+    )
+    if duplicates:
+        sql, count = duplicates[0]
+        message += f"; repeated {count}x: {sql[:300]}"
+    logger.warning(message)
+    return True
+
+
+class MetricsStore:
+    """Last samples of each view in this process, and their copy in the shared cache."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(self._new_buffer)
+        self.flushed_at = None
+        self.generation = None
+
+    def _new_buffer(self):
+        return deque(maxlen=get_setting('SAMPLES_PER_VIEW', 500))
+
+    def cache(self):
+        return caches[get_setting('CACHE_ALIAS', 'default')]
+
+    def record(self, view_name, sample):
+        with self.lock:
+            self.samples[view_name].append(sample)
+            due = self.flushed_at is None or time.monotonic() - self.flushed_at >= get_setting('FLUSH_SECONDS', 10)
+        if due:
+            self.flush()
+
+    def local_samples(self):
+        with self.lock:
+            return {view_name: list(samples) for view_name, samples in self.samples.items()}
+
+    def flush(self):
+        """Copy this process' samples to the shared cache and register the process."""
+        pid = os.getpid()
+        cache = self.cache()
+        with self.lock:
+            self.flushed_at = time.monotonic()
+        try:
+            generation = cache.get(GENERATION_KEY, 0)
+            with self.lock:
+                if generation != self.generation:
+                    # The samples were reset (possibly by another process) since the last flush
+                    if self.generation is not None:
+                        self.samples.clear()
+                    self.generation = generation
+            cache.set(PROCESS_KEY.format(pid), self.local_samples(), PROCESS_TTL)
+            processes = cache.get(REGISTRY_KEY) or []
+            if pid not in processes:
+                cache.set(REGISTRY_KEY, [*processes, pid], None)
+        except Exception:
+            # Metrics must never break a request
+            logger.exception('Could not store the instrumentation samples')
+
+    def collect(self):
+        """Samples of every process that flushed recently, merged per view."""
+        self.flush()
+        cache = self.cache()
+        processes = cache.get(REGISTRY_KEY) or []
+        stored = cache.get_many([PROCESS_KEY.format(pid) for pid in processes])
+        alive = [pid for pid in processes if PROCESS_KEY.format(pid) in stored]
+        if alive != processes:
+            cache.set(REGISTRY_KEY, alive, None)
+
+        merged = defaultdict(list)
+        for samples in stored.values():
+            for view_name, view_samples in samples.items():
+                merged[view_name].extend(view_samples)
+        return merged, len(alive)
+
+    def reset(self):
+        """
+        Drop the samples of every process.
+
+        The shared copies are deleted now; the other processes drop their local
+        samples at their next flush, when they see the new generation.
+        """
+        cache = self.cache()
+        processes = cache.get(REGISTRY_KEY) or []
+        cache.delete_many([PROCESS_KEY.format(pid) for pid in processes])
+        cache.delete(REGISTRY_KEY)
+        generation = (cache.get(GENERATION_KEY) or 0) + 1
+        cache.set(GENERATION_KEY, generation, None)
+        with self.lock:
+            self.samples.clear()
+            self.flushed_at = None
+            self.generation = generation
+
+
+store = MetricsStore()
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples_by_view):
+    """
+    Per-view figures for the staff page.
+
+    Returns:
+        list: One dict per view, slowest p90 first
+    """
+    rows = []
+    for view_name, samples in samples_by_view.items():
+        if not samples:
+            continue
+        durations = [sample['duration_ms'] for sample in samples]
+        queries = [sample['queries'] for sample in samples]
+        sizes = [sample['size'] for sample in samples if sample['size'] is not None]
+        duplicates = Counter()
+        for sample in samples:
+            if sample['top_duplicate']:
+                sql, count = sample['top_duplicate']
+                duplicates[sql] = max(duplicates[sql], count)
+        top_duplicate = duplicates.most_common(1)[0] if duplicates else None
+        count = len(samples)
+        rows.append({
+            'view': view_name,
+            'requests': count,
+            'p50_ms': percentile(durations, 0.5),
+            'p90_ms': percentile(durations, 0.9),
+            'p99_ms': percentile(durations, 0.99),
+            'max_ms': max(durations),
+            'avg_queries': sum(queries) / count,
+            'max_queries': max(queries),
+            'avg_db_ms': sum(sample['db_ms'] for sample in samples) / count,
+            'avg_render_ms': sum(sample['render_ms'] for sample in samples) / count,
+            'avg_size': sum(sizes) / len(sizes) if sizes else None,
+            'avg_duplicated_queries': sum(sample['duplicated_queries'] for sample in samples) / count,
+            'top_duplicate': top_duplicate[0] if top_duplicate else None,
+            'top_duplicate_count': top_duplicate[1] if top_duplicate else 0,
+        })
+    rows.sort(key=lambda row: row['p90_ms'], reverse=True)
+    return rows
@@ -0,0 +1,141 @@
+"""
+Database-backed job queue shared by the background export and import jobs
+
+ExportJob and ImportJob rows are their own queue: both have a status going
+pendente -> processando -> concluido/erro and criado_em/iniciado_em
+timestamps. This module holds the parts that do not depend on the kind of
+job: claiming the oldest pending row, draining the queue and the polling
+loop of the worker management commands.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+
+def release_old_connections():
+    """
+    Close database connections that errored or outlived CONN_MAX_AGE.
+
+    Connections inside an atomic block are left alone: closing them would
+    break the transaction (tests run the workers inside one).
+    """
+    if not any(connection.in_atomic_block for connection in connections.all()):
+        close_old_connections()
+
+
+def claim_next_job(model, timestamp_fields=('iniciado_em',)):
+    """
+    Atomically claim the oldest pending job of a model.
+
+    The status transition is a conditional UPDATE, so when several workers
+    race for the same row only one of them gets a row count of 1.
+
+    Args:
+        model: Job model (ExportJob or ImportJob)
+        timestamp_fields: Fields set to the claim time
+
+    Returns:
+        Model instance or None: The claimed job, or None when the queue is empty
+    """
+    while True:
+        job = model.objects.filter(status=model.STATUS_PENDENTE).order_by('criado_em', 'pk').first()
+        if job is None:
+            return None
+        now = timezone.now()
+        claimed = model.objects.filter(pk=job.pk, status=model.STATUS_PENDENTE).update(
+            status=model.STATUS_PROCESSANDO, **{field: now for field in timestamp_fields}
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def process_pending_jobs(claim, run, limit=None):
+    """
+    Claim and run pending jobs until the queue is empty.
+
+    Args:
+        claim: Callable returning the next claimed job or None
+        run: Callable running a claimed job and returning it updated
+        limit: Optional maximum number of jobs to process
+
+    Returns:
+        list: Processed jobs
+    """
+    processed = []
+    while limit is None or len(processed) < limit:
+        job = claim()
+        if job is None:
+            break
+        processed.append(run(job))
+    return processed
+
+
+class JobWorkerCommand(BaseCommand):
+    """
+    Polling worker for a job queue.
+
+    Subclasses set label and implement process_pending_jobs, job_name and
+    summarize_job. Database connections are checked between iterations the
+    way Django does between requests, so a worker that runs for weeks does
+    not keep using a connection the server already closed.
+    """
+
+    label = 'Job'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the pending jobs and exit instead of polling the queue',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait between queue polls (default: 5)',
+        )
+
+    def process_pending_jobs(self):
+        """Claim and run the pending jobs, returning them."""
+        raise NotImplementedError
+
+    def job_name(self, job):
+        """What the job is about (report type, file name) for the worker output."""
+        raise NotImplementedError
+
+    def summarize_job(self, job):
+        """Short summary of a finished job for the worker output."""
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        once = options['once']
+        interval = options['interval']
+
+        if not once:
+            self.stdout.write(f"👷 {self.label} worker started (polling every {interval}s)")
+
+        try:
+            while True:
+                release_old_connections()
+                try:
+                    jobs = self.process_pending_jobs()
+                finally:
+                    release_old_connections()
+                for job in jobs:
+                    if job.status == job.STATUS_CONCLUIDO:
+                        self.stdout.write(self.style.SUCCESS(
+                            f"✅ Job #{job.pk} ({self.job_name(job)}): {self.summarize_job(job)}"
+                        ))
+                    else:
+                        self.stdout.write(self.style.ERROR(
+                            f"❌ Job #{job.pk} ({self.job_name(job)}) failed: {job.mensagem_erro}"
+                        ))
+                if once:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            self.stdout.write(f"🛑 {self.label} worker stopped")
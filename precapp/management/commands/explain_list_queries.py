@@ -0,0 +1,169 @@
+"""
+Show the query plans and timings of the main list-view queries
+
+Benchmark for the list filter indexes (migration 0009): each query mirrors a
+filter of a list view. With --compare the indexes declared in the models'
+Meta.indexes are dropped inside a transaction, the queries are explained and
+timed, and the transaction is rolled back, so the plans before and after the
+indexes are printed side by side. The DROP INDEX locks the tables until the
+rollback: do not use --compare on a busy production database.
+
+Plans only mean something on realistic volumes: on a near-empty PostgreSQL
+database the planner prefers sequential scans whatever the indexes.
+
+Usage:
+    python manage.py explain_list_queries
+    python manage.py explain_list_queries --compare
+    python manage.py explain_list_queries --analyze          # PostgreSQL only
+    python manage.py explain_list_queries --query alvaras_tipo --repeat 20
+"""
+
+import statistics
+import time
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from precapp.models import Alvara, Cliente, Diligencias, Precatorio, Recebimentos
+
+
+PAGE_SIZE = 100
+
+
+def _sample_orcamento():
+    return Precatorio.objects.exclude(orcamento=None).values_list('orcamento', flat=True).first() or date.today().year
+
+
+def _sample_alvara():
+    return Alvara.objects.values_list('pk', flat=True).first() or 0
+
+
+# name -> (description, queryset factory)
+LIST_QUERIES = {
+    'precatorios_credito': (
+        'Precatórios by crédito principal (precatorio_view)',
+        lambda: Precatorio.objects.filter(credito_principal='pendente').order_by('cnj')[:PAGE_SIZE],
+    ),
+    'precatorios_orcamento': (
+        'Precatórios by orçamento (precatorio_view)',
+        lambda: Precatorio.objects.filter(orcamento=_sample_orcamento()).order_by('cnj')[:PAGE_SIZE],
+    ),
+    'clientes_lista': (
+        'Clientes page (clientes_view)',
+        lambda: Cliente.objects.order_by('nome', 'cpf')[:PAGE_SIZE],
+    ),
+    'clientes_prioridade_idade': (
+        'Clientes over 60 without prioridade (update_priority_by_age)',
+        lambda: Cliente.objects.filter(
+            prioridade=False, nascimento__lt=date.today() - relativedelta(years=60)
+        ).only('cpf'),
+    ),
+    'clientes_falecidos': (
+        'Deceased clientes (clientes_view)',
+        lambda: Cliente.objects.filter(falecido=True).order_by('nome', 'cpf')[:PAGE_SIZE],
+    ),
+    'diligencias_pendentes': (
+        'Pending diligências page (diligencias_list_view)',
+        lambda: Diligencias.objects.filter(concluida=False).order_by('-data_criacao', '-id')[:PAGE_SIZE],
+    ),
+    'diligencias_atrasadas': (
+        'Overdue diligências counter (dashboard, diligencias_list_view)',
+        lambda: Diligencias.objects.filter(concluida=False, data_final__lt=date.today()).order_by().only('id'),
+    ),
+    'alvaras_tipo': (
+        'Alvarás by tipo (alvaras_view)',
+        lambda: Alvara.objects.filter(tipo='prioridade').order_by('-id')[:PAGE_SIZE],
+    ),
+    'recebimentos_alvara': (
+        'Recebimentos of an alvará (listar_recebimentos_view)',
+        lambda: Recebimentos.objects.filter(alvara_id=_sample_alvara()).order_by('-data', '-numero_documento'),
+    ),
+}
+
+
+def declared_indexes():
+    """(model, index) for every index declared in Meta.indexes of precapp"""
+    return [
+        (model, index)
+        for model in apps.get_app_config('precapp').get_models()
+        for index in model._meta.indexes
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Explain and time the main list-view queries, optionally with and without the list filter indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help='Also run every query with the Meta.indexes dropped (inside a rolled back transaction)',
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Use EXPLAIN ANALYZE (PostgreSQL only)',
+        )
+        parser.add_argument(
+            '--query',
+            action='append',
+            dest='queries',
+            choices=sorted(LIST_QUERIES),
+            help='Limit to this query (can be repeated)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Executions per query for the timing (default: 5, median reported)',
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be a positive integer')
+        if options['analyze'] and connection.vendor != 'postgresql':
+            raise CommandError('--analyze is only supported on PostgreSQL')
+
+        names = options['queries'] or list(LIST_QUERIES)
+        index_names = [index.name for model, index in declared_indexes()]
+        self.stdout.write(f'Database: {connection.vendor}, {len(index_names)} declared indexes\n')
+
+        without = {}
+        if options['compare']:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for model, index in declared_indexes():
+                        cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+                without = {name: self.measure(name, options) for name in names}
+                transaction.set_rollback(True)
+
+        for name in names:
+            description, factory = LIST_QUERIES[name]
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {name}: {description}'))
+            self.stdout.write(f'   {factory().query}')
+            if name in without:
+                self.write_plan('without indexes', without[name], index_names)
+            self.write_plan('with indexes', self.measure(name, options), index_names)
+            self.stdout.write('')
+
+    def measure(self, name, options):
+        """Plan and median wall time (ms) of one query"""
+        queryset = LIST_QUERIES[name][1]()
+        explain_options = {'analyze': True} if options['analyze'] else {}
+        plan = queryset.explain(**explain_options)
+        timings = []
+        for _ in range(options['repeat']):
+            start = time.perf_counter()
+            list(LIST_QUERIES[name][1]())
+            timings.append((time.perf_counter() - start) * 1000)
+        return plan, statistics.median(timings)
+
+    def write_plan(self, label, result, index_names):
+        plan, elapsed = result
+        used = [index_name for index_name in index_names if index_name in plan]
+        self.stdout.write(f'   -- {label}: {elapsed:.2f} ms, indexes used: {", ".join(used) or "none"}')
+        for line in plan.splitlines():
+            self.stdout.write(f'      {line}')
@@ -0,0 +1,85 @@
+"""
+Generate a synthetic dataset for benchmarking (see precapp/benchmarks/dataset.py)
+
+Refuses to run when ENVIRONMENT is 'production'.
+
+Usage:
+    python manage.py generate_synthetic_data --scale 10k
+    python manage.py generate_synthetic_data --scale 100k --seed 7
+    python manage.py generate_synthetic_data --scale 2500 --alvaras-por-precatorio 2
+    python manage.py generate_synthetic_data --clear
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from precapp.benchmarks import SCALES, clear_dataset, generate_dataset, resolve_scale
+from precapp.benchmarks.dataset import DEFAULT_RATIOS
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with a synthetic dataset of precatórios and related records for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            default='small',
+            help=f"Precatórios to create: {', '.join(SCALES)} or a number (default: small)",
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed; the same seed gives the same dataset (default: 42)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Precatórios created per transaction (default: 1000)',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete the synthetic records first (real records are kept)',
+        )
+        for ratio, default in DEFAULT_RATIOS.items():
+            parser.add_argument(
+                f"--{ratio.replace('_', '-')}",
+                dest=ratio,
+                type=float,
+                default=default,
+                help=f'Average {ratio.replace("_", " ")} (default: {default})',
+            )
+
+    def handle(self, *args, **options):
+        if getattr(settings, 'ENVIRONMENT', 'local') == 'production':
+            raise CommandError('Synthetic data cannot be generated in production')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be a positive integer')
+        try:
+            precatorios = resolve_scale(options['scale'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['clear']:
+            deleted = clear_dataset()
+            self.stdout.write(f"🧹 Removed {', '.join(f'{count} {model}' for model, count in deleted.items())}")
+
+        def progress(done, total):
+            self.stdout.write(f'  {done}/{total} precatórios')
+
+        try:
+            created = generate_dataset(
+                precatorios,
+                seed=options['seed'],
+                ratios={ratio: options[ratio] for ratio in DEFAULT_RATIOS},
+                batch_size=options['batch_size'],
+                progress=progress,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Created {', '.join(f'{count} {model}' for model, count in created.items())}"
+        ))
@@ -16,6 +16,9 @@ Usage Examples:
     python manage.py import_excel --file "data.xlsx" --dry-run
     python manage.py import_excel --file "data.xlsx" --sheet "Main"
     python manage.py import_excel --dry-run
+    python manage.py import_excel --file "large.xlsx" --bulk --batch-size 1000
+    python manage.py import_excel --file "large.xlsx" --chunk-size 1000
+    python manage.py import_excel --file "large.xlsx" --resume
 
 Supported Data Types:
 - Precatórios (court payment orders)
@@ -27,15 +30,173 @@ Author: Precatórios System Team
 Version: 2.0
 Last Updated: September 2025
 """
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.utils import timezone
 from decimal import Decimal, InvalidOperation
 from datetime import datetime
+import hashlib
+import numpy as np
 import pandas as pd
 import os
-from precapp.models import Precatorio, Cliente, Alvara, Requerimento, Fase
+from openpyxl import load_workbook
+from precapp.models import (
+    Precatorio, Cliente, Alvara, Requerimento, Fase, PedidoRequerimento, Tipo, ImportCheckpoint,
+    PrecatorioResumo
+)
 from precapp.forms import validate_cpf, validate_cnpj, validate_cnj
+from precapp.catalog import invalidate_catalog
+from precapp.dashboard import invalidate_dashboard_statistics
+from precapp.search import normalize_search_text
+
+
+CNJ_PATTERN = r'\d{7}-\d{2}\.\d{4}\.\d{1}\.\d{2}\.\d{4}'
+CPF_WEIGHTS = (np.arange(10, 1, -1), np.arange(11, 1, -1))
+CNPJ_WEIGHTS = (np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]), np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+
+
+# Columns of the current spreadsheet format, in sheet order
+# ('Origem', 'Tipo', 'CNJ', 'Orçamento', 'Destacado', 'Autor', 'CPF', 'Nascimento', 'Valor de Face')
+IMPORT_COLUMNS = ['origem', 'tipo', 'cnj', 'orcamento', 'destacado', 'nome', 'cpf', 'nascimento', 'valor_face']
+# Title row and header row come before the data
+DATA_FIRST_ROW = 3
+
+
+class StreamingSheetReader:
+    """
+    Read an .xlsx sheet in DataFrame batches with openpyxl's read-only mode.
+    
+    The workbook is opened once and rows are parsed lazily from the sheet
+    XML, so only one batch is held in memory regardless of the file size.
+    Empty rows are skipped, like DataFrame.dropna(how='all') in the pandas
+    reader, and batches keep a positional index over the non-empty rows.
+    """
+
+    def __init__(self, file_path):
+        self.workbook = load_workbook(file_path, read_only=True, data_only=True)
+
+    @property
+    def sheet_names(self):
+        return self.workbook.sheetnames
+
+    def estimated_rows(self, sheet_name):
+        """Data rows according to the sheet dimension (may count trailing empty rows)."""
+        max_row = self.workbook[sheet_name].max_row
+        return max(max_row - DATA_FIRST_ROW + 1, 0) if max_row else None
+
+    def iter_batches(self, sheet_name, size, skip=0):
+        """
+        Yield DataFrames of up to size rows with the IMPORT_COLUMNS columns.
+        
+        Args:
+            sheet_name (str): Sheet to read
+            size (int): Rows per batch
+            skip (int): Non-empty rows to skip before the first batch (resume)
+        """
+        width = len(IMPORT_COLUMNS)
+        position = 0
+        rows = []
+        for values in self.workbook[sheet_name].iter_rows(min_row=DATA_FIRST_ROW, values_only=True):
+            values = (tuple(values) + (None,) * width)[:width]
+            if all(value is None or value == '' for value in values):
+                continue
+            position += 1
+            if position <= skip:
+                continue
+            rows.append(values)
+            if len(rows) == size:
+                yield self._frame(rows, position)
+                rows = []
+        if rows:
+            yield self._frame(rows, position)
+
+    def _frame(self, rows, last_position):
+        start = last_position - len(rows)
+        return pd.DataFrame(rows, columns=IMPORT_COLUMNS, index=range(start, last_position))
+
+    def close(self):
+        self.workbook.close()
+
+
+def file_sha256(file_path):
+    """SHA-256 of a file's contents, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _normalize_name(nome):
+    """Catalog lookup key: stripped and case-folded name."""
+    return str(nome).strip().casefold()
+
+
+def _present(series):
+    """Vectorized truthiness test: not null, not empty and not zero/False."""
+    return series.notna() & series.astype(bool)
+
+
+def _as_text(series):
+    """Convert a column to strings like str(value), with '' for null cells."""
+    return series.astype(str).where(series.notna(), '').astype(object)
+
+
+def _as_dates(series):
+    """
+    Convert a column to datetime.date objects (None when missing or invalid).
+
+    Accepts the same inputs as the row-by-row parser: datetime values and
+    strings in the YYYY-MM-DD format.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        parsed = series
+    else:
+        is_text = series.map(lambda value: isinstance(value, str))
+        is_datetime = series.map(lambda value: isinstance(value, datetime))
+        parsed = pd.to_datetime(series.where(is_text), format='%Y-%m-%d', errors='coerce')
+        parsed = parsed.fillna(pd.to_datetime(series.where(is_datetime), errors='coerce'))
+    return parsed.dt.date.astype(object).where(parsed.notna(), None)
+
+
+def _valid_cnj(series):
+    """Vectorized validate_cnj: format, year between 1988 and 2050 and segment 1-9."""
+    cnj = series.str.replace(' ', '', regex=False)
+    valid = cnj.str.fullmatch(CNJ_PATTERN).fillna(False).astype(bool)
+    year = pd.to_numeric(cnj.str[11:15].where(valid), errors='coerce')
+    return valid & year.between(1988, 2050) & (cnj.str[16] != '0')
+
+
+def _check_digits_ok(digits, weights):
+    """Compare the last two digits of each row against the mod-11 check digits."""
+    n = digits.shape[1]
+    # All-equal documents such as 111.111.111-11 pass the digit math but are invalid
+    ok = np.any(digits != digits[:, :1], axis=1)
+    for position, weight in zip((n - 2, n - 1), weights):
+        remainder = (digits[:, :position] * weight).sum(axis=1) % 11
+        expected = np.where(remainder < 2, 0, 11 - remainder)
+        ok &= digits[:, position] == expected
+    return ok
+
+
+def _valid_documents(series):
+    """
+    Vectorized validate_cpf/validate_cnpj for cleaned document strings.
+
+    The digits of all 11- and 14-character documents are stacked into one
+    integer matrix per length, so check digits are computed with numpy
+    instead of a Python loop per row.
+    """
+    valid = pd.Series(False, index=series.index)
+    for length, weights in ((11, CPF_WEIGHTS), (14, CNPJ_WEIGHTS)):
+        mask = series.str.fullmatch(rf'\d{{{length}}}').fillna(False).astype(bool)
+        if mask.any():
+            encoded = ''.join(series[mask]).encode('ascii')
+            digits = (np.frombuffer(encoded, dtype=np.uint8).reshape(-1, length) - ord('0')).astype(np.int64)
+            valid[mask] = _check_digits_ok(digits, weights)
+    return valid
 
 
 class Command(BaseCommand):
@@ -68,11 +229,26 @@ class Command(BaseCommand):
     
     Performance Features:
     - Memory-efficient row-by-row processing
+    - Set-based bulk mode (--bulk) for large files
+    - Tipo/Fase catalogs loaded once per sheet and resolved in memory
     - Progress reporting for long operations
     - Configurable batch processing for large files
+    - Chunked commits with a resumable checkpoint (--chunk-size, --resume)
     """
     help = 'Import data from Pasta1.xlsx file'
     
+    # Row error messages kept in memory for the result of web imports
+    MAX_ERROR_MESSAGES = 50
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Structured outcome of the run, read by callers instead of parsing stdout
+        self.result = None
+        self.row_errors = 0
+        self.error_messages = []
+        # Optional callable(rows_done, total_rows, imported, errors) invoked after each commit
+        self.progress_callback = None
+    
     def add_arguments(self, parser):
         """
         Define command-line arguments for the import command.
@@ -97,6 +273,24 @@ class Command(BaseCommand):
                 When specified, shows what would be imported without saving data
                 Useful for testing and validation before actual import
                 
+            --bulk (flag): Use the set-based import engine
+                Resolves existing keys with one query per model and batch, then
+                inserts with bulk_create instead of get_or_create per row
+                
+            --batch-size (int): Rows per bulk batch
+                Default: IMPORT_BATCH_SIZE setting (500)
+                
+            --chunk-size (int): Commit every N rows instead of one transaction
+                Progress is saved in an ImportCheckpoint after every chunk
+                
+            --reader (str): How the sheet is read
+                pandas (default): whole sheet loaded with pandas.read_excel
+                streaming: openpyxl read-only mode, rows parsed in batches
+                
+            --resume (flag): Continue an interrupted chunked import
+                Skips the rows already committed for the same file and sheet;
+                uses IMPORT_CHUNK_SIZE (1000) when --chunk-size is not given
+                
         Usage Examples:
             python manage.py import_excel --file "data.xlsx"
             python manage.py import_excel --sheet "Main" --dry-run
@@ -119,6 +313,34 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be imported without actually importing'
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Use set-based bulk inserts instead of row-by-row get_or_create'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Rows per bulk batch (default: IMPORT_BATCH_SIZE setting)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Commit every N rows and save a checkpoint (default: one transaction for the whole sheet)'
+        )
+        parser.add_argument(
+            '--reader',
+            choices=['pandas', 'streaming'],
+            default='pandas',
+            help='pandas loads the whole sheet; streaming reads .xlsx rows in batches (openpyxl read-only)'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue a chunked import from its last committed row'
+        )
     
     def handle(self, *args, **options):
         """
@@ -134,6 +356,11 @@ class Command(BaseCommand):
                 - file (str): Path to Excel file
                 - sheet (str): Sheet name to import
                 - dry_run (bool): Whether to run in dry run mode
+                - bulk (bool): Whether to use the set-based import engine
+                - batch_size (int|None): Rows per bulk batch
+                - chunk_size (int|None): Rows per committed chunk
+                - resume (bool): Whether to continue from the saved checkpoint
+                - reader (str): 'pandas' or 'streaming'
                 
         Raises:
             CommandError: If file is not found or import fails
@@ -159,6 +386,18 @@ class Command(BaseCommand):
         file_path = options['file']
         sheet_name = options['sheet']
         dry_run = options['dry_run']
+        bulk = options.get('bulk', False)
+        batch_size = options.get('batch_size') or getattr(settings, 'IMPORT_BATCH_SIZE', 500)
+        
+        chunk_size = options.get('chunk_size')
+        resume = options.get('resume', False)
+        if resume and not chunk_size:
+            chunk_size = getattr(settings, 'IMPORT_CHUNK_SIZE', 1000)
+        
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer')
+        if chunk_size is not None and chunk_size < 1:
+            raise CommandError('--chunk-size must be a positive integer')
         
         if not os.path.exists(file_path):
             raise CommandError(f'File not found: {file_path}')
@@ -167,11 +406,24 @@ class Command(BaseCommand):
             self.stdout.write(self.style.WARNING('Running in DRY RUN mode - no data will be saved'))
         
         try:
-            self.import_excel_data(file_path, sheet_name, dry_run)
+            self.import_excel_data(
+                file_path, sheet_name, dry_run, bulk=bulk, batch_size=batch_size,
+                chunk_size=chunk_size, resume=resume, reader=options.get('reader') or 'pandas'
+            )
         except Exception as e:
             raise CommandError(f'Import failed: {str(e)}')
+        finally:
+            # The bulk paths skip post_save, so the dashboard counters are
+            # refreshed here (the summaries are rebuilt by import_batch)
+            if not dry_run:
+                try:
+                    invalidate_dashboard_statistics()
+                except Exception as e:
+                    # Never hide the outcome of the import; the counters expire anyway
+                    self.stderr.write(self.style.WARNING(f'Could not refresh the dashboard counters: {e}'))
 
-    def import_excel_data(self, file_path, sheet_name, dry_run):
+    def import_excel_data(self, file_path, sheet_name, dry_run, bulk=False, batch_size=500,
+                          chunk_size=None, resume=False, reader='pandas'):
         """
         Main import logic coordinator for Excel data processing.
         
@@ -183,6 +435,13 @@ class Command(BaseCommand):
             file_path (str): Absolute path to the Excel file to import
             sheet_name (str|None): Specific sheet name to import, or None for auto-detection
             dry_run (bool): If True, simulates import without saving data to database
+            bulk (bool): If True, uses the set-based engine (import_complete_data_bulk)
+            batch_size (int): Rows per bulk batch
+            chunk_size (int|None): Commit every chunk_size rows (see import_in_chunks);
+                                   None imports the sheet in a single transaction
+            resume (bool): Continue from the checkpoint of a previous chunked run
+            reader (str): 'pandas' loads the sheet into one DataFrame; 'streaming'
+                          uses StreamingSheetReader and feeds the pipeline in batches
             
         Process Flow:
         1. Read Excel file using pandas
@@ -239,66 +498,238 @@ class Command(BaseCommand):
         - CommandError: If sheet not found or critical processing error
         - pandas errors: If Excel file cannot be read
         """
-        # Read Excel file
-        excel_file = pd.ExcelFile(file_path)
-        
-        # Use the first sheet by default, or the provided sheet_name
-        target_sheet = sheet_name if sheet_name else excel_file.sheet_names[0]
+        # Open the workbook once; both readers select the sheet from the open file
+        if reader == 'streaming':
+            source = StreamingSheetReader(file_path)
+        else:
+            source = pd.ExcelFile(file_path)
         
-        if target_sheet not in excel_file.sheet_names:
-            raise CommandError(f'Sheet "{target_sheet}" not found. Available sheets: {excel_file.sheet_names}')
+        try:
+            # Use the first sheet by default, or the provided sheet_name
+            target_sheet = sheet_name if sheet_name else source.sheet_names[0]
+            
+            if target_sheet not in source.sheet_names:
+                raise CommandError(f'Sheet "{target_sheet}" not found. Available sheets: {source.sheet_names}')
+            
+            self.stdout.write(f'Found sheets: {source.sheet_names}')
+            self.stdout.write(f'Using sheet: {target_sheet}')
+            self.stdout.write(f'\n=== Processing sheet: {target_sheet} ===')
+            
+            read_size = chunk_size or batch_size
+            if reader == 'streaming':
+                total_rows = source.estimated_rows(target_sheet)
+                read_chunks = lambda skip=0: source.iter_batches(target_sheet, read_size, skip)
+                self.stdout.write(f'Streaming up to {total_rows} rows in batches of {read_size}')
+                self.stdout.write(f'Columns: {IMPORT_COLUMNS}')
+            else:
+                df = self.read_sheet(source, target_sheet)
+                total_rows = len(df)
+                read_chunks = lambda skip=0: (
+                    df.iloc[start:start + read_size] for start in range(skip, total_rows, read_size)
+                )
+                
+                # Display sheet info
+                self.stdout.write(f'Shape after cleaning: {df.shape} (rows x columns)')
+                self.stdout.write(f'Columns: {list(df.columns)}')
+                self.stdout.write(f'Sample data:')
+                self.stdout.write(str(df.head(2)))
+            
+            total_imported, total_rows = self.import_sheet(
+                read_chunks, total_rows, file_path, target_sheet, dry_run, chunk_size, resume,
+                sheet_name=sheet_name, bulk=bulk, batch_size=batch_size
+            )
+        finally:
+            source.close()
+        
+        self.result = {
+            'imported': total_imported,
+            'total_rows': total_rows,
+            'errors': self.row_errors,
+            'error_messages': self.error_messages,
+            'dry_run': dry_run,
+        }
         
-        self.stdout.write(f'Found sheets: {excel_file.sheet_names}')
-        self.stdout.write(f'Using sheet: {target_sheet}')
+        # Summary
+        self.stdout.write(f'\n=== IMPORT SUMMARY ===')
+        for model, count in total_imported.items():
+            self.stdout.write(f'{model.capitalize()}: {count}')
         
-        total_imported = {
-            'precatorios': 0,
-            'clientes': 0,
-            'requerimentos': 0
-        }
+        if dry_run:
+            self.stdout.write(self.style.WARNING('DRY RUN - No data was actually imported'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Import completed successfully!'))
+    
+    def report_row_error(self, message, warning=False):
+        """
+        Print a row-level error and count it in the run result.
         
-        self.stdout.write(f'\n=== Processing sheet: {target_sheet} ===')
+        Args:
+            message (str): Error message for the row
+            warning (bool): Print with the WARNING style
+        """
+        self.row_errors += 1
+        if len(self.error_messages) < self.MAX_ERROR_MESSAGES:
+            self.error_messages.append(message)
+        self.stdout.write(self.style.WARNING(message) if warning else message)
+    
+    def report_progress(self, rows_done, total_rows, imported):
+        """Pass committed progress to progress_callback, when one is set."""
+        if self.progress_callback:
+            self.progress_callback(rows_done, total_rows, dict(imported), self.row_errors)
+    
+    def read_sheet(self, excel_file, target_sheet):
+        """
+        Load a whole sheet with pandas from an already opened ExcelFile.
         
+        Args:
+            excel_file (pandas.ExcelFile): Open workbook
+            target_sheet (str): Sheet to read
+            
+        Returns:
+            pandas.DataFrame: Rows with the IMPORT_COLUMNS columns, empty rows removed
+        """
         # Read with header row detection
-        df = pd.read_excel(file_path, sheet_name=target_sheet, header=1)  # Headers are in row 1 (0-indexed)
+        df = pd.read_excel(excel_file, sheet_name=target_sheet, header=1)  # Headers are in row 1 (0-indexed)
         
         # Clean up column names for current format
-        # Expected columns: ['Origem', 'Tipo', 'CNJ', 'Orçamento', 'Destacado', 'Autor', 'CPF', 'Nascimento', 'Valor de Face']
-        df.columns = [
-            'origem', 'tipo', 'cnj', 'orcamento', 'destacado', 'nome', 'cpf', 'nascimento', 'valor_face'
-        ]
+        df.columns = IMPORT_COLUMNS
         
         # Remove any completely empty rows
-        df = df.dropna(how='all')
+        return df.dropna(how='all')
+    
+    def import_sheet(self, read_chunks, total_rows, file_path, target_sheet, dry_run, chunk_size, resume,
+                     sheet_name=None, bulk=False, batch_size=500):
+        """
+        Feed the chunks of a sheet to the import pipeline.
+        
+        Args:
+            read_chunks (callable): read_chunks(skip=0) returns an iterator of
+                DataFrames starting after the first skip rows
+            total_rows (int|None): Data rows in the sheet (an estimate when streaming)
+            file_path (str): Path of the Excel file
+            target_sheet (str): Sheet being imported
+            dry_run (bool): Only count and preview the rows
+            chunk_size (int|None): Commit every chunk (see import_in_chunks), or
+                                   None for a single transaction
+            resume (bool): Continue from the checkpoint of a previous chunked run
+            sheet_name (str|None): Sheet name passed through to process_sheet_data
+            bulk (bool): Use the set-based engine
+            batch_size (int): Rows per bulk batch
+            
+        Returns:
+            tuple: (imported counts per model, data rows read)
+        """
+        total_imported = {
+            'precatorios': 0,
+            'clientes': 0,
+            'requerimentos': 0
+        }
         
-        # Display sheet info
-        self.stdout.write(f'Shape after cleaning: {df.shape} (rows x columns)')
-        self.stdout.write(f'Columns: {list(df.columns)}')
-        self.stdout.write(f'Sample data:')
-        self.stdout.write(str(df.head(2)))
+        if dry_run:
+            rows_read = 0
+            for chunk in read_chunks():
+                if not rows_read:
+                    self.stdout.write('Sample records that would be created (Precatórios + Clientes only):')
+                    for idx, row in chunk.head(3).iterrows():
+                        self.stdout.write(f'  Precatório: {row["cnj"]} | Cliente: {row["nome"]} | CPF: {row["cpf"]} | Valor: {row["valor_face"]}')
+                        self.stdout.write(f'    Tipo: {row.get("tipo", "N/A")} | Destacado: {row.get("destacado", "N/A")}')
+                rows_read += len(chunk)
+            self.stdout.write(f'\n📊 DRY RUN - Would process {rows_read} rows')
+            self.stdout.write('Note: Alvarás will NOT be created during import')
+            return total_imported, rows_read
         
-        if not dry_run and not df.empty:
-            with transaction.atomic():
-                imported = self.process_sheet_data(df, sheet_name)
+        if chunk_size:
+            return self.import_in_chunks(
+                read_chunks, total_rows, file_path, target_sheet, resume,
+                sheet_name=sheet_name, bulk=bulk, batch_size=batch_size
+            )
+        
+        rows_read = 0
+        with transaction.atomic():
+            for chunk in read_chunks():
+                imported = self.process_sheet_data(chunk, sheet_name, bulk=bulk, batch_size=batch_size)
                 for key, value in imported.items():
                     total_imported[key] += value
-        elif dry_run:
-            self.stdout.write(f'\n📊 DRY RUN - Would process {len(df)} rows')
-            self.stdout.write('Sample records that would be created (Precatórios + Clientes only):')
-            for idx, row in df.head(3).iterrows():
-                self.stdout.write(f'  Precatório: {row["cnj"]} | Cliente: {row["nome"]} | CPF: {row["cpf"]} | Valor: {row["valor_face"]}')
-                self.stdout.write(f'    Tipo: {row.get("tipo", "N/A")} | Destacado: {row.get("destacado", "N/A")}')
-            self.stdout.write('Note: Alvarás will NOT be created during import')
+                rows_read += len(chunk)
+        if rows_read:
+            self.report_progress(rows_read, rows_read, total_imported)
+        return total_imported, rows_read
+    
+    def import_in_chunks(self, read_chunks, total_rows, file_path, target_sheet, resume, sheet_name=None,
+                         bulk=False, batch_size=500):
+        """
+        Import a sheet committing chunk by chunk, with a resumable checkpoint.
         
-        # Summary
-        self.stdout.write(f'\n=== IMPORT SUMMARY ===')
-        for model, count in total_imported.items():
-            self.stdout.write(f'{model.capitalize()}: {count}')
+        Each chunk is processed by process_sheet_data() inside its own
+        transaction, and the ImportCheckpoint of the file is advanced in that
+        same transaction. Locks are held for one chunk at a time, a failure
+        only rolls back the current chunk, and the checkpoint never points
+        past what was committed.
         
-        if dry_run:
-            self.stdout.write(self.style.WARNING('DRY RUN - No data was actually imported'))
+        Args:
+            read_chunks (callable): read_chunks(skip) returns an iterator of
+                chunk DataFrames starting after the first skip rows
+            total_rows (int|None): Data rows in the sheet (an estimate when streaming)
+            file_path (str): Path of the Excel file (hashed to identify the checkpoint)
+            target_sheet (str): Sheet being imported
+            resume (bool): Start after the last committed row of the checkpoint
+            sheet_name (str|None): Sheet name passed through to process_sheet_data
+            bulk (bool): Use the set-based engine inside each chunk
+            batch_size (int): Rows per bulk batch
+            
+        Returns:
+            tuple: (records imported by this run, data rows in the sheet);
+                   rows skipped on resume are not included in the counts
+        """
+        checkpoint, created = ImportCheckpoint.objects.get_or_create(
+            arquivo_hash=file_sha256(file_path),
+            planilha=target_sheet,
+            defaults={'nome_arquivo': os.path.basename(file_path), 'total_linhas': total_rows or 0}
+        )
+        
+        imported = {'precatorios': 0, 'clientes': 0, 'requerimentos': 0}
+        
+        if resume and not created:
+            if checkpoint.concluido:
+                self.stdout.write(self.style.WARNING(
+                    f'Sheet "{target_sheet}" of this file was already imported ({checkpoint.total_linhas} rows)'
+                ))
+                return imported, checkpoint.total_linhas
+            start = checkpoint.ultima_linha
+            self.stdout.write(f'Resuming import from row {start + 1} of {total_rows}')
         else:
-            self.stdout.write(self.style.SUCCESS('Import completed successfully!'))
+            if resume:
+                self.stdout.write('No checkpoint found for this file, starting from the first row')
+            elif not created and not checkpoint.concluido:
+                self.stdout.write(
+                    f'Previous import stopped at row {checkpoint.ultima_linha} of {checkpoint.total_linhas}, '
+                    f'starting over (use --resume to continue)'
+                )
+            start = 0
+            checkpoint.nome_arquivo = os.path.basename(file_path)
+            checkpoint.status = ImportCheckpoint.STATUS_EM_ANDAMENTO
+            checkpoint.ultima_linha = 0
+            checkpoint.total_linhas = total_rows or 0
+            checkpoint.totais = {}
+            checkpoint.save()
+        
+        for chunk in read_chunks(start):
+            chunk_start = checkpoint.ultima_linha
+            with transaction.atomic():
+                chunk_imported = self.process_sheet_data(chunk, sheet_name, bulk=bulk, batch_size=batch_size)
+                for key, value in chunk_imported.items():
+                    imported[key] = imported.get(key, 0) + value
+                    checkpoint.totais[key] = checkpoint.totais.get(key, 0) + value
+                checkpoint.ultima_linha = chunk_start + len(chunk)
+                checkpoint.save(update_fields=['ultima_linha', 'totais', 'atualizado_em'])
+            self.stdout.write(f'Committed rows {chunk_start + 1}-{checkpoint.ultima_linha} of {total_rows}')
+            self.report_progress(checkpoint.ultima_linha, total_rows, imported)
+        
+        # A streamed sheet is only counted exactly once it has been read to the end
+        checkpoint.total_linhas = checkpoint.ultima_linha
+        checkpoint.status = ImportCheckpoint.STATUS_CONCLUIDO
+        checkpoint.save(update_fields=['total_linhas', 'status', 'atualizado_em'])
+        return imported, checkpoint.total_linhas
     
     def create_precatorio_from_row(self, row):
         """
@@ -391,7 +822,7 @@ class Command(BaseCommand):
         try:
             validate_cnj(cnj)
         except ValidationError as e:
-            self.stdout.write(f'✗ Invalid CNJ: {cnj} - {str(e)}')
+            self.report_row_error(f'✗ Invalid CNJ: {cnj} - {str(e)}')
             return None
         
         # Get origem from the origem column
@@ -402,21 +833,13 @@ class Command(BaseCommand):
             try:
                 validate_cnj(origem)
             except ValidationError as e:
-                self.stdout.write(f'✗ Invalid origem CNJ: {origem} - {str(e)}')
+                self.report_row_error(f'✗ Invalid origem CNJ: {origem} - {str(e)}')
                 return None
         
         # Get tipo from the tipo column and map to Tipo model
         tipo_obj = None
         if pd.notna(row['tipo']):
-            tipo_nome = str(row['tipo']).strip()
-            try:
-                from precapp.models import Tipo
-                tipo_obj = Tipo.objects.filter(nome__icontains=tipo_nome).first()
-                if not tipo_obj:
-                    self.stdout.write(f'Warning: Tipo "{tipo_nome}" not found, creating new one')
-                    tipo_obj = Tipo.objects.create(nome=tipo_nome, ativa=True)
-            except Exception as e:
-                self.stdout.write(f'Warning: Error handling tipo "{tipo_nome}": {e}')
+            tipo_obj = self.resolve_tipo(str(row['tipo']).strip())
         
         # Get destacado value for percentual_contratuais_apartado
         destacado = 0.0
@@ -546,14 +969,14 @@ class Command(BaseCommand):
         # Validate CPF or CNPJ format
         if len(cpf) == 11:
             if not validate_cpf(cpf):
-                self.stdout.write(f'✗ Invalid CPF: {cpf} for client {nome}')
+                self.report_row_error(f'✗ Invalid CPF: {cpf} for client {nome}')
                 return None
         elif len(cpf) == 14:
             if not validate_cnpj(cpf):
-                self.stdout.write(f'✗ Invalid CNPJ: {cpf} for client {nome}')
+                self.report_row_error(f'✗ Invalid CNPJ: {cpf} for client {nome}')
                 return None
         else:
-            self.stdout.write(f'✗ Invalid document: {cpf} for client {nome} (must be 11 or 14 digits)')
+            self.report_row_error(f'✗ Invalid document: {cpf} for client {nome} (must be 11 or 14 digits)')
             return None
         
         # Handle birth date - field can now be null/blank
@@ -591,7 +1014,7 @@ class Command(BaseCommand):
     
     # NOTE: create_alvara_from_row method removed - Alvarás are no longer created during import
     
-    def process_sheet_data(self, df, sheet_name):
+    def process_sheet_data(self, df, sheet_name, bulk=False, batch_size=500):
         """
         Process data from a single Excel sheet with intelligent format detection.
         
@@ -602,6 +1025,8 @@ class Command(BaseCommand):
         Args:
             df (pandas.DataFrame): Excel sheet data to process
             sheet_name (str): Name of the sheet being processed (for context)
+            bulk (bool): Use the set-based engine for complete datasets
+            batch_size (int): Rows per bulk batch
             
         Returns:
             dict: Import statistics containing counts for each model type:
@@ -706,9 +1131,15 @@ class Command(BaseCommand):
         data_type = self.identify_data_type(columns, column_mappings)
         self.stdout.write(f'Detected data type: {data_type}')
         
+        # Tipo and Fase lookups are resolved in memory for the whole sheet
+        self.load_catalogs()
+        
         if data_type == 'mixed' or data_type == 'precatorio_with_details':
             # Process as complete precatorio data with clients and alvaras/requerimentos
-            imported = self.import_complete_data(df, column_mappings)
+            if bulk:
+                imported = self.import_complete_data_bulk(df, column_mappings, batch_size)
+            else:
+                imported = self.import_complete_data(df, column_mappings)
         elif data_type == 'precatorios':
             imported['precatorios'] = self.import_precatorios(df, column_mappings)
         elif data_type == 'clientes':
@@ -1047,6 +1478,7 @@ class Command(BaseCommand):
         """
         imported = {'precatorios': 0, 'clientes': 0, 'requerimentos': 0}
         columns = [col.lower().strip() for col in df.columns]
+        self.prepare_tipos(df, columns, mappings)
         
         for index, row in df.iterrows():
             try:
@@ -1076,13 +1508,332 @@ class Command(BaseCommand):
                         imported['requerimentos'] += 1
                 
             except Exception as e:
-                self.stdout.write(
-                    self.style.WARNING(f'Error processing row {index}: {str(e)}')
-                )
+                self.report_row_error(f'Error processing row {index}: {str(e)}', warning=True)
                 continue
         
         return imported
     
+    def import_complete_data_bulk(self, df, mappings, batch_size):
+        """
+        Set-based variant of import_complete_data for large spreadsheets.
+
+        Produces the same records and the same summary counts as the
+        row-by-row path, but instead of get_or_create/add/create per row it
+        works on whole columns and batches:
+
+        1. Normalize and validate the whole DataFrame at once
+           (normalize_dataframe): typed columns plus validity masks
+        2. For each batch of batch_size rows, resolve which CNJs and CPFs
+           already exist with one query per model
+        3. bulk_create the missing Precatorio and Cliente records
+        4. Insert all precatório ↔ cliente links with a single bulk insert
+           into the through table (existing links are ignored)
+        5. bulk_create the requerimentos of rows that have a pedido
+
+        Within a file the first row of a CNJ/CPF wins, like get_or_create.
+        Existing records are never modified, also like the row-by-row path.
+
+        Args:
+            df (pandas.DataFrame): Excel data with complete dataset
+            mappings (dict): Column mapping configuration
+            batch_size (int): Rows per batch (also used as bulk_create batch size)
+
+        Returns:
+            dict: Import statistics with precatorios, clientes and requerimentos counts
+        """
+        imported = {'precatorios': 0, 'clientes': 0, 'requerimentos': 0}
+        columns = [col.lower().strip() for col in df.columns]
+        clean = self.normalize_dataframe(df, columns, mappings)
+        self.create_missing_tipos(clean.loc[clean['precatorio_valido'], 'tipo'].dropna())
+        total_rows = len(clean)
+
+        for start in range(0, total_rows, batch_size):
+            batch = clean.iloc[start:start + batch_size]
+            batch_imported = self.import_batch(batch, batch_size)
+            for key, value in batch_imported.items():
+                imported[key] += value
+            self.stdout.write(f'Processed {min(start + batch_size, total_rows)}/{total_rows} rows')
+
+        return imported
+
+    def normalize_dataframe(self, df, columns, mappings, report=True):
+        """
+        Normalize and validate all import fields column by column.
+
+        Vectorized counterpart of build_precatorio_data/build_cliente_data:
+        string cleaning uses pandas string methods, numbers go through
+        pd.to_numeric, dates through pd.to_datetime and CPF/CNPJ check
+        digits are computed with numpy over the whole column. Python code
+        only runs for the rows that fail validation, to print the same
+        messages as the row-by-row path.
+
+        Args:
+            df (pandas.DataFrame): Excel data
+            columns (list): Available column names (normalized)
+            mappings (dict): Column mapping configuration
+            report (bool): Print a message for each invalid row
+
+        Returns:
+            pandas.DataFrame: Same index as df with the columns
+                cnj, origem, orcamento, tipo, valor_de_face, ultima_atualizacao,
+                data_ultima_atualizacao, cpf, nome, nascimento, prioridade,
+                pedido, desagio and the boolean masks precatorio_valido
+                and cliente_valido
+        """
+        def column(key):
+            name = self.find_column(columns, mappings[key])
+            if name and name in df.columns:
+                return df[name]
+            return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+        clean = pd.DataFrame(index=df.index)
+
+        # Precatorio fields
+        cnj_raw = column('cnj')
+        cnj_present = _present(cnj_raw)
+        clean['cnj'] = _as_text(cnj_raw).str.strip()
+        cnj_valido = cnj_present & _valid_cnj(clean['cnj'])
+
+        origem_raw = column('origem')
+        origem = _as_text(origem_raw).str.strip()
+        origem_present = _present(origem_raw)
+        origem_cnj = origem_present & (origem.str.len() > 20)
+        origem_valida = ~origem_cnj | _valid_cnj(origem)
+        clean['origem'] = origem.where(origem_present, 'Importado da planilha')
+
+        orcamento = pd.to_numeric(column('orcamento'), errors='coerce')
+        clean['orcamento'] = np.trunc(orcamento).astype('Int64')
+
+        tipo_raw = column('tipo')
+        clean['tipo'] = _as_text(tipo_raw).str.strip().where(_present(tipo_raw))
+
+        valor_face = pd.to_numeric(column('valor_face'), errors='coerce').fillna(0.0)
+        clean['valor_de_face'] = valor_face
+        ultima = pd.to_numeric(column('ultima_atualizacao'), errors='coerce')
+        clean['ultima_atualizacao'] = ultima.where(ultima.notna() & (ultima != 0), valor_face)
+        clean['data_ultima_atualizacao'] = _as_dates(column('data_atualizacao')).fillna(datetime.now().date())
+
+        # Cliente fields
+        cpf_raw = column('cpf')
+        nome_raw = column('nome')
+        cliente_present = _present(cpf_raw) & _present(nome_raw)
+        clean['cpf'] = (
+            _as_text(cpf_raw)
+            .str.replace('.', '', regex=False)
+            .str.replace('-', '', regex=False)
+            .str.replace('/', '', regex=False)
+            .str.strip()
+        )
+        clean['nome'] = _as_text(nome_raw).str.strip()
+        cpf_valido = _valid_documents(clean['cpf'])
+        clean['nascimento'] = _as_dates(column('nascimento'))
+        prioridade = column('prioridade')
+        clean['prioridade'] = prioridade.notna() & prioridade.astype(bool)
+
+        # Requerimento fields
+        pedido_raw = column('pedido')
+        clean['pedido'] = _as_text(pedido_raw).str.strip().where(_present(pedido_raw))
+        clean['desagio'] = pd.to_numeric(column('desagio'), errors='coerce').fillna(0.0)
+
+        clean['precatorio_valido'] = cnj_valido & origem_valida
+        clean['cliente_valido'] = clean['precatorio_valido'] & cliente_present & cpf_valido
+
+        if not report:
+            return clean
+
+        # Report invalid rows with the same messages as the row-by-row path
+        for index in clean.index[cnj_present & ~cnj_valido]:
+            try:
+                validate_cnj(clean.at[index, 'cnj'])
+            except ValidationError as e:
+                self.report_row_error(f'✗ Invalid CNJ: {clean.at[index, "cnj"]} - {str(e)}')
+        for index in clean.index[cnj_valido & ~origem_valida]:
+            try:
+                validate_cnj(origem.at[index])
+            except ValidationError as e:
+                self.report_row_error(f'✗ Invalid origem CNJ: {origem.at[index]} - {str(e)}')
+        for index in clean.index[clean['precatorio_valido'] & cliente_present & ~cpf_valido]:
+            cpf, nome = clean.at[index, 'cpf'], nome_raw.at[index]
+            if len(cpf) == 11:
+                self.report_row_error(f'✗ Invalid CPF: {cpf} for client {nome}')
+            elif len(cpf) == 14:
+                self.report_row_error(f'✗ Invalid CNPJ: {cpf} for client {nome}')
+            else:
+                self.report_row_error(f'✗ Invalid document: {cpf} for client {nome} (must be 11 or 14 digits)')
+
+        return clean
+
+    def import_batch(self, batch, batch_size):
+        """
+        Import one batch of normalized rows with bulk operations.
+
+        Args:
+            batch (pandas.DataFrame): Rows of the frame returned by normalize_dataframe
+            batch_size (int): bulk_create batch size
+
+        Returns:
+            dict: Import statistics for the batch
+        """
+        imported = {'precatorios': 0, 'clientes': 0, 'requerimentos': 0}
+
+        precatorio_rows = batch[batch['precatorio_valido']]
+        imported['precatorios'] = len(precatorio_rows)
+        tipos = {nome: self.resolve_tipo(nome) for nome in precatorio_rows['tipo'].dropna().unique()}
+
+        # First occurrence of each key wins, like get_or_create
+        precatorio_rows = precatorio_rows.drop_duplicates('cnj')
+        cliente_rows = batch[batch['cliente_valido']]
+
+        # Resolve existing keys with one query per model
+        existing_cnjs = set(
+            Precatorio.objects.filter(cnj__in=list(precatorio_rows['cnj'])).values_list('cnj', flat=True)
+        )
+        existing_cpfs = set(
+            Cliente.objects.filter(cpf__in=list(cliente_rows['cpf'].unique())).values_list('cpf', flat=True)
+        )
+
+        new_precatorios = [
+            Precatorio(
+                cnj=cnj,
+                origem=origem,
+                origem_busca=normalize_search_text(origem),
+                orcamento=None if pd.isna(orcamento) else int(orcamento),
+                tipo=tipos.get(tipo) if isinstance(tipo, str) else None,
+                valor_de_face=float(valor),
+                ultima_atualizacao=float(ultima),
+                data_ultima_atualizacao=data,
+                percentual_contratuais_assinado=0.0,
+                percentual_contratuais_apartado=0.0,
+                percentual_sucumbenciais=0.0,
+                credito_principal='pendente',
+                honorarios_contratuais='pendente',
+                honorarios_sucumbenciais='pendente',
+            )
+            for cnj, origem, orcamento, tipo, valor, ultima, data in zip(
+                precatorio_rows['cnj'], precatorio_rows['origem'], precatorio_rows['orcamento'],
+                precatorio_rows['tipo'], precatorio_rows['valor_de_face'],
+                precatorio_rows['ultima_atualizacao'], precatorio_rows['data_ultima_atualizacao'],
+            )
+            if cnj not in existing_cnjs
+        ]
+        Precatorio.objects.bulk_create(new_precatorios, batch_size=batch_size)
+
+        new_clientes = [
+            Cliente(
+                cpf=cpf, nome=nome, nome_busca=normalize_search_text(nome),
+                nascimento=nascimento, prioridade=bool(prioridade)
+            )
+            for cpf, nome, nascimento, prioridade in zip(
+                *(cliente_rows.drop_duplicates('cpf')[key] for key in ('cpf', 'nome', 'nascimento', 'prioridade'))
+            )
+            if cpf not in existing_cpfs
+        ]
+        Cliente.objects.bulk_create(new_clientes, batch_size=batch_size)
+        imported['clientes'] = len(new_clientes)
+
+        # Single insert into the M2M through table; links that already exist are skipped
+        links = cliente_rows[['cnj', 'cpf']].drop_duplicates()
+        PrecatorioClientes = Precatorio.clientes.through
+        PrecatorioClientes.objects.bulk_create(
+            [PrecatorioClientes(precatorio_id=cnj, cliente_id=cpf) for cnj, cpf in zip(links['cnj'], links['cpf'])],
+            batch_size=batch_size,
+            ignore_conflicts=True
+        )
+
+        requerimento_rows = cliente_rows[cliente_rows['pedido'].notna()]
+        if not requerimento_rows.empty:
+            imported['requerimentos'] = self.bulk_create_requerimentos(requerimento_rows, batch_size)
+
+        # bulk_create skips the signals that keep the summaries current, so the
+        # precatórios of this batch are rebuilt in the same transaction
+        touched = set(precatorio_rows['cnj']) | set(links['cnj'])
+        PrecatorioResumo.rebuild(cnjs=touched)
+
+        return imported
+
+    def bulk_create_requerimentos(self, rows, batch_size):
+        """
+        Create the requerimentos of a batch with a single bulk insert.
+
+        Mirrors what Requerimento.save() would set for a new record (initial
+        fase audit fields). The precatório ↔ cliente link checked by
+        Requerimento.clean() is guaranteed because it was inserted by the
+        same batch. Pedidos are matched by name against the in-memory catalog
+        (see load_catalogs); rows whose pedido does not exist are reported and
+        skipped.
+
+        Args:
+            rows (pandas.DataFrame): Normalized rows with a pedido
+            batch_size (int): bulk_create batch size
+
+        Returns:
+            int: Number of requerimentos created
+        """
+        fase = self.get_default_requerimento_fase()
+        if not hasattr(self, 'pedidos_by_nome'):
+            self.load_catalogs()
+        pedidos = self.pedidos_by_nome
+        now = timezone.now()
+
+        requerimentos = []
+        for cnj, cpf, pedido_nome, valor, desagio in zip(
+            rows['cnj'], rows['cpf'], rows['pedido'], rows['valor_de_face'], rows['desagio']
+        ):
+            pedido = pedidos.get(pedido_nome.lower())
+            if pedido is None:
+                self.report_row_error(f'✗ Pedido "{pedido_nome}" not found, skipping requerimento for {cpf}')
+                continue
+
+            requerimentos.append(Requerimento(
+                precatorio_id=cnj,
+                cliente_id=cpf,
+                pedido=pedido,
+                fase=fase,
+                valor=float(valor),
+                desagio=float(desagio),
+                fase_ultima_alteracao=now,
+                fase_alterada_por='System',
+            ))
+
+        Requerimento.objects.bulk_create(requerimentos, batch_size=batch_size)
+        return len(requerimentos)
+    
+    def get_default_requerimento_fase(self):
+        """
+        Return the fase assigned to imported requerimentos, creating it if needed.
+        
+        Returns:
+            Fase: First active fase usable by requerimentos, or a new
+                  'Em Andamento' fase when none exists
+        """
+        return self.get_default_fase('requerimento', nome='Em Andamento', cor='#28A745')
+    
+    def get_default_fase(self, tipo, nome, cor):
+        """
+        Return the first active fase usable by a record type, creating it if needed.
+        
+        Resolved once per import from the in-memory catalog (see load_catalogs).
+        
+        Args:
+            tipo (str): 'alvara' or 'requerimento'
+            nome (str): Name of the fase created when none exists
+            cor (str): Color of the fase created when none exists
+            
+        Returns:
+            Fase: Default fase for the record type
+        """
+        if not hasattr(self, 'fases'):
+            self.load_catalogs()
+        
+        if tipo not in self.default_fases:
+            fase = next((fase for fase in self.fases if fase.tipo in (tipo, 'ambos')), None)
+            if not fase:
+                # Create a default fase
+                fase = Fase.objects.create(nome=nome, tipo=tipo, cor=cor, ativa=True)
+                self.fases.append(fase)
+            self.default_fases[tipo] = fase
+        return self.default_fases[tipo]
+    
     def create_or_update_precatorio(self, row, columns, mappings):
         """
         Create or update a Precatorio record with advanced field mapping and validation.
@@ -1177,6 +1928,38 @@ class Command(BaseCommand):
         - Supports various Excel format structures
         - Enables relationship establishment with clients
         """
+        precatorio_data = self.build_precatorio_data(row, columns, mappings)
+        if precatorio_data is None:
+            return None
+        cnj, defaults = precatorio_data
+        
+        precatorio, created = Precatorio.objects.get_or_create(
+            cnj=cnj,
+            defaults=defaults
+        )
+        
+        if created:
+            self.stdout.write(f'Created precatorio: {cnj}')
+        
+        return precatorio
+    
+    def build_precatorio_data(self, row, columns, mappings):
+        """
+        Extract and validate the Precatorio fields of a row without touching the database.
+        
+        Shared by the row-by-row path (create_or_update_precatorio) and the
+        set-based path (import_complete_data_bulk), so both apply exactly the
+        same CNJ validation, tipo mapping and default values.
+        
+        Args:
+            row (pandas.Series): Single row of Excel data
+            columns (list): Available column names (normalized)
+            mappings (dict): Column mapping configuration
+            
+        Returns:
+            tuple|None: (cnj, defaults) ready for Precatorio(cnj=cnj, **defaults),
+                        or None when the row has no valid CNJ/origem
+        """
         cnj = self.get_column_value(row, columns, mappings, 'cnj')
         if not cnj:
             return None
@@ -1188,7 +1971,7 @@ class Command(BaseCommand):
         try:
             validate_cnj(cnj)
         except ValidationError as e:
-            self.stdout.write(f'✗ Invalid CNJ: {cnj} - {str(e)}')
+            self.report_row_error(f'✗ Invalid CNJ: {cnj} - {str(e)}')
             return None
         
         defaults = {}
@@ -1201,7 +1984,7 @@ class Command(BaseCommand):
                 try:
                     validate_cnj(origem_str)
                 except ValidationError as e:
-                    self.stdout.write(f'✗ Invalid origem CNJ: {origem_str} - {str(e)}')
+                    self.report_row_error(f'✗ Invalid origem CNJ: {origem_str} - {str(e)}')
                     return None
             defaults['origem'] = origem_str
         
@@ -1217,16 +2000,8 @@ class Command(BaseCommand):
         
         # Handle tipo field (map to Tipo model)
         if tipo_nome := self.get_column_value(row, columns, mappings, 'tipo'):
-            try:
-                from precapp.models import Tipo
-                tipo_nome = str(tipo_nome).strip()
-                tipo_obj = Tipo.objects.filter(nome__icontains=tipo_nome).first()
-                if not tipo_obj:
-                    self.stdout.write(f'Warning: Tipo "{tipo_nome}" not found, creating new one')
-                    tipo_obj = Tipo.objects.create(nome=tipo_nome, ativa=True)
+            if tipo_obj := self.resolve_tipo(str(tipo_nome).strip()):
                 defaults['tipo'] = tipo_obj
-            except Exception as e:
-                self.stdout.write(f'Warning: Error handling tipo "{tipo_nome}": {e}')
 
         if valor_face := self.get_column_value(row, columns, mappings, 'valor_face'):
             try:
@@ -1321,15 +2096,115 @@ class Command(BaseCommand):
             'honorarios_sucumbenciais': 'pendente'
         })
         
-        precatorio, created = Precatorio.objects.get_or_create(
-            cnj=cnj,
-            defaults=defaults
-        )
+        return cnj, defaults
+    
+    def load_catalogs(self):
+        """
+        Load the Tipo, Fase and PedidoRequerimento catalogs once for the whole import.
         
-        if created:
-            self.stdout.write(f'Created precatorio: {cnj}')
+        The tables hold a few dozen rows, so keeping them in memory turns the
+        per-row lookups of resolve_tipo(), the default fase getters and the
+        pedido lookups of the bulk engine into dictionary hits. Called at the
+        start of every sheet so records created outside the import are
+        picked up.
+        """
+        self.tipos = list(Tipo.objects.all())
+        self.tipos_by_nome = {_normalize_name(tipo.nome): tipo for tipo in self.tipos}
+        self.tipo_matches = {}
+        self.fases = list(Fase.objects.filter(ativa=True))
+        self.default_fases = {}
+        self.pedidos_by_nome = {pedido.nome.lower(): pedido for pedido in PedidoRequerimento.objects.all()}
+    
+    def find_tipo(self, key):
+        """
+        Look up a normalized tipo name in the in-memory catalog.
         
-        return precatorio
+        Same semantics as Tipo.objects.filter(nome__icontains=...).first():
+        an exact name wins, otherwise the first tipo (catalog ordering) whose
+        name contains the key.
+        
+        Args:
+            key (str): Name normalized with _normalize_name()
+            
+        Returns:
+            Tipo|None: Matching tipo, or None when there is no match
+        """
+        if key not in self.tipo_matches:
+            self.tipo_matches[key] = self.tipos_by_nome.get(key) or next(
+                (tipo for tipo in self.tipos if key in _normalize_name(tipo.nome)), None
+            )
+        return self.tipo_matches[key]
+    
+    def create_missing_tipos(self, tipo_nomes):
+        """
+        Create every tipo of the sheet that is not in the catalog with one insert.
+        
+        Runs before the rows are persisted, because precatórios reference their
+        tipo on insert. Names are checked in sheet order against the catalog and
+        against the names already queued, so the result matches what the
+        row-by-row lookups would have created.
+        
+        Args:
+            tipo_nomes (iterable): Cleaned tipo names, in sheet order
+        """
+        if not hasattr(self, 'tipos'):
+            self.load_catalogs()
+        
+        novos = []
+        for tipo_nome in tipo_nomes:
+            key = _normalize_name(tipo_nome)
+            if self.find_tipo(key) or any(key in _normalize_name(nome) for nome in novos):
+                continue
+            self.stdout.write(f'Warning: Tipo "{tipo_nome}" not found, creating new one')
+            novos.append(tipo_nome)
+        
+        if novos:
+            Tipo.objects.bulk_create([Tipo(nome=nome, ativa=True) for nome in novos], ignore_conflicts=True)
+            invalidate_catalog()  # bulk_create skips the post_save that does it
+            self.add_tipos(Tipo.objects.filter(nome__in=novos))
+    
+    def add_tipos(self, tipos):
+        """Add newly created tipos to the catalog, keeping its ordering."""
+        self.tipos = sorted([*self.tipos, *tipos], key=lambda tipo: (tipo.ordem, tipo.nome))
+        self.tipos_by_nome = {_normalize_name(tipo.nome): tipo for tipo in self.tipos}
+        self.tipo_matches = {}
+    
+    def prepare_tipos(self, df, columns, mappings):
+        """
+        Batch-create the tipos of the rows that will produce a precatório.
+        
+        Used by the row-by-row engine; the bulk engine calls
+        create_missing_tipos() with its already normalized frame.
+        """
+        clean = self.normalize_dataframe(df, columns, mappings, report=False)
+        self.create_missing_tipos(clean.loc[clean['precatorio_valido'], 'tipo'].dropna())
+    
+    def resolve_tipo(self, tipo_nome):
+        """
+        Find the Tipo matching a spreadsheet value, creating it when missing.
+        
+        Resolved against the in-memory catalog (see load_catalogs); a tipo is
+        only created here when it was not batch-created beforehand.
+        
+        Args:
+            tipo_nome (str): Cleaned tipo name from the spreadsheet
+            
+        Returns:
+            Tipo|None: Matching or newly created Tipo, or None on error
+        """
+        if not hasattr(self, 'tipos'):
+            self.load_catalogs()
+        
+        try:
+            tipo_obj = self.find_tipo(_normalize_name(tipo_nome))
+            if not tipo_obj:
+                self.stdout.write(f'Warning: Tipo "{tipo_nome}" not found, creating new one')
+                tipo_obj = Tipo.objects.create(nome=tipo_nome, ativa=True)
+                self.add_tipos([tipo_obj])
+            return tipo_obj
+        except Exception as e:
+            self.stdout.write(f'Warning: Error handling tipo "{tipo_nome}": {e}')
+            return None
     
     def create_or_update_cliente(self, row, columns, mappings):
         """
@@ -1436,6 +2311,36 @@ class Command(BaseCommand):
             precatorio.clientes.add(cliente)
         ```
         """
+        cliente_data = self.build_cliente_data(row, columns, mappings)
+        if cliente_data is None:
+            return None
+        cpf, defaults = cliente_data
+        
+        cliente, created = Cliente.objects.get_or_create(
+            cpf=cpf,
+            defaults=defaults
+        )
+        
+        if created:
+            self.stdout.write(f'Created cliente: {defaults["nome"]} ({cpf})')
+        
+        return cliente, created
+    
+    def build_cliente_data(self, row, columns, mappings):
+        """
+        Extract and validate the Cliente fields of a row without touching the database.
+        
+        Shared by create_or_update_cliente and import_complete_data_bulk.
+        
+        Args:
+            row (pandas.Series): Single row of Excel data
+            columns (list): Available column names (normalized)
+            mappings (dict): Column mapping configuration
+            
+        Returns:
+            tuple|None: (cpf, defaults) with the cleaned CPF/CNPJ, or None when
+                        the name is missing or the document is invalid
+        """
         cpf = self.get_column_value(row, columns, mappings, 'cpf')
         nome = self.get_column_value(row, columns, mappings, 'nome')
         
@@ -1448,14 +2353,14 @@ class Command(BaseCommand):
         # Validate CPF or CNPJ format
         if len(cpf) == 11:
             if not validate_cpf(cpf):
-                self.stdout.write(f'✗ Invalid CPF: {cpf} for client {nome}')
+                self.report_row_error(f'✗ Invalid CPF: {cpf} for client {nome}')
                 return None
         elif len(cpf) == 14:
             if not validate_cnpj(cpf):
-                self.stdout.write(f'✗ Invalid CNPJ: {cpf} for client {nome}')
+                self.report_row_error(f'✗ Invalid CNPJ: {cpf} for client {nome}')
                 return None
         else:
-            self.stdout.write(f'✗ Invalid document: {cpf} for client {nome} (must be 11 or 14 digits)')
+            self.report_row_error(f'✗ Invalid document: {cpf} for client {nome} (must be 11 or 14 digits)')
             return None
 
         defaults = {
@@ -1480,15 +2385,7 @@ class Command(BaseCommand):
         if prioridade := self.get_column_value(row, columns, mappings, 'prioridade'):
             defaults['prioridade'] = bool(prioridade)
         
-        cliente, created = Cliente.objects.get_or_create(
-            cpf=cpf,
-            defaults=defaults
-        )
-        
-        if created:
-            self.stdout.write(f'Created cliente: {nome} ({cpf})')
-        
-        return cliente, created
+        return cpf, defaults
     
     def create_alvara(self, row, columns, mappings, precatorio, cliente):
         """
@@ -1573,15 +2470,7 @@ class Command(BaseCommand):
             tipo = 'comum'
         
         # Get default fase
-        fase = Fase.objects.filter(tipo__in=['alvara', 'ambos'], ativa=True).first()
-        if not fase:
-            # Create a default fase
-            fase = Fase.objects.create(
-                nome='Importado',
-                tipo='alvara',
-                cor='#007BFF',
-                ativa=True
-            )
+        fase = self.get_default_fase('alvara', nome='Importado', cor='#007BFF')
         
         defaults = {
             'precatorio': precatorio,
@@ -1713,16 +2602,7 @@ class Command(BaseCommand):
         if not pedido:
             pedido = 'outros'
         
-        # Get default fase
-        fase = Fase.objects.filter(tipo__in=['requerimento', 'ambos'], ativa=True).first()
-        if not fase:
-            # Create a default fase
-            fase = Fase.objects.create(
-                nome='Em Andamento',
-                tipo='requerimento',
-                cor='#28A745',
-                ativa=True
-            )
+        fase = self.get_default_requerimento_fase()
         
         defaults = {
             'precatorio': precatorio,
@@ -1798,6 +2678,7 @@ class Command(BaseCommand):
         """
         count = 0
         columns = [col.lower().strip() for col in df.columns]
+        self.prepare_tipos(df, columns, mappings)
         
         for index, row in df.iterrows():
             try:
@@ -1805,9 +2686,7 @@ class Command(BaseCommand):
                 if precatorio:
                     count += 1
             except Exception as e:
-                self.stdout.write(
-                    self.style.WARNING(f'Error importing precatorio at row {index}: {str(e)}')
-                )
+                self.report_row_error(f'Error importing precatorio at row {index}: {str(e)}', warning=True)
         
         return count
     
@@ -1865,9 +2744,7 @@ class Command(BaseCommand):
                 if cliente and created:
                     count += 1
             except Exception as e:
-                self.stdout.write(
-                    self.style.WARNING(f'Error importing cliente at row {index}: {str(e)}')
-                )
+                self.report_row_error(f'Error importing cliente at row {index}: {str(e)}', warning=True)
         
         return count
     
@@ -0,0 +1,20 @@
+"""
+Process background Excel export jobs
+"""
+
+from precapp.exports import process_pending_jobs
+from precapp.jobqueue import JobWorkerCommand
+
+
+class Command(JobWorkerCommand):
+    help = 'Generate pending Excel export jobs and store the files in the configured storage'
+    label = 'Export'
+
+    def process_pending_jobs(self):
+        return process_pending_jobs()
+
+    def job_name(self, job):
+        return job.tipo
+
+    def summarize_job(self, job):
+        return f"{job.total_linhas} rows in {job.duracao_segundos}s, peak {job.pico_memoria_kb} KB"
@@ -0,0 +1,20 @@
+"""
+Process background Excel import jobs
+"""
+
+from precapp.imports import process_pending_jobs
+from precapp.jobqueue import JobWorkerCommand
+
+
+class Command(JobWorkerCommand):
+    help = 'Import the Excel files uploaded through the web interface'
+    label = 'Import'
+
+    def process_pending_jobs(self):
+        return process_pending_jobs()
+
+    def job_name(self, job):
+        return job.nome_arquivo
+
+    def summarize_job(self, job):
+        return f"{job.linhas_processadas} rows, {job.linhas_com_erro} errors, {job.linhas_por_segundo} rows/s"
@@ -0,0 +1,77 @@
+"""
+Rebuild or verify the materialized precatório summaries (PrecatorioResumo)
+
+Usage:
+    python manage.py rebuild_precatorio_summaries
+    python manage.py rebuild_precatorio_summaries --verify
+    python manage.py rebuild_precatorio_summaries --verify --fix
+    python manage.py rebuild_precatorio_summaries --cnj 1234567-89.2023.8.26.0100
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from precapp.models import PrecatorioResumo
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-precatório financial summaries in bulk, or verify them against the source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only compare the stored summaries with freshly computed figures',
+        )
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='With --verify, rebuild the summaries that diverge',
+        )
+        parser.add_argument(
+            '--cnj',
+            action='append',
+            dest='cnjs',
+            help='Limit to this precatório (can be repeated)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows read and inserted per batch (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        cnjs = options['cnjs']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer')
+        if options['fix'] and not options['verify']:
+            raise CommandError('--fix can only be used with --verify')
+
+        if not options['verify']:
+            written = PrecatorioResumo.rebuild(cnjs=cnjs, batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f'{written} precatório summaries rebuilt'))
+            return
+
+        divergencias = PrecatorioResumo.verify(cnjs=cnjs)
+        if not divergencias:
+            self.stdout.write(self.style.SUCCESS('All precatório summaries are consistent'))
+            return
+
+        for divergencia in divergencias[:50]:
+            if divergencia['campo'] == 'resumo':
+                self.stdout.write(f"  {divergencia['cnj']}: summary missing")
+            else:
+                self.stdout.write(
+                    f"  {divergencia['cnj']}: {divergencia['campo']} stored {divergencia['armazenado']}, "
+                    f"expected {divergencia['esperado']}"
+                )
+        if len(divergencias) > 50:
+            self.stdout.write(f'  ... and {len(divergencias) - 50} more')
+
+        divergentes = sorted({divergencia['cnj'] for divergencia in divergencias})
+        if options['fix']:
+            written = PrecatorioResumo.rebuild(cnjs=divergentes, batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f'{written} precatório summaries rebuilt'))
+        else:
+            raise CommandError(f'{len(divergentes)} precatório summaries diverge (run with --fix to rebuild them)')
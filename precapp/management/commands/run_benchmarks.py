@@ -0,0 +1,114 @@
+"""
+Time the views, exports and imports on the current data (see precapp/benchmarks/suite.py)
+
+Generate a dataset first with generate_synthetic_data; compare runs of the
+same scale only.
+
+Usage:
+    python manage.py run_benchmarks --output bench_10k.json
+    python manage.py run_benchmarks --case clientes --case export_clientes --repeat 10
+    python manage.py run_benchmarks --compare bench_main.json --fail-above 1.5
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from precapp.benchmarks import CASES, compare_results, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the list views, detail views, Excel exports and imports and write the results as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--case',
+            action='append',
+            dest='cases',
+            choices=CASES,
+            help='Run only this case (can be repeated; default: all)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per case (default: 5)',
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=1,
+            help='Untimed runs per case before timing (default: 1)',
+        )
+        parser.add_argument(
+            '--import-rows',
+            type=int,
+            default=1000,
+            help='Rows of the workbook used by the import cases (default: 1000)',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON results to this file instead of stdout',
+        )
+        parser.add_argument(
+            '--compare',
+            help='JSON results of an earlier run to compare the medians with',
+        )
+        parser.add_argument(
+            '--fail-above',
+            type=float,
+            help='With --compare, fail when a case is this many times slower than before (e.g. 1.5)',
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat must be a positive integer')
+        if options['warmup'] < 0:
+            raise CommandError('--warmup cannot be negative')
+        if options['import_rows'] < 1:
+            raise CommandError('--import-rows must be a positive integer')
+        if options['fail_above'] and not options['compare']:
+            raise CommandError('--fail-above can only be used with --compare')
+
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as source:
+                    baseline = json.load(source)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read {options['compare']}: {e}")
+
+        def progress(name, result):
+            if 'median_ms' in result:
+                self.stderr.write(f"  {name}: {result['median_ms']} ms, {result['queries']} queries")
+            else:
+                self.stderr.write(f"  {name}: skipped ({result.get('skipped')})")
+
+        results = run_benchmarks(
+            cases=options['cases'],
+            repeat=options['repeat'],
+            warmup=options['warmup'],
+            import_rows=options['import_rows'],
+            progress=progress,
+        )
+
+        output = json.dumps(results, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w') as target:
+                target.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f"✅ Results written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if baseline is None:
+            return
+        if baseline.get('dataset') != results['dataset']:
+            self.stderr.write(self.style.WARNING('⚠️  The baseline was measured on a different dataset'))
+
+        regressions = []
+        for name, before, after, ratio in compare_results(baseline, results):
+            self.stderr.write(f'  {name}: {before} ms -> {after} ms ({ratio}x)')
+            if options['fail_above'] and ratio is not None and ratio > options['fail_above']:
+                regressions.append(name)
+        if regressions:
+            raise CommandError(f"Slower than {options['fail_above']}x the baseline: {', '.join(regressions)}")
@@ -0,0 +1,334 @@
+"""
+Prometheus metrics
+
+Counters and histograms are kept in memory by each process and written to
+METRICS_DIR, one JSON file per process, every METRICS_FLUSH_SECONDS (and
+after every background job). The metrics endpoint (metrics_view) merges the
+files of every gunicorn worker and of the export/import workers and renders
+them in the Prometheus text format, so no external service or client
+library is needed.
+
+Recorded while METRICS_ENABLED is on:
+- request latency and per-request query counts per URL name, by
+  MetricsMiddleware (see middleware.py);
+- export and import job durations (exports/jobs.py, imports/jobs.py);
+- S3 call latencies and errors of LargeFileS3Storage;
+- hits and misses of the dashboard and catalog caches.
+
+Counters must never go backwards, so the file of a process that has exited
+is not deleted: the next scrape folds it into ARCHIVE_FILE. Clear METRICS_DIR
+on deploy to start over, as with any Prometheus multiprocess setup.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FILE = 'archived.json'
+LOCK_FILE = '.lock'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+JOB_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+STORAGE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Metric name -> (type, help, histogram buckets)
+METRICS = {
+    'precatorios_http_requests_total': (
+        'counter', 'HTTP requests by URL name, method and status code.', None),
+    'precatorios_http_request_duration_seconds': (
+        'histogram', 'HTTP request latency by URL name.', LATENCY_BUCKETS),
+    'precatorios_http_request_db_queries': (
+        'histogram', 'SQL queries run per HTTP request, by URL name.', QUERY_BUCKETS),
+    'precatorios_export_job_duration_seconds': (
+        'histogram', 'Duration of the background Excel export jobs.', JOB_BUCKETS),
+    'precatorios_import_job_duration_seconds': (
+        'histogram', 'Duration of the background Excel import jobs.', JOB_BUCKETS),
+    'precatorios_storage_operation_duration_seconds': (
+        'histogram', 'Latency of the S3 storage calls by operation.', STORAGE_BUCKETS),
+    'precatorios_storage_operation_errors_total': (
+        'counter', 'S3 storage calls that raised, by operation.', None),
+    'precatorios_cache_requests_total': (
+        'counter', 'Cache lookups by cache and result (hit or miss).', None),
+}
+
+
+def get_setting(name, default):
+    return getattr(settings, f'METRICS_{name}', default)
+
+
+def is_enabled():
+    return get_setting('ENABLED', False)
+
+
+def get_metrics_dir():
+    return get_setting('DIR', os.path.join(tempfile.gettempdir(), 'precatorios_metrics'))
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Registry:
+    """Metric values of this process, written to its own file in METRICS_DIR."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.token = uuid.uuid4().hex[:8]
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self.flushed_at = None
+
+    def filename(self):
+        # The token tells apart processes that got the same pid
+        return f'{os.getpid()}-{self.token}.json'
+
+    def increment(self, name, amount=1, **labels):
+        with self.lock:
+            self.counters[(name, _label_key(labels))] += amount
+        self._flush_if_due()
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = (name, _label_key(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {'buckets': [0] * (len(buckets) + 1), 'sum': 0.0}
+            index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+            histogram['buckets'][index] += 1
+            histogram['sum'] += value
+        self._flush_if_due()
+
+    def _flush_if_due(self):
+        # Deciding and claiming the flush under one lock lets a single thread write per interval
+        with self.lock:
+            now = time.monotonic()
+            due = self.flushed_at is None or now - self.flushed_at >= get_setting('FLUSH_SECONDS', 5)
+            if due:
+                self.flushed_at = now
+        if due:
+            self._write()
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [
+                    [name, list(labels), list(histogram['buckets']), histogram['sum']]
+                    for (name, labels), histogram in self.histograms.items()
+                ],
+            }
+
+    def flush(self):
+        """Write this process' values to its file (atomically, readers never see half a file)."""
+        with self.lock:
+            self.flushed_at = time.monotonic()
+        self._write()
+
+    def _write(self):
+        try:
+            directory = get_metrics_dir()
+            os.makedirs(directory, exist_ok=True)
+            _write_json(os.path.join(directory, self.filename()), self.snapshot())
+        except Exception:
+            # Metrics must never break a request or a job
+            logger.exception('Could not write the metrics file')
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.flushed_at = None
+
+
+registry = Registry()
+
+
+def increment(name, amount=1, **labels):
+    """Add to a counter of this process (no-op while METRICS_ENABLED is off)."""
+    if is_enabled():
+        registry.increment(name, amount, **labels)
+
+
+def observe(name, value, **labels):
+    """Record a histogram observation (no-op while METRICS_ENABLED is off)."""
+    if is_enabled():
+        registry.observe(name, value, **labels)
+
+
+def flush():
+    """Write this process' values now, e.g. once a background job finishes."""
+    if is_enabled():
+        registry.flush()
+
+
+def record_cache_lookup(cache_name, hit):
+    increment('precatorios_cache_requests_total', cache=cache_name, result='hit' if hit else 'miss')
+
+
+@contextmanager
+def storage_timer(operation):
+    """Time a storage call, counting it as an error when it raises."""
+    if not is_enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        registry.increment('precatorios_storage_operation_errors_total', operation=operation)
+        raise
+    finally:
+        registry.observe('precatorios_storage_operation_duration_seconds', time.perf_counter() - start,
+                         operation=operation)
+
+
+def _write_json(path, data):
+    # A unique temporary file per write: threads flushing at the same time
+    # must not write into, or rename, each other's half-written file
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'w') as temp_file:
+            json.dump(data, temp_file)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _read_json(path):
+    try:
+        with open(path) as source:
+            return json.load(source)
+    except (OSError, ValueError):
+        return None
+
+
+def _merge(totals, data):
+    counters, histograms = totals
+    for name, labels, value in data.get('counters', []):
+        counters[(name, tuple(map(tuple, labels)))] += value
+    for name, labels, buckets, total in data.get('histograms', []):
+        key = (name, tuple(map(tuple, labels)))
+        merged = histograms.get(key)
+        if merged is None or len(merged['buckets']) != len(buckets):
+            merged = histograms[key] = {'buckets': [0] * len(buckets), 'sum': 0.0}
+        merged['buckets'] = [a + b for a, b in zip(merged['buckets'], buckets)]
+        merged['sum'] += total
+
+
+def _process_alive(filename):
+    try:
+        pid = int(filename.split('-', 1)[0])
+    except ValueError:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _as_data(totals):
+    counters, histograms = totals
+    return {
+        'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+        'histograms': [
+            [name, list(labels), histogram['buckets'], histogram['sum']]
+            for (name, labels), histogram in histograms.items()
+        ],
+    }
+
+
+def collect():
+    """
+    Merge the values of every process that wrote to METRICS_DIR.
+
+    The files of processes that have exited are folded into ARCHIVE_FILE
+    first, under a file lock so concurrent scrapes do not count them twice.
+
+    Returns:
+        tuple: (counters, histograms) dicts keyed by (name, labels)
+    """
+    registry.flush()
+    directory = get_metrics_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    with open(os.path.join(directory, LOCK_FILE), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            archive_path = os.path.join(directory, ARCHIVE_FILE)
+            archived = (defaultdict(float), {})
+            _merge(archived, _read_json(archive_path) or {})
+            dead = []
+            for filename in os.listdir(directory):
+                if filename.endswith('.json') and filename != ARCHIVE_FILE and not _process_alive(filename):
+                    _merge(archived, _read_json(os.path.join(directory, filename)) or {})
+                    dead.append(filename)
+            if dead:
+                _write_json(archive_path, _as_data(archived))
+                for filename in dead:
+                    os.remove(os.path.join(directory, filename))
+
+            totals = (defaultdict(float), {})
+            for filename in os.listdir(directory):
+                if filename.endswith('.json'):
+                    _merge(totals, _read_json(os.path.join(directory, filename)) or {})
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    return totals
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def render(totals):
+    """Render merged values in the Prometheus text exposition format (version 0.0.4)."""
+    counters, histograms = totals
+    lines = []
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        if metric_type == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+            continue
+        for (metric, labels), histogram in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip([*buckets, '+Inf'], histogram['buckets']):
+                cumulative += count
+                le = bound if bound == '+Inf' else _format_value(float(bound))
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", le)])} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(histogram["sum"])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
@@ -1,14 +1,21 @@
 """
-Middleware for tracking user context in Django applications.
+Middleware for tracking user context and measuring requests.
 
-This middleware captures the current user and stores it in thread-local storage,
-making it available for use in model save methods and other contexts where
-the request object is not directly accessible.
+UserTrackingMiddleware captures the current user and stores it in thread-local
+storage, making it available for use in model save methods and other contexts
+where the request object is not directly accessible.
+
+InstrumentationMiddleware records per-request performance figures when
+INSTRUMENTATION_ENABLED is set, and MetricsMiddleware feeds the Prometheus
+metrics when METRICS_ENABLED is set.
 """
 
 import threading
+
 from django.utils.deprecation import MiddlewareMixin
 
+from . import instrumentation, metrics
+
 
 class UserTrackingMiddleware(MiddlewareMixin):
     """
@@ -76,3 +83,72 @@ class UserTrackingMiddleware(MiddlewareMixin):
         if hasattr(threading.current_thread(), 'user'):
             delattr(threading.current_thread(), 'user')
         return None
+
+
+class InstrumentationMiddleware:
+    """
+    Middleware measuring each request for the instrumentation page.
+
+    While settings.INSTRUMENTATION_ENABLED is on, records the SQL query
+    count and time, the repeated queries, the template rendering time and
+    the response size of every request, logs the requests crossing the
+    thresholds and keeps the samples per view (see instrumentation.py).
+    With the setting off a request costs a single settings lookup.
+
+    Usage:
+        Add to MIDDLEWARE in settings.py, after AuthenticationMiddleware:
+            'precapp.middleware.InstrumentationMiddleware'
+
+        and view the figures at /instrumentacao/ (staff only).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not instrumentation.is_enabled():
+            return self.get_response(request)
+
+        instrumentation.install_render_timer()
+        with instrumentation.measure_request() as stats:
+            response = self.get_response(request)
+            stats.finish(response)
+
+        view_name = instrumentation.view_name(request)
+        instrumentation.log_if_slow(view_name, stats)
+        instrumentation.store.record(view_name, stats.as_sample())
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Middleware recording request latency and query counts for /metrics/.
+
+    While settings.METRICS_ENABLED is on, observes the duration and the
+    number of SQL queries of every request, labelled with the URL name
+    (see metrics.py). The measurement is shared with InstrumentationMiddleware
+    when both are on (see instrumentation.measure_request). With the setting
+    off a request costs a single settings lookup.
+
+    Usage:
+        Add to MIDDLEWARE in settings.py:
+            'precapp.middleware.MetricsMiddleware'
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not metrics.is_enabled():
+            return self.get_response(request)
+
+        with instrumentation.measure_request() as stats:
+            response = self.get_response(request)
+            stats.finish(response)
+
+        view_name = instrumentation.view_name(request)
+        metrics.increment('precatorios_http_requests_total', view=view_name, method=request.method,
+                          status=response.status_code)
+        metrics.observe('precatorios_http_request_duration_seconds', stats.duration, view=view_name)
+        metrics.observe('precatorios_http_request_db_queries', stats.queries, view=view_name)
+        return response
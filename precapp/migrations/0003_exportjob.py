@@ -0,0 +1,40 @@
+# Generated by Django 3.2 on 2026-10-16 19:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('precapp', '0002_add_integra_precatorio_uploaded_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('precatorios', 'Relatório completo do sistema'), ('clientes', 'Relatório de clientes')], help_text='Relatório a ser gerado', max_length=20)),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluido', 'Concluído'), ('erro', 'Erro')], db_index=True, default='pendente', help_text='Situação atual da exportação', max_length=20)),
+                ('arquivo', models.FileField(blank=True, help_text='Planilha gerada', null=True, upload_to='exports/%Y/%m/')),
+                ('nome_arquivo', models.CharField(blank=True, help_text='Nome do arquivo oferecido no download', max_length=255)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True)),
+                ('concluido_em', models.DateTimeField(blank=True, null=True)),
+                ('duracao_segundos', models.FloatField(blank=True, help_text='Tempo total de geração e armazenamento da planilha', null=True)),
+                ('total_linhas', models.PositiveIntegerField(blank=True, help_text='Linhas de dados escritas (sem cabeçalhos)', null=True)),
+                ('linhas_por_planilha', models.JSONField(blank=True, default=dict, help_text='Linhas de dados escritas em cada aba')),
+                ('pico_memoria_kb', models.PositiveIntegerField(blank=True, help_text='Pico de memória alocada durante a exportação (KB)', null=True)),
+                ('mensagem_erro', models.TextField(blank=True, help_text='Mensagem de erro quando a exportação falha')),
+                ('solicitado_por', models.ForeignKey(blank=True, help_text='Usuário que solicitou a exportação', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Exportação',
+                'verbose_name_plural': 'Exportações',
+                'ordering': ['-criado_em'],
+            },
+        ),
+    ]
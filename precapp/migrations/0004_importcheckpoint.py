@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-16 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('precapp', '0003_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('arquivo_hash', models.CharField(help_text='SHA-256 do conteúdo do arquivo', max_length=64)),
+                ('planilha', models.CharField(help_text='Aba importada', max_length=100)),
+                ('nome_arquivo', models.CharField(blank=True, help_text='Nome do arquivo importado', max_length=255)),
+                ('status', models.CharField(choices=[('em_andamento', 'Em andamento'), ('concluido', 'Concluído')], default='em_andamento', help_text='Situação da importação', max_length=20)),
+                ('ultima_linha', models.PositiveIntegerField(default=0, help_text='Linhas já gravadas no banco')),
+                ('total_linhas', models.PositiveIntegerField(default=0, help_text='Linhas de dados da aba')),
+                ('totais', models.JSONField(blank=True, default=dict, help_text='Registros importados por modelo')),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Checkpoint de Importação',
+                'verbose_name_plural': 'Checkpoints de Importação',
+                'ordering': ['-atualizado_em'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importcheckpoint',
+            constraint=models.UniqueConstraint(fields=('arquivo_hash', 'planilha'), name='unique_import_checkpoint'),
+        ),
+    ]
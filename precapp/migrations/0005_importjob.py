@@ -0,0 +1,41 @@
+# Generated by Django 3.2 on 2026-10-16 20:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('precapp', '0004_importcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('arquivo', models.FileField(help_text='Planilha enviada para importação', upload_to='imports/%Y/%m/')),
+                ('nome_arquivo', models.CharField(help_text='Nome original do arquivo enviado', max_length=255)),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('concluido', 'Concluído'), ('erro', 'Erro')], db_index=True, default='pendente', help_text='Situação atual da importação', max_length=20)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True)),
+                ('concluido_em', models.DateTimeField(blank=True, null=True)),
+                ('total_linhas', models.PositiveIntegerField(blank=True, help_text='Linhas de dados da planilha', null=True)),
+                ('linhas_processadas', models.PositiveIntegerField(default=0, help_text='Linhas já gravadas')),
+                ('linhas_com_erro', models.PositiveIntegerField(default=0, help_text='Linhas rejeitadas na validação')),
+                ('linhas_por_segundo', models.FloatField(blank=True, help_text='Velocidade da importação', null=True)),
+                ('resultado', models.JSONField(blank=True, default=dict, help_text='Registros importados por modelo')),
+                ('erros', models.JSONField(blank=True, default=list, help_text='Primeiras mensagens de erro das linhas rejeitadas')),
+                ('mensagem_erro', models.TextField(blank=True, help_text='Mensagem de erro quando a importação falha')),
+                ('solicitado_por', models.ForeignKey(blank=True, help_text='Usuário que enviou a planilha', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Importação',
+                'verbose_name_plural': 'Importações',
+                'ordering': ['-criado_em'],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 3.2 on 2026-10-16 20:30
+
+from django.db import migrations, models
+
+from precapp.search import TrigramIndex, create_trigram_indexes, drop_trigram_indexes, normalize_search_text
+
+
+SEARCH_INDEXES = [
+    TrigramIndex('precapp_precatorio_cnj_trgm', 'Precatorio', 'cnj'),
+    TrigramIndex('precapp_precatorio_origem_busca_trgm', 'Precatorio', 'origem_busca'),
+    TrigramIndex('precapp_cliente_nome_busca_trgm', 'Cliente', 'nome_busca'),
+    TrigramIndex('precapp_cliente_cpf_trgm', 'Cliente', 'cpf'),
+    TrigramIndex('precapp_requerimento_cnj_trgm', 'Requerimento', 'cnj'),
+    # Still filtered with __icontains, so the index is on UPPER(descricao)
+    TrigramIndex('precapp_diligencias_descricao_trgm', 'Diligencias', 'UPPER("descricao")'),
+]
+
+
+def fill_search_columns(apps, schema_editor):
+    """Populate the normalized columns of existing records"""
+    for model_name, source, target in [
+        ('Cliente', 'nome', 'nome_busca'),
+        ('Precatorio', 'origem', 'origem_busca'),
+    ]:
+        model = apps.get_model('precapp', model_name)
+        batch = []
+        for obj in model.objects.only('pk', source).iterator(chunk_size=2000):
+            setattr(obj, target, normalize_search_text(getattr(obj, source)))
+            batch.append(obj)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, [target])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, [target])
+
+
+def add_search_indexes(apps, schema_editor):
+    create_trigram_indexes(apps, schema_editor, SEARCH_INDEXES)
+
+
+def remove_search_indexes(apps, schema_editor):
+    drop_trigram_indexes(apps, schema_editor, SEARCH_INDEXES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('precapp', '0005_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='nome_busca',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Nome sem acentos e em minúsculas, usado pela busca', max_length=400),
+        ),
+        migrations.AddField(
+            model_name='precatorio',
+            name='origem_busca',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Origem sem acentos e em minúsculas, usada pela busca', max_length=200),
+        ),
+        migrations.RunPython(fill_search_columns, migrations.RunPython.noop),
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
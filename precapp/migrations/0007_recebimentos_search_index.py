@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-16 21:00
+
+from django.db import migrations
+
+from precapp.search import TrigramIndex, create_trigram_indexes, drop_trigram_indexes
+
+
+SEARCH_INDEXES = [
+    # Global search filters numero_documento with __icontains
+    TrigramIndex('precapp_recebimentos_numero_documento_trgm', 'Recebimentos', 'UPPER("numero_documento")'),
+]
+
+
+def add_search_indexes(apps, schema_editor):
+    create_trigram_indexes(apps, schema_editor, SEARCH_INDEXES)
+
+
+def remove_search_indexes(apps, schema_editor):
+    drop_trigram_indexes(apps, schema_editor, SEARCH_INDEXES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('precapp', '0006_search_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2 on 2026-10-16 20:33
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('precapp', '0007_recebimentos_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrecatorioResumo',
+            fields=[
+                ('precatorio', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resumo', serialize=False, to='precapp.precatorio')),
+                ('total_principal', models.FloatField(default=0.0)),
+                ('total_contratuais', models.FloatField(default=0.0)),
+                ('total_sucumbenciais', models.FloatField(default=0.0)),
+                ('total_recebido', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('quantidade_alvaras', models.PositiveIntegerField(default=0)),
+                ('quantidade_requerimentos', models.PositiveIntegerField(default=0)),
+                ('quantidade_clientes', models.PositiveIntegerField(default=0)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Resumo do Precatório',
+                'verbose_name_plural': 'Resumos dos Precatórios',
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2 on 2026-10-16 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('precapp', '0008_precatorio_resumo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alvara',
+            index=models.Index(fields=['tipo', '-id'], name='precapp_alvara_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['nome', 'cpf'], name='precapp_cliente_nome_cpf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(condition=models.Q(prioridade=False), fields=['nascimento'], name='precapp_cliente_sem_prio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(condition=models.Q(falecido=True), fields=['nome', 'cpf'], name='precapp_cliente_falecido_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diligencias',
+            index=models.Index(fields=['-data_criacao', '-id'], name='precapp_dil_criacao_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diligencias',
+            index=models.Index(fields=['concluida', '-data_criacao', '-id'], name='precapp_dil_status_criacao_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='diligencias',
+            index=models.Index(condition=models.Q(concluida=False), fields=['data_final'], name='precapp_dil_pendente_prazo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='precatorio',
+            index=models.Index(fields=['credito_principal', 'cnj'], name='precapp_prec_credito_cnj_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='precatorio',
+            index=models.Index(fields=['orcamento', 'cnj'], name='precapp_prec_orcamento_cnj_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recebimentos',
+            index=models.Index(fields=['alvara', '-data', '-numero_documento'], name='precapp_receb_alvara_data_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-16 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('precapp', '0009_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='pico_memoria_kb',
+            field=models.PositiveIntegerField(blank=True, help_text='Pico de memória residente do worker ao fim da exportação (KB)', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-16 22:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('precapp', '0010_exportjob_pico_memoria_help'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='atualizado_em',
+            field=models.DateTimeField(blank=True, help_text='Último progresso registrado pelo worker', null=True),
+        ),
+    ]
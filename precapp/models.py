@@ -2,7 +2,7 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
-from django.db.models.signals import pre_save, post_delete
+from django.db.models.signals import m2m_changed, pre_save, post_save, pre_delete, post_delete
 from django.dispatch import receiver
 from django.core.files.storage import default_storage
 from datetime import datetime
@@ -11,6 +11,8 @@ import threading
 import logging
 from django.utils import timezone
 
+from .search.text import normalize_search_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +36,81 @@ def validate_pdf_extension(value):
 
 # Create your models here.
 
+class LoadedValuesMixin:
+    """
+    Keep the field values read from the database on model instances.
+    
+    from_db() stores the loaded values in _loaded_values, keyed by attname,
+    so save() overrides and signal receivers can tell what changed without
+    reading the row again. Instances created in memory have no loaded values
+    until they are saved; receivers that rely on them refresh the snapshot
+    with remember_loaded_values() after applying a change.
+    """
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is not None:
+            fields = [self._meta.get_field(name).attname for name in fields]
+        self.remember_loaded_values(fields)
+    
+    def has_loaded_values(self, attnames):
+        """Whether the snapshot holds the stored value of every attname."""
+        loaded = getattr(self, '_loaded_values', {})
+        return all(attname in loaded for attname in attnames)
+    
+    def get_loaded_value(self, attname, default=None):
+        """Value of attname as last read from (or written to) the database."""
+        return getattr(self, '_loaded_values', {}).get(attname, default)
+    
+    def get_stored_values(self, attnames):
+        """
+        Stored values of attnames, from the snapshot when it has them all.
+        
+        Instances built in memory with an existing pk have no snapshot; for
+        those the values are read with one query.
+        
+        Returns:
+            dict|None: attname -> value, or None when the row does not exist
+        """
+        if self.has_loaded_values(attnames):
+            return {attname: self._loaded_values[attname] for attname in attnames}
+        return type(self)._base_manager.filter(pk=self.pk).values(*attnames).first()
+    
+    def unchanged_foreign_keys(self):
+        """
+        Names of the foreign keys that still point at the loaded rows.
+        
+        They were valid when the instance was loaded and on_delete keeps
+        them valid, so full_clean(exclude=...) can skip their existence query.
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        return [
+            field.name for field in self._meta.concrete_fields
+            if field.many_to_one and field.attname in loaded
+            and loaded[field.attname] == getattr(self, field.attname)
+        ]
+    
+    def remember_loaded_values(self, attnames=None):
+        """
+        Record the current in-memory values as the stored ones.
+        
+        Args:
+            attnames (list|None): Attnames to record; None records every
+                                  concrete field that is not deferred
+        """
+        if attnames is None:
+            attnames = [f.attname for f in self._meta.concrete_fields if f.attname in self.__dict__]
+        loaded = dict(getattr(self, '_loaded_values', {}))
+        loaded.update((attname, getattr(self, attname)) for attname in attnames)
+        self._loaded_values = loaded
+
+
 class Fase(models.Model):
     """
     Model for custom phases that can be used in Alvarás and Requerimentos.
@@ -354,6 +431,7 @@ class Precatorio(models.Model):
         cnj (CharField): CNJ number serving as primary key (unique identifier)
         orcamento (IntegerField): Budget year (YYYY format, validated 1988-2050)
         origem (CharField): Origin or source reference (max 200 characters)
+        origem_busca (CharField): origem without accents, lowercased (search column, set on save)
         credito_principal (CharField): Payment status of the principal credit
         honorarios_contratuais (CharField): Payment status of contractual fees
         honorarios_sucumbenciais (CharField): Payment status of succumbence fees
@@ -410,6 +488,13 @@ class Precatorio(models.Model):
         help_text="Ano do orçamento (formato: YYYY)"
     )
     origem = models.CharField(max_length=200)
+    origem_busca = models.CharField(
+        max_length=200,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="Origem sem acentos e em minúsculas, usada pela busca"
+    )
     credito_principal = models.CharField(
         max_length=20,
         choices=STATUS_PAGAMENTO_CHOICES,
@@ -481,10 +566,23 @@ class Precatorio(models.Model):
     def __str__(self):
         return f"{self.cnj} - {self.origem}"
 
+    def save(self, *args, **kwargs):
+        """Keep the normalized search column in sync with origem"""
+        self.origem_busca = normalize_search_text(self.origem)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'origem' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'origem_busca'}
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Precatório"
         verbose_name_plural = "Precatórios"
         ordering = ['cnj']  # Changed from data_oficio to cnj
+        indexes = [
+            # List filters, in the list's (keyset) order
+            models.Index(fields=['credito_principal', 'cnj'], name='precapp_prec_credito_cnj_idx'),
+            models.Index(fields=['orcamento', 'cnj'], name='precapp_prec_orcamento_cnj_idx'),
+        ]
 
     def delete_old_file(self, field_name):
         """Delete old file from storage when replacing with new file"""
@@ -551,6 +649,88 @@ def precatorio_post_delete(sender, instance, **kwargs):
         logger.error(f"Error in precatorio_post_delete signal: {str(e)}")
 
 
+class ClienteQuerySet(models.QuerySet):
+    """
+    QuerySet for Cliente with SQL-side summaries of related records.
+    
+    Every figure is computed by a correlated subquery, so a page or chunk of
+    clients is fetched in a single query and the precatório sums are not
+    multiplied by the number of diligências (as they would be with JOINs).
+    """
+    
+    def with_resumo(self, today=None):
+        """
+        Annotate each client with precatório and diligência summaries.
+        
+        Args:
+            today: Reference date for overdue/upcoming diligências (defaults to today)
+        
+        Annotations:
+            total_precatorios (int): Number of linked precatórios
+            valor_total_precatorios (float): Sum of ultima_atualizacao (0 when unset)
+            valor_atual_precatorios (float): Sum of ultima_atualizacao, falling back to
+                                             valor_de_face when unset or zero
+            total_diligencias (int): Number of diligências
+            diligencias_pendentes (int): Diligências not yet concluded
+            diligencias_concluidas (int): Concluded diligências
+            diligencias_atrasadas (int): Pending diligências past data_final
+            proximo_vencimento (date): Earliest data_final of pending diligências
+                                       due today or later (None when there is none)
+            ultima_diligencia_tipo (str): Tipo name of the most recently created diligência
+            ultima_diligencia_descricao (str): Description of that diligência
+        
+        Returns:
+            ClienteQuerySet: Annotated queryset
+        """
+        from django.db.models import Count, FloatField, Min, OuterRef, Subquery, Sum, Value
+        from django.db.models.functions import Coalesce, NullIf
+        
+        if today is None:
+            today = timezone.now().date()
+        zero = Value(0.0, output_field=FloatField())
+        
+        precatorios = Precatorio.objects.filter(clientes=OuterRef('pk')).order_by().values('clientes')
+        diligencias = Diligencias.objects.filter(cliente=OuterRef('pk')).order_by().values('cliente')
+        pendentes = diligencias.filter(concluida=False)
+        ultima = Diligencias.objects.filter(cliente=OuterRef('pk')).order_by('-data_criacao', '-pk')
+        
+        def aggregate(queryset, expression, default):
+            return Coalesce(Subquery(queryset.annotate(resultado=expression).values('resultado')), default)
+        
+        return self.annotate(
+            total_precatorios=aggregate(precatorios, Count('cnj'), 0),
+            valor_total_precatorios=aggregate(
+                precatorios, Sum(Coalesce('ultima_atualizacao', zero)), zero
+            ),
+            valor_atual_precatorios=aggregate(
+                precatorios, Sum(Coalesce(NullIf('ultima_atualizacao', zero), 'valor_de_face', zero)), zero
+            ),
+            total_diligencias=aggregate(diligencias, Count('id'), 0),
+            diligencias_pendentes=aggregate(pendentes, Count('id'), 0),
+            diligencias_concluidas=aggregate(diligencias.filter(concluida=True), Count('id'), 0),
+            diligencias_atrasadas=aggregate(pendentes.filter(data_final__lt=today), Count('id'), 0),
+            proximo_vencimento=Subquery(
+                pendentes.filter(data_final__gte=today).annotate(resultado=Min('data_final')).values('resultado')
+            ),
+            ultima_diligencia_tipo=Subquery(ultima.values('tipo__nome')[:1]),
+            ultima_diligencia_descricao=Subquery(ultima.values('descricao')[:1]),
+        )
+    
+    def with_priority_requerimentos(self):
+        """
+        Prefetch each client's priority requerimentos in one batch.
+        
+        When the queryset (or a page of it) is evaluated, a single query loads
+        the priority requerimentos of all fetched clients, with pedido and
+        fase, and get_priority_requerimentos() returns them without touching
+        the database.
+        
+        Returns:
+            ClienteQuerySet: Queryset with the prefetch attached
+        """
+        return self.prefetch_related(Cliente.priority_requerimentos_prefetch())
+
+
 class Cliente(models.Model):
     """
     Model representing a client with rights to precatórios.
@@ -562,6 +742,7 @@ class Cliente(models.Model):
     Attributes:
         cpf (CharField): CPF or CNPJ serving as primary key (max 18 characters)
         nome (CharField): Full name or company name (max 400 characters)
+        nome_busca (CharField): nome without accents, lowercased (search column, set on save)
         nascimento (DateField): Birth date or company founding date
         prioridade (BooleanField): Whether client has priority status
         falecido (BooleanField): Whether client is deceased (nullable)
@@ -583,6 +764,10 @@ class Cliente(models.Model):
     Methods:
         get_priority_requerimentos(): Returns priority requests (age/illness) for this client
     
+    QuerySet Methods:
+        Cliente.objects.with_resumo(): Annotates precatório and diligência summaries
+        Cliente.objects.with_priority_requerimentos(): Batch-loads priority requests
+    
     Usage Examples:
         # Create an individual client
         cliente = Cliente.objects.create(
@@ -605,6 +790,13 @@ class Cliente(models.Model):
     """
     cpf = models.CharField(max_length=18, primary_key=True, help_text="CPF ou CNPJ do cliente")
     nome = models.CharField(max_length=400)
+    nome_busca = models.CharField(
+        max_length=400,
+        blank=True,
+        default='',
+        editable=False,
+        help_text="Nome sem acentos e em minúsculas, usado pela busca"
+    )
     nascimento = models.DateField(null=True, blank=True)
     prioridade = models.BooleanField()
     falecido = models.BooleanField(
@@ -619,10 +811,76 @@ class Cliente(models.Model):
         verbose_name="Observações",
         help_text="Observações gerais sobre o cliente"
     )
+    
+    objects = ClienteQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # List order (nome, cpf), also used by the cursor pagination
+            models.Index(fields=['nome', 'cpf'], name='precapp_cliente_nome_cpf_idx'),
+            # Clients without prioridade by birth date, for the update by age
+            # (nascimento < 60 years ago)
+            models.Index(
+                fields=['nascimento'], name='precapp_cliente_sem_prio_idx',
+                condition=models.Q(prioridade=False)
+            ),
+            # Deceased clients are a small minority: a partial index in list order
+            models.Index(
+                fields=['nome', 'cpf'], name='precapp_cliente_falecido_idx',
+                condition=models.Q(falecido=True)
+            ),
+        ]
 
     def __str__(self):
         return f"{self.nome} - {self.cpf}"
     
+    def save(self, *args, **kwargs):
+        """Keep the normalized search column in sync with nome"""
+        self.nome_busca = normalize_search_text(self.nome)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'nome' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'nome_busca'}
+        super().save(*args, **kwargs)
+    
+    PRIORITY_REQUERIMENTOS_ATTR = '_priority_requerimentos'
+    
+    @classmethod
+    def priority_requerimentos_prefetch(cls):
+        """
+        Build the Prefetch that batch-loads priority requerimentos.
+        
+        Selects requerimentos whose pedido name contains 'prioridade' (case
+        insensitive), joined with pedido and fase, and stores them on each
+        client under PRIORITY_REQUERIMENTOS_ATTR.
+        
+        Returns:
+            Prefetch: For prefetch_related() or prefetch_related_objects()
+        """
+        return models.Prefetch(
+            'requerimento_set',
+            queryset=Requerimento.objects.filter(
+                pedido__nome__icontains='prioridade'
+            ).select_related('pedido', 'fase').order_by('pk'),
+            to_attr=cls.PRIORITY_REQUERIMENTOS_ATTR
+        )
+    
+    @classmethod
+    def prefetch_priority_requerimentos(cls, clientes):
+        """
+        Attach priority requerimentos to an already loaded page of clients.
+        
+        Runs one query for the whole page, whatever its size.
+        
+        Args:
+            clientes: Iterable of Cliente instances (e.g. a Paginator page)
+        
+        Returns:
+            list: The clients, each with its priority requerimentos attached
+        """
+        clientes = list(clientes)
+        models.prefetch_related_objects(clientes, cls.priority_requerimentos_prefetch())
+        return clientes
+    
     def get_priority_requerimentos(self):
         """
         Get all priority requerimentos (idade/doença) for this cliente.
@@ -631,10 +889,17 @@ class Cliente(models.Model):
         based on age or illness conditions. This method filters all requerimentos
         belonging to this client and returns only those with priority pedidos.
         
+        When the client was loaded through with_priority_requerimentos() or
+        prefetch_priority_requerimentos(), the batch-loaded list is returned
+        and no query is made.
+        
         Returns:
             list: List of Requerimento instances with priority pedidos
                  (pedidos with names containing 'prioridade')
         """
+        if hasattr(self, self.PRIORITY_REQUERIMENTOS_ATTR):
+            return getattr(self, self.PRIORITY_REQUERIMENTOS_ATTR)
+        
         priority_reqs = []
         
         # Only get requerimentos that actually belong to THIS cliente
@@ -1051,9 +1316,19 @@ class Diligencias(models.Model):
         verbose_name = "Diligência"
         verbose_name_plural = "Diligências"
         ordering = ['-data_criacao']
+        indexes = [
+            # List order, with and without the status filter
+            models.Index(fields=['-data_criacao', '-id'], name='precapp_dil_criacao_idx'),
+            models.Index(fields=['concluida', '-data_criacao', '-id'], name='precapp_dil_status_criacao_idx'),
+            # Pending diligências by due date (overdue counters, prazo filters)
+            models.Index(
+                fields=['data_final'], name='precapp_dil_pendente_prazo_idx',
+                condition=models.Q(concluida=False)
+            ),
+        ]
 
 
-class Alvara(models.Model):
+class Alvara(LoadedValuesMixin, models.Model):
     """
     Model representing an Alvará (payment authorization) document.
     
@@ -1195,6 +1470,9 @@ class Alvara(models.Model):
             is not fully populated (e.g., during form validation).
         """
         super().clean()
+        if getattr(self, '_skip_link_check', False):
+            # save(skip_link_check=True): the caller already verified the link
+            return
         # Only validate the linkage if both precatorio and cliente are set
         # Use hasattr and getattr to safely check for the precatorio without triggering RelatedObjectDoesNotExist
         try:
@@ -1211,25 +1489,27 @@ class Alvara(models.Model):
             # This can happen during form validation when the instance is not fully populated
             pass
     
-    def save(self, *args, **kwargs):
+    FASE_ATTNAMES = ['fase_id', 'fase_honorarios_contratuais_id', 'fase_honorarios_sucumbenciais_id']
+    
+    def save(self, *args, skip_link_check=False, **kwargs):
         """
         Override save to call clean validation and track fase changes.
         
         Ensures that validation rules are always enforced when saving,
         and tracks when fase or fase_honorarios_contratuais fields are modified.
+        
+        Changes are detected against the values loaded from the database
+        (LoadedValuesMixin) instead of fetching the row again, and foreign
+        keys that did not change are not re-validated by full_clean().
+        
+        Args:
+            skip_link_check (bool): Skip the cliente-precatório link query of
+                                    clean() when the caller already verified it
         """
         # Check if this is an update (not a new instance)
         if self.pk:
-            try:
-                # Get the old instance from database
-                old_instance = Alvara.objects.get(pk=self.pk)
-                old_fase = old_instance.fase
-                old_fase_honorarios_contratuais = old_instance.fase_honorarios_contratuais
-                old_fase_honorarios_sucumbenciais = old_instance.fase_honorarios_sucumbenciais
-                new_fase = self.fase
-                new_fase_honorarios_contratuais = self.fase_honorarios_contratuais
-                new_fase_honorarios_sucumbenciais = self.fase_honorarios_sucumbenciais
-                
+            old_values = self.get_stored_values(self.FASE_ATTNAMES)
+            if old_values is not None:
                 # Try to get current user from thread-local storage
                 current_user = getattr(threading.current_thread(), 'user', None)
                 if current_user and hasattr(current_user, 'get_full_name'):
@@ -1239,23 +1519,19 @@ class Alvara(models.Model):
                     user_name = "System"
                 
                 # Check if main fase has changed
-                if old_fase != new_fase:
+                if old_values['fase_id'] != self.fase_id:
                     self.fase_ultima_alteracao = timezone.now()
                     self.fase_alterada_por = user_name
                 
                 # Check if honorarios contratuais fase has changed
-                if old_fase_honorarios_contratuais != new_fase_honorarios_contratuais:
+                if old_values['fase_honorarios_contratuais_id'] != self.fase_honorarios_contratuais_id:
                     self.fase_honorarios_ultima_alteracao = timezone.now()
                     self.fase_honorarios_alterada_por = user_name
                 
                 # Check if honorarios sucumbenciais fase has changed
-                if old_fase_honorarios_sucumbenciais != new_fase_honorarios_sucumbenciais:
+                if old_values['fase_honorarios_sucumbenciais_id'] != self.fase_honorarios_sucumbenciais_id:
                     self.fase_honorarios_sucumbenciais_ultima_alteracao = timezone.now()
                     self.fase_honorarios_sucumbenciais_alterada_por = user_name
-                        
-            except Alvara.DoesNotExist:
-                # This shouldn't happen, but handle gracefully
-                pass
         else:
             # This is a new instance - set initial audit values
             # Try to get current user from thread-local storage
@@ -1281,14 +1557,25 @@ class Alvara(models.Model):
                 self.fase_honorarios_sucumbenciais_ultima_alteracao = timezone.now()
                 self.fase_honorarios_sucumbenciais_alterada_por = user_name
         
-        self.full_clean()
+        self._skip_link_check = skip_link_check
+        try:
+            self.full_clean(exclude=self.unchanged_foreign_keys())
+        finally:
+            self._skip_link_check = False
         super().save(*args, **kwargs)
+        self.remember_loaded_values(self.FASE_ATTNAMES)
 
     def __str__(self):
         return f"{self.tipo} - {self.cliente.nome}"
+
+    class Meta:
+        indexes = [
+            # Tipo filter of the list, in list order
+            models.Index(fields=['tipo', '-id'], name='precapp_alvara_tipo_idx'),
+        ]
     
 
-class Requerimento(models.Model):
+class Requerimento(LoadedValuesMixin, models.Model):
     """
     Model representing a legal Requerimento (request) document.
     
@@ -1398,6 +1685,9 @@ class Requerimento(models.Model):
             is not fully populated (e.g., during form validation).
         """
         super().clean()
+        if getattr(self, '_skip_link_check', False):
+            # save(skip_link_check=True): the caller already verified the link
+            return
         # Only validate the linkage if both precatorio and cliente are set
         # Use hasattr and getattr to safely check for the precatorio without triggering RelatedObjectDoesNotExist
         try:
@@ -1414,37 +1704,37 @@ class Requerimento(models.Model):
             # This can happen during form validation when the instance is not fully populated
             pass
     
-    def save(self, *args, **kwargs):
+    def save(self, *args, skip_link_check=False, **kwargs):
         """
         Override save to call clean validation and track fase changes.
         
         Ensures that validation rules are always enforced when saving,
         and tracks when the fase field is modified.
+        
+        Changes are detected against the values loaded from the database
+        (LoadedValuesMixin) instead of fetching the row again, and foreign
+        keys that did not change are not re-validated by full_clean().
+        
+        Args:
+            skip_link_check (bool): Skip the cliente-precatório link query of
+                                    clean() when the caller already verified it
         """
         # Check if this is an update (not a new instance)
         if self.pk:
-            try:
-                # Get the old instance from database
-                old_instance = Requerimento.objects.get(pk=self.pk)
-                old_fase = old_instance.fase
-                new_fase = self.fase
+            old_values = self.get_stored_values(['fase_id'])
+            
+            # Check if fase has changed
+            if old_values is not None and old_values['fase_id'] != self.fase_id:
+                self.fase_ultima_alteracao = timezone.now()
                 
-                # Check if fase has changed
-                if old_fase != new_fase:
-                    self.fase_ultima_alteracao = timezone.now()
-                    
-                    # Try to get current user from thread-local storage
-                    current_user = getattr(threading.current_thread(), 'user', None)
-                    if current_user and hasattr(current_user, 'get_full_name'):
-                        user_name = current_user.get_full_name() or current_user.username
-                        self.fase_alterada_por = user_name
-                    else:
-                        # Fallback if no user available
-                        self.fase_alterada_por = "System"
-                        
-            except Requerimento.DoesNotExist:
-                # This shouldn't happen, but handle gracefully
-                pass
+                # Try to get current user from thread-local storage
+                current_user = getattr(threading.current_thread(), 'user', None)
+                if current_user and hasattr(current_user, 'get_full_name'):
+                    user_name = current_user.get_full_name() or current_user.username
+                    self.fase_alterada_por = user_name
+                else:
+                    # Fallback if no user available
+                    self.fase_alterada_por = "System"
         else:
             # This is a new instance - set initial audit values if fase is provided
             if self.fase:
@@ -1459,8 +1749,13 @@ class Requerimento(models.Model):
                     # Fallback if no user available
                     self.fase_alterada_por = "System"
         
-        self.full_clean()
+        self._skip_link_check = skip_link_check
+        try:
+            self.full_clean(exclude=self.unchanged_foreign_keys())
+        finally:
+            self._skip_link_check = False
         super().save(*args, **kwargs)
+        self.remember_loaded_values(['fase_id'])
 
     def __str__(self):
         return f"Requerimento - {self.pedido.nome} - {self.cliente.nome}"
@@ -1549,7 +1844,7 @@ class ContaBancaria(models.Model):
         return f"{self.banco} - Ag: {self.agencia} - CC: {self.conta}"
 
 
-class Recebimentos(models.Model):
+class Recebimentos(LoadedValuesMixin, models.Model):
     """
     Model representing receipts made for a specific Alvará.
     
@@ -1640,6 +1935,10 @@ class Recebimentos(models.Model):
         verbose_name = "Recebimento"
         verbose_name_plural = "Recebimentos"
         ordering = ['-data', '-numero_documento']
+        indexes = [
+            # Receipts of an alvará, in the default order
+            models.Index(fields=['alvara', '-data', '-numero_documento'], name='precapp_receb_alvara_data_idx'),
+        ]
         
     def clean(self):
         """
@@ -1681,4 +1980,819 @@ class Recebimentos(models.Model):
     @property
     def valor_formatado(self):
         """Return formatted currency value."""
-        return f"R$ {self.valor:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
\ No newline at end of file
+        return f"R$ {self.valor:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+
+
+class PrecatorioResumoQuerySet(models.QuerySet):
+    """QuerySet for PrecatorioResumo with the incremental update helpers."""
+    
+    def increment(self, **deltas):
+        """
+        Add deltas to the summary counters in a single UPDATE.
+        
+        Zero deltas are dropped. Rows that do not exist are left alone: a
+        missing summary is built from scratch the next time it is read, so
+        there is nothing to keep up to date.
+        
+        Args:
+            **deltas: Field name -> amount to add (negative to subtract)
+        
+        Returns:
+            int: Number of summaries updated
+        """
+        from django.db.models import F
+        
+        changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if not changes:
+            return 0
+        return self.update(atualizado_em=timezone.now(), **changes)
+    
+    def refresh_clientes(self):
+        """Recount the linked clients of the selected summaries in a single UPDATE."""
+        from django.db.models import Count, OuterRef, Subquery
+        from django.db.models.functions import Coalesce
+        
+        clientes = Precatorio.clientes.through.objects.filter(
+            precatorio_id=OuterRef('precatorio_id')
+        ).order_by().values('precatorio_id').annotate(total=Count('pk')).values('total')
+        return self.update(
+            quantidade_clientes=Coalesce(Subquery(clientes), 0),
+            atualizado_em=timezone.now()
+        )
+
+
+class PrecatorioResumo(models.Model):
+    """
+    Denormalized financial summary of a precatório.
+    
+    The detail page and reports need the alvará totals, the amount received
+    and the number of related records of a precatório. Instead of summing
+    them on every request, one row per precatório keeps the figures and is
+    updated incrementally by signal receivers (see the end of this module):
+    every save or delete of an Alvara, Requerimento or Recebimentos applies
+    its difference with a single UPDATE, and changes to the clientes
+    relationship recount the linked clients.
+    
+    Writes that bypass signals (QuerySet.update, bulk_create) are not seen
+    by the receivers; the bulk import rebuilds the precatórios of each batch
+    and the rebuild_precatorio_summaries command can rebuild or verify the
+    table at any time. A precatório without a summary gets one computed in
+    memory on access.
+    
+    Attributes:
+        precatorio (OneToOneField): Summarized precatório (primary key, CASCADE deletion)
+        total_principal (FloatField): Sum of the alvarás' valor_principal
+        total_contratuais (FloatField): Sum of the alvarás' honorarios_contratuais
+        total_sucumbenciais (FloatField): Sum of the alvarás' honorarios_sucumbenciais
+        total_recebido (DecimalField): Sum of the recebimentos of its alvarás
+        quantidade_alvaras (PositiveIntegerField): Number of alvarás
+        quantidade_requerimentos (PositiveIntegerField): Number of requerimentos
+        quantidade_clientes (PositiveIntegerField): Number of linked clients
+        atualizado_em (DateTimeField): Last change
+    
+    Usage Examples:
+        resumo = PrecatorioResumo.for_precatorio(precatorio)
+        resumo.total_principal
+        
+        PrecatorioResumo.rebuild()              # whole table
+        PrecatorioResumo.verify(cnjs=[cnj])     # list of divergent figures
+    """
+    
+    AMOUNT_FIELDS = ['total_principal', 'total_contratuais', 'total_sucumbenciais', 'total_recebido']
+    COUNT_FIELDS = ['quantidade_alvaras', 'quantidade_requerimentos', 'quantidade_clientes']
+    # Float sums maintained incrementally may differ from a fresh SUM by rounding
+    TOLERANCIA = 0.01
+    
+    precatorio = models.OneToOneField(
+        Precatorio,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        to_field='cnj',
+        related_name='resumo'
+    )
+    total_principal = models.FloatField(default=0.0)
+    total_contratuais = models.FloatField(default=0.0)
+    total_sucumbenciais = models.FloatField(default=0.0)
+    total_recebido = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    quantidade_alvaras = models.PositiveIntegerField(default=0)
+    quantidade_requerimentos = models.PositiveIntegerField(default=0)
+    quantidade_clientes = models.PositiveIntegerField(default=0)
+    atualizado_em = models.DateTimeField(auto_now=True)
+    
+    objects = PrecatorioResumoQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = "Resumo do Precatório"
+        verbose_name_plural = "Resumos dos Precatórios"
+    
+    def __str__(self):
+        return f"Resumo {self.precatorio_id}"
+    
+    @classmethod
+    def expected_values(cls, precatorios=None):
+        """
+        Compute the summary figures from the source tables.
+        
+        Every figure is a correlated subquery, as in ClienteQuerySet.with_resumo,
+        so the sums are not multiplied by joins between the related tables.
+        
+        Args:
+            precatorios (QuerySet|None): Precatórios to summarize (default: all)
+        
+        Returns:
+            QuerySet: Precatório queryset annotated with the summary fields
+        """
+        from django.db.models import Count, DecimalField, FloatField, OuterRef, Subquery, Sum, Value
+        from django.db.models.functions import Coalesce
+        
+        if precatorios is None:
+            precatorios = Precatorio.objects.all()
+        zero = Value(0.0, output_field=FloatField())
+        zero_decimal = Value(Decimal('0.00'), output_field=DecimalField(max_digits=15, decimal_places=2))
+        
+        alvaras = Alvara.objects.filter(precatorio=OuterRef('pk')).order_by().values('precatorio')
+        requerimentos = Requerimento.objects.filter(precatorio=OuterRef('pk')).order_by().values('precatorio')
+        recebimentos = Recebimentos.objects.filter(
+            alvara__precatorio=OuterRef('pk')
+        ).order_by().values('alvara__precatorio')
+        clientes = Precatorio.clientes.through.objects.filter(
+            precatorio_id=OuterRef('pk')
+        ).order_by().values('precatorio_id')
+        
+        def aggregate(queryset, expression, default):
+            return Coalesce(Subquery(queryset.annotate(resultado=expression).values('resultado')), default)
+        
+        return precatorios.annotate(
+            total_principal=aggregate(alvaras, Sum('valor_principal'), zero),
+            total_contratuais=aggregate(alvaras, Sum('honorarios_contratuais'), zero),
+            total_sucumbenciais=aggregate(alvaras, Sum('honorarios_sucumbenciais'), zero),
+            total_recebido=aggregate(recebimentos, Sum('valor'), zero_decimal),
+            quantidade_alvaras=aggregate(alvaras, Count('pk'), 0),
+            quantidade_requerimentos=aggregate(requerimentos, Count('pk'), 0),
+            quantidade_clientes=aggregate(clientes, Count('pk'), 0),
+        )
+    
+    @classmethod
+    def rebuild(cls, cnjs=None, batch_size=1000):
+        """
+        Recompute the summaries from the source tables in bulk.
+        
+        Args:
+            cnjs (iterable|None): Precatórios to rebuild (default: all)
+            batch_size (int): Rows read and inserted per batch
+        
+        Returns:
+            int: Number of summaries written
+        """
+        from django.db import transaction
+        
+        precatorios = Precatorio.objects.order_by()
+        resumos = cls.objects.all()
+        if cnjs is not None:
+            cnjs = list(cnjs)
+            precatorios = precatorios.filter(cnj__in=cnjs)
+            resumos = resumos.filter(precatorio_id__in=cnjs)
+        
+        fields = cls.AMOUNT_FIELDS + cls.COUNT_FIELDS
+        rows = cls.expected_values(precatorios).values_list('cnj', *fields)
+        written = 0
+        with transaction.atomic():
+            resumos.delete()
+            batch = []
+            for cnj, *values in rows.iterator(chunk_size=batch_size):
+                batch.append(cls(precatorio_id=cnj, **dict(zip(fields, values))))
+                if len(batch) >= batch_size:
+                    cls.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                cls.objects.bulk_create(batch)
+                written += len(batch)
+        return written
+    
+    @classmethod
+    def verify(cls, cnjs=None):
+        """
+        Compare the stored summaries with freshly computed figures.
+        
+        Args:
+            cnjs (iterable|None): Precatórios to check (default: all)
+        
+        Returns:
+            list: One dict per divergence with cnj, campo, esperado and
+                  armazenado; a missing summary is reported with campo='resumo'
+        """
+        precatorios = Precatorio.objects.order_by('cnj')
+        if cnjs is not None:
+            precatorios = precatorios.filter(cnj__in=list(cnjs))
+        
+        fields = cls.AMOUNT_FIELDS + cls.COUNT_FIELDS
+        stored = [f'resumo__{field}' for field in fields]
+        rows = cls.expected_values(precatorios).values_list('cnj', 'resumo__precatorio', *fields, *stored)
+        
+        divergencias = []
+        for cnj, resumo, *values in rows.iterator():
+            if resumo is None:
+                divergencias.append({'cnj': cnj, 'campo': 'resumo', 'esperado': None, 'armazenado': None})
+                continue
+            for field, esperado, armazenado in zip(fields, values[:len(fields)], values[len(fields):]):
+                if abs(float(esperado or 0) - float(armazenado or 0)) > cls.TOLERANCIA:
+                    divergencias.append({'cnj': cnj, 'campo': field, 'esperado': esperado, 'armazenado': armazenado})
+        return divergencias
+    
+    @classmethod
+    def for_precatorio(cls, precatorio):
+        """
+        Return the summary of a precatório, computing it when it is missing.
+        
+        A missing summary is computed in memory and not saved, so reading a
+        page never writes; the signals and rebuild_precatorio_summaries
+        maintain the stored rows.
+        
+        Args:
+            precatorio (Precatorio): Summarized precatório
+        
+        Returns:
+            PrecatorioResumo: Stored summary, or an unsaved one
+        """
+        try:
+            return cls.objects.get(precatorio_id=precatorio.pk)
+        except cls.DoesNotExist:
+            fields = cls.AMOUNT_FIELDS + cls.COUNT_FIELDS
+            values = cls.expected_values(Precatorio.objects.filter(pk=precatorio.pk)).values(*fields).first()
+            return cls(precatorio=precatorio, **(values or {}))
+
+
+class ExportJob(models.Model):
+    """
+    Model representing a background Excel export request.
+    
+    Export views no longer build the workbook inside the HTTP request: they
+    create an ExportJob in the 'pendente' state and return immediately. The
+    process_export_jobs management command claims pending jobs, generates the
+    workbook into the default storage backend (S3 or local media) and records
+    metrics about the run so regressions can be tracked over time.
+    
+    Attributes:
+        tipo (CharField): Which report to generate (precatorios or clientes)
+        status (CharField): Lifecycle state (pendente, processando, concluido, erro)
+        solicitado_por (ForeignKey): User who requested the export
+        arquivo (FileField): Generated workbook in the configured storage
+        nome_arquivo (CharField): Filename offered on download
+        criado_em / iniciado_em / concluido_em (DateTimeField): Timestamps
+        duracao_segundos (FloatField): Wall-clock time spent building and storing the file
+        total_linhas (PositiveIntegerField): Data rows written, headers excluded
+        linhas_por_planilha (JSONField): Data rows written per worksheet
+        pico_memoria_kb (PositiveIntegerField): Peak resident memory of the worker process after the export
+        mensagem_erro (TextField): Error message when the job fails
+    
+    Business Rules:
+        - Jobs are processed in creation order
+        - A job is claimed atomically, so several workers never run the same job
+        - Failed jobs keep the error message and are not retried automatically
+        - Jobs left processing by a dead worker are marked as failed
+        - Deleting a job removes its file from storage
+    """
+    
+    TIPO_CHOICES = [
+        ('precatorios', 'Relatório completo do sistema'),
+        ('clientes', 'Relatório de clientes'),
+    ]
+    
+    STATUS_PENDENTE = 'pendente'
+    STATUS_PROCESSANDO = 'processando'
+    STATUS_CONCLUIDO = 'concluido'
+    STATUS_ERRO = 'erro'
+    STATUS_CHOICES = [
+        (STATUS_PENDENTE, 'Pendente'),
+        (STATUS_PROCESSANDO, 'Processando'),
+        (STATUS_CONCLUIDO, 'Concluído'),
+        (STATUS_ERRO, 'Erro'),
+    ]
+    
+    tipo = models.CharField(
+        max_length=20,
+        choices=TIPO_CHOICES,
+        help_text="Relatório a ser gerado"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDENTE,
+        db_index=True,
+        help_text="Situação atual da exportação"
+    )
+    solicitado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='export_jobs',
+        help_text="Usuário que solicitou a exportação"
+    )
+    arquivo = models.FileField(
+        upload_to='exports/%Y/%m/',
+        blank=True,
+        null=True,
+        help_text="Planilha gerada"
+    )
+    nome_arquivo = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Nome do arquivo oferecido no download"
+    )
+    
+    # Timestamps
+    criado_em = models.DateTimeField(auto_now_add=True)
+    iniciado_em = models.DateTimeField(null=True, blank=True)
+    concluido_em = models.DateTimeField(null=True, blank=True)
+    
+    # Run metrics
+    duracao_segundos = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Tempo total de geração e armazenamento da planilha"
+    )
+    total_linhas = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Linhas de dados escritas (sem cabeçalhos)"
+    )
+    linhas_por_planilha = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Linhas de dados escritas em cada aba"
+    )
+    pico_memoria_kb = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Pico de memória residente do worker ao fim da exportação (KB)"
+    )
+    mensagem_erro = models.TextField(
+        blank=True,
+        help_text="Mensagem de erro quando a exportação falha"
+    )
+    
+    class Meta:
+        verbose_name = "Exportação"
+        verbose_name_plural = "Exportações"
+        ordering = ['-criado_em']
+    
+    def __str__(self):
+        return f"Exportação #{self.pk} - {self.get_tipo_display()} ({self.get_status_display()})"
+    
+    @property
+    def finalizado(self):
+        """Whether the job reached a final state (success or error)."""
+        return self.status in (self.STATUS_CONCLUIDO, self.STATUS_ERRO)
+
+
+@receiver(post_delete, sender=ExportJob)
+def export_job_post_delete(sender, instance, **kwargs):
+    """Delete the generated workbook when an ExportJob is deleted"""
+    try:
+        if instance.arquivo and default_storage.exists(instance.arquivo.name):
+            default_storage.delete(instance.arquivo.name)
+            logger.info(f"Deleted export file on job deletion: {instance.arquivo.name}")
+    except Exception as e:
+        logger.error(f"Error in export_job_post_delete signal: {str(e)}")
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Progress of a chunked Excel import, used by import_excel --resume.
+    
+    In chunked mode (import_excel --chunk-size N) every chunk of N rows is
+    committed in its own transaction together with this checkpoint, so the
+    checkpoint always points at the last row that is really in the database.
+    A crashed or interrupted import can then be continued with --resume
+    instead of starting over.
+    
+    Attributes:
+        arquivo_hash (CharField): SHA-256 of the imported file contents
+        planilha (CharField): Sheet being imported
+        nome_arquivo (CharField): File name, for display only
+        status (CharField): em_andamento or concluido
+        ultima_linha (PositiveIntegerField): Rows already committed (0-based position of the next row)
+        total_linhas (PositiveIntegerField): Data rows in the sheet
+        totais (JSONField): Records imported so far per model
+        criado_em / atualizado_em (DateTimeField): Timestamps
+    
+    Business Rules:
+        - The file is identified by its contents, so a renamed copy resumes
+          and an edited file starts a new checkpoint
+        - One checkpoint per file and sheet
+        - Running without --resume restarts the checkpoint from the first row
+    """
+    
+    STATUS_EM_ANDAMENTO = 'em_andamento'
+    STATUS_CONCLUIDO = 'concluido'
+    STATUS_CHOICES = [
+        (STATUS_EM_ANDAMENTO, 'Em andamento'),
+        (STATUS_CONCLUIDO, 'Concluído'),
+    ]
+    
+    arquivo_hash = models.CharField(max_length=64, help_text="SHA-256 do conteúdo do arquivo")
+    planilha = models.CharField(max_length=100, help_text="Aba importada")
+    nome_arquivo = models.CharField(max_length=255, blank=True, help_text="Nome do arquivo importado")
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_EM_ANDAMENTO,
+        help_text="Situação da importação"
+    )
+    ultima_linha = models.PositiveIntegerField(default=0, help_text="Linhas já gravadas no banco")
+    total_linhas = models.PositiveIntegerField(default=0, help_text="Linhas de dados da aba")
+    totais = models.JSONField(default=dict, blank=True, help_text="Registros importados por modelo")
+    criado_em = models.DateTimeField(auto_now_add=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Checkpoint de Importação"
+        verbose_name_plural = "Checkpoints de Importação"
+        ordering = ['-atualizado_em']
+        constraints = [
+            models.UniqueConstraint(fields=['arquivo_hash', 'planilha'], name='unique_import_checkpoint')
+        ]
+    
+    def __str__(self):
+        return f"{self.nome_arquivo} [{self.planilha}] - {self.ultima_linha}/{self.total_linhas}"
+    
+    @property
+    def concluido(self):
+        """Whether every row of the sheet was committed."""
+        return self.status == self.STATUS_CONCLUIDO
+
+
+class ImportJob(models.Model):
+    """
+    Model representing an Excel import uploaded through the web interface.
+    
+    The upload view only stores the file and creates an ImportJob in the
+    'pendente' state. The process_import_jobs management command claims it,
+    runs import_excel in chunked mode and, after every committed chunk,
+    records how many rows were processed, how many had errors and the
+    throughput, so the page can poll the progress. The final counts are
+    stored in resultado as structured data.
+    
+    Attributes:
+        arquivo (FileField): Uploaded workbook in the configured storage
+        nome_arquivo (CharField): Original name of the uploaded file
+        status (CharField): Lifecycle state (pendente, processando, concluido, erro)
+        solicitado_por (ForeignKey): User who uploaded the file
+        criado_em / iniciado_em / concluido_em (DateTimeField): Timestamps
+        atualizado_em (DateTimeField): Last sign of life of the worker (claim or committed chunk)
+        total_linhas (PositiveIntegerField): Data rows in the sheet
+        linhas_processadas (PositiveIntegerField): Rows committed so far
+        linhas_com_erro (PositiveIntegerField): Rows rejected so far
+        linhas_por_segundo (FloatField): Throughput of the run
+        resultado (JSONField): Imported records per model
+        erros (JSONField): First row error messages
+        mensagem_erro (TextField): Error message when the whole job fails
+    
+    Business Rules:
+        - Jobs are processed in upload order
+        - A job is claimed atomically, so several workers never run the same job
+        - Rows committed before a failure stay imported
+        - Jobs whose worker stopped reporting progress are requeued and resume
+          after the last committed chunk
+        - Deleting a job removes the uploaded file from storage
+    """
+    
+    STATUS_PENDENTE = 'pendente'
+    STATUS_PROCESSANDO = 'processando'
+    STATUS_CONCLUIDO = 'concluido'
+    STATUS_ERRO = 'erro'
+    STATUS_CHOICES = [
+        (STATUS_PENDENTE, 'Pendente'),
+        (STATUS_PROCESSANDO, 'Processando'),
+        (STATUS_CONCLUIDO, 'Concluído'),
+        (STATUS_ERRO, 'Erro'),
+    ]
+    
+    arquivo = models.FileField(
+        upload_to='imports/%Y/%m/',
+        help_text="Planilha enviada para importação"
+    )
+    nome_arquivo = models.CharField(
+        max_length=255,
+        help_text="Nome original do arquivo enviado"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDENTE,
+        db_index=True,
+        help_text="Situação atual da importação"
+    )
+    solicitado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='import_jobs',
+        help_text="Usuário que enviou a planilha"
+    )
+    
+    # Timestamps
+    criado_em = models.DateTimeField(auto_now_add=True)
+    iniciado_em = models.DateTimeField(null=True, blank=True)
+    concluido_em = models.DateTimeField(null=True, blank=True)
+    atualizado_em = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Último progresso registrado pelo worker"
+    )
+    
+    # Progress
+    total_linhas = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Linhas de dados da planilha"
+    )
+    linhas_processadas = models.PositiveIntegerField(default=0, help_text="Linhas já gravadas")
+    linhas_com_erro = models.PositiveIntegerField(default=0, help_text="Linhas rejeitadas na validação")
+    linhas_por_segundo = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Velocidade da importação"
+    )
+    
+    # Result
+    resultado = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Registros importados por modelo"
+    )
+    erros = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Primeiras mensagens de erro das linhas rejeitadas"
+    )
+    mensagem_erro = models.TextField(
+        blank=True,
+        help_text="Mensagem de erro quando a importação falha"
+    )
+    
+    class Meta:
+        verbose_name = "Importação"
+        verbose_name_plural = "Importações"
+        ordering = ['-criado_em']
+    
+    def __str__(self):
+        return f"Importação #{self.pk} - {self.nome_arquivo} ({self.get_status_display()})"
+    
+    @property
+    def finalizado(self):
+        """Whether the job reached a final state (success or error)."""
+        return self.status in (self.STATUS_CONCLUIDO, self.STATUS_ERRO)
+    
+    @property
+    def progresso(self):
+        """Percentage of rows processed, or None while the sheet size is unknown."""
+        if not self.total_linhas:
+            return 100 if self.status == self.STATUS_CONCLUIDO else None
+        return min(100, round(100 * self.linhas_processadas / self.total_linhas))
+
+
+@receiver(post_delete, sender=ImportJob)
+def import_job_post_delete(sender, instance, **kwargs):
+    """Delete the uploaded workbook when an ImportJob is deleted"""
+    try:
+        if instance.arquivo and default_storage.exists(instance.arquivo.name):
+            default_storage.delete(instance.arquivo.name)
+            logger.info(f"Deleted import file on job deletion: {instance.arquivo.name}")
+    except Exception as e:
+        logger.error(f"Error in import_job_post_delete signal: {str(e)}")
+
+
+# Dashboard counters cache invalidation
+@receiver(post_save, sender=Precatorio)
+@receiver(post_delete, sender=Precatorio)
+@receiver(post_save, sender=Cliente)
+@receiver(post_delete, sender=Cliente)
+@receiver(post_save, sender=Alvara)
+@receiver(post_delete, sender=Alvara)
+@receiver(post_save, sender=Requerimento)
+@receiver(post_delete, sender=Requerimento)
+@receiver(post_save, sender=Diligencias)
+@receiver(post_delete, sender=Diligencias)
+@receiver(post_save, sender=TipoDiligencia)
+@receiver(post_delete, sender=TipoDiligencia)
+def dashboard_statistics_changed(sender, instance, **kwargs):
+    """Clear the cached home page counters when a record that feeds them changes"""
+    from .dashboard import invalidate_dashboard_statistics
+    invalidate_dashboard_statistics()
+
+
+@receiver(post_save, sender=Fase)
+@receiver(post_delete, sender=Fase)
+@receiver(post_save, sender=FaseHonorariosContratuais)
+@receiver(post_delete, sender=FaseHonorariosContratuais)
+@receiver(post_save, sender=FaseHonorariosSucumbenciais)
+@receiver(post_delete, sender=FaseHonorariosSucumbenciais)
+@receiver(post_save, sender=Tipo)
+@receiver(post_delete, sender=Tipo)
+@receiver(post_save, sender=PedidoRequerimento)
+@receiver(post_delete, sender=PedidoRequerimento)
+@receiver(post_save, sender=TipoDiligencia)
+@receiver(post_delete, sender=TipoDiligencia)
+def catalog_changed(sender, instance, **kwargs):
+    """Make every process reload its cached catalogs (see catalog.py)"""
+    from .catalog import invalidate_catalog
+    invalidate_catalog()
+
+
+# Precatório summary maintenance (see PrecatorioResumo)
+ALVARA_RESUMO_ATTNAMES = ['precatorio_id', 'valor_principal', 'honorarios_contratuais', 'honorarios_sucumbenciais']
+
+
+def _alvara_amounts(principal, contratuais, sucumbenciais, sign=1):
+    return {
+        'total_principal': sign * (principal or 0),
+        'total_contratuais': sign * (contratuais or 0),
+        'total_sucumbenciais': sign * (sucumbenciais or 0),
+    }
+
+
+@receiver(post_save, sender=Precatorio)
+def precatorio_resumo_post_save(sender, instance, created, raw=False, **kwargs):
+    """Create the empty summary of a new precatório"""
+    if created and not raw:
+        PrecatorioResumo.objects.bulk_create([PrecatorioResumo(precatorio_id=instance.pk)], ignore_conflicts=True)
+
+
+def _remember_stored_precatorio(instance, attnames):
+    """
+    Read the stored precatório of a row saved without a snapshot.
+    
+    Without the snapshot the post_save receivers cannot tell whether the row
+    moved to another precatório, so they rebuild both the stored one and the
+    current one.
+    """
+    if instance.pk is None or instance.has_loaded_values(attnames):
+        return
+    stored = instance.get_stored_values(['precatorio_id'])
+    instance._resumo_cnj_anterior = stored['precatorio_id'] if stored else None
+
+
+def _rebuild_stored_and_current(instance):
+    cnjs = {instance.precatorio_id, getattr(instance, '_resumo_cnj_anterior', None)} - {None}
+    PrecatorioResumo.rebuild(cnjs=cnjs)
+
+
+@receiver(pre_save, sender=Alvara)
+def alvara_resumo_pre_save(sender, instance, raw=False, **kwargs):
+    """Remember the stored precatório of an alvará saved without a snapshot"""
+    if not raw:
+        _remember_stored_precatorio(instance, ALVARA_RESUMO_ATTNAMES)
+
+
+@receiver(post_save, sender=Alvara)
+def alvara_resumo_post_save(sender, instance, created, raw=False, **kwargs):
+    """Apply the difference made by an alvará save to the precatório summaries"""
+    if raw:
+        return
+    resumos = PrecatorioResumo.objects
+    novo = _alvara_amounts(instance.valor_principal, instance.honorarios_contratuais, instance.honorarios_sucumbenciais)
+    
+    if created:
+        resumos.filter(precatorio_id=instance.precatorio_id).increment(quantidade_alvaras=1, **novo)
+    elif not instance.has_loaded_values(ALVARA_RESUMO_ATTNAMES):
+        # Previous values unknown: recompute the previous and the current precatório
+        _rebuild_stored_and_current(instance)
+    else:
+        antigo_cnj = instance.get_loaded_value('precatorio_id')
+        antigo = _alvara_amounts(
+            instance.get_loaded_value('valor_principal'),
+            instance.get_loaded_value('honorarios_contratuais'),
+            instance.get_loaded_value('honorarios_sucumbenciais'),
+            sign=-1
+        )
+        if antigo_cnj == instance.precatorio_id:
+            resumos.filter(precatorio_id=instance.precatorio_id).increment(
+                **{field: novo[field] + antigo[field] for field in novo}
+            )
+        else:
+            # The alvará moved to another precatório, taking its recebimentos along
+            from django.db.models import Sum
+            recebido = instance.recebimentos.aggregate(total=Sum('valor'))['total'] or 0
+            resumos.filter(precatorio_id=antigo_cnj).increment(
+                quantidade_alvaras=-1, total_recebido=-recebido, **antigo
+            )
+            resumos.filter(precatorio_id=instance.precatorio_id).increment(
+                quantidade_alvaras=1, total_recebido=recebido, **novo
+            )
+    instance.remember_loaded_values(ALVARA_RESUMO_ATTNAMES)
+
+
+@receiver(post_delete, sender=Alvara)
+def alvara_resumo_post_delete(sender, instance, **kwargs):
+    """Remove a deleted alvará from its precatório summary"""
+    loaded = instance.get_loaded_value
+    PrecatorioResumo.objects.filter(
+        precatorio_id=loaded('precatorio_id', instance.precatorio_id)
+    ).increment(quantidade_alvaras=-1, **_alvara_amounts(
+        loaded('valor_principal', instance.valor_principal),
+        loaded('honorarios_contratuais', instance.honorarios_contratuais),
+        loaded('honorarios_sucumbenciais', instance.honorarios_sucumbenciais),
+        sign=-1
+    ))
+
+
+@receiver(pre_save, sender=Requerimento)
+def requerimento_resumo_pre_save(sender, instance, raw=False, **kwargs):
+    """Remember the stored precatório of a requerimento saved without a snapshot"""
+    if not raw:
+        _remember_stored_precatorio(instance, ['precatorio_id'])
+
+
+@receiver(post_save, sender=Requerimento)
+def requerimento_resumo_post_save(sender, instance, created, raw=False, **kwargs):
+    """Count a new requerimento, or move it when its precatório changed"""
+    if raw:
+        return
+    resumos = PrecatorioResumo.objects
+    if created:
+        resumos.filter(precatorio_id=instance.precatorio_id).increment(quantidade_requerimentos=1)
+    elif not instance.has_loaded_values(['precatorio_id']):
+        _rebuild_stored_and_current(instance)
+    elif instance.get_loaded_value('precatorio_id') != instance.precatorio_id:
+        resumos.filter(precatorio_id=instance.get_loaded_value('precatorio_id')).increment(quantidade_requerimentos=-1)
+        resumos.filter(precatorio_id=instance.precatorio_id).increment(quantidade_requerimentos=1)
+    instance.remember_loaded_values(['precatorio_id'])
+
+
+@receiver(post_delete, sender=Requerimento)
+def requerimento_resumo_post_delete(sender, instance, **kwargs):
+    """Uncount a deleted requerimento"""
+    PrecatorioResumo.objects.filter(
+        precatorio_id=instance.get_loaded_value('precatorio_id', instance.precatorio_id)
+    ).increment(quantidade_requerimentos=-1)
+
+
+@receiver(post_save, sender=Recebimentos)
+def recebimento_resumo_post_save(sender, instance, created, raw=False, **kwargs):
+    """Apply the difference made by a recebimento save to the precatório summaries"""
+    if raw:
+        return
+    resumos = PrecatorioResumo.objects
+    if created:
+        resumos.filter(precatorio__alvara=instance.alvara_id).increment(total_recebido=instance.valor)
+    elif not instance.has_loaded_values(['alvara_id', 'valor']):
+        PrecatorioResumo.rebuild(
+            cnjs=Alvara.objects.filter(pk=instance.alvara_id).values_list('precatorio_id', flat=True)
+        )
+    else:
+        antigo_alvara = instance.get_loaded_value('alvara_id')
+        antigo_valor = instance.get_loaded_value('valor') or 0
+        if antigo_alvara == instance.alvara_id:
+            resumos.filter(precatorio__alvara=instance.alvara_id).increment(
+                total_recebido=instance.valor - antigo_valor
+            )
+        else:
+            resumos.filter(precatorio__alvara=antigo_alvara).increment(total_recebido=-antigo_valor)
+            resumos.filter(precatorio__alvara=instance.alvara_id).increment(total_recebido=instance.valor)
+    instance.remember_loaded_values(['alvara_id', 'valor'])
+
+
+@receiver(post_delete, sender=Recebimentos)
+def recebimento_resumo_post_delete(sender, instance, **kwargs):
+    """Remove a deleted recebimento from its precatório summary"""
+    PrecatorioResumo.objects.filter(
+        precatorio__alvara=instance.get_loaded_value('alvara_id', instance.alvara_id)
+    ).increment(total_recebido=-instance.get_loaded_value('valor', instance.valor))
+
+
+@receiver(m2m_changed, sender=Precatorio.clientes.through)
+def precatorio_clientes_resumo_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recount the clients of the precatórios whose clientes relationship changed"""
+    if reverse and action == 'pre_clear':
+        # After the clear the client no longer knows its precatórios
+        instance._resumo_precatorios = list(instance.precatorios.values_list('cnj', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    
+    if not reverse:
+        cnjs = [instance.pk]
+    elif action == 'post_clear':
+        cnjs = getattr(instance, '_resumo_precatorios', [])
+    else:
+        cnjs = list(pk_set or [])
+    if cnjs:
+        PrecatorioResumo.objects.filter(precatorio_id__in=cnjs).refresh_clientes()
+
+
+@receiver(pre_delete, sender=Cliente)
+def cliente_resumo_pre_delete(sender, instance, **kwargs):
+    """Remember the precatórios of a client being deleted (the cascade sends no m2m_changed)"""
+    instance._resumo_precatorios = list(instance.precatorios.values_list('cnj', flat=True))
+
+
+@receiver(post_delete, sender=Cliente)
+def cliente_resumo_post_delete(sender, instance, **kwargs):
+    """Recount the clients of the precatórios a deleted client was linked to"""
+    cnjs = getattr(instance, '_resumo_precatorios', [])
+    if cnjs:
+        PrecatorioResumo.objects.filter(precatorio_id__in=cnjs).refresh_clientes()
@@ -0,0 +1,243 @@
+"""
+Keyset (cursor) pagination for the main list views
+
+Django's Paginator pages with OFFSET and runs COUNT(*) over the filtered
+queryset on every request, so deep pages and large filters get slower
+linearly. CursorPaginator instead filters on the ordering key of the last
+(or first) row shown, which lets the database seek straight to the page
+through the ordering index, and the total shown in the header comes from a
+short-lived cache.
+
+Cursor mode is optional: list views keep the numbered OFFSET pagination
+unless the request asks for ?paginacao=cursor or settings.LIST_PAGINATION_MODE
+is 'cursor'. Next/previous links carry an opaque, signed ?cursor= token.
+"""
+
+import hashlib
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+
+PAGINATION_MODE_PARAM = 'paginacao'
+CURSOR_PARAM = 'cursor'
+CURSOR_MODE = 'cursor'
+OFFSET_MODE = 'offset'
+CURSOR_SALT = 'precapp.pagination.cursor'
+
+
+def get_count_cache_timeout():
+    """Seconds a cached total count stays valid (settings.PAGINATION_COUNT_CACHE_SECONDS)"""
+    return getattr(settings, 'PAGINATION_COUNT_CACHE_SECONDS', 60)
+
+
+def is_cursor_mode(request):
+    """
+    Tell whether a list request should use cursor pagination.
+
+    ?paginacao=cursor or ?paginacao=offset decide per request; otherwise
+    settings.LIST_PAGINATION_MODE ('offset' by default) applies.
+    """
+    mode = request.GET.get(PAGINATION_MODE_PARAM, '').strip().lower()
+    if mode not in (CURSOR_MODE, OFFSET_MODE):
+        mode = getattr(settings, 'LIST_PAGINATION_MODE', OFFSET_MODE)
+    return mode == CURSOR_MODE
+
+
+def cached_count(queryset):
+    """
+    Count a queryset, caching the result per SQL statement.
+
+    The total is approximate in the sense that it may be up to
+    PAGINATION_COUNT_CACHE_SECONDS old; the same filters hit the cache while
+    the user moves between pages.
+
+    Args:
+        queryset (QuerySet): Filtered queryset
+
+    Returns:
+        int: Number of rows
+    """
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+
+    digest = hashlib.md5(f'{sql}|{params!r}'.encode('utf-8')).hexdigest()
+    key = f'precapp:pagination:count:{digest}'
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, get_count_cache_timeout())
+    return count
+
+
+class CursorPage(Sequence):
+    """One page of a CursorPaginator, iterable like django.core.paginator.Page"""
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset paginator over a queryset ordered by a unique key.
+
+    The ordering must end in a unique, non-null field (e.g. ('nome', 'cpf')
+    or ('-data_criacao', '-id')) so every row has a distinct position.
+    Cursors encode the ordering values of the boundary row and the
+    direction; they are signed, so a tampered or foreign token simply
+    yields the first page.
+
+    Args:
+        queryset (QuerySet): Filtered queryset (any ordering is replaced)
+        per_page (int): Rows per page
+        ordering (tuple): Field names with optional '-' prefix
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.model = queryset.model
+        self.fields = [
+            (self.model._meta.get_field(name.lstrip('-')), name.startswith('-'))
+            for name in self.ordering
+        ]
+
+    @property
+    def count(self):
+        """Total rows of the queryset (cached, see cached_count)"""
+        if not hasattr(self, '_count'):
+            self._count = cached_count(self.queryset)
+        return self._count
+
+    def encode_cursor(self, obj, direction):
+        """Build the token pointing after (direction 'n') or before ('p') obj"""
+        values = [field.value_to_string(obj) for field, _ in self.fields]
+        return signing.dumps({'o': list(self.ordering), 'v': values, 'd': direction}, salt=CURSOR_SALT)
+
+    def decode_cursor(self, token):
+        """
+        Decode a cursor token.
+
+        Returns:
+            tuple: (values, direction) or (None, None) for a missing,
+                   invalid or foreign token
+        """
+        if not token:
+            return None, None
+        try:
+            payload = signing.loads(token, salt=CURSOR_SALT)
+            if payload.get('o') != list(self.ordering) or payload.get('d') not in ('n', 'p'):
+                return None, None
+            values = [field.to_python(raw) for (field, _), raw in zip(self.fields, payload['v'])]
+        except (signing.BadSignature, ValidationError, AttributeError, TypeError, ValueError):
+            return None, None
+        if len(values) != len(self.fields):
+            return None, None
+        return values, payload['d']
+
+    def keyset_filter(self, values, forward):
+        """
+        Lexicographic "comes after/before values" condition on the ordering.
+
+        For ordering (a, b) and forward paging this is
+        a > va OR (a = va AND b > vb), with > and < swapped for descending
+        fields and for backward paging.
+        """
+        condition = Q()
+        equal = {}
+        for (field, descending), value in zip(self.fields, values):
+            lookup = 'gt' if forward != descending else 'lt'
+            condition |= Q(**equal, **{f'{field.name}__{lookup}': value})
+            equal[field.name] = value
+        return condition
+
+    def get_page(self, token=None):
+        """
+        Return the page addressed by token (the first page when token is empty or invalid).
+
+        Fetches per_page + 1 rows to know whether another page follows, so
+        each page costs one query plus the cached count.
+        """
+        values, direction = self.decode_cursor(token)
+        forward = direction != 'p'
+
+        if forward:
+            ordering = self.ordering
+        else:
+            ordering = tuple(name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering)
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.keyset_filter(values, forward))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        if not rows:
+            return CursorPage([], self)
+
+        if forward:
+            has_next, has_previous = has_more, values is not None
+        else:
+            has_next, has_previous = True, has_more
+
+        return CursorPage(
+            rows,
+            self,
+            next_cursor=self.encode_cursor(rows[-1], 'n') if has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], 'p') if has_previous else None,
+        )
+
+
+def paginate_queryset(request, queryset, per_page, cursor_ordering, page_param='page'):
+    """
+    Paginate a list view queryset in OFFSET or cursor mode.
+
+    Args:
+        request (HttpRequest): Current request (reads page/cursor/paginacao)
+        queryset (QuerySet): Filtered queryset
+        per_page (int): Rows per page
+        cursor_ordering (tuple): Unique ordering used in cursor mode
+        page_param (str): GET parameter holding the page number in OFFSET mode
+
+    Returns:
+        tuple: (paginator, page_obj, cursor_mode)
+    """
+    if is_cursor_mode(request):
+        paginator = CursorPaginator(queryset, per_page, cursor_ordering)
+        return paginator, paginator.get_page(request.GET.get(CURSOR_PARAM)), True
+
+    paginator = Paginator(queryset, per_page)
+    return paginator, paginator.get_page(request.GET.get(page_param)), False
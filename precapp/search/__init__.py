@@ -0,0 +1,29 @@
+"""
+Search package for Django Precatorios application
+
+This package provides the indexed text search used by the list filters:
+- Accent- and case-insensitive normalization for the *_busca columns
+- Q builders that produce lookups the search indexes can serve
+- PostgreSQL pg_trgm GIN index management (no-op on SQLite)
+- Ranked global search across all entities within a latency budget
+"""
+
+from .text import normalize_search_text, text_search_q, code_search_q
+from .indexes import TrigramIndex, create_trigram_indexes, drop_trigram_indexes
+from .unified import global_search, MIN_QUERY_LENGTH
+
+__all__ = [
+    # Normalization and lookups
+    'normalize_search_text',
+    'text_search_q',
+    'code_search_q',
+    
+    # Indexes
+    'TrigramIndex',
+    'create_trigram_indexes',
+    'drop_trigram_indexes',
+    
+    # Global search
+    'global_search',
+    'MIN_QUERY_LENGTH',
+]
@@ -0,0 +1,69 @@
+"""
+pg_trgm GIN indexes for the search columns
+
+Trigram GIN indexes let PostgreSQL answer LIKE '%term%' filters with an
+index scan instead of a sequential scan. They only exist on PostgreSQL: on
+SQLite (local development and tests) the helpers below do nothing and the
+same queries run as plain scans, which is fine at that scale.
+
+The helpers are meant for RunPython operations in migrations, where the
+vendor of the connection is only known at migrate time.
+"""
+
+from collections import namedtuple
+
+
+TrigramIndex = namedtuple('TrigramIndex', ['name', 'model', 'expression'])
+TrigramIndex.__doc__ = """
+Trigram index definition.
+
+Attributes:
+    name (str): Index name
+    model (str): Model name in the precapp app (e.g. 'Cliente')
+    expression (str): Indexed column, or SQL expression such as 'UPPER("descricao")'
+                      for columns still filtered with __icontains
+"""
+
+
+def _is_postgresql(schema_editor):
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+def create_trigram_indexes(apps, schema_editor, indexes):
+    """
+    Create the pg_trgm extension and the given GIN indexes (PostgreSQL only).
+
+    Args:
+        apps: Historical app registry passed to RunPython
+        schema_editor: Schema editor passed to RunPython
+        indexes (iterable): TrigramIndex definitions
+    """
+    if not _is_postgresql(schema_editor):
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index in indexes:
+        table = apps.get_model('precapp', index.model)._meta.db_table
+        expression = index.expression
+        if expression.isidentifier():
+            expression = schema_editor.quote_name(expression)
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {schema_editor.quote_name(index.name)} '
+            f'ON {schema_editor.quote_name(table)} USING gin (({expression}) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor, indexes):
+    """
+    Drop the given GIN indexes (PostgreSQL only); the extension is left installed.
+
+    Args:
+        apps: Historical app registry passed to RunPython
+        schema_editor: Schema editor passed to RunPython
+        indexes (iterable): TrigramIndex definitions
+    """
+    if not _is_postgresql(schema_editor):
+        return
+
+    for index in indexes:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(index.name)}')
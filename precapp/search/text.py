@@ -0,0 +1,66 @@
+"""
+Text normalization and lookups for indexed search
+
+Names and court descriptions are searched through normalized shadow
+columns (Cliente.nome_busca, Precatorio.origem_busca) that hold the value
+without accents, casefolded and with collapsed whitespace. Filtering them
+with a plain LIKE '%term%' (Django's __contains) on the normalized term is
+accent-insensitive on every database and, on PostgreSQL, is served by the
+pg_trgm GIN indexes, which cannot be used by __icontains' UPPER(...) LIKE.
+"""
+
+import unicodedata
+
+from django.db.models import Q
+
+
+def normalize_search_text(value):
+    """
+    Normalize text for accent- and case-insensitive search.
+
+    Args:
+        value: Text to normalize (None becomes '')
+
+    Returns:
+        str: Text without diacritics, casefolded, single-spaced
+
+    Example:
+        >>> normalize_search_text('  JOSÉ  da Conceição ')
+        'jose da conceicao'
+    """
+    if value is None:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(text.casefold().split())
+
+
+def text_search_q(field, term):
+    """
+    Build an accent-insensitive substring filter on a normalized column.
+
+    Args:
+        field (str): Lookup path of a *_busca column (e.g. 'cliente__nome_busca')
+        term (str): Text typed by the user
+
+    Returns:
+        Q: field contains the normalized term
+    """
+    return Q(**{f'{field}__contains': normalize_search_text(term)})
+
+
+def code_search_q(field, term):
+    """
+    Build a substring filter on an identifier column (CNJ, CPF/CNPJ, document number).
+
+    Identifiers are digits and punctuation, so no case folding is needed and
+    the plain LIKE can use the column's trigram index on PostgreSQL.
+
+    Args:
+        field (str): Lookup path of the identifier column (e.g. 'precatorio__cnj')
+        term (str): Text typed by the user
+
+    Returns:
+        Q: field contains the stripped term
+    """
+    return Q(**{f'{field}__contains': term.strip()})
@@ -0,0 +1,266 @@
+"""
+Global search across precatórios, clientes, requerimentos, alvarás and recebimentos
+
+Each entity is queried with the indexed lookups of this package (normalized
+*_busca columns and trigram-indexed identifiers), ranked in the database
+(exact match > prefix > substring) and capped to a few rows, so the whole
+search costs one small query per entity. Entities are searched in order
+until the latency budget is spent; the rest are reported as skipped. On
+PostgreSQL every query also runs under a statement_timeout equal to the
+remaining budget.
+
+Models are imported inside the functions because precapp.models itself
+imports this package for normalize_search_text.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.urls import reverse
+
+from .text import code_search_q, normalize_search_text, text_search_q
+
+
+MIN_QUERY_LENGTH = 3  # Trigram indexes need at least three characters
+
+RANK_EXACT = 3
+RANK_PREFIX = 2
+RANK_SUBSTRING = 1
+
+
+def get_search_limit():
+    """Results returned per entity (settings.GLOBAL_SEARCH_LIMIT)"""
+    return getattr(settings, 'GLOBAL_SEARCH_LIMIT', 5)
+
+
+def get_search_max_limit():
+    """Upper bound for the per-entity limit a request may ask for (settings.GLOBAL_SEARCH_MAX_LIMIT)"""
+    return getattr(settings, 'GLOBAL_SEARCH_MAX_LIMIT', 20)
+
+
+def get_search_budget_ms():
+    """Latency budget of one global search in milliseconds (settings.GLOBAL_SEARCH_BUDGET_MS)"""
+    return getattr(settings, 'GLOBAL_SEARCH_BUDGET_MS', 500)
+
+
+def _rank(exact, prefix):
+    """Database-side rank: RANK_EXACT when exact matches, RANK_PREFIX when prefix matches"""
+    return Case(
+        When(exact, then=Value(RANK_EXACT)),
+        When(prefix, then=Value(RANK_PREFIX)),
+        default=Value(RANK_SUBSTRING),
+        output_field=IntegerField(),
+    )
+
+
+def _document_digits(term):
+    """Digits of a CPF/CNPJ typed with or without punctuation"""
+    return re.sub(r'\D', '', term)
+
+
+def search_precatorios(term, limit):
+    """Precatórios by CNJ or origem"""
+    from ..models import Precatorio
+
+    cnj = term.strip()
+    origem = normalize_search_text(term)
+    precatorios = Precatorio.objects.filter(
+        code_search_q('cnj', cnj) | text_search_q('origem_busca', origem)
+    ).annotate(
+        rank=_rank(Q(cnj=cnj), Q(cnj__startswith=cnj) | Q(origem_busca__startswith=origem))
+    ).order_by('-rank', 'cnj').only('cnj', 'origem')[:limit]
+
+    return [
+        {
+            'tipo': 'precatorio',
+            'id': precatorio.cnj,
+            'titulo': precatorio.cnj,
+            'subtitulo': precatorio.origem,
+            'url': reverse('precatorio_detalhe', args=[precatorio.cnj]),
+            'rank': precatorio.rank,
+        }
+        for precatorio in precatorios
+    ]
+
+
+def search_clientes(term, limit):
+    """Clientes by nome (accent-insensitive) or CPF/CNPJ (with or without punctuation)"""
+    from ..models import Cliente
+
+    nome = normalize_search_text(term)
+    digits = _document_digits(term)
+    condition = text_search_q('nome_busca', nome)
+    exact, prefix = Q(nome_busca=nome), Q(nome_busca__startswith=nome)
+    if digits:
+        condition |= code_search_q('cpf', digits)
+        exact |= Q(cpf=digits)
+        prefix |= Q(cpf__startswith=digits)
+
+    clientes = Cliente.objects.filter(condition).annotate(
+        rank=_rank(exact, prefix)
+    ).order_by('-rank', 'nome_busca', 'cpf').only('cpf', 'nome')[:limit]
+
+    return [
+        {
+            'tipo': 'cliente',
+            'id': cliente.cpf,
+            'titulo': cliente.nome,
+            'subtitulo': cliente.cpf,
+            'url': reverse('cliente_detail', args=[cliente.cpf]),
+            'rank': cliente.rank,
+        }
+        for cliente in clientes
+    ]
+
+
+def search_requerimentos(term, limit):
+    """Requerimentos by their own CNJ"""
+    from ..models import Requerimento
+
+    cnj = term.strip()
+    requerimentos = Requerimento.objects.filter(code_search_q('cnj', cnj)).annotate(
+        rank=_rank(Q(cnj=cnj), Q(cnj__startswith=cnj))
+    ).select_related('cliente', 'pedido').only(
+        'id', 'cnj', 'precatorio_id', 'cliente__nome', 'pedido__nome'
+    ).order_by('-rank', '-id')[:limit]
+
+    return [
+        {
+            'tipo': 'requerimento',
+            'id': requerimento.id,
+            'titulo': requerimento.cnj,
+            'subtitulo': f'{requerimento.pedido.nome if requerimento.pedido else "Requerimento"} - {requerimento.cliente.nome}',
+            'url': reverse('precatorio_detalhe', args=[requerimento.precatorio_id]),
+            'rank': requerimento.rank,
+        }
+        for requerimento in requerimentos
+    ]
+
+
+def search_alvaras(term, limit):
+    """Alvarás by precatório CNJ or cliente nome"""
+    from ..models import Alvara
+
+    cnj = term.strip()
+    nome = normalize_search_text(term)
+    alvaras = Alvara.objects.filter(
+        code_search_q('precatorio__cnj', cnj) | text_search_q('cliente__nome_busca', nome)
+    ).annotate(
+        rank=_rank(
+            Q(precatorio__cnj=cnj) | Q(cliente__nome_busca=nome),
+            Q(precatorio__cnj__startswith=cnj) | Q(cliente__nome_busca__startswith=nome)
+        )
+    ).select_related('cliente').only(
+        'id', 'tipo', 'precatorio_id', 'cliente__nome'
+    ).order_by('-rank', '-id')[:limit]
+
+    return [
+        {
+            'tipo': 'alvara',
+            'id': alvara.id,
+            'titulo': f'Alvará #{alvara.id} - {alvara.tipo}',
+            'subtitulo': f'{alvara.cliente.nome} - {alvara.precatorio_id}',
+            'url': reverse('precatorio_detalhe', args=[alvara.precatorio_id]),
+            'rank': alvara.rank,
+        }
+        for alvara in alvaras
+    ]
+
+
+def search_recebimentos(term, limit):
+    """Recebimentos by número do documento (stored with letters and digits only)"""
+    from ..models import Recebimentos
+
+    numero = re.sub(r'[^A-Za-z0-9]', '', term)
+    if not numero:
+        return []
+
+    recebimentos = Recebimentos.objects.filter(numero_documento__icontains=numero).annotate(
+        rank=_rank(Q(numero_documento__iexact=numero), Q(numero_documento__istartswith=numero))
+    ).only('numero_documento', 'tipo', 'valor', 'data').order_by('-rank', '-data')[:limit]
+
+    return [
+        {
+            'tipo': 'recebimento',
+            'id': recebimento.numero_documento,
+            'titulo': recebimento.numero_documento,
+            'subtitulo': f'{recebimento.tipo} - R$ {recebimento.valor:,.2f} em {recebimento.data:%d/%m/%Y}',
+            'url': reverse('editar_recebimento', args=[recebimento.numero_documento]),
+            'rank': recebimento.rank,
+        }
+        for recebimento in recebimentos
+    ]
+
+
+SEARCHERS = [
+    ('precatorios', search_precatorios),
+    ('clientes', search_clientes),
+    ('requerimentos', search_requerimentos),
+    ('alvaras', search_alvaras),
+    ('recebimentos', search_recebimentos),
+]
+
+
+@contextmanager
+def statement_timeout(milliseconds):
+    """
+    Bound the queries of the block to the given time (PostgreSQL only).
+
+    Uses SET LOCAL inside a transaction, so the timeout ends with the block.
+    On other databases the block runs unbounded.
+    """
+    if connection.vendor != 'postgresql':
+        yield
+        return
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'SET LOCAL statement_timeout = {max(int(milliseconds), 1)}')
+        yield
+
+
+def global_search(term, limit=None, budget_ms=None):
+    """
+    Search all entities for term.
+
+    Args:
+        term (str): Text typed by the user (at least MIN_QUERY_LENGTH characters)
+        limit (int): Results per entity (defaults to GLOBAL_SEARCH_LIMIT)
+        budget_ms (float): Latency budget (defaults to GLOBAL_SEARCH_BUDGET_MS)
+
+    Returns:
+        dict: query, results (ranked, each with tipo, id, titulo, subtitulo,
+              url and rank), counts per entity, skipped entities (budget
+              spent or query timed out) and elapsed_ms
+    """
+    limit = get_search_limit() if limit is None else limit
+    budget_ms = get_search_budget_ms() if budget_ms is None else budget_ms
+    term = (term or '').strip()
+
+    response = {'query': term, 'results': [], 'counts': {}, 'skipped': [], 'elapsed_ms': 0.0}
+    if len(term) < MIN_QUERY_LENGTH:
+        return response
+
+    start = time.monotonic()
+    for entity, searcher in SEARCHERS:
+        remaining = budget_ms - (time.monotonic() - start) * 1000
+        if remaining <= 0:
+            response['skipped'].append(entity)
+            continue
+        try:
+            with statement_timeout(remaining):
+                results = searcher(term, limit)
+        except DatabaseError:
+            response['skipped'].append(entity)
+            continue
+        response['counts'][entity] = len(results)
+        response['results'].extend(results)
+
+    # Stable sort: equal ranks keep the entity order of SEARCHERS
+    response['results'].sort(key=lambda result: -result['rank'])
+    response['elapsed_ms'] = round((time.monotonic() - start) * 1000, 1)
+    return response
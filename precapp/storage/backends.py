@@ -1,6 +1,8 @@
 """
 Enhanced S3 Storage Backend for Large File Handling
 Optimized with better multipart upload support and signed URL generation
+
+The S3 calls are timed for the Prometheus metrics (see precapp/metrics.py).
 """
 
 from storages.backends.s3boto3 import S3Boto3Storage
@@ -8,6 +10,8 @@ from django.conf import settings
 from botocore.config import Config
 import logging
 
+from .. import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,7 +42,8 @@ class LargeFileS3Storage(S3Boto3Storage):
             logger.info(f"Starting upload of file: {name}, size: {content.size} bytes")
             
             # Use parent method which handles multipart automatically
-            saved_name = super()._save(name, content)
+            with metrics.storage_timer('save'):
+                saved_name = super()._save(name, content)
             
             logger.info(f"Successfully uploaded file: {saved_name}")
             return saved_name
@@ -47,6 +52,13 @@ class LargeFileS3Storage(S3Boto3Storage):
             logger.error(f"Failed to upload file {name}: {str(e)}")
             raise
     
+    def _open(self, name, mode='rb'):
+        """
+        Open a file, timing the call for the storage metrics
+        """
+        with metrics.storage_timer('open'):
+            return super()._open(name, mode)
+    
     def url(self, name, parameters=None, expire=None, http_method=None):
         """
         Enhanced URL generation with proper signed URLs for private files
@@ -57,11 +69,12 @@ class LargeFileS3Storage(S3Boto3Storage):
                 expire = getattr(settings, 'AWS_QUERYSTRING_EXPIRE', 3600)
             
             # Generate signed URL for private files
-            if getattr(settings, 'AWS_QUERYSTRING_AUTH', True):
-                return super().url(name, parameters=parameters, expire=expire, http_method=http_method)
-            else:
-                # For public files (if ACL is public)
-                return super().url(name)
+            with metrics.storage_timer('url'):
+                if getattr(settings, 'AWS_QUERYSTRING_AUTH', True):
+                    return super().url(name, parameters=parameters, expire=expire, http_method=http_method)
+                else:
+                    # For public files (if ACL is public)
+                    return super().url(name)
                 
         except Exception as e:
             logger.error(f"Failed to generate URL for file {name}: {str(e)}")
@@ -73,7 +86,8 @@ class LargeFileS3Storage(S3Boto3Storage):
         Enhanced exists check with better error handling
         """
         try:
-            return super().exists(name)
+            with metrics.storage_timer('exists'):
+                return super().exists(name)
         except Exception as e:
             logger.error(f"Error checking if file exists {name}: {str(e)}")
             return False
@@ -83,7 +97,8 @@ class LargeFileS3Storage(S3Boto3Storage):
         Enhanced size method with better error handling
         """
         try:
-            return super().size(name)
+            with metrics.storage_timer('size'):
+                return super().size(name)
         except Exception as e:
             logger.error(f"Error getting file size {name}: {str(e)}")
             return 0
@@ -93,7 +108,8 @@ class LargeFileS3Storage(S3Boto3Storage):
         Enhanced delete method with better error handling
         """
         try:
-            result = super().delete(name)
+            with metrics.storage_timer('delete'):
+                result = super().delete(name)
             logger.info(f"Successfully deleted file: {name}")
             return result
         except Exception as e:
@@ -0,0 +1,121 @@
+"""
+Test cases for the synthetic dataset generator and the benchmark suite
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from precapp.benchmarks import clear_dataset, compare_results, generate_dataset, resolve_scale, run_benchmarks
+from precapp.benchmarks.dataset import synthetic_cnj, synthetic_cpf
+from precapp.forms import validate_cnj, validate_cpf
+from precapp.models import Alvara, Cliente, Precatorio, PrecatorioResumo, Recebimentos, Requerimento
+
+
+class SyntheticDatasetTest(TestCase):
+    """Tests for generate_dataset and clear_dataset"""
+
+    def test_generates_consistent_records(self):
+        created = generate_dataset(30, seed=1, batch_size=10)
+
+        self.assertEqual(created['precatorios'], 30)
+        self.assertEqual(Precatorio.objects.count(), 30)
+        self.assertEqual(Cliente.objects.count(), created['clientes'])
+        self.assertEqual(Alvara.objects.count(), created['alvaras'])
+        self.assertEqual(Recebimentos.objects.count(), created['recebimentos'])
+        self.assertEqual(PrecatorioResumo.objects.count(), 30)
+
+        # Alvarás and requerimentos belong to a cliente of their precatório
+        for model in (Alvara, Requerimento):
+            for record in model.objects.select_related('precatorio'):
+                self.assertTrue(record.precatorio.clientes.filter(cpf=record.cliente_id).exists())
+
+        cliente = Cliente.objects.first()
+        self.assertTrue(validate_cpf(cliente.cpf))
+        self.assertTrue(cliente.nome_busca)
+
+    def test_identifiers_are_valid(self):
+        for index in (0, 1, 12345):
+            self.assertTrue(validate_cpf(synthetic_cpf(index)))
+            validate_cnj(synthetic_cnj(index))
+
+    def test_same_seed_same_dataset(self):
+        generate_dataset(10, seed=5)
+        first = list(Precatorio.objects.values_list('cnj', 'valor_de_face'))
+        clear_dataset()
+        generate_dataset(10, seed=5)
+        self.assertEqual(list(Precatorio.objects.values_list('cnj', 'valor_de_face')), first)
+
+    def test_grows_and_clears_only_synthetic_records(self):
+        real = Cliente.objects.create(cpf='12345678909', nome='Cliente Real', prioridade=False)
+        generate_dataset(5, seed=1)
+        generate_dataset(5, seed=1)
+        self.assertEqual(Precatorio.objects.count(), 10)
+
+        deleted = clear_dataset()
+        self.assertEqual(deleted['precatorios'], 10)
+        self.assertFalse(Precatorio.objects.exists())
+        self.assertEqual(list(Cliente.objects.all()), [real])
+
+    def test_resolve_scale(self):
+        self.assertEqual(resolve_scale('10k'), 10000)
+        self.assertEqual(resolve_scale('250'), 250)
+        with self.assertRaises(ValueError):
+            resolve_scale('enorme')
+
+    @override_settings(ENVIRONMENT='production')
+    def test_command_refuses_production(self):
+        with self.assertRaises(CommandError):
+            call_command('generate_synthetic_data', '--scale', '5', stdout=StringIO())
+
+
+class BenchmarkSuiteTest(TestCase):
+    """Tests for run_benchmarks and the run_benchmarks command"""
+
+    def setUp(self):
+        generate_dataset(15, seed=3)
+
+    def test_results_per_case(self):
+        results = run_benchmarks(
+            cases=['clientes', 'precatorio_detalhe', 'export_clientes', 'import_excel_bulk'],
+            repeat=1, warmup=0, import_rows=5,
+        )
+
+        self.assertEqual(results['dataset']['precatorios'], 15)
+        self.assertEqual(results['results']['clientes']['status'], 200)
+        self.assertGreater(results['results']['clientes']['queries'], 0)
+        self.assertEqual(results['results']['precatorio_detalhe']['status'], 200)
+        self.assertGreater(results['results']['export_clientes']['rows'], 0)
+        self.assertIn('median_ms', results['results']['import_excel_bulk'])
+
+        # The import is rolled back
+        self.assertEqual(Precatorio.objects.count(), 15)
+        json.dumps(results)
+
+    def test_compare_results(self):
+        baseline = {'results': {'clientes': {'median_ms': 10.0}, 'home': {'median_ms': 5.0}}}
+        current = {'results': {'clientes': {'median_ms': 25.0}, 'alvaras': {'median_ms': 1.0}}}
+        self.assertEqual(compare_results(baseline, current), [('clientes', 10.0, 25.0, 2.5)])
+
+    def test_command_writes_json_and_fails_on_regression(self):
+        handle, path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+
+        call_command('run_benchmarks', '--case', 'home', '--repeat', '1', '--warmup', '0',
+                     '--output', path, stderr=StringIO())
+        with open(path) as source:
+            results = json.load(source)
+        self.assertIn('home', results['results'])
+
+        results['results']['home']['median_ms'] = 0.0001
+        with open(path, 'w') as target:
+            json.dump(results, target)
+        with self.assertRaises(CommandError):
+            call_command('run_benchmarks', '--case', 'home', '--repeat', '1', '--warmup', '0',
+                         '--compare', path, '--fail-above', '1.5', stdout=StringIO(), stderr=StringIO())
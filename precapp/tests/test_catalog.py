@@ -0,0 +1,143 @@
+"""
+Test cases for the process-local catalog cache and the form fields built on it
+"""
+
+from django.test import TestCase, override_settings
+
+from precapp import catalog
+from precapp.catalog import CATALOG_VERSION_KEY, get_catalog_cache, invalidate_catalog
+from precapp.forms import AlvaraSimpleForm, RequerimentoForm
+from precapp.models import Fase, FaseHonorariosContratuais, PedidoRequerimento, TipoDiligencia
+
+
+@override_settings(CATALOG_VERSION_CHECK_SECONDS=0)
+class CatalogCacheTest(TestCase):
+    """Tests for catalog.py and the invalidation receivers"""
+
+    def setUp(self):
+        invalidate_catalog()  # Snapshots of earlier tests refer to rolled back rows
+        self.fase_alvara = Fase.objects.create(nome='Depositado', tipo='alvara', ativa=True, ordem=2)
+        self.fase_ambos = Fase.objects.create(nome='Aguardando', tipo='ambos', ativa=True, ordem=1)
+        self.fase_requerimento = Fase.objects.create(nome='Deferido', tipo='requerimento', ativa=True)
+        self.fase_inativa = Fase.objects.create(nome='Arquivada', tipo='ambos', ativa=False)
+
+    def test_served_from_memory(self):
+        with self.assertNumQueries(1):
+            fases = catalog.fases_for_alvara()
+        self.assertEqual(fases, [self.fase_ambos, self.fase_alvara])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(catalog.fases_for_requerimento(), [self.fase_requerimento, self.fase_ambos])
+            self.assertEqual(catalog.fases_for_alvara(), fases)
+
+    def test_matches_model_classmethods(self):
+        FaseHonorariosContratuais.objects.create(nome='Pago', ativa=True)
+        FaseHonorariosContratuais.objects.create(nome='Antiga', ativa=False)
+        TipoDiligencia.objects.create(nome='Ligação', ativo=True)
+
+        self.assertEqual(catalog.fases_for_alvara(), list(Fase.get_fases_for_alvara()))
+        self.assertEqual(catalog.fases_honorarios_contratuais(), list(FaseHonorariosContratuais.get_fases_ativas()))
+        self.assertEqual(len(catalog.fases_honorarios_contratuais(active_only=False)), 2)
+        self.assertEqual(catalog.tipos_diligencia_ativos(), list(TipoDiligencia.get_ativos()))
+
+    def test_save_and_delete_invalidate(self):
+        catalog.fases_for_alvara()
+
+        nova = Fase.objects.create(nome='Nova', tipo='alvara', ativa=True, ordem=9)
+        self.assertIn(nova, catalog.fases_for_alvara())
+
+        self.fase_alvara.ativa = False
+        self.fase_alvara.save()
+        self.assertNotIn(self.fase_alvara, catalog.fases_for_alvara())
+
+        nova.delete()
+        self.assertEqual(catalog.fases_for_alvara(), [self.fase_ambos])
+
+    def test_invalidation_by_another_process(self):
+        """Test that a new token in the shared cache makes this process reload"""
+        catalog.fases_for_alvara()
+        Fase.objects.filter(pk=self.fase_alvara.pk).update(ativa=False)  # No signal
+
+        with self.assertNumQueries(0):
+            self.assertIn(self.fase_alvara, catalog.fases_for_alvara())
+
+        get_catalog_cache().set(CATALOG_VERSION_KEY, 'changed-elsewhere', None)
+        with self.assertNumQueries(1):
+            self.assertNotIn(self.fase_alvara, catalog.fases_for_alvara())
+
+    @override_settings(CATALOG_VERSION_CHECK_SECONDS=3600)
+    def test_token_checked_once_per_interval(self):
+        catalog.fases_for_alvara()
+        get_catalog_cache().set(CATALOG_VERSION_KEY, 'changed-elsewhere', None)
+        with self.assertNumQueries(0):
+            catalog.fases_for_alvara()
+
+    def test_token_replaced_again_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            PedidoRequerimento.objects.create(nome='Prioridade por idade', ativo=True)
+        token = get_catalog_cache().get(CATALOG_VERSION_KEY)
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertNotEqual(get_catalog_cache().get(CATALOG_VERSION_KEY), token)
+
+    def test_pedido_names(self):
+        PedidoRequerimento.objects.create(nome='Prioridade por idade', ativo=True)
+        PedidoRequerimento.objects.create(nome='Acordo no Principal', ativo=True)
+        PedidoRequerimento.objects.create(nome='Prioridade antiga', ativo=False)
+
+        self.assertEqual(catalog.pedido_names_containing('prioridade'), ['Prioridade por idade'])
+        self.assertEqual(catalog.pedido_names_containing('ACORDO'), ['Acordo no Principal'])
+
+
+@override_settings(CATALOG_VERSION_CHECK_SECONDS=0)
+class CatalogChoiceFieldTest(TestCase):
+    """Tests for the form fields whose options come from the catalog cache"""
+
+    def setUp(self):
+        invalidate_catalog()
+        self.fase_alvara = Fase.objects.create(nome='Depositado', tipo='alvara', ativa=True)
+        self.fase_requerimento = Fase.objects.create(nome='Deferido', tipo='requerimento', ativa=True)
+        self.fase_inativa = Fase.objects.create(nome='Arquivada', tipo='ambos', ativa=False)
+        self.pedido = PedidoRequerimento.objects.create(nome='Prioridade por idade', ativo=True)
+        self.honorarios = FaseHonorariosContratuais.objects.create(nome='Pago', ativa=True)
+
+    def fase_errors(self, fase):
+        form = RequerimentoForm({'pedido': self.pedido.pk, 'fase': fase})
+        form.is_valid()
+        return form, form.errors.get('fase')
+
+    def test_rendering_runs_no_queries(self):
+        for name in catalog.CATALOG_MODELS:
+            catalog.get_snapshot(name)
+
+        with self.assertNumQueries(0):
+            requerimento_html = str(RequerimentoForm()['fase']) + str(RequerimentoForm()['pedido'])
+            alvara_html = ''.join(str(field) for field in AlvaraSimpleForm())
+
+        self.assertIn(f'<option value="{self.fase_requerimento.pk}">Deferido</option>', requerimento_html)
+        self.assertIn(f'<option value="{self.pedido.pk}">Prioridade por idade</option>', requerimento_html)
+        self.assertNotIn('Arquivada', requerimento_html)
+        self.assertIn(f'<option value="{self.honorarios.pk}">Pago</option>', alvara_html)
+        self.assertNotIn('Deferido', alvara_html)
+
+    def test_selected_option(self):
+        form = RequerimentoForm(initial={'fase': self.fase_requerimento.pk})
+        self.assertIn(f'<option value="{self.fase_requerimento.pk}" selected>', str(form['fase']))
+
+    def test_submitted_ids_are_validated(self):
+        form, errors = self.fase_errors(self.fase_requerimento.pk)
+        self.assertIsNone(errors)
+        self.assertEqual(form.cleaned_data['fase'], self.fase_requerimento)
+
+        for fase in [self.fase_alvara.pk, self.fase_inativa.pk, 999999]:
+            self.assertIsNotNone(self.fase_errors(fase)[1], fase)
+
+    def test_validation_is_not_fooled_by_a_stale_snapshot(self):
+        """Test that an option deactivated since the snapshot was taken is rejected"""
+        catalog.fases_for_requerimento()
+        Fase.objects.filter(pk=self.fase_requerimento.pk).update(ativa=False)  # No signal
+
+        form, errors = self.fase_errors(self.fase_requerimento.pk)
+        self.assertIn(f'value="{self.fase_requerimento.pk}"', str(form['fase']))
+        self.assertIsNotNone(errors)
@@ -0,0 +1,360 @@
+"""
+Test cases for the Excel export engine (precapp.exports)
+"""
+
+import io
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from precapp.exports import (
+    StreamingWorkbook, iter_chunked, build_precatorios_report, get_system_statistics,
+    enqueue_export, claim_next_job, run_export_job, process_pending_jobs
+)
+from precapp.models import (
+    Alvara, Cliente, ContaBancaria, Diligencias, ExportJob, Precatorio, Recebimentos, TipoDiligencia
+)
+
+
+class StreamingWorkbookTest(TestCase):
+    """Tests for the write-only workbook wrapper"""
+
+    def _reload(self, workbook):
+        return load_workbook(workbook.save())
+
+    def test_headers_and_rows_are_written(self):
+        """Test that header and data rows end up in the saved file"""
+        workbook = StreamingWorkbook()
+        ws = workbook.create_sheet("Teste", ['A', 'B'], header_color="366092", width=12)
+        workbook.append(ws, ['x', 10])
+        workbook.append(ws, ['y', 20])
+
+        sheet = self._reload(workbook)['Teste']
+        rows = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(rows, [('A', 'B'), ('x', 10), ('y', 20)])
+        self.assertEqual(sheet.column_dimensions['A'].width, 12)
+
+    def test_styles_are_shared(self):
+        """Test that identical style requests reuse the same named style"""
+        workbook = StreamingWorkbook()
+        first = workbook.style(fill="FFF3CD", currency=True)
+        second = workbook.style(fill="FFF3CD", currency=True)
+        other = workbook.style(fill="F8D7DA")
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_cell_formatting(self):
+        """Test that named styles carry number format, fill and font"""
+        workbook = StreamingWorkbook()
+        ws = workbook.create_sheet("Teste", ['Valor'], header_color="366092")
+        workbook.append(ws, [1500.5], styles={1: workbook.style(currency=True)})
+
+        sheet = self._reload(workbook)['Teste']
+        header = sheet.cell(row=1, column=1)
+        valor = sheet.cell(row=2, column=1)
+        self.assertTrue(header.font.bold)
+        self.assertEqual(header.fill.start_color.rgb[-6:], '366092')
+        self.assertIn('R$', valor.number_format)
+        self.assertEqual(valor.border.left.style, 'thin')
+
+    def test_response_is_streamed(self):
+        """Test that as_response returns a streaming attachment"""
+        workbook = StreamingWorkbook()
+        workbook.create_sheet("Teste", ['A'], header_color="366092")
+        response = workbook.as_response('teste.xlsx')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="teste.xlsx"')
+        content = b''.join(response.streaming_content)
+        response.close()
+        self.assertEqual(load_workbook(io.BytesIO(content)).sheetnames, ['Teste'])
+
+    def test_row_counts_exclude_headers(self):
+        """Test that appended data rows are counted per sheet"""
+        workbook = StreamingWorkbook()
+        first = workbook.create_sheet("Um", ['A'], header_color="366092")
+        workbook.create_sheet("Dois", ['A'], header_color="366092")
+        workbook.append(first, ['x'])
+        workbook.append(first, ['y'])
+
+        self.assertEqual(workbook.row_counts, {'Um': 2, 'Dois': 0})
+        self.assertEqual(workbook.total_rows, 2)
+
+
+class IterChunkedTest(TestCase):
+    """Tests for chunked queryset iteration"""
+
+    def setUp(self):
+        for i in range(7):
+            Cliente.objects.create(
+                cpf=f'{i + 10000000000:011d}',
+                nome=f'Cliente {i}',
+                nascimento=date(1980, 1, 1),
+                prioridade=False
+            )
+
+    def test_yields_every_row_once_in_order(self):
+        """Test that chunk boundaries neither skip nor repeat rows"""
+        queryset = Cliente.objects.order_by('cpf')
+        cpfs = [c.cpf for c in iter_chunked(queryset, chunk_size=3)]
+        self.assertEqual(cpfs, list(queryset.values_list('cpf', flat=True)))
+
+    def test_one_query_per_chunk(self):
+        """Test that each chunk is fetched with a single query, without OFFSET"""
+        queryset = Cliente.objects.order_by('cpf')
+        # The primary keys, then 3 chunks
+        with self.assertNumQueries(4):
+            list(iter_chunked(queryset, chunk_size=3))
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_prefetch_is_resolved_per_chunk(self):
+        """Test that prefetched relations are available without extra queries"""
+        precatorio = Precatorio.objects.create(
+            cnj='0000001-00.2023.8.26.0001', origem='Teste', valor_de_face=1000
+        )
+        precatorio.clientes.add(*Cliente.objects.all())
+
+        queryset = Cliente.objects.prefetch_related('precatorios').order_by('cpf')
+        # The primary keys, 4 chunks of clientes and one prefetch query per chunk
+        with self.assertNumQueries(9):
+            counts = [len(c.precatorios.all()) for c in iter_chunked(queryset)]
+        self.assertEqual(counts, [1] * 7)
+
+
+class PrecatoriosReportTest(TestCase):
+    """Tests for the complete system report builder"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='relatorio', password='x')
+
+    def test_first_client_is_lowest_cpf(self):
+        """Test that the Precatórios sheet shows the client with the lowest pk"""
+        precatorio = Precatorio.objects.create(
+            cnj='0000002-00.2023.8.26.0001', origem='Teste', valor_de_face=1000
+        )
+        for cpf, nome in [('22222222222', 'Segundo'), ('11111111111', 'Primeiro')]:
+            precatorio.clientes.add(Cliente.objects.create(cpf=cpf, nome=nome, prioridade=False))
+
+        sheet = load_workbook(build_precatorios_report(self.user).save())['Precatórios']
+        row = [cell.value for cell in sheet[2]]
+        self.assertEqual(row[8], 'Primeiro')
+        self.assertEqual(row[9], '11111111111')
+
+    def test_clientes_sheet_uses_annotations(self):
+        """Test that the Clientes sheet counters come from the annotated queryset"""
+        tipo = TipoDiligencia.objects.create(nome='Documentos')
+        for i in range(3):
+            cliente = Cliente.objects.create(cpf=f'{i + 60000000000:011d}', nome=f'Cliente {i}', prioridade=False)
+            precatorio = Precatorio.objects.create(
+                cnj=f'000001{i}-00.2023.8.26.0001', origem='Teste',
+                valor_de_face=1000, ultima_atualizacao=100 * (i + 1)
+            )
+            precatorio.clientes.add(cliente)
+            Diligencias.objects.create(
+                cliente=cliente, tipo=tipo, data_final=date(2000, 1, 1), criado_por='Teste', concluida=bool(i)
+            )
+
+        with mock.patch('precapp.exports.reports.iter_chunked', wraps=iter_chunked) as chunked:
+            sheet = load_workbook(build_precatorios_report(self.user).save())['Clientes']
+        clientes_queryset = chunked.call_args_list[1][0][0]
+        self.assertIn('total_diligencias', clientes_queryset.query.annotations)
+
+        rows = [[cell.value for cell in row] for row in sheet.iter_rows(min_row=2)]
+        self.assertEqual([row[4:] for row in rows], [
+            [1, 100, 1, 1, 0],
+            [1, 200, 1, 0, 1],
+            [1, 300, 1, 0, 1],
+        ])
+
+
+class SystemStatisticsTest(TestCase):
+    """Tests for the database-side statistics used by the reports"""
+
+    def setUp(self):
+        self.precatorio = Precatorio.objects.create(
+            cnj='0000003-00.2023.8.26.0001', origem='Teste',
+            valor_de_face=1000, ultima_atualizacao=1500
+        )
+        Precatorio.objects.create(
+            cnj='0000004-00.2023.8.26.0001', origem='Teste', valor_de_face=300
+        )
+        self.cliente = Cliente.objects.create(cpf='33333333333', nome='Cliente', prioridade=True)
+        Cliente.objects.create(cpf='44444444444', nome='Outro', prioridade=False)
+        self.precatorio.clientes.add(self.cliente)
+
+        tipo = TipoDiligencia.objects.create(nome='Documentos')
+        Diligencias.objects.create(
+            cliente=self.cliente, tipo=tipo, data_final=date(2000, 1, 1), criado_por='Teste'
+        )
+        Diligencias.objects.create(
+            cliente=self.cliente, tipo=tipo, data_final=date(2000, 1, 1),
+            criado_por='Teste', concluida=True
+        )
+
+        alvara = Alvara.objects.create(
+            precatorio=self.precatorio, cliente=self.cliente, valor_principal=100,
+            honorarios_contratuais=20, honorarios_sucumbenciais=None,
+            tipo='aguardando depósito'
+        )
+        conta = ContaBancaria.objects.create(banco='Banco', agencia='1', conta='2')
+        Recebimentos.objects.create(
+            numero_documento='REC1', alvara=alvara, data=date(2023, 1, 1),
+            conta_bancaria=conta, valor='10.50', tipo='Hon. contratuais'
+        )
+
+    def test_one_query_per_model(self):
+        """Test that the statistics never scale with the number of rows"""
+        with self.assertNumQueries(6):
+            get_system_statistics()
+
+    def test_values(self):
+        """Test that aggregates match the data and handle nulls"""
+        stats = get_system_statistics()
+
+        self.assertEqual(stats['total_precatorios'], 2)
+        self.assertEqual(stats['valor_total_precatorios'], 1500.0)
+        self.assertEqual(stats['valor_atual_precatorios'], 1800.0)
+        self.assertEqual(stats['clientes_prioritarios'], 1)
+        self.assertEqual(stats['diligencias_pendentes'], 1)
+        self.assertEqual(stats['diligencias_atrasadas'], 1)
+        self.assertEqual(stats['requerimentos_sem_fase'], 0)
+        self.assertEqual(stats['valor_total_requerimentos'], 0.0)
+        self.assertEqual(stats['alvaras_aguardando_deposito'], 1)
+        self.assertEqual(stats['valor_total_alvaras'], 120.0)
+        self.assertEqual(stats['valor_recebimentos_contratuais'], 10.5)
+        self.assertEqual(stats['valor_recebimentos_sucumbenciais'], 0.0)
+
+
+class ExportJobTest(TestCase):
+    """Tests for the database-backed export job queue"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_superuser(
+            username='exportador', password='x', email='exportador@test.com'
+        )
+        precatorio = Precatorio.objects.create(
+            cnj='0000005-00.2023.8.26.0001', origem='Teste', valor_de_face=1000
+        )
+        precatorio.clientes.add(Cliente.objects.create(cpf='55555555555', nome='Cliente', prioridade=False))
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_enqueue_creates_pending_job(self):
+        """Test that enqueueing only records the request"""
+        job = enqueue_export('clientes', self.user)
+        self.assertEqual(job.status, ExportJob.STATUS_PENDENTE)
+        self.assertEqual(job.solicitado_por, self.user)
+        self.assertFalse(job.arquivo)
+
+    def test_enqueue_rejects_unknown_tipo(self):
+        """Test that only known reports can be enqueued"""
+        with self.assertRaises(ValueError):
+            enqueue_export('desconhecido', self.user)
+
+    def test_claim_is_exclusive_and_ordered(self):
+        """Test that jobs are claimed oldest first and only once"""
+        first = enqueue_export('precatorios', self.user)
+        second = enqueue_export('clientes', self.user)
+
+        self.assertEqual(claim_next_job().pk, first.pk)
+        self.assertEqual(claim_next_job().pk, second.pk)
+        self.assertIsNone(claim_next_job())
+        self.assertEqual(ExportJob.objects.get(pk=first.pk).status, ExportJob.STATUS_PROCESSANDO)
+
+    @override_settings(EXPORT_JOB_STALE_SECONDS=600)
+    def test_stale_jobs_are_failed(self):
+        """Test that jobs abandoned by a dead worker are failed before the next claim"""
+        stale = enqueue_export('precatorios', self.user)
+        running = enqueue_export('clientes', self.user)
+        ExportJob.objects.filter(pk=stale.pk).update(
+            status=ExportJob.STATUS_PROCESSANDO, iniciado_em=timezone.now() - timedelta(minutes=11)
+        )
+        ExportJob.objects.filter(pk=running.pk).update(
+            status=ExportJob.STATUS_PROCESSANDO, iniciado_em=timezone.now() - timedelta(minutes=5)
+        )
+
+        self.assertIsNone(claim_next_job())
+        stale.refresh_from_db()
+        running.refresh_from_db()
+        self.assertEqual(stale.status, ExportJob.STATUS_ERRO)
+        self.assertTrue(stale.mensagem_erro)
+        self.assertIsNotNone(stale.concluido_em)
+        self.assertEqual(running.status, ExportJob.STATUS_PROCESSANDO)
+
+    def test_run_stores_file_and_metrics(self):
+        """Test that a finished job has its workbook in storage and run metrics"""
+        enqueue_export('precatorios', self.user)
+        job, = process_pending_jobs()
+
+        self.assertEqual(job.status, ExportJob.STATUS_CONCLUIDO)
+        self.assertTrue(job.nome_arquivo.startswith('relatorio_completo_sistema_'))
+        self.assertEqual(job.linhas_por_planilha['Precatórios'], 1)
+        self.assertEqual(job.linhas_por_planilha['Clientes'], 1)
+        self.assertEqual(job.total_linhas, sum(job.linhas_por_planilha.values()))
+        self.assertIsNotNone(job.duracao_segundos)
+        self.assertGreater(job.pico_memoria_kb, 0)
+        self.assertIsNotNone(job.concluido_em)
+
+        with job.arquivo.open('rb') as f:
+            self.assertIn('Precatórios', load_workbook(f).sheetnames)
+
+    def test_failure_is_recorded(self):
+        """Test that a failing report marks the job as failed instead of raising"""
+        job = enqueue_export('clientes', self.user)
+        claim_next_job()
+        job.refresh_from_db()
+        with mock.patch.dict('precapp.exports.jobs.REPORT_BUILDERS',
+                             {'clientes': (mock.Mock(side_effect=RuntimeError('falhou')), 'x')}):
+            job = run_export_job(job)
+
+        self.assertEqual(job.status, ExportJob.STATUS_ERRO)
+        self.assertEqual(job.mensagem_erro, 'falhou')
+        self.assertFalse(job.arquivo)
+
+    def test_run_finishing_after_stale_sweep_keeps_failure(self):
+        """Test that a run outliving the stale limit does not mark its failed job as finished"""
+        job = enqueue_export('clientes', self.user)
+        claim_next_job()
+        job.refresh_from_db()
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJob.STATUS_ERRO, mensagem_erro='expirou', concluido_em=timezone.now()
+        )
+
+        job = run_export_job(job)
+
+        self.assertEqual(job.status, ExportJob.STATUS_ERRO)
+        self.assertEqual(job.mensagem_erro, 'expirou')
+        self.assertFalse(job.arquivo)
+
+    def test_worker_command_runs_pending_jobs(self):
+        """Test that process_export_jobs --once drains the queue and reports each job"""
+        job = enqueue_export('clientes', self.user)
+        out = io.StringIO()
+        call_command('process_export_jobs', '--once', stdout=out)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.STATUS_CONCLUIDO)
+        self.assertIn(f'Job #{job.pk} (clientes)', out.getvalue())
+
+    def test_delete_removes_file(self):
+        """Test that deleting a job removes its workbook from storage"""
+        enqueue_export('clientes', self.user)
+        job, = process_pending_jobs()
+        storage, name = job.arquivo.storage, job.arquivo.name
+        self.assertTrue(storage.exists(name))
+
+        job.delete()
+        self.assertFalse(storage.exists(name))
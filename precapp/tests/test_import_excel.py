@@ -5,15 +5,20 @@ Tests the functionality of importing Excel files with the 2026 format.
 
 import os
 import tempfile
+from datetime import date, datetime
 from io import StringIO
 from unittest.mock import patch, MagicMock
 
 import pandas as pd
+from openpyxl import Workbook
 from django.test import TestCase
 from django.core.management import call_command
 from django.core.management.base import CommandError
 
-from precapp.models import Tipo, Cliente, Precatorio
+from precapp.management.commands.import_excel import Command, IMPORT_COLUMNS, StreamingSheetReader
+from precapp.models import (
+    Tipo, Cliente, Precatorio, PrecatorioResumo, Fase, ImportCheckpoint, PedidoRequerimento, Requerimento
+)
 
 
 class ImportExcelCommandTest(TestCase):
@@ -768,3 +773,426 @@ class ImportExcelCommandTest(TestCase):
             # Check that no error messages are in output
             output = out.getvalue()
             self.assertNotIn('Invalid', output)
+
+
+class BulkImportExcelCommandTest(TestCase):
+    """Test cases for the set-based import engine (import_excel --bulk)."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.test_tipo = Tipo.objects.create(
+            nome='Test Tipo',
+            descricao='Test description',
+            cor='#007bff',
+            ordem=1,
+            ativa=True
+        )
+
+    def create_test_dataframe(self, rows):
+        """Create a 2026-format DataFrame from (cnj, nome, cpf, valor) tuples."""
+        return pd.DataFrame({
+            'origem': ['Test Origin'] * len(rows),
+            'tipo': ['Test Tipo'] * len(rows),
+            'cnj': [row[0] for row in rows],
+            'orcamento': [2026] * len(rows),
+            'destacado': [0.1] * len(rows),
+            'nome': [row[1] for row in rows],
+            'cpf': [row[2] for row in rows],
+            'nascimento': [None] * len(rows),
+            'valor_face': [row[3] for row in rows],
+        })
+
+    def run_import(self, df, *args):
+        """Run import_excel on a mocked spreadsheet and return the output."""
+        out = StringIO()
+        with patch('precapp.management.commands.import_excel.os.path.exists', return_value=True), \
+                patch('precapp.management.commands.import_excel.pd.ExcelFile') as mock_excel_file, \
+                patch('precapp.management.commands.import_excel.pd.read_excel', return_value=df):
+            mock_excel_file.return_value.sheet_names = ['2026']
+            call_command('import_excel', '--file', 'dummy_file.xlsx', *args, stdout=out)
+        return out.getvalue()
+
+    def snapshot(self):
+        """Return the imported state in a comparable form."""
+        return (
+            list(Precatorio.objects.order_by('cnj').values_list('cnj', 'valor_de_face', 'tipo_id', 'orcamento', 'origem_busca')),
+            list(Cliente.objects.order_by('cpf').values_list('cpf', 'nome', 'prioridade', 'nome_busca')),
+            sorted(Precatorio.clientes.through.objects.values_list('precatorio_id', 'cliente_id')),
+        )
+
+    def test_bulk_matches_row_by_row_import(self):
+        """Test that both engines produce the same records and summary."""
+        rows = [
+            ('1234567-89.2026.8.26.0001', 'João Silva', '123.456.789-09', 10000.0),
+            ('1234567-89.2026.8.26.0002', 'Maria Santos', '98765432100', 15000.0),
+            ('1234567-89.2026.8.26.0002', 'João Silva', '12345678909', 99999.0),  # repeated CNJ
+            ('invalid-cnj', 'Ana Souza', '11144477735', 1000.0),
+            ('1234567-89.2026.8.26.0003', 'CPF Inválido', '11111111112', 5000.0),
+        ]
+        df = self.create_test_dataframe(rows)
+
+        row_output = self.run_import(df.copy())
+        row_state = self.snapshot()
+        Precatorio.objects.all().delete()
+        Cliente.objects.all().delete()
+
+        bulk_output = self.run_import(df.copy(), '--bulk', '--batch-size', '2')
+
+        self.assertEqual(self.snapshot(), row_state)
+        for line in ('Precatorios: 4', 'Clientes: 2', 'Requerimentos: 0'):
+            self.assertIn(line, row_output)
+            self.assertIn(line, bulk_output)
+
+    def test_bulk_keeps_existing_records(self):
+        """Test that existing records and links are neither changed nor duplicated."""
+        precatorio = Precatorio.objects.create(
+            cnj='1234567-89.2026.8.26.0001', origem='Original', valor_de_face=1.0
+        )
+        cliente = Cliente.objects.create(cpf='12345678909', nome='Nome Original', prioridade=True)
+        precatorio.clientes.add(cliente)
+
+        output = self.run_import(self.create_test_dataframe([
+            ('1234567-89.2026.8.26.0001', 'João Silva', '12345678909', 10000.0),
+        ]), '--bulk')
+
+        precatorio.refresh_from_db()
+        cliente.refresh_from_db()
+        self.assertEqual(precatorio.valor_de_face, 1.0)
+        self.assertEqual(cliente.nome, 'Nome Original')
+        self.assertEqual(Precatorio.clientes.through.objects.count(), 1)
+        self.assertIn('Clientes: 0', output)
+
+    def test_bulk_query_count_does_not_scale_with_rows(self):
+        """Test that a batch costs a fixed number of queries."""
+        def queries_for(count):
+            rows = [
+                (f'{i:07d}-89.2026.8.26.0001', f'Cliente {i}', '12345678909', 1000.0)
+                for i in range(count)
+            ]
+            df = self.create_test_dataframe(rows)
+            Precatorio.objects.all().delete()
+            Cliente.objects.all().delete()
+            from django.db import connection
+            from django.test.utils import CaptureQueriesContext
+            with CaptureQueriesContext(connection) as context:
+                self.run_import(df, '--bulk', '--batch-size', '100')
+            return len(context.captured_queries)
+
+        self.assertEqual(queries_for(5), queries_for(50))
+        self.assertEqual(Precatorio.objects.count(), 50)
+        self.assertEqual(Precatorio.clientes.through.objects.count(), 50)
+
+    def test_bulk_rebuilds_only_imported_summaries(self):
+        """Test that the summaries of the imported precatórios are written and others are untouched."""
+        other = Precatorio.objects.create(cnj='1234567-89.2026.8.26.0009', origem='Outro', valor_de_face=1.0)
+        PrecatorioResumo.objects.filter(precatorio=other).delete()
+
+        self.run_import(self.create_test_dataframe([
+            ('1234567-89.2026.8.26.0001', 'João Silva', '12345678909', 10000.0),
+        ]), '--bulk')
+
+        resumo = PrecatorioResumo.objects.get(precatorio_id='1234567-89.2026.8.26.0001')
+        self.assertEqual(resumo.quantidade_clientes, 1)
+        self.assertFalse(PrecatorioResumo.objects.filter(precatorio=other).exists())
+
+    def test_invalid_batch_size(self):
+        """Test that a non-positive batch size is rejected."""
+        with patch('precapp.management.commands.import_excel.os.path.exists', return_value=True):
+            with self.assertRaises(CommandError):
+                call_command('import_excel', '--file', 'dummy_file.xlsx', '--bulk', '--batch-size', '0')
+
+
+class NormalizeDataframeTest(TestCase):
+    """Test cases for the vectorized normalization stage of the bulk importer."""
+
+    MAPPINGS = {key: [key] for key in (
+        'cnj', 'origem', 'orcamento', 'tipo', 'valor_face', 'ultima_atualizacao', 'data_atualizacao',
+        'nome', 'cpf', 'nascimento', 'prioridade', 'pedido', 'desagio',
+    )}
+
+    def normalize(self, data):
+        """Normalize a DataFrame with one column name per mapping key."""
+        command = Command(stdout=StringIO())
+        df = pd.DataFrame(data)
+        clean = command.normalize_dataframe(df, list(df.columns), self.MAPPINGS)
+        return clean, command.stdout.getvalue()
+
+    def test_documents_and_cnj_masks(self):
+        """Test that CNJ, CPF and CNPJ validity match the row validators."""
+        clean, output = self.normalize({
+            'cnj': ['1234567-89.2026.8.26.0001', '1234567-89.1900.8.26.0001',
+                    '1234567-89.2026.8.26.0002', '1234567-89.2026.8.26.0003',
+                    '1234567-89.2026.8.26.0004', None],
+            'nome': ['João', 'Maria', 'Ana', 'Empresa', 'Pedro', 'Sem CNJ'],
+            'cpf': ['123.456.789-09', '12345678909', '111.111.111-11',
+                    '11.222.333/0001-81', '123', '12345678909'],
+        })
+
+        self.assertEqual(list(clean['precatorio_valido']), [True, False, True, True, True, False])
+        self.assertEqual(list(clean['cliente_valido']), [True, False, False, True, False, False])
+        self.assertEqual(clean['cpf'].iloc[3], '11222333000181')
+        self.assertIn('✗ Invalid CNJ: 1234567-89.1900.8.26.0001', output)
+        self.assertIn('✗ Invalid CPF: 11111111111 for client Ana', output)
+        self.assertIn('✗ Invalid document: 123 for client Pedro', output)
+
+    def test_typed_columns(self):
+        """Test numeric, date and default conversions."""
+        clean, _ = self.normalize({
+            'cnj': ['1234567-89.2026.8.26.0001', '1234567-89.2026.8.26.0002'],
+            'origem': [None, '  Vara Cível  '],
+            'orcamento': [2026.0, 'abc'],
+            'valor_face': ['1500.5', None],
+            'nascimento': [pd.Timestamp('1950-03-04'), '1960-12-31'],
+        })
+
+        self.assertEqual(list(clean['origem']), ['Importado da planilha', 'Vara Cível'])
+        self.assertEqual(clean['orcamento'].iloc[0], 2026)
+        self.assertTrue(pd.isna(clean['orcamento'].iloc[1]))
+        self.assertEqual(list(clean['valor_de_face']), [1500.5, 0.0])
+        self.assertEqual(list(clean['ultima_atualizacao']), [1500.5, 0.0])
+        self.assertEqual(list(clean['nascimento']), [date(1950, 3, 4), date(1960, 12, 31)])
+
+
+class ImportCatalogCacheTest(TestCase):
+    """Test cases for the in-memory Tipo and Fase catalogs used during import."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.alimentar = Tipo.objects.create(nome='Alimentar', ordem=1)
+        self.command = Command(stdout=StringIO())
+        self.command.load_catalogs()
+
+    def test_find_tipo_matches_icontains_semantics(self):
+        """Test exact, partial and case-insensitive lookups without queries."""
+        with self.assertNumQueries(0):
+            self.assertEqual(self.command.resolve_tipo('alimentar'), self.alimentar)
+            self.assertEqual(self.command.resolve_tipo('ALIMENT'), self.alimentar)
+        self.assertIsNone(self.command.find_tipo('comum'))
+
+    def test_create_missing_tipos_in_one_insert(self):
+        """Test that unknown tipos are created once, in sheet order."""
+        with self.assertNumQueries(2):
+            self.command.create_missing_tipos(['Comum', 'comum', 'Especial Federal', 'Especial', 'Alimentar'])
+
+        self.assertEqual(
+            sorted(Tipo.objects.values_list('nome', flat=True)),
+            ['Alimentar', 'Comum', 'Especial Federal']
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(self.command.resolve_tipo('Especial').nome, 'Especial Federal')
+
+    def test_default_fase_is_loaded_once(self):
+        """Test that the default fase is resolved from the catalog and cached."""
+        fase = Fase.objects.create(nome='Em Análise', tipo='ambos', ativa=True)
+        self.command.load_catalogs()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.command.get_default_requerimento_fase(), fase)
+            self.assertEqual(self.command.get_default_fase('alvara', nome='Importado', cor='#007BFF'), fase)
+
+    def test_bulk_requerimentos_resolve_pedidos_from_catalog(self):
+        """Test that the bulk engine does not query the pedidos per batch."""
+        PedidoRequerimento.objects.create(nome='Prioridade por idade', cor='#007bff', ordem=1)
+        Fase.objects.create(nome='Em Análise', tipo='ambos', ativa=True)
+        precatorio = Precatorio.objects.create(cnj='1234567-89.2026.8.26.0001', origem='Origem', valor_de_face=1.0)
+        cliente = Cliente.objects.create(cpf='12345678909', nome='João Silva', prioridade=False)
+        precatorio.clientes.add(cliente)
+        self.command.load_catalogs()
+        rows = pd.DataFrame({
+            'cnj': [precatorio.cnj] * 2,
+            'cpf': [cliente.cpf] * 2,
+            'pedido': ['PRIORIDADE POR IDADE', 'Desconhecido'],
+            'valor_de_face': [1000.0] * 2,
+            'desagio': [0.0] * 2,
+        })
+
+        with self.assertNumQueries(1):  # The insert
+            self.assertEqual(self.command.bulk_create_requerimentos(rows, batch_size=100), 1)
+        self.assertEqual(Requerimento.objects.get().pedido.nome, 'Prioridade por idade')
+        self.assertEqual(self.command.row_errors, 1)
+
+    def test_row_import_resolves_tipo_per_sheet(self):
+        """Test that the row-by-row engine does not query Tipo per row."""
+        rows = pd.DataFrame({
+            'origem': ['Origem'] * 3,
+            'tipo': ['Novo Tipo'] * 3,
+            'cnj': [f'123456{i}-89.2026.8.26.0001' for i in range(3)],
+            'orcamento': [2026] * 3,
+            'destacado': [None] * 3,
+            'nome': [None] * 3,
+            'cpf': [None] * 3,
+            'nascimento': [None] * 3,
+            'valor_face': [1000.0] * 3,
+        })
+        output = StringIO()
+        with patch('precapp.management.commands.import_excel.os.path.exists', return_value=True), \
+                patch('precapp.management.commands.import_excel.pd.ExcelFile') as mock_excel_file, \
+                patch('precapp.management.commands.import_excel.pd.read_excel', return_value=rows):
+            mock_excel_file.return_value.sheet_names = ['2026']
+            call_command('import_excel', '--file', 'dummy_file.xlsx', stdout=output)
+
+        tipo = Tipo.objects.get(nome='Novo Tipo')
+        self.assertEqual(Precatorio.objects.filter(tipo=tipo).count(), 3)
+        self.assertEqual(output.getvalue().count('Tipo "Novo Tipo" not found'), 1)
+
+
+class ChunkedImportExcelCommandTest(TestCase):
+    """Test cases for chunked commits and --resume."""
+
+    def setUp(self):
+        """Create a real file to hash; its rows come from the mocked read_excel."""
+        handle, self.file_path = tempfile.mkstemp(suffix='.xlsx')
+        with os.fdopen(handle, 'wb') as f:
+            f.write(b'planilha de teste')
+        self.addCleanup(os.remove, self.file_path)
+        self.df = pd.DataFrame({
+            'origem': ['Origem'] * 5,
+            'tipo': [None] * 5,
+            'cnj': [f'123456{i}-89.2026.8.26.0001' for i in range(5)],
+            'orcamento': [2026] * 5,
+            'destacado': [None] * 5,
+            'nome': [f'Cliente {i}' for i in range(5)],
+            'cpf': ['12345678909'] * 5,
+            'nascimento': [None] * 5,
+            'valor_face': [1000.0] * 5,
+        })
+
+    def run_import(self, *args):
+        """Run import_excel on the temp file and return the output."""
+        out = StringIO()
+        with patch('precapp.management.commands.import_excel.pd.ExcelFile') as mock_excel_file, \
+                patch('precapp.management.commands.import_excel.pd.read_excel', return_value=self.df.copy()):
+            mock_excel_file.return_value.sheet_names = ['2026']
+            call_command('import_excel', '--file', self.file_path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_chunks_advance_checkpoint(self):
+        """Test that every chunk is committed and recorded in the checkpoint."""
+        output = self.run_import('--chunk-size', '2')
+
+        checkpoint = ImportCheckpoint.objects.get()
+        self.assertTrue(checkpoint.concluido)
+        self.assertEqual((checkpoint.ultima_linha, checkpoint.total_linhas), (5, 5))
+        self.assertEqual(checkpoint.totais['precatorios'], 5)
+        self.assertEqual(Precatorio.objects.count(), 5)
+        self.assertIn('Committed rows 5-5 of 5', output)
+
+    def test_resume_after_failure(self):
+        """Test that a failed chunk is rolled back and --resume continues from it."""
+        original = Command.process_sheet_data
+        calls = []
+
+        def fail_on_second_chunk(command, df, *args, **kwargs):
+            calls.append(len(df))
+            result = original(command, df, *args, **kwargs)
+            if len(calls) == 2:
+                raise RuntimeError('conexão perdida')
+            return result
+
+        with patch.object(Command, 'process_sheet_data', fail_on_second_chunk):
+            with self.assertRaises(CommandError):
+                self.run_import('--chunk-size', '2')
+
+        checkpoint = ImportCheckpoint.objects.get()
+        self.assertEqual(checkpoint.ultima_linha, 2)
+        self.assertFalse(checkpoint.concluido)
+        self.assertEqual(Precatorio.objects.count(), 2)
+
+        output = self.run_import('--resume', '--chunk-size', '2')
+
+        self.assertIn('Resuming import from row 3 of 5', output)
+        self.assertIn('Precatorios: 3', output)
+        checkpoint.refresh_from_db()
+        self.assertTrue(checkpoint.concluido)
+        self.assertEqual(checkpoint.totais['precatorios'], 5)
+        self.assertEqual(Precatorio.objects.count(), 5)
+
+    def test_resume_completed_import_does_nothing(self):
+        """Test that resuming a finished file imports nothing."""
+        self.run_import('--chunk-size', '10')
+        Precatorio.objects.all().delete()
+
+        output = self.run_import('--resume')
+
+        self.assertIn('already imported', output)
+        self.assertEqual(Precatorio.objects.count(), 0)
+
+    def test_invalid_chunk_size(self):
+        """Test that a non-positive chunk size is rejected."""
+        with self.assertRaises(CommandError):
+            call_command('import_excel', '--file', self.file_path, '--chunk-size', '0')
+
+
+class StreamingReaderImportTest(TestCase):
+    """Test cases for import_excel --reader streaming."""
+
+    def setUp(self):
+        """Write a real workbook: title row, header row, data rows with a gap."""
+        Tipo.objects.create(nome='Alimentar', ativa=True)
+        wb = Workbook()
+        ws = wb.active
+        ws.title = '2026'
+        ws.append(['Precatórios 2026'])
+        ws.append(['Origem', 'Tipo', 'CNJ', 'Orçamento', 'Destacado', 'Autor', 'CPF', 'Nascimento', 'Valor de Face'])
+        ws.append(['Vara', 'Alimentar', '1234567-89.2026.8.26.0001', 2026, 0.1, 'João Silva', '123.456.789-09',
+                   datetime(1950, 3, 4), 1000])
+        ws.append([None] * 9)
+        ws.append(['Vara', 'Alimentar', '1234567-89.2026.8.26.0002', 2026, 0, 'Maria Santos', '987.654.321-00',
+                   None, 2500.5])
+        ws.append(['Vara', 'Alimentar', 'cnj-invalido', 2026, 0, 'Ana Souza', '11144477735', None, 3000])
+        wb.create_sheet('Outra')
+        handle, self.file_path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(handle)
+        wb.save(self.file_path)
+        self.addCleanup(os.remove, self.file_path)
+
+    def snapshot(self):
+        """Return the imported state in a comparable form."""
+        return (
+            list(Precatorio.objects.order_by('cnj').values_list('cnj', 'valor_de_face', 'tipo_id', 'orcamento')),
+            list(Cliente.objects.order_by('cpf').values_list('cpf', 'nome', 'nascimento')),
+            sorted(Precatorio.clientes.through.objects.values_list('precatorio_id', 'cliente_id')),
+        )
+
+    def test_batches_skip_empty_rows_and_resume_offset(self):
+        """Test that batches have positional indexes over the non-empty rows."""
+        reader = StreamingSheetReader(self.file_path)
+        try:
+            self.assertEqual(reader.sheet_names, ['2026', 'Outra'])
+            batches = list(reader.iter_batches('2026', size=2))
+            resumed = list(reader.iter_batches('2026', size=2, skip=2))
+        finally:
+            reader.close()
+
+        self.assertEqual([list(batch.index) for batch in batches], [[0, 1], [2]])
+        self.assertEqual(list(batches[0].columns), IMPORT_COLUMNS)
+        self.assertEqual(batches[1]['cnj'].iloc[0], 'cnj-invalido')
+        self.assertEqual([list(batch.index) for batch in resumed], [[2]])
+
+    def test_streaming_matches_pandas_reader(self):
+        """Test that both readers import the same records."""
+        pandas_output = StringIO()
+        call_command('import_excel', '--file', self.file_path, stdout=pandas_output)
+        pandas_state = self.snapshot()
+        Precatorio.objects.all().delete()
+        Cliente.objects.all().delete()
+
+        streaming_output = StringIO()
+        call_command('import_excel', '--file', self.file_path, '--reader', 'streaming',
+                     '--batch-size', '1', stdout=streaming_output)
+
+        self.assertEqual(self.snapshot(), pandas_state)
+        self.assertEqual(len(pandas_state[0]), 2)
+        for line in ('Precatorios: 2', 'Clientes: 2'):
+            self.assertIn(line, pandas_output.getvalue())
+            self.assertIn(line, streaming_output.getvalue())
+
+    def test_streaming_chunked_counts_rows(self):
+        """Test that a streamed chunked import records the exact row count."""
+        command = Command(stdout=StringIO())
+        call_command(command, '--file', self.file_path, '--reader', 'streaming', '--chunk-size', '2')
+
+        self.assertEqual(command.result['total_rows'], 3)
+        checkpoint = ImportCheckpoint.objects.get()
+        self.assertEqual((checkpoint.ultima_linha, checkpoint.total_linhas), (3, 3))
+        self.assertTrue(checkpoint.concluido)
@@ -0,0 +1,152 @@
+"""
+Test cases for the request instrumentation middleware and staff page
+"""
+
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from precapp import instrumentation
+from precapp.instrumentation import MetricsStore, RequestStats, fingerprint, measure_request, percentile, summarize
+from precapp.models import Cliente
+
+
+INSTRUMENTATION_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'instrumentation-tests'},
+}
+
+
+class InstrumentationHelpersTest(TestCase):
+    """Tests for the fingerprints, percentiles and per-view summary"""
+
+    def test_fingerprint_ignores_whitespace_and_batch_size(self):
+        self.assertEqual(
+            fingerprint('SELECT *  FROM t\n WHERE id IN (%s, %s, %s)'),
+            fingerprint('SELECT * FROM t WHERE id IN (%s)'),
+        )
+
+    def test_duplicates(self):
+        stats = RequestStats()
+        for _ in range(3):
+            stats.record_query('SELECT * FROM cliente WHERE cpf = %s', 0.001)
+        stats.record_query('SELECT COUNT(*) FROM precatorio', 0.001)
+
+        self.assertEqual(stats.queries, 4)
+        self.assertEqual(stats.duplicates(), [('SELECT * FROM cliente WHERE cpf = %s', 3)])
+
+    def test_nested_measurements_share_stats(self):
+        """Test that the instrumentation and metrics middlewares count a query once"""
+        with measure_request() as outer:
+            with measure_request() as inner:
+                Cliente.objects.count()
+        self.assertIs(inner, outer)
+        self.assertEqual(outer.queries, 1)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.9), 90)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.99), 7)
+
+    def test_summarize_sorts_by_p90(self):
+        def sample(duration):
+            return {
+                'duration_ms': duration, 'queries': 2, 'db_ms': 1.0, 'render_ms': 1.0,
+                'size': 100, 'duplicated_queries': 0, 'top_duplicate': None,
+            }
+
+        rows = summarize({
+            'home': [sample(10), sample(20)],
+            'clientes': [sample(300)],
+            'vazia': [],
+        })
+        self.assertEqual([row['view'] for row in rows], ['clientes', 'home'])
+        self.assertEqual(rows[1]['requests'], 2)
+        self.assertEqual(rows[1]['avg_queries'], 2)
+
+
+@override_settings(CACHES=INSTRUMENTATION_CACHES, INSTRUMENTATION_CACHE_ALIAS='shared')
+class InstrumentationMiddlewareTest(TestCase):
+    """Tests for InstrumentationMiddleware and instrumentation_view"""
+
+    def setUp(self):
+        instrumentation.store.reset()
+        self.staff = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        User.objects.create_user(username='regular', password='testpass123')
+        for i in range(3):
+            Cliente.objects.create(cpf=f'1234567890{i}', nome=f'Cliente {i}', prioridade=False)
+
+        self.client_app = Client()
+        self.client_app.login(username='staff', password='testpass123')
+
+    def tearDown(self):
+        instrumentation.store.reset()
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_disabled_records_nothing(self):
+        self.client_app.get(reverse('clientes'))
+        self.assertEqual(instrumentation.store.local_samples(), {})
+
+    @override_settings(INSTRUMENTATION_ENABLED=True)
+    def test_records_samples_per_view(self):
+        self.client_app.get(reverse('clientes'))
+        self.client_app.get(reverse('clientes'))
+
+        samples = instrumentation.store.local_samples()['clientes']
+        self.assertEqual(len(samples), 2)
+        sample = samples[-1]
+        self.assertGreater(sample['queries'], 0)
+        self.assertGreater(sample['duration_ms'], 0)
+        self.assertGreater(sample['render_ms'], 0)
+        self.assertGreater(sample['size'], 0)
+
+    @override_settings(INSTRUMENTATION_ENABLED=True, INSTRUMENTATION_SLOW_QUERY_COUNT=1)
+    def test_logs_requests_over_threshold(self):
+        # The test settings disable logging, so assertLogs would see nothing
+        with mock.patch.object(instrumentation, 'logger') as logger:
+            self.client_app.get(reverse('clientes'))
+        logger.warning.assert_called_once()
+        message = logger.warning.call_args[0][0]
+        self.assertIn('many queries', message.lower())
+        self.assertIn('clientes took', message)
+
+    @override_settings(INSTRUMENTATION_ENABLED=True)
+    def test_page_merges_flushed_samples(self):
+        self.client_app.get(reverse('clientes'))
+
+        response = self.client_app.get(reverse('instrumentation'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('clientes', [row['view'] for row in response.context['views']])
+        self.assertEqual(response.context['processes'], 1)
+
+    @override_settings(INSTRUMENTATION_ENABLED=True)
+    def test_post_resets_samples(self):
+        self.client_app.get(reverse('clientes'))
+
+        response = self.client_app.post(reverse('instrumentation'))
+        self.assertRedirects(response, reverse('instrumentation'), fetch_redirect_response=False)
+        self.assertEqual(instrumentation.store.collect()[0].get('clientes'), None)
+
+    def test_reset_reaches_other_processes(self):
+        other = MetricsStore()  # Stands for another worker process
+        other.record('clientes', {'duration_ms': 1.0})
+        self.assertIn('clientes', other.local_samples())
+
+        instrumentation.store.reset()
+        other.flush()
+        self.assertEqual(other.local_samples(), {})
+
+        # Samples recorded after the reset are kept
+        other.record('clientes', {'duration_ms': 2.0})
+        other.flush()
+        self.assertEqual(other.local_samples(), {'clientes': [{'duration_ms': 2.0}]})
+
+    def test_page_requires_staff(self):
+        client = Client()
+        client.login(username='regular', password='testpass123')
+        response = client.get(reverse('instrumentation'))
+        self.assertRedirects(response, reverse('home'))
@@ -0,0 +1,61 @@
+"""
+Test cases for the list filter indexes and the explain_list_queries command
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+
+from precapp.management.commands.explain_list_queries import LIST_QUERIES, declared_indexes
+
+
+class ListIndexesTest(TestCase):
+    """Tests that the indexes exist and the list queries can use them"""
+
+    def existing_indexes(self):
+        with connection.cursor() as cursor:
+            return {
+                name
+                for model, index in declared_indexes()
+                for name, info in connection.introspection.get_constraints(cursor, model._meta.db_table).items()
+                if info['index']
+            }
+
+    def test_indexes_created_by_migration(self):
+        names = {index.name for model, index in declared_indexes()}
+        self.assertIn('precapp_dil_pendente_prazo_idx', names)
+        self.assertTrue(names <= self.existing_indexes())
+
+    def test_partial_indexes(self):
+        conditions = {index.name: index.condition for model, index in declared_indexes() if index.condition}
+        self.assertEqual(
+            set(conditions),
+            {'precapp_cliente_sem_prio_idx', 'precapp_cliente_falecido_idx', 'precapp_dil_pendente_prazo_idx'}
+        )
+
+    def test_compare_plans(self):
+        """Test that --compare shows the plans with and without the indexes, then restores them"""
+        out = StringIO()
+        call_command('explain_list_queries', '--compare', '--query', 'alvaras_tipo', '--repeat', '1', stdout=out)
+        output = out.getvalue()
+
+        self.assertIn('-- without indexes', output)
+        self.assertIn('indexes used: none', output)
+        self.assertIn('-- with indexes', output)
+        self.assertIn('indexes used: precapp_alvara_tipo_idx', output)
+        self.assertTrue({index.name for model, index in declared_indexes()} <= self.existing_indexes())
+
+    def test_every_query_runs(self):
+        out = StringIO()
+        call_command('explain_list_queries', '--repeat', '1', stdout=out)
+        for name in LIST_QUERIES:
+            self.assertIn(f'== {name}:', out.getvalue())
+
+    def test_analyze_requires_postgresql(self):
+        if connection.vendor == 'postgresql':
+            self.skipTest('EXPLAIN ANALYZE is available')
+        with self.assertRaises(CommandError):
+            call_command('explain_list_queries', '--analyze', stdout=StringIO())
@@ -0,0 +1,124 @@
+"""
+Test cases for the Prometheus metrics registry, middleware and endpoint
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from precapp import metrics
+from precapp.dashboard import get_dashboard_statistics, invalidate_dashboard_statistics
+
+
+class MetricsTestMixin:
+    """Point METRICS_DIR at a temporary directory and start from an empty registry"""
+
+    def setUp(self):
+        self.metrics_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            METRICS_ENABLED=True, METRICS_DIR=self.metrics_dir, METRICS_TOKEN='segredo'
+        )
+        self.settings_override.enable()
+        metrics.registry.reset()
+
+    def tearDown(self):
+        metrics.registry.reset()
+        self.settings_override.disable()
+        shutil.rmtree(self.metrics_dir, ignore_errors=True)
+
+
+class MetricsRegistryTest(MetricsTestMixin, TestCase):
+    """Tests for recording, merging and rendering the metrics"""
+
+    def test_render_histogram_and_counter(self):
+        metrics.observe('precatorios_http_request_duration_seconds', 0.02, view='clientes')
+        metrics.observe('precatorios_http_request_duration_seconds', 3, view='clientes')
+        metrics.increment('precatorios_http_requests_total', view='clientes', method='GET', status=200)
+
+        output = metrics.render(metrics.collect())
+        self.assertIn('# TYPE precatorios_http_request_duration_seconds histogram', output)
+        self.assertIn('precatorios_http_request_duration_seconds_bucket{view="clientes",le="0.025"} 1', output)
+        self.assertIn('precatorios_http_request_duration_seconds_bucket{view="clientes",le="5"} 2', output)
+        self.assertIn('precatorios_http_request_duration_seconds_bucket{view="clientes",le="+Inf"} 2', output)
+        self.assertIn('precatorios_http_request_duration_seconds_count{view="clientes"} 2', output)
+        self.assertIn('precatorios_http_requests_total{method="GET",status="200",view="clientes"} 1', output)
+
+    def test_merges_processes_and_archives_dead_ones(self):
+        metrics.increment('precatorios_cache_requests_total', cache='catalog', result='hit')
+        dead_file = os.path.join(self.metrics_dir, '999999999-dead.json')
+        with open(dead_file, 'w') as handle:
+            json.dump({
+                'counters': [['precatorios_cache_requests_total', [['cache', 'catalog'], ['result', 'hit']], 4]],
+                'histograms': [],
+            }, handle)
+
+        counters, histograms = metrics.collect()
+        key = ('precatorios_cache_requests_total', (('cache', 'catalog'), ('result', 'hit')))
+        self.assertEqual(counters[key], 5)
+        self.assertFalse(os.path.exists(dead_file))
+        self.assertTrue(os.path.exists(os.path.join(self.metrics_dir, metrics.ARCHIVE_FILE)))
+
+        # The archived values are counted once
+        counters, histograms = metrics.collect()
+        self.assertEqual(counters[key], 5)
+
+    def test_storage_timer_counts_errors(self):
+        with self.assertRaises(OSError):
+            with metrics.storage_timer('save'):
+                raise OSError('S3 indisponível')
+
+        counters, histograms = metrics.collect()
+        self.assertEqual(counters[('precatorios_storage_operation_errors_total', (('operation', 'save'),))], 1)
+        self.assertIn(('precatorios_storage_operation_duration_seconds', (('operation', 'save'),)), histograms)
+
+    def test_dashboard_cache_lookups(self):
+        invalidate_dashboard_statistics()
+        get_dashboard_statistics()
+        get_dashboard_statistics()
+
+        counters, histograms = metrics.collect()
+        self.assertGreaterEqual(counters[('precatorios_cache_requests_total', (('cache', 'dashboard'), ('result', 'hit')))], 1)
+        self.assertGreaterEqual(counters[('precatorios_cache_requests_total', (('cache', 'dashboard'), ('result', 'miss')))], 1)
+
+    def test_disabled_records_nothing(self):
+        with override_settings(METRICS_ENABLED=False):
+            metrics.increment('precatorios_http_requests_total', view='home', method='GET', status=200)
+        self.assertEqual(metrics.registry.snapshot()['counters'], [])
+
+
+class MetricsEndpointTest(MetricsTestMixin, TestCase):
+    """Tests for MetricsMiddleware and metrics_view"""
+
+    def setUp(self):
+        super().setUp()
+        User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.client_app = Client()
+
+    def test_requires_token_or_staff(self):
+        self.assertEqual(self.client_app.get(reverse('metrics')).status_code, 403)
+
+        response = self.client_app.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer segredo')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+        self.client_app.login(username='staff', password='testpass123')
+        self.assertEqual(self.client_app.get(reverse('metrics')).status_code, 200)
+
+    def test_not_found_when_disabled(self):
+        with override_settings(METRICS_ENABLED=False):
+            response = self.client_app.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer segredo')
+        self.assertEqual(response.status_code, 404)
+
+    def test_records_requests_per_url_name(self):
+        self.client_app.login(username='staff', password='testpass123')
+        self.client_app.get(reverse('clientes'))
+
+        output = self.client_app.get(reverse('metrics')).content.decode()
+        self.assertIn('precatorios_http_requests_total{method="GET",status="200",view="clientes"} 1', output)
+        self.assertIn('precatorios_http_request_duration_seconds_count{view="clientes"} 1', output)
+        self.assertIn('precatorios_http_request_db_queries_count{view="clientes"} 1', output)
@@ -2244,6 +2244,113 @@ class ClienteModelTest(TestCase):
         self.assertTrue(falecido_field.blank)
 
 
+class ClienteQuerySetTest(TestCase):
+    """Test cases for the annotated Cliente.objects.with_resumo() queryset"""
+    
+    def setUp(self):
+        """Set up a client with two precatórios and diligências in every state"""
+        self.today = date(2024, 6, 1)
+        self.cliente = Cliente.objects.create(cpf='12345678909', nome='Cliente Resumo', prioridade=False)
+        self.vazio = Cliente.objects.create(cpf='98765432100', nome='Sem Registros', prioridade=False)
+        
+        atualizado = Precatorio.objects.create(
+            cnj='0000001-11.2023.8.26.0001', origem='Teste',
+            valor_de_face=1000.0, ultima_atualizacao=1500.0
+        )
+        sem_atualizacao = Precatorio.objects.create(
+            cnj='0000002-22.2023.8.26.0001', origem='Teste', valor_de_face=400.0
+        )
+        atualizado.clientes.add(self.cliente)
+        sem_atualizacao.clientes.add(self.cliente)
+        
+        tipo = TipoDiligencia.objects.create(nome='Documentos')
+        for data_final, concluida in [
+            (date(2024, 5, 1), False),   # overdue
+            (date(2024, 6, 10), False),  # next due date
+            (date(2024, 7, 1), False),
+            (date(2024, 5, 1), True),
+        ]:
+            Diligencias.objects.create(
+                cliente=self.cliente, tipo=tipo, data_final=data_final,
+                concluida=concluida, criado_por='Teste', descricao=f'Vence {data_final}'
+            )
+    
+    def test_with_resumo_values(self):
+        """Test that the annotations match the related records"""
+        cliente = Cliente.objects.with_resumo(self.today).get(cpf=self.cliente.cpf)
+        
+        self.assertEqual(cliente.total_precatorios, 2)
+        self.assertEqual(cliente.valor_total_precatorios, 1500.0)
+        self.assertEqual(cliente.valor_atual_precatorios, 1900.0)
+        self.assertEqual(cliente.total_diligencias, 4)
+        self.assertEqual(cliente.diligencias_pendentes, 3)
+        self.assertEqual(cliente.diligencias_concluidas, 1)
+        self.assertEqual(cliente.diligencias_atrasadas, 1)
+        self.assertEqual(cliente.proximo_vencimento, date(2024, 6, 10))
+        self.assertEqual(cliente.ultima_diligencia_tipo, 'Documentos')
+    
+    def test_with_resumo_defaults_without_related_records(self):
+        """Test that clients without related records get zeros and None"""
+        cliente = Cliente.objects.with_resumo(self.today).get(cpf=self.vazio.cpf)
+        
+        self.assertEqual(cliente.total_precatorios, 0)
+        self.assertEqual(cliente.valor_atual_precatorios, 0.0)
+        self.assertEqual(cliente.total_diligencias, 0)
+        self.assertEqual(cliente.diligencias_atrasadas, 0)
+        self.assertIsNone(cliente.proximo_vencimento)
+        self.assertIsNone(cliente.ultima_diligencia_tipo)
+    
+    def test_with_resumo_single_query(self):
+        """Test that all clients and their summaries are fetched in one query"""
+        with self.assertNumQueries(1):
+            clientes = list(Cliente.objects.with_resumo(self.today))
+        self.assertEqual(len(clientes), 2)
+    
+    def create_priority_requerimentos(self):
+        """Create one priority and one non-priority requerimento per client"""
+        precatorio = Precatorio.objects.get(cnj='0000001-11.2023.8.26.0001')
+        precatorio.clientes.add(self.vazio)
+        fase = Fase.objects.create(nome='Deferido', tipo='requerimento')
+        idade = PedidoRequerimento.objects.create(nome='Prioridade por idade')
+        acordo = PedidoRequerimento.objects.create(nome='Acordo no Principal')
+        for cliente in (self.cliente, self.vazio):
+            for pedido in (idade, acordo):
+                Requerimento.objects.create(
+                    precatorio=precatorio, cliente=cliente, pedido=pedido,
+                    fase=fase, valor=1000.0, desagio=10.0
+                )
+    
+    def test_with_priority_requerimentos_batches_one_query(self):
+        """Test that priority requerimentos of every client come from one prefetch query"""
+        self.create_priority_requerimentos()
+        
+        with self.assertNumQueries(2):  # clients + one batch of requerimentos (pedido and fase joined)
+            clientes = list(Cliente.objects.with_priority_requerimentos().order_by('cpf'))
+            resultado = {
+                cliente.cpf: [(req.pedido.nome, req.fase.nome) for req in cliente.get_priority_requerimentos()]
+                for cliente in clientes
+            }
+        
+        for cliente in clientes:
+            self.assertEqual(resultado[cliente.cpf], [('Prioridade por idade', 'Deferido')])
+    
+    def test_prefetch_priority_requerimentos_matches_per_client_lookup(self):
+        """Test that the batch API returns the same requerimentos as the per-client method"""
+        self.create_priority_requerimentos()
+        esperado = {
+            cliente.cpf: [req.pk for req in cliente.get_priority_requerimentos()]
+            for cliente in Cliente.objects.all()
+        }
+        
+        pagina = list(Cliente.objects.all())
+        with self.assertNumQueries(1):
+            clientes = Cliente.prefetch_priority_requerimentos(pagina)
+        with self.assertNumQueries(0):
+            obtido = {cliente.cpf: [req.pk for req in cliente.get_priority_requerimentos()] for cliente in clientes}
+        
+        self.assertEqual(obtido, esperado)
+
+
 class AlvaraModelTest(TestCase):
     """
     Comprehensive test suite for the Alvara model.
@@ -4784,3 +4891,87 @@ class RecebimentosModelTest(TestCase):
             data__month__in=[1, 2, 3]
         ).count()
         self.assertEqual(q1_payments, 3)
+
+
+class SaveChangeTrackingTest(TestCase):
+    """
+    Tests for the change tracking of Alvara.save and Requerimento.save.
+    
+    Fase changes are detected against the values loaded from the database
+    (LoadedValuesMixin), so an update costs the UPDATE itself plus, unless
+    skipped, the cliente-precatório link check.
+    """
+    
+    def setUp(self):
+        self.precatorio = Precatorio.objects.create(
+            cnj='1234567-89.2023.8.26.0100', origem='Tribunal', valor_de_face=100000.0
+        )
+        self.cliente = Cliente.objects.create(
+            cpf='12345678909', nome='José da Silva', nascimento=date(1950, 1, 1), prioridade=True
+        )
+        self.precatorio.clientes.add(self.cliente)
+        self.fase = Fase.objects.create(nome='Aguardando Depósito', tipo='ambos', ativa=True)
+        self.fase_nova = Fase.objects.create(nome='Depositado', tipo='ambos', ativa=True)
+        self.pedido = PedidoRequerimento.objects.create(nome='Prioridade por idade')
+        self.alvara = Alvara.objects.create(
+            precatorio=self.precatorio, cliente=self.cliente, valor_principal=1000.0,
+            tipo='prioridade', fase=self.fase
+        )
+        self.requerimento = Requerimento.objects.create(
+            precatorio=self.precatorio, cliente=self.cliente, pedido=self.pedido, fase=self.fase,
+            valor=1000.0, desagio=0.0
+        )
+    
+    def test_alvara_update_does_not_refetch_row(self):
+        alvara = Alvara.objects.select_related('precatorio', 'cliente').get(pk=self.alvara.pk)
+        alvara.fase = self.fase_nova
+        with self.assertNumQueries(3):  # new fase exists + link check + UPDATE
+            alvara.save()
+        
+        alvara.refresh_from_db()
+        self.assertIsNotNone(alvara.fase_ultima_alteracao)
+        self.assertEqual(alvara.fase_alterada_por, 'System')
+    
+    def test_skip_link_check(self):
+        alvara = Alvara.objects.get(pk=self.alvara.pk)
+        alvara.tipo = 'comum'
+        with self.assertNumQueries(1):
+            alvara.save(skip_link_check=True)
+        
+        requerimento = Requerimento.objects.get(pk=self.requerimento.pk)
+        requerimento.fase = self.fase_nova
+        with self.assertNumQueries(2):  # only the changed fase is validated
+            requerimento.save(skip_link_check=True)
+        self.assertIsNotNone(requerimento.fase_ultima_alteracao)
+    
+    def test_link_check_still_runs_by_default(self):
+        outro = Cliente.objects.create(cpf='98765432100', nome='Maria', nascimento=date(1970, 1, 1), prioridade=False)
+        alvara = Alvara.objects.get(pk=self.alvara.pk)
+        alvara.cliente = outro
+        with self.assertRaises(ValidationError):
+            alvara.save()
+    
+    def test_fase_timestamp_kept_when_fase_unchanged(self):
+        requerimento = Requerimento.objects.get(pk=self.requerimento.pk)
+        timestamp = requerimento.fase_ultima_alteracao
+        requerimento.valor = 2000.0
+        requerimento.save()
+        self.assertEqual(requerimento.fase_ultima_alteracao, timestamp)
+        
+        # A second save of the same instance compares with what the first one wrote
+        requerimento.fase = self.fase_nova
+        requerimento.save()
+        changed = requerimento.fase_ultima_alteracao
+        self.assertNotEqual(changed, timestamp)
+        requerimento.save()
+        self.assertEqual(requerimento.fase_ultima_alteracao, changed)
+    
+    def test_partial_snapshot_falls_back_to_query(self):
+        """Test that fase changes are still detected when the fase was not loaded"""
+        alvara = Alvara.objects.only('pk', 'precatorio', 'cliente', 'valor_principal', 'tipo').get(pk=self.alvara.pk)
+        alvara.fase = self.fase_nova
+        alvara.save()
+        
+        alvara = Alvara.objects.get(pk=self.alvara.pk)
+        self.assertEqual(alvara.fase_id, self.fase_nova.pk)
+        self.assertGreater(alvara.fase_ultima_alteracao, self.alvara.fase_ultima_alteracao)
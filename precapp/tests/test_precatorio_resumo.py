@@ -0,0 +1,252 @@
+"""
+Test cases for the materialized precatório summaries (PrecatorioResumo)
+"""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from precapp.models import (
+    Alvara, Cliente, ContaBancaria, Fase, PedidoRequerimento, Precatorio, PrecatorioResumo,
+    Recebimentos, Requerimento
+)
+
+
+class PrecatorioResumoTestMixin:
+    """Shared fixtures: two precatórios, one client linked to both"""
+
+    def setUp(self):
+        self.precatorio = Precatorio.objects.create(
+            cnj='1234567-89.2023.8.26.0100', origem='Tribunal', valor_de_face=100000.0
+        )
+        self.outro = Precatorio.objects.create(
+            cnj='7654321-00.2023.8.26.0100', origem='Tribunal', valor_de_face=50000.0
+        )
+        self.cliente = Cliente.objects.create(
+            cpf='12345678909', nome='José da Silva', nascimento=date(1950, 1, 1), prioridade=True
+        )
+        self.precatorio.clientes.add(self.cliente)
+        self.outro.clientes.add(self.cliente)
+        self.fase = Fase.objects.create(nome='Aguardando Depósito', tipo='ambos', ativa=True)
+        self.pedido = PedidoRequerimento.objects.create(nome='Prioridade por idade')
+        self.conta = ContaBancaria.objects.create(
+            banco='Banco do Brasil', tipo_de_conta='corrente', agencia='1234-5', conta='12345678-9'
+        )
+
+    def create_alvara(self, precatorio=None, principal=1000.0, contratuais=100.0, sucumbenciais=10.0):
+        return Alvara.objects.create(
+            precatorio=precatorio or self.precatorio, cliente=self.cliente, valor_principal=principal,
+            honorarios_contratuais=contratuais, honorarios_sucumbenciais=sucumbenciais,
+            tipo='prioridade', fase=self.fase
+        )
+
+    def create_recebimento(self, alvara, numero='REC001', valor='500.00'):
+        return Recebimentos.objects.create(
+            numero_documento=numero, alvara=alvara, data=date(2024, 1, 10),
+            conta_bancaria=self.conta, valor=Decimal(valor), tipo='Hon. contratuais'
+        )
+
+    def resumo(self, precatorio=None):
+        return PrecatorioResumo.objects.get(precatorio=precatorio or self.precatorio)
+
+    def assertConsistent(self):
+        self.assertEqual(PrecatorioResumo.verify(), [])
+
+
+class PrecatorioResumoSignalsTest(PrecatorioResumoTestMixin, TestCase):
+    """Tests that the signal receivers keep the summaries in step"""
+
+    def test_new_precatorio_gets_empty_summary(self):
+        resumo = self.resumo(self.outro)
+        self.assertEqual(resumo.quantidade_alvaras, 0)
+        self.assertEqual(resumo.total_recebido, Decimal('0.00'))
+        self.assertEqual(resumo.quantidade_clientes, 1)
+
+    def test_alvara_create_update_delete(self):
+        alvara = self.create_alvara()
+        self.create_alvara(principal=500.0, contratuais=None, sucumbenciais=0.0)
+        resumo = self.resumo()
+        self.assertEqual(resumo.quantidade_alvaras, 2)
+        self.assertAlmostEqual(resumo.total_principal, 1500.0)
+        self.assertAlmostEqual(resumo.total_contratuais, 100.0)
+
+        alvara.valor_principal = 2000.0
+        alvara.save()
+        alvara.save()  # Saving again must not apply the difference twice
+        self.assertAlmostEqual(self.resumo().total_principal, 2500.0)
+
+        Alvara.objects.get(pk=alvara.pk).delete()
+        resumo = self.resumo()
+        self.assertEqual(resumo.quantidade_alvaras, 1)
+        self.assertAlmostEqual(resumo.total_principal, 500.0)
+        self.assertConsistent()
+
+    def test_alvara_moved_to_another_precatorio(self):
+        """Test that an alvará moving precatório takes its totals and recebimentos along"""
+        alvara = self.create_alvara()
+        self.create_recebimento(alvara)
+
+        alvara = Alvara.objects.get(pk=alvara.pk)
+        alvara.precatorio = self.outro
+        alvara.save()
+
+        self.assertEqual(self.resumo().quantidade_alvaras, 0)
+        self.assertEqual(self.resumo().total_recebido, Decimal('0.00'))
+        self.assertEqual(self.resumo(self.outro).quantidade_alvaras, 1)
+        self.assertEqual(self.resumo(self.outro).total_recebido, Decimal('500.00'))
+        self.assertConsistent()
+
+    def test_alvara_moved_without_snapshot(self):
+        """Test that the previous precatório is rebuilt when the stored values are unknown"""
+        alvara = self.create_alvara()
+
+        alvara = Alvara.objects.get(pk=alvara.pk)
+        alvara._loaded_values = {}  # As for an instance built in memory with an existing pk
+        alvara.precatorio = self.outro
+        alvara.save()
+
+        self.assertEqual(self.resumo().quantidade_alvaras, 0)
+        self.assertEqual(self.resumo().total_principal, 0.0)
+        self.assertEqual(self.resumo(self.outro).quantidade_alvaras, 1)
+        self.assertConsistent()
+
+    def test_recebimentos(self):
+        alvara = self.create_alvara()
+        recebimento = self.create_recebimento(alvara)
+        self.create_recebimento(alvara, numero='REC002', valor='250.50')
+        self.assertEqual(self.resumo().total_recebido, Decimal('750.50'))
+
+        recebimento = Recebimentos.objects.get(pk=recebimento.pk)
+        recebimento.valor = Decimal('100.00')
+        recebimento.save()
+        self.assertEqual(self.resumo().total_recebido, Decimal('350.50'))
+
+        recebimento.delete()
+        self.assertEqual(self.resumo().total_recebido, Decimal('250.50'))
+        self.assertConsistent()
+
+    def test_requerimentos(self):
+        requerimento = Requerimento.objects.create(
+            precatorio=self.precatorio, cliente=self.cliente, pedido=self.pedido, fase=self.fase,
+            valor=1000.0, desagio=0.0
+        )
+        self.assertEqual(self.resumo().quantidade_requerimentos, 1)
+
+        requerimento.precatorio = self.outro
+        requerimento.save()
+        self.assertEqual(self.resumo().quantidade_requerimentos, 0)
+        self.assertEqual(self.resumo(self.outro).quantidade_requerimentos, 1)
+
+        requerimento.delete()
+        self.assertEqual(self.resumo(self.outro).quantidade_requerimentos, 0)
+        self.assertConsistent()
+
+    def test_clientes_relationship(self):
+        segundo = Cliente.objects.create(cpf='98765432100', nome='Maria', nascimento=date(1970, 1, 1), prioridade=False)
+        self.precatorio.clientes.add(segundo)
+        self.assertEqual(self.resumo().quantidade_clientes, 2)
+
+        self.precatorio.clientes.remove(segundo)
+        self.assertEqual(self.resumo().quantidade_clientes, 1)
+
+        segundo.precatorios.add(self.precatorio, self.outro)
+        self.assertEqual(self.resumo(self.outro).quantidade_clientes, 2)
+
+        segundo.precatorios.clear()
+        self.assertEqual(self.resumo().quantidade_clientes, 1)
+        self.assertEqual(self.resumo(self.outro).quantidade_clientes, 1)
+
+        self.cliente.delete()
+        self.assertEqual(self.resumo().quantidade_clientes, 0)
+        self.assertConsistent()
+
+    def test_precatorio_delete_cascades(self):
+        self.create_alvara()
+        self.precatorio.delete()
+        self.assertFalse(PrecatorioResumo.objects.filter(precatorio_id='1234567-89.2023.8.26.0100').exists())
+        self.assertConsistent()
+
+
+class PrecatorioResumoRebuildTest(PrecatorioResumoTestMixin, TestCase):
+    """Tests for rebuild, verify and the management command"""
+
+    def setUp(self):
+        super().setUp()
+        alvara = self.create_alvara()
+        self.create_alvara(precatorio=self.outro, principal=300.0)
+        self.create_recebimento(alvara)
+
+    def test_verify_reports_drift_and_missing_rows(self):
+        """Test that writes bypassing signals are detected"""
+        Alvara.objects.filter(precatorio=self.precatorio).update(valor_principal=9999.0)
+        PrecatorioResumo.objects.filter(precatorio=self.outro).delete()
+
+        divergencias = PrecatorioResumo.verify()
+        self.assertIn(
+            {'cnj': self.precatorio.cnj, 'campo': 'total_principal', 'esperado': 9999.0, 'armazenado': 1000.0},
+            divergencias
+        )
+        self.assertIn({'cnj': self.outro.cnj, 'campo': 'resumo', 'esperado': None, 'armazenado': None}, divergencias)
+
+    def test_rebuild(self):
+        PrecatorioResumo.objects.all().delete()
+        Alvara.objects.update(honorarios_contratuais=1.0)
+
+        self.assertEqual(PrecatorioResumo.rebuild(batch_size=1), 2)
+        resumo = self.resumo()
+        self.assertAlmostEqual(resumo.total_contratuais, 1.0)
+        self.assertEqual(resumo.total_recebido, Decimal('500.00'))
+        self.assertEqual(resumo.quantidade_clientes, 1)
+        self.assertConsistent()
+
+    def test_for_precatorio_computes_missing_summary(self):
+        PrecatorioResumo.objects.all().delete()
+        resumo = PrecatorioResumo.for_precatorio(self.precatorio)
+        self.assertEqual(resumo.quantidade_alvaras, 1)
+        self.assertEqual(resumo.total_recebido, Decimal('500.00'))
+        # Reading never writes a summary
+        self.assertFalse(PrecatorioResumo.objects.exists())
+
+    def test_command_verify_and_fix(self):
+        Alvara.objects.update(valor_principal=1.0)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_precatorio_summaries', '--verify', stdout=StringIO())
+
+        out = StringIO()
+        call_command('rebuild_precatorio_summaries', '--verify', '--fix', stdout=out)
+        self.assertIn('2 precatório summaries rebuilt', out.getvalue())
+
+        out = StringIO()
+        call_command('rebuild_precatorio_summaries', '--verify', stdout=out)
+        self.assertIn('consistent', out.getvalue())
+
+    def test_command_rebuild_single_precatorio(self):
+        PrecatorioResumo.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_precatorio_summaries', '--cnj', self.precatorio.cnj, stdout=out)
+        self.assertIn('1 precatório summaries rebuilt', out.getvalue())
+        self.assertEqual(PrecatorioResumo.objects.count(), 1)
+
+
+class PrecatorioDetailResumoTest(PrecatorioResumoTestMixin, TestCase):
+    """Tests that the detail page reads its totals from the summary"""
+
+    def test_detail_totals(self):
+        User.objects.create_user(username='testuser', password='testpass123')
+        client = Client()
+        client.login(username='testuser', password='testpass123')
+        self.create_alvara()
+        self.create_alvara(principal=500.0)
+
+        response = client.get(reverse('precatorio_detalhe', args=[self.precatorio.cnj]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['resumo'].quantidade_alvaras, 2)
+        self.assertAlmostEqual(response.context['alvaras_total_principal'], 1500.0)
+        self.assertAlmostEqual(response.context['alvaras_total_contratuais'], 200.0)
@@ -0,0 +1,116 @@
+"""
+Test cases for the indexed search columns and lookups
+"""
+
+from datetime import date
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from precapp.models import Cliente, Precatorio
+from precapp.search import (
+    TrigramIndex, code_search_q, create_trigram_indexes, normalize_search_text, text_search_q
+)
+
+
+class NormalizeSearchTextTest(TestCase):
+    """Tests for normalize_search_text"""
+
+    def test_removes_accents_case_and_extra_spaces(self):
+        self.assertEqual(normalize_search_text('  JOSÉ  da Conceição '), 'jose da conceicao')
+        self.assertEqual(normalize_search_text('São Paulo - Fazenda Pública'), 'sao paulo - fazenda publica')
+
+    def test_none_and_non_strings(self):
+        self.assertEqual(normalize_search_text(None), '')
+        self.assertEqual(normalize_search_text(2023), '2023')
+
+
+class SearchColumnsTest(TestCase):
+    """Tests that the normalized columns follow the source fields"""
+
+    def setUp(self):
+        self.cliente = Cliente.objects.create(cpf='12345678909', nome='João Conceição', prioridade=False)
+        self.precatorio = Precatorio.objects.create(
+            cnj='1234567-89.2023.8.26.0100', origem='Tribunal de São Paulo', valor_de_face=1000.0
+        )
+
+    def test_columns_set_on_create(self):
+        self.assertEqual(self.cliente.nome_busca, 'joao conceicao')
+        self.assertEqual(self.precatorio.origem_busca, 'tribunal de sao paulo')
+
+    def test_columns_updated_with_update_fields(self):
+        """Test that save(update_fields=[...]) also writes the search column"""
+        self.cliente.nome = 'Ângela Müller'
+        self.cliente.save(update_fields=['nome'])
+        self.precatorio.origem = 'Vara Cível de Maringá'
+        self.precatorio.save(update_fields=['origem'])
+
+        self.assertEqual(Cliente.objects.get(pk=self.cliente.pk).nome_busca, 'angela muller')
+        self.assertEqual(Precatorio.objects.get(pk=self.precatorio.pk).origem_busca, 'vara civel de maringa')
+
+    def test_text_search_is_accent_insensitive(self):
+        for termo in ('joao', 'JOÃO', 'conceicao', 'Conceição'):
+            self.assertTrue(Cliente.objects.filter(text_search_q('nome_busca', termo)).exists(), termo)
+        self.assertTrue(Precatorio.objects.filter(text_search_q('origem_busca', 'SAO PAULO')).exists())
+        self.assertFalse(Cliente.objects.filter(text_search_q('nome_busca', 'maria')).exists())
+
+    def test_code_search_uses_plain_like(self):
+        """Test that identifier lookups avoid UPPER(), which trigram indexes cannot serve"""
+        queryset = Precatorio.objects.filter(code_search_q('cnj', ' 2023.8.26 '))
+        self.assertEqual(list(queryset), [self.precatorio])
+        self.assertNotIn('UPPER', str(queryset.query))
+
+
+class SearchViewsTest(TestCase):
+    """Tests that the list filters match names regardless of accents"""
+
+    def setUp(self):
+        User.objects.create_user(username='testuser', password='testpass123')
+        self.client_app = Client()
+        self.client_app.login(username='testuser', password='testpass123')
+        Cliente.objects.create(cpf='12345678909', nome='José Conceição', nascimento=date(1960, 1, 1), prioridade=False)
+        Cliente.objects.create(cpf='98765432100', nome='Maria Souza', nascimento=date(1970, 1, 1), prioridade=False)
+        Precatorio.objects.create(cnj='1234567-89.2023.8.26.0100', origem='Tribunal de Justiça', valor_de_face=1.0)
+
+    def test_clientes_name_filter_ignores_accents(self):
+        response = self.client_app.get(reverse('clientes'), {'nome': 'jose conceicao'})
+        self.assertEqual([c.cpf for c in response.context['clientes']], ['12345678909'])
+
+    def test_precatorios_origem_filter_ignores_accents(self):
+        response = self.client_app.get(reverse('precatorios'), {'origem': 'JUSTICA'})
+        self.assertEqual(len(response.context['precatorios']), 1)
+
+
+class TrigramIndexesTest(TestCase):
+    """Tests for the PostgreSQL-only index helpers"""
+
+    INDEXES = [
+        TrigramIndex('precapp_cliente_nome_busca_trgm', 'Cliente', 'nome_busca'),
+        TrigramIndex('precapp_diligencias_descricao_trgm', 'Diligencias', 'UPPER("descricao")'),
+    ]
+
+    def test_noop_on_sqlite(self):
+        schema_editor = mock.Mock(connection=connection)
+        create_trigram_indexes(apps, schema_editor, self.INDEXES)
+        if connection.vendor != 'postgresql':
+            schema_editor.execute.assert_not_called()
+
+    def test_postgresql_statements(self):
+        schema_editor = mock.Mock()
+        schema_editor.connection.vendor = 'postgresql'
+        schema_editor.quote_name.side_effect = lambda name: f'"{name}"'
+
+        create_trigram_indexes(apps, schema_editor, self.INDEXES)
+
+        statements = [call.args[0] for call in schema_editor.execute.call_args_list]
+        self.assertEqual(statements[0], 'CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        self.assertEqual(
+            statements[1],
+            'CREATE INDEX IF NOT EXISTS "precapp_cliente_nome_busca_trgm" '
+            'ON "precapp_cliente" USING gin (("nome_busca") gin_trgm_ops)'
+        )
+        self.assertIn('USING gin ((UPPER("descricao")) gin_trgm_ops)', statements[2])
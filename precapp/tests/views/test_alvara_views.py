@@ -504,7 +504,7 @@ class AlvarasViewTest(TestCase):
         
         # Test available_fases (should include alvara and ambos types)
         available_fases = context['available_fases']
-        fase_tipos = set(available_fases.values_list('tipo', flat=True))
+        fase_tipos = {fase.tipo for fase in available_fases}
         self.assertTrue(fase_tipos.issubset({'alvara', 'ambos'}))
         self.assertIn(self.fase_alvara, available_fases)
         self.assertIn(self.fase_ambos, available_fases)
@@ -465,12 +465,51 @@ class ClientesViewTest(TestCase):
         self.assertEqual(context['current_requerimento_prioridade'], 'deferido')
         self.assertEqual(context['current_precatorio'], '1234567')
     
+    def test_clientes_view_priority_requerimentos_batched(self):
+        """Test that priority requerimentos do not add queries per listed client"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        self.client.login(username='testuser', password='testpass123')
+        self.client.get(self.clientes_url)  # Load the catalog cache (catalog.py) first
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(self.clientes_url)
+        
+        # Give every client (and a few new ones) a priority requerimento
+        for i, cliente in enumerate([self.cliente3, self.cliente4]):
+            Requerimento.objects.create(
+                cliente=cliente, precatorio=self.precatorio2, valor=1000.00 * (i + 1),
+                desagio=0.0, pedido=self.pedido_prioridade, fase=self.fase_deferido
+            )
+        for i in range(5):
+            cliente = Cliente.objects.create(
+                cpf=f'9990000000{i}', nome=f'Cliente Extra {i}', nascimento=date(1950, 1, 1), prioridade=True
+            )
+            self.precatorio2.clientes.add(cliente)
+            Requerimento.objects.create(
+                cliente=cliente, precatorio=self.precatorio2, valor=1000.00,
+                desagio=0.0, pedido=self.pedido_prioridade, fase=self.fase_deferido
+            )
+        
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get(self.clientes_url)
+        
+        self.assertEqual(len(after), len(before))
+        clientes = {cliente.cpf: cliente for cliente in response.context['clientes']}
+        self.assertEqual(len(clientes), 9)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                [req.fase.nome for req in clientes[self.cliente1.cpf].get_priority_requerimentos()],
+                ['Deferido']
+            )
+            self.assertEqual(clientes[self.cliente3.cpf].get_priority_requerimentos()[0].pedido.nome, 'Prioridade por idade')
+    
     def test_clientes_view_prefetch_optimization(self):
         """Test that queries are optimized with proper prefetch_related"""
         self.client.login(username='testuser', password='testpass123')
         
         # Monitor database queries to ensure optimization
-        with self.assertNumQueries(18):  # Expected queries include auth, counts, main query, and prefetched data
+        with self.assertNumQueries(12):  # Expected queries include auth, counts, main query, and prefetched data (priority requerimentos in one batch)
             response = self.client.get(self.clientes_url)
         
         self.assertEqual(response.status_code, 200)
@@ -0,0 +1,174 @@
+"""
+Test cases for keyset (cursor) pagination of the list views
+"""
+
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from precapp.models import Cliente, Diligencias, TipoDiligencia
+from precapp.pagination import CursorPaginator, cached_count
+
+
+class CursorPaginatorTest(TestCase):
+    """Tests for CursorPaginator over a non-unique leading ordering field"""
+
+    def setUp(self):
+        cache.clear()
+        # Duplicate names make the cpf tie-breaker decide the order
+        for i in range(7):
+            Cliente.objects.create(
+                cpf=f'{i:011d}',
+                nome=f'Cliente {i // 2}',
+                nascimento=date(1960, 1, 1),
+                prioridade=False
+            )
+        self.expected = list(Cliente.objects.order_by('nome', 'cpf').values_list('cpf', flat=True))
+
+    def walk_forward(self, paginator):
+        pages, page = [], paginator.get_page()
+        pages.append(page)
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor)
+            pages.append(page)
+        return pages
+
+    def test_forward_pages_cover_every_row_once(self):
+        """Test that following next cursors visits all rows in order"""
+        paginator = CursorPaginator(Cliente.objects.all(), 3, ('nome', 'cpf'))
+        pages = self.walk_forward(paginator)
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([c.cpf for page in pages for c in page], self.expected)
+        self.assertFalse(pages[0].has_previous())
+        self.assertTrue(pages[-1].has_previous())
+        self.assertFalse(pages[-1].has_next())
+
+    def test_previous_cursor_returns_same_rows(self):
+        """Test that going back from a page yields exactly the page before it"""
+        paginator = CursorPaginator(Cliente.objects.all(), 3, ('nome', 'cpf'))
+        pages = self.walk_forward(paginator)
+
+        previous = paginator.get_page(pages[2].previous_cursor)
+        self.assertEqual([c.cpf for c in previous], [c.cpf for c in pages[1]])
+        self.assertTrue(previous.has_next())
+        self.assertTrue(previous.has_previous())
+
+        first = paginator.get_page(previous.previous_cursor)
+        self.assertEqual([c.cpf for c in first], self.expected[:3])
+        self.assertFalse(first.has_previous())
+
+    def test_descending_ordering(self):
+        """Test keyset filtering on descending fields with an id tie-breaker"""
+        tipo = TipoDiligencia.objects.create(nome='Documentação', ativo=True)
+        cliente = Cliente.objects.first()
+        for i in range(5):
+            Diligencias.objects.create(
+                cliente=cliente, tipo=tipo, data_final=date.today() + timedelta(days=i),
+                criado_por='Test User', urgencia='media'
+            )
+        # Identical timestamps: only -id can order them
+        Diligencias.objects.update(data_criacao=timezone.now())
+
+        paginator = CursorPaginator(Diligencias.objects.all(), 2, ('-data_criacao', '-id'))
+        ids = [d.id for page in self.walk_forward(paginator) for d in page]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        self.assertEqual(len(ids), 5)
+
+    def test_invalid_or_foreign_cursor_returns_first_page(self):
+        """Test that tampered tokens and tokens of another ordering are ignored"""
+        paginator = CursorPaginator(Cliente.objects.all(), 3, ('nome', 'cpf'))
+        second = paginator.get_page(paginator.get_page().next_cursor)
+        other = CursorPaginator(Cliente.objects.all(), 3, ('cpf',))
+
+        for token in ('garbage', second.next_cursor + 'x', other.get_page().next_cursor):
+            page = paginator.get_page(token)
+            self.assertEqual([c.cpf for c in page], self.expected[:3])
+
+    def test_each_page_is_one_query(self):
+        """Test that a page costs a single query once the count is cached"""
+        paginator = CursorPaginator(Cliente.objects.all(), 3, ('nome', 'cpf'))
+        token = paginator.get_page().next_cursor
+        with self.assertNumQueries(1):
+            list(paginator.get_page(token))
+
+    def test_count_is_cached_per_filter(self):
+        """Test that totals are cached per SQL statement"""
+        queryset = Cliente.objects.filter(nome__startswith='Cliente')
+        self.assertEqual(cached_count(queryset), 7)
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_count(Cliente.objects.filter(nome__startswith='Cliente')), 7)
+        with self.assertNumQueries(1):
+            self.assertEqual(cached_count(Cliente.objects.filter(nome='Cliente 0')), 2)
+
+
+class CursorPaginationViewTest(TestCase):
+    """Tests for the list views in cursor pagination mode"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client_app = Client()
+        self.client_app.login(username='testuser', password='testpass123')
+        for i in range(15):
+            Cliente.objects.create(
+                cpf=f'{i:011d}',
+                nome=f'Cliente {i:02d}',
+                nascimento=date(1980, 1, 1),
+                prioridade=False
+            )
+
+    def test_offset_mode_is_default(self):
+        """Test that the numbered paginator is kept unless cursor mode is requested"""
+        response = self.client_app.get(reverse('clientes'), {'per_page': 10})
+        self.assertFalse(response.context['cursor_mode'])
+        self.assertEqual(response.context['page_obj'].number, 1)
+        self.assertEqual([c.nome for c in response.context['page_obj']], [f'Cliente {i:02d}' for i in range(10)])
+
+    def test_clientes_cursor_navigation(self):
+        """Test next and previous links of the client list in cursor mode"""
+        url = reverse('clientes')
+        response = self.client_app.get(url, {'paginacao': 'cursor', 'per_page': 10})
+        page = response.context['page_obj']
+
+        self.assertTrue(response.context['cursor_mode'])
+        self.assertEqual([c.nome for c in page], [f'Cliente {i:02d}' for i in range(10)])
+        self.assertContains(response, 'cursor=')
+        self.assertContains(response, 'Mostrando 10 de 15 clientes')
+
+        response = self.client_app.get(url, {'paginacao': 'cursor', 'per_page': 10, 'cursor': page.next_cursor})
+        page = response.context['page_obj']
+        self.assertEqual([c.nome for c in page], [f'Cliente {i:02d}' for i in range(10, 15)])
+        self.assertFalse(page.has_next())
+
+        response = self.client_app.get(url, {'paginacao': 'cursor', 'per_page': 10, 'cursor': page.previous_cursor})
+        self.assertEqual(len(response.context['page_obj']), 10)
+
+    @override_settings(LIST_PAGINATION_MODE='cursor')
+    def test_setting_enables_cursor_mode(self):
+        """Test that LIST_PAGINATION_MODE switches every list view and ?paginacao overrides it"""
+        for name in ('precatorios', 'clientes', 'alvaras', 'requerimentos', 'diligencias_list'):
+            response = self.client_app.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.context['cursor_mode'], name)
+
+        response = self.client_app.get(reverse('clientes'), {'paginacao': 'offset'})
+        self.assertFalse(response.context['cursor_mode'])
+
+    def test_cursor_page_skips_offset_and_count_queries(self):
+        """Test that a deep cursor page uses a keyset filter instead of OFFSET"""
+        url = reverse('clientes')
+        first = self.client_app.get(url, {'paginacao': 'cursor', 'per_page': 10}).context['page_obj']
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client_app.get(url, {'paginacao': 'cursor', 'per_page': 10, 'cursor': first.next_cursor})
+
+        page_queries = [q['sql'] for q in queries if 'FROM "precapp_cliente"' in q['sql'] and 'LIMIT 11' in q['sql']]
+        self.assertEqual(len(page_queries), 1)
+        self.assertNotIn('OFFSET', page_queries[0])
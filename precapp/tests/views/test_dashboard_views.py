@@ -4,11 +4,12 @@ Dashboard View Tests
 Tests for dashboard-related views including:
 - HomeViewTest: Dashboard statistics and calculations
 
-Total tests: 15 (15 HomeViewTest)
+Total tests: 19 (13 HomeViewTest, 6 DashboardStatisticsCacheTest)
 Test classes migrated: 1
 """
 
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
+from django.core.cache import caches
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.utils import timezone
@@ -17,6 +18,13 @@ from precapp.models import (
     Precatorio, Cliente, Alvara, Requerimento, Fase, 
     FaseHonorariosContratuais, TipoDiligencia, Diligencias, PedidoRequerimento
 )
+from precapp.dashboard import compute_dashboard_statistics, get_dashboard_cache, get_dashboard_statistics
+
+
+DASHBOARD_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'dashboard-tests'},
+}
 
 
 class HomeViewTest(TestCase):
@@ -305,7 +313,7 @@ class HomeViewTest(TestCase):
         self.client_app.login(username='testuser', password='testpass123')
         
         # Monitor database queries
-        with self.assertNumQueries(22):  # Updated expected number based on actual queries including PedidoRequerimento
+        with self.assertNumQueries(15):  # One aggregate per table for the counters, plus recent activity
             response = self.client_app.get(self.home_url)
         
         self.assertEqual(response.status_code, 200)
@@ -485,3 +493,84 @@ class HomeViewTest(TestCase):
         # Urgent and overdue should have overlap but not exceed total
         self.assertLessEqual(context['diligencias_urgentes'], context['diligencias_pendentes'])
         self.assertLessEqual(context['diligencias_atrasadas'], context['diligencias_pendentes'])
+
+
+@override_settings(CACHES=DASHBOARD_CACHES, DASHBOARD_CACHE_ALIAS='shared')
+class DashboardStatisticsCacheTest(TestCase):
+    """Tests for the cached dashboard counters in precapp.dashboard"""
+
+    def setUp(self):
+        get_dashboard_cache().clear()
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client_app = Client()
+        self.client_app.login(username='testuser', password='testpass123')
+        self.tipo = TipoDiligencia.objects.create(nome='Documentação', ativo=True, ordem=1)
+        self.cliente = Cliente.objects.create(
+            nome='Cliente Cache', cpf='12345678909', nascimento='1950-01-01', prioridade=True
+        )
+        self.precatorio = Precatorio.objects.create(
+            cnj='1234567-89.2023.4.05.0001', orcamento=2023, origem='Tribunal', valor_de_face=1000.0
+        )
+        Diligencias.objects.create(
+            cliente=self.cliente, tipo=self.tipo, data_final=timezone.now().date() - timedelta(days=1),
+            urgencia='alta', criado_por='Test User'
+        )
+
+    def test_counters_use_one_query_per_table(self):
+        with self.assertNumQueries(6):
+            statistics = compute_dashboard_statistics()
+
+        self.assertEqual(statistics['total_precatorios'], 1)
+        self.assertEqual(statistics['total_valor_precatorios'], 1000.0)
+        self.assertEqual(statistics['diligencias_pendentes'], 1)
+        self.assertEqual(statistics['diligencias_atrasadas'], 1)
+        self.assertEqual(statistics['diligencias_urgentes'], 1)
+        self.assertEqual(statistics['diligencias_concluidas'], 0)
+
+    def test_cached_counters_skip_queries(self):
+        """Test that a second home page view only queries the recent activity lists"""
+        get_dashboard_statistics()
+        with self.assertNumQueries(0):
+            get_dashboard_statistics()
+
+        self.client_app.get(reverse('home'))
+        with self.assertNumQueries(7):  # session, user and the recent activity lists
+            response = self.client_app.get(reverse('home'))
+        self.assertEqual(response.context['total_precatorios'], 1)
+
+    def test_save_and_delete_invalidate_cache(self):
+        self.assertEqual(get_dashboard_statistics()['total_precatorios'], 1)
+
+        outro = Precatorio.objects.create(
+            cnj='1234567-89.2023.4.05.0002', orcamento=2023, origem='Tribunal', valor_de_face=500.0
+        )
+        statistics = get_dashboard_statistics()
+        self.assertEqual(statistics['total_precatorios'], 2)
+        self.assertEqual(statistics['total_valor_precatorios'], 1500.0)
+
+        outro.delete()
+        self.assertEqual(get_dashboard_statistics()['total_precatorios'], 1)
+
+    def test_diligencia_changes_invalidate_cache(self):
+        self.assertEqual(get_dashboard_statistics()['diligencias_concluidas'], 0)
+
+        diligencia = Diligencias.objects.get()
+        diligencia.concluida = True
+        diligencia.save()
+
+        statistics = get_dashboard_statistics()
+        self.assertEqual(statistics['diligencias_concluidas'], 1)
+        self.assertEqual(statistics['diligencias_pendentes'], 0)
+
+    def test_counters_are_shared_between_processes(self):
+        """Test that the counters live in the shared cache, not in the process"""
+        get_dashboard_statistics()
+        caches['default'].clear()
+        with self.assertNumQueries(0):
+            get_dashboard_statistics()
+
+    @override_settings(DASHBOARD_CACHE_SECONDS=0)
+    def test_cache_can_be_disabled(self):
+        get_dashboard_statistics()
+        with self.assertNumQueries(6):
+            get_dashboard_statistics()
@@ -27,8 +27,10 @@ class ExportPrecatoriosExcelViewTest(TestCase):
     
     def setUp(self):
         """Set up test data"""
-        self.user = User.objects.create_user(
+        # Exports are restricted to superusers
+        self.user = User.objects.create_superuser(
             username='testuser',
+            email='testuser@example.com',
             password='testpass123',
             first_name='Test',
             last_name='User'
@@ -202,6 +204,20 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         self.assertEqual(response.status_code, 302)  # Redirect to login
         self.assertIn('/login/', response.url)
     
+    def test_export_precatorios_requires_superuser(self):
+        """Test that regular users are redirected back to the list"""
+        User.objects.create_user(username='regular', password='testpass123')
+        client_regular = Client()
+        client_regular.login(username='regular', password='testpass123')
+        
+        response = client_regular.get(reverse('export_precatorios_excel'))
+        self.assertRedirects(response, reverse('precatorios'))
+    
+    def test_export_precatorios_is_streamed(self):
+        """Test that the workbook is streamed instead of built into the response"""
+        response = self.client_app.get(reverse('export_precatorios_excel'))
+        self.assertTrue(response.streaming)
+    
     def test_export_precatorios_authenticated_access(self):
         """Test that authenticated users can access export"""
         response = self.client_app.get(reverse('export_precatorios_excel'))
@@ -258,11 +274,11 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         response = self.client_app.get(reverse('export_precatorios_excel'))
         
         # Load Excel from response content
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Check worksheet names
-        expected_sheets = ['Precatórios', 'Clientes', 'Diligências', 'Requerimentos', 'Alvarás', 'Estatísticas']
+        expected_sheets = ['Precatórios', 'Clientes', 'Diligências', 'Requerimentos', 'Alvarás', 'Recebimentos', 'Estatísticas']
         self.assertEqual(workbook.sheetnames, expected_sheets)
         
         # Check each worksheet has headers
@@ -278,7 +294,7 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_precatorios_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Test Precatórios sheet headers
@@ -305,7 +321,7 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_precatorios_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Test Precatórios data
@@ -330,7 +346,7 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_precatorios_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Check statistics sheet
@@ -358,7 +374,7 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_precatorios_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Check Precatórios sheet currency formatting
@@ -376,7 +392,7 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_precatorios_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Check date formatting in various sheets
@@ -433,7 +449,7 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         from openpyxl import load_workbook
         import io
         
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         self.assertIn('Precatórios', workbook.sheetnames)
 
@@ -468,7 +484,7 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         
         # Response should have content
-        self.assertGreater(len(response.content), 1000)
+        self.assertGreater(len(b''.join(response.streaming_content)), 1000)
 
     # ==================== INTEGRATION TESTS ====================
     
@@ -486,7 +502,7 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_precatorios_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Check statistics sheet for user information
@@ -508,7 +524,7 @@ class ExportPrecatoriosExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_precatorios_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Verify all expected data is present across sheets
@@ -537,8 +553,10 @@ class ExportClientesExcelViewTest(TestCase):
     
     def setUp(self):
         """Set up test data"""
-        self.user = User.objects.create_user(
+        # Exports are restricted to superusers
+        self.user = User.objects.create_superuser(
             username='testuser',
+            email='testuser@example.com',
             password='testpass123',
             first_name='Test',
             last_name='User'
@@ -720,11 +738,11 @@ class ExportClientesExcelViewTest(TestCase):
         response = self.client_app.get(reverse('export_clientes_excel'))
         
         # Load Excel from response content
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Check worksheet names
-        expected_sheets = ['Clientes Detalhado', 'Resumo por Prioridade', 'Estatísticas Detalhadas']
+        expected_sheets = ['Clientes Detalhado', 'Resumo por Prioridade', 'Estatísticas Detalhadas', 'Diligências']
         self.assertEqual(workbook.sheetnames, expected_sheets)
         
         # Check each worksheet has headers
@@ -740,7 +758,7 @@ class ExportClientesExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_clientes_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Test Clientes Detalhado sheet headers
@@ -768,7 +786,7 @@ class ExportClientesExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_clientes_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Test Clientes Detalhado data
@@ -798,18 +816,20 @@ class ExportClientesExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_clientes_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         clientes_sheet = workbook['Clientes Detalhado']
         
+        # Same rule as the report: whole years of 365 days since birth
+        expected_age = (date.today() - self.cliente_prioritario.nascimento).days // 365
+        
         # Find cliente prioritario row and check age
-        for row in clientes_sheet.iter_rows(min_row=2, values_only=True):
-            if row[1] == self.cliente_prioritario.nome:
-                idade_str = row[3]  # Idade column
-                # Born in 1950, should be 74-75 years (depending on current date vs birthday)
-                self.assertTrue('74 anos' in str(idade_str) or '75 anos' in str(idade_str))
-                break
+        ages = [
+            row[3] for row in clientes_sheet.iter_rows(min_row=2, values_only=True)  # Idade column
+            if row[1] == self.cliente_prioritario.nome
+        ]
+        self.assertEqual(ages, [f'{expected_age} anos'])
     
     def test_export_clientes_priority_summary(self):
         """Test priority summary calculations"""
@@ -817,7 +837,7 @@ class ExportClientesExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_clientes_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Test Resumo por Prioridade data
@@ -854,7 +874,7 @@ class ExportClientesExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_clientes_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Check statistics sheet
@@ -881,7 +901,7 @@ class ExportClientesExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_clientes_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         stats_sheet = workbook['Estatísticas Detalhadas']
@@ -902,7 +922,7 @@ class ExportClientesExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_clientes_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         clientes_sheet = workbook['Clientes Detalhado']
@@ -931,7 +951,7 @@ class ExportClientesExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_clientes_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         clientes_sheet = workbook['Clientes Detalhado']
@@ -988,7 +1008,7 @@ class ExportClientesExcelViewTest(TestCase):
         from openpyxl import load_workbook
         import io
         
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         self.assertIn('Clientes Detalhado', workbook.sheetnames)
 
@@ -1008,7 +1028,7 @@ class ExportClientesExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_clientes_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         # Check statistics sheet for user information
@@ -1030,7 +1050,7 @@ class ExportClientesExcelViewTest(TestCase):
         import io
         
         response = self.client_app.get(reverse('export_clientes_excel'))
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(b''.join(response.streaming_content))
         workbook = load_workbook(excel_file)
         
         stats_sheet = workbook['Estatísticas Detalhadas']
@@ -1066,13 +1086,14 @@ class ExportClientesExcelViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         
         # Response should have content
-        self.assertGreater(len(response.content), 1000)
+        content = b''.join(response.streaming_content)
+        self.assertGreater(len(content), 1000)
         
         # Verify Excel structure remains intact
         from openpyxl import load_workbook
         import io
         
-        excel_file = io.BytesIO(response.content)
+        excel_file = io.BytesIO(content)
         workbook = load_workbook(excel_file)
-        expected_sheets = ['Clientes Detalhado', 'Resumo por Prioridade', 'Estatísticas Detalhadas']
+        expected_sheets = ['Clientes Detalhado', 'Resumo por Prioridade', 'Estatísticas Detalhadas', 'Diligências']
         self.assertEqual(workbook.sheetnames, expected_sheets)
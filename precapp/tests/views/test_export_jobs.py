@@ -0,0 +1,104 @@
+"""
+Test cases for the background export job views
+"""
+
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from openpyxl import load_workbook
+import io
+
+from precapp.exports import process_pending_jobs
+from precapp.models import Cliente, ExportJob
+
+
+class ExportJobViewsTest(TestCase):
+    """Tests for enqueueing, polling and downloading export jobs"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.user = User.objects.create_superuser(
+            username='admin', password='testpass123', email='admin@test.com'
+        )
+        self.regular_user = User.objects.create_user(username='regular', password='testpass123')
+        Cliente.objects.create(cpf='12345678909', nome='Cliente Teste', prioridade=False)
+
+        self.client_app = Client()
+        self.client_app.login(username='admin', password='testpass123')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_post_enqueues_instead_of_exporting(self):
+        """Test that POSTing to the export views creates a pending job"""
+        response = self.client_app.post(reverse('export_clientes_excel'))
+        self.assertRedirects(response, reverse('export_jobs'))
+
+        job = ExportJob.objects.get()
+        self.assertEqual(job.tipo, 'clientes')
+        self.assertEqual(job.status, ExportJob.STATUS_PENDENTE)
+        self.assertEqual(job.solicitado_por, self.user)
+
+    def test_post_requires_superuser(self):
+        """Test that regular users cannot enqueue exports"""
+        client = Client()
+        client.login(username='regular', password='testpass123')
+        response = client.post(reverse('export_precatorios_excel'))
+
+        self.assertRedirects(response, reverse('precatorios'))
+        self.assertFalse(ExportJob.objects.exists())
+
+    def test_jobs_page_lists_jobs(self):
+        """Test that the jobs page shows queued jobs and polls unfinished ones"""
+        self.client_app.post(reverse('export_precatorios_excel'))
+        response = self.client_app.get(reverse('export_jobs'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Relatório completo do sistema')
+        self.assertTrue(response.context['has_pending_jobs'])
+
+    def test_status_and_download_after_processing(self):
+        """Test the polling endpoint and download once the worker finished"""
+        self.client_app.post(reverse('export_clientes_excel'))
+        job = ExportJob.objects.get()
+
+        status = self.client_app.get(reverse('export_job_status', args=[job.pk])).json()
+        self.assertEqual(status['status'], 'pendente')
+        self.assertIsNone(status['download_url'])
+
+        process_pending_jobs()
+
+        status = self.client_app.get(reverse('export_job_status', args=[job.pk])).json()
+        self.assertEqual(status['status'], 'concluido')
+        self.assertTrue(status['finalizado'])
+        self.assertEqual(status['linhas_por_planilha']['Clientes Detalhado'], 1)
+        self.assertEqual(status['download_url'], reverse('export_job_download', args=[job.pk]))
+
+        response = self.client_app.get(status['download_url'])
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content)
+        self.assertIn('Clientes Detalhado', load_workbook(io.BytesIO(content)).sheetnames)
+
+    def test_download_unfinished_job_returns_404(self):
+        """Test that a pending job cannot be downloaded"""
+        self.client_app.post(reverse('export_clientes_excel'))
+        job = ExportJob.objects.get()
+
+        response = self.client_app.get(reverse('export_job_download', args=[job.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_status_requires_superuser(self):
+        """Test that the polling endpoint is restricted to superusers"""
+        job = ExportJob.objects.create(tipo='clientes', solicitado_por=self.user)
+        client = Client()
+        client.login(username='regular', password='testpass123')
+
+        response = client.get(reverse('export_job_status', args=[job.pk]))
+        self.assertEqual(response.status_code, 403)
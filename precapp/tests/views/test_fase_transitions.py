@@ -0,0 +1,149 @@
+"""
+Test cases for the bulk fase transitions of alvarás and requerimentos
+"""
+
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from precapp.models import (
+    Alvara, Cliente, Fase, FaseHonorariosContratuais, PedidoRequerimento, Precatorio, Requerimento
+)
+from precapp.transitions import bulk_transition_fase
+
+
+class FaseTransitionTestMixin:
+    """Shared fixtures: one precatório with two clients, alvarás and requerimentos"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser', password='testpass123', first_name='Ana', last_name='Souza'
+        )
+        self.client_app = Client()
+        self.client_app.login(username='testuser', password='testpass123')
+
+        self.precatorio = Precatorio.objects.create(
+            cnj='1234567-89.2023.8.26.0100', origem='Tribunal', valor_de_face=100000.0
+        )
+        self.jose = Cliente.objects.create(
+            cpf='12345678909', nome='José da Silva', nascimento=date(1950, 1, 1), prioridade=True
+        )
+        self.maria = Cliente.objects.create(
+            cpf='98765432100', nome='Maria Santos', nascimento=date(1970, 1, 1), prioridade=False
+        )
+        self.precatorio.clientes.add(self.jose, self.maria)
+
+        self.aguardando = Fase.objects.create(nome='Aguardando Depósito', tipo='ambos', ativa=True)
+        self.depositado = Fase.objects.create(nome='Depositado', tipo='alvara', ativa=True)
+        self.deferido = Fase.objects.create(nome='Deferido', tipo='requerimento', ativa=True)
+        self.inativa = Fase.objects.create(nome='Arquivada', tipo='ambos', ativa=False)
+        self.hon_pago = FaseHonorariosContratuais.objects.create(nome='Pago', ativa=True)
+
+        self.alvaras = [
+            Alvara.objects.create(
+                precatorio=self.precatorio, cliente=cliente, valor_principal=1000.0,
+                honorarios_contratuais=100.0, honorarios_sucumbenciais=0.0, tipo='prioridade',
+                fase=self.aguardando
+            )
+            for cliente in (self.jose, self.maria)
+        ]
+        pedido = PedidoRequerimento.objects.create(nome='Prioridade por idade')
+        self.requerimentos = [
+            Requerimento.objects.create(
+                precatorio=self.precatorio, cliente=cliente, pedido=pedido, fase=self.aguardando,
+                valor=1000.0, desagio=0.0
+            )
+            for cliente in (self.jose, self.maria)
+        ]
+
+
+class BulkTransitionFaseTest(FaseTransitionTestMixin, TestCase):
+    """Tests for bulk_transition_fase"""
+
+    def test_single_update_with_audit_fields(self):
+        with self.assertNumQueries(2):  # Fase availability check + UPDATE
+            updated = bulk_transition_fase(Alvara.objects.all(), self.depositado, user=self.user)
+
+        self.assertEqual(updated, 2)
+        for alvara in Alvara.objects.all():
+            self.assertEqual(alvara.fase, self.depositado)
+            self.assertEqual(alvara.fase_alterada_por, 'Ana Souza')
+            self.assertIsNotNone(alvara.fase_ultima_alteracao)
+
+    def test_records_already_in_fase_are_untouched(self):
+        Alvara.objects.filter(pk=self.alvaras[0].pk).update(fase=self.depositado, fase_alterada_por='Outro')
+
+        self.assertEqual(bulk_transition_fase(Alvara.objects.all(), self.depositado), 1)
+        self.assertEqual(Alvara.objects.get(pk=self.alvaras[0].pk).fase_alterada_por, 'Outro')
+        self.assertEqual(Alvara.objects.get(pk=self.alvaras[1].pk).fase_alterada_por, 'System')
+
+    def test_honorarios_field(self):
+        updated = bulk_transition_fase(
+            Alvara.objects.filter(cliente=self.jose), self.hon_pago, field='fase_honorarios_contratuais'
+        )
+        self.assertEqual(updated, 1)
+        alvara = Alvara.objects.get(cliente=self.jose)
+        self.assertEqual(alvara.fase_honorarios_contratuais, self.hon_pago)
+        self.assertIsNotNone(alvara.fase_honorarios_ultima_alteracao)
+        self.assertEqual(alvara.fase, self.aguardando)
+
+    def test_unavailable_fase_is_rejected(self):
+        for queryset, fase, field in [
+            (Alvara.objects.all(), self.inativa, 'fase'),
+            (Alvara.objects.all(), self.deferido, 'fase'),
+            (Requerimento.objects.all(), self.depositado, 'fase'),
+            (Alvara.objects.all(), self.depositado, 'fase_honorarios_contratuais'),
+            (Requerimento.objects.all(), self.hon_pago, 'fase_honorarios_contratuais'),
+        ]:
+            with self.assertRaises(ValidationError):
+                bulk_transition_fase(queryset, fase, field=field)
+        self.assertFalse(Alvara.objects.exclude(fase=self.aguardando).exists())
+
+
+class FaseTransitionViewTest(FaseTransitionTestMixin, TestCase):
+    """Tests for the bulk fase transition views"""
+
+    def test_requires_login_and_post(self):
+        url = reverse('alvaras_transicao_fase')
+        self.assertEqual(self.client_app.get(url).status_code, 405)
+        self.client_app.logout()
+        self.assertEqual(self.client_app.post(url).status_code, 302)
+        self.assertFalse(Alvara.objects.filter(fase=self.depositado).exists())
+
+    def test_selected_alvaras(self):
+        response = self.client_app.post(reverse('alvaras_transicao_fase'), {
+            'destino': f'fase:{self.depositado.id}',
+            'selecionados': [self.alvaras[0].id],
+            'nome': 'José',
+        })
+        self.assertRedirects(response, reverse('alvaras') + '?nome=Jos%C3%A9')
+        self.assertEqual(list(Alvara.objects.filter(fase=self.depositado)), [self.alvaras[0]])
+
+    def test_filtered_requerimentos(self):
+        """Test that escopo=filtro moves every requerimento matching the list filters"""
+        response = self.client_app.post(reverse('requerimentos_transicao_fase'), {
+            'destino': f'fase:{self.deferido.id}',
+            'escopo': 'filtro',
+            'cliente': 'Maria',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(list(Requerimento.objects.filter(fase=self.deferido)), [self.requerimentos[1]])
+        self.assertEqual(Requerimento.objects.get(pk=self.requerimentos[1].pk).fase_alterada_por, 'Ana Souza')
+
+    def test_invalid_destino(self):
+        for destino in ['', f'fase:{self.inativa.id}', f'tipo:{self.depositado.id}', 'fase:abc']:
+            response = self.client_app.post(reverse('alvaras_transicao_fase'), {
+                'destino': destino,
+                'selecionados': [alvara.id for alvara in self.alvaras],
+            }, follow=True)
+            self.assertContains(response, 'Selecione uma fase de destino válida.')
+        self.assertFalse(Alvara.objects.exclude(fase=self.aguardando).exists())
+
+    def test_list_shows_transition_form(self):
+        response = self.client_app.get(reverse('alvaras'))
+        self.assertContains(response, 'id="transicaoFaseForm"')
+        self.assertContains(response, f'value="fase_honorarios_contratuais:{self.hon_pago.id}"')
+        self.assertNotContains(response, f'value="fase:{self.deferido.id}"')
@@ -0,0 +1,135 @@
+"""
+Test cases for the global search endpoint
+"""
+
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import OperationalError
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from precapp.models import (
+    Alvara, Cliente, ContaBancaria, Fase, PedidoRequerimento, Precatorio, Recebimentos, Requerimento
+)
+from precapp.search import global_search
+from precapp.search.unified import search_precatorios
+
+
+class GlobalSearchTest(TestCase):
+    """Tests for global_search and global_search_view"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client_app = Client()
+        self.client_app.login(username='testuser', password='testpass123')
+        self.url = reverse('global_search')
+
+        self.precatorio = Precatorio.objects.create(
+            cnj='1234567-89.2023.8.26.0100', origem='Tribunal de São Paulo', valor_de_face=100000.0
+        )
+        self.outro = Precatorio.objects.create(
+            cnj='7654321-00.2023.8.26.0100', origem='Vara de Conceição', valor_de_face=5000.0
+        )
+        self.cliente = Cliente.objects.create(
+            cpf='12345678909', nome='José Conceição', nascimento=date(1950, 1, 1), prioridade=True
+        )
+        self.precatorio.clientes.add(self.cliente)
+
+        fase = Fase.objects.create(nome='Aguardando Depósito', tipo='ambos', ativa=True)
+        pedido = PedidoRequerimento.objects.create(nome='Prioridade por idade')
+        Requerimento.objects.create(
+            precatorio=self.precatorio, cliente=self.cliente, pedido=pedido, fase=fase,
+            valor=1000.0, desagio=0.0, cnj='9999999-11.2024.8.26.0100'
+        )
+        self.alvara = Alvara.objects.create(
+            precatorio=self.precatorio, cliente=self.cliente, valor_principal=50000.0,
+            honorarios_contratuais=0.0, honorarios_sucumbenciais=0.0, tipo='prioridade', fase=fase
+        )
+        conta = ContaBancaria.objects.create(
+            banco='Banco do Brasil', tipo_de_conta='corrente', agencia='1234-5', conta='12345678-9'
+        )
+        Recebimentos.objects.create(
+            numero_documento='REC-2023-001234', alvara=self.alvara, data=date(2024, 1, 10),
+            conta_bancaria=conta, valor=Decimal('1500.00'), tipo='Hon. contratuais'
+        )
+
+    def search(self, q, **params):
+        response = self.client_app.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_requires_login(self):
+        self.client_app.logout()
+        response = self.client_app.get(self.url, {'q': 'José'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_short_query_returns_nothing(self):
+        data = self.search('Jo')
+        self.assertEqual(data['results'], [])
+        self.assertEqual(data['min_length'], 3)
+
+    def test_cliente_by_name_without_accents_and_by_formatted_cpf(self):
+        for termo in ('jose conceicao', '123.456.789-09'):
+            data = self.search(termo)
+            clientes = [r for r in data['results'] if r['tipo'] == 'cliente']
+            self.assertEqual([r['id'] for r in clientes], ['12345678909'], termo)
+            self.assertEqual(clientes[0]['url'], reverse('cliente_detail', args=['12345678909']))
+
+    def test_typed_results_across_entities(self):
+        """Test that one name finds the client, the alvará and the precatório origem"""
+        data = self.search('conceicao')
+        tipos = {r['tipo'] for r in data['results']}
+        self.assertEqual(tipos, {'cliente', 'alvara', 'precatorio'})
+        self.assertEqual(data['counts']['recebimentos'], 0)
+        for result in data['results']:
+            self.assertEqual(set(result), {'tipo', 'id', 'titulo', 'subtitulo', 'url', 'rank'})
+
+    def test_requerimento_and_recebimento_lookups(self):
+        requerimentos = [r for r in self.search('9999999-11')['results'] if r['tipo'] == 'requerimento']
+        self.assertEqual(len(requerimentos), 1)
+        self.assertEqual(requerimentos[0]['url'], reverse('precatorio_detalhe', args=[self.precatorio.cnj]))
+
+        recebimentos = [r for r in self.search('rec-2023')['results'] if r['tipo'] == 'recebimento']
+        self.assertEqual([r['id'] for r in recebimentos], ['REC2023001234'])
+
+    def test_exact_match_ranks_first(self):
+        data = self.search(self.precatorio.cnj)
+        self.assertEqual(data['results'][0]['tipo'], 'precatorio')
+        self.assertEqual(data['results'][0]['id'], self.precatorio.cnj)
+        self.assertEqual(data['results'][0]['rank'], 3)
+        self.assertEqual(data['results'], sorted(data['results'], key=lambda r: -r['rank']))
+
+    def test_per_entity_limit_is_capped(self):
+        for i in range(30):
+            Precatorio.objects.create(cnj=f'55555{i:02d}-00.2023.8.26.0100', origem='Teste', valor_de_face=1.0)
+
+        self.assertEqual(self.search('55555', limit=3)['counts']['precatorios'], 3)
+        with override_settings(GLOBAL_SEARCH_MAX_LIMIT=10):
+            self.assertEqual(self.search('55555', limit=1000)['counts']['precatorios'], 10)
+
+    def test_budget_skips_remaining_entities(self):
+        """Test that entities not reached within the latency budget are reported as skipped"""
+        clock = iter([0.0, 0.0, 1.0, 1.0, 1.0, 1.0, 1.0])
+        with mock.patch('precapp.search.unified.time.monotonic', side_effect=lambda: next(clock)):
+            data = global_search('conceicao', budget_ms=500)
+
+        self.assertEqual(list(data['counts']), ['precatorios'])
+        self.assertEqual(data['skipped'], ['clientes', 'requerimentos', 'alvaras', 'recebimentos'])
+
+    def test_database_timeout_skips_entity(self):
+        def timeout(term, limit):
+            raise OperationalError('canceling statement due to statement timeout')
+
+        searchers = [('clientes', timeout), ('precatorios', search_precatorios)]
+        with mock.patch('precapp.search.unified.SEARCHERS', searchers):
+            data = global_search('conceicao')
+
+        self.assertEqual(data['skipped'], ['clientes'])
+        self.assertEqual(data['counts'], {'precatorios': 1})
+
+    def test_one_query_per_entity(self):
+        with self.assertNumQueries(5):
+            global_search('conceicao')
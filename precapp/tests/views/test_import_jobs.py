@@ -0,0 +1,192 @@
+"""
+Test cases for the background import job views
+"""
+
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import Workbook
+
+from precapp.imports import process_pending_jobs
+from precapp.management.commands.import_excel import Command as ImportExcelCommand
+from precapp.models import Cliente, ImportJob, Precatorio, Tipo
+
+
+def build_workbook(rows):
+    """Build an upload in the import_excel format: title row, header row, data rows."""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['Precatórios 2026'])
+    ws.append(['Origem', 'Tipo', 'CNJ', 'Orçamento', 'Destacado', 'Autor', 'CPF', 'Nascimento', 'Valor de Face'])
+    for row in rows:
+        ws.append(row)
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+class ImportJobViewsTest(TestCase):
+    """Tests for uploading, processing and polling import jobs"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, IMPORT_CHUNK_SIZE=2)
+        self.settings_override.enable()
+
+        Tipo.objects.create(nome='Alimentar', ativa=True)
+        self.user = User.objects.create_user(username='operador', password='testpass123')
+        self.other_user = User.objects.create_user(username='outro', password='testpass123')
+
+        self.client_app = Client()
+        self.client_app.login(username='operador', password='testpass123')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def upload(self, content, name='precatorios.xlsx'):
+        return self.client_app.post(
+            reverse('import_excel'), {'excel_file': SimpleUploadedFile(name, content)}
+        )
+
+    def test_upload_enqueues_instead_of_importing(self):
+        """Test that the upload only stores the file and creates a pending job"""
+        response = self.upload(build_workbook([
+            ['Vara', 'Alimentar', '1234567-89.2026.8.26.0001', 2026, 0, 'João Silva', '12345678909', None, 1000],
+        ]))
+
+        self.assertRedirects(response, reverse('import_jobs'))
+        job = ImportJob.objects.get()
+        self.assertEqual(job.status, ImportJob.STATUS_PENDENTE)
+        self.assertEqual(job.nome_arquivo, 'precatorios.xlsx')
+        self.assertEqual(job.solicitado_por, self.user)
+        self.assertFalse(Precatorio.objects.exists())
+
+    def test_worker_imports_and_records_progress(self):
+        """Test that the worker imports the file and stores a structured result"""
+        self.upload(build_workbook([
+            ['Vara', 'Alimentar', '1234567-89.2026.8.26.0001', 2026, 0, 'João Silva', '12345678909', None, 1000],
+            ['Vara', 'Alimentar', '1234567-89.2026.8.26.0002', 2026, 0, 'Maria Santos', '98765432100', None, 2000],
+            ['Vara', 'Alimentar', 'cnj-invalido', 2026, 0, 'Ana Souza', '11144477735', None, 3000],
+        ]))
+
+        [job] = process_pending_jobs()
+
+        self.assertEqual(job.status, ImportJob.STATUS_CONCLUIDO)
+        self.assertEqual(job.resultado, {'precatorios': 2, 'clientes': 2, 'requerimentos': 0})
+        self.assertEqual((job.linhas_processadas, job.total_linhas), (3, 3))
+        self.assertEqual(job.progresso, 100)
+        self.assertEqual(job.linhas_com_erro, 1)
+        self.assertIn('cnj-invalido', job.erros[0])
+        self.assertIsNotNone(job.linhas_por_segundo)
+        self.assertEqual(Precatorio.objects.count(), 2)
+        self.assertEqual(Cliente.objects.count(), 2)
+
+    def test_unreadable_file_marks_job_as_failed(self):
+        """Test that a broken upload is recorded as an error"""
+        self.upload(b'not a spreadsheet')
+
+        [job] = process_pending_jobs()
+
+        self.assertEqual(job.status, ImportJob.STATUS_ERRO)
+        self.assertTrue(job.mensagem_erro)
+        self.assertIsNotNone(job.concluido_em)
+
+    def test_missing_upload_leaves_no_temporary_file(self):
+        """Test that a copy failing before the import still removes the temporary file"""
+        self.upload(build_workbook([]))
+        job = ImportJob.objects.get()
+        job.arquivo.storage.delete(job.arquivo.name)
+
+        created = []
+
+        def mkstemp(*args, **kwargs):
+            created.append(tempfile.mkstemp(*args, **kwargs))
+            return created[-1]
+
+        with mock.patch('precapp.imports.jobs.tempfile.mkstemp', side_effect=mkstemp):
+            [job] = process_pending_jobs()
+
+        self.assertEqual(job.status, ImportJob.STATUS_ERRO)
+        [(handle, temp_path)] = created
+        self.assertFalse(os.path.exists(temp_path))
+
+    @override_settings(IMPORT_JOB_STALE_SECONDS=600)
+    def test_stale_job_is_requeued_and_resumed(self):
+        """Test that a job abandoned by a dead worker is run again from its checkpoint"""
+        self.upload(build_workbook([
+            ['Vara', 'Alimentar', '1234567-89.2026.8.26.0001', 2026, 0, 'João Silva', '12345678909', None, 1000],
+            ['Vara', 'Alimentar', '1234567-89.2026.8.26.0002', 2026, 0, 'Maria Santos', '98765432100', None, 2000],
+            ['Vara', 'Alimentar', '1234567-89.2026.8.26.0003', 2026, 0, 'Ana Souza', '11144477735', None, 3000],
+        ]))
+        original = ImportExcelCommand.process_sheet_data
+        chunks = []
+
+        def killed_on_second_chunk(command, df, *args, **kwargs):
+            chunks.append(len(df))
+            if len(chunks) == 2:
+                raise SystemExit('worker killed')  # Not caught by the job, like a dead process
+            return original(command, df, *args, **kwargs)
+
+        with mock.patch.object(ImportExcelCommand, 'process_sheet_data', killed_on_second_chunk):
+            with self.assertRaises(SystemExit):
+                process_pending_jobs()
+
+        job = ImportJob.objects.get()
+        self.assertEqual((job.status, job.linhas_processadas), (ImportJob.STATUS_PROCESSANDO, 2))
+
+        # Not stale yet: the job is left alone
+        self.assertEqual(process_pending_jobs(), [])
+
+        # A long run is not stale while it keeps reporting progress
+        ImportJob.objects.filter(pk=job.pk).update(iniciado_em=timezone.now() - timedelta(hours=2))
+        self.assertEqual(process_pending_jobs(), [])
+
+        ImportJob.objects.filter(pk=job.pk).update(atualizado_em=timezone.now() - timedelta(minutes=11))
+        [job] = process_pending_jobs()
+
+        self.assertEqual(job.status, ImportJob.STATUS_CONCLUIDO)
+        self.assertEqual(job.linhas_processadas, 3)
+        self.assertEqual(job.resultado['precatorios'], 3)
+        self.assertEqual(Precatorio.objects.count(), 3)
+
+    def test_status_endpoint(self):
+        """Test the polling endpoint payload"""
+        self.upload(build_workbook([]))
+        job = ImportJob.objects.get()
+
+        response = self.client_app.get(reverse('import_job_status', args=[job.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['status'], ImportJob.STATUS_PENDENTE)
+        self.assertFalse(data['finalizado'])
+        self.assertEqual(data['linhas_processadas'], 0)
+
+    def test_jobs_are_private_to_their_owner(self):
+        """Test that other users neither see nor poll someone else's job"""
+        self.upload(build_workbook([]))
+        job = ImportJob.objects.get()
+
+        client = Client()
+        client.login(username='outro', password='testpass123')
+        self.assertEqual(client.get(reverse('import_job_status', args=[job.pk])).status_code, 404)
+        self.assertNotContains(client.get(reverse('import_jobs')), 'precatorios.xlsx')
+
+    def test_jobs_page_lists_jobs(self):
+        """Test that the jobs page shows the upload and polls it"""
+        self.upload(build_workbook([]))
+
+        response = self.client_app.get(reverse('import_jobs'))
+
+        self.assertContains(response, 'precatorios.xlsx')
+        self.assertContains(response, '/importacoes/')
@@ -12,6 +12,8 @@ Test classes migrated: 4
 """
 
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.contrib.messages import get_messages
@@ -691,12 +693,12 @@ class PrecatorioDetalheViewTest(TestCase):
         
         # Check alvará phases include 'alvara' and 'ambos' types
         alvara_fases = response.context['alvara_fases']
-        alvara_tipos = set(alvara_fases.values_list('tipo', flat=True))
+        alvara_tipos = {fase.tipo for fase in alvara_fases}
         self.assertTrue(alvara_tipos.issubset({'alvara', 'ambos'}))
         
         # Check requerimento phases include 'requerimento' and 'ambos' types
         requerimento_fases = response.context['requerimento_fases']
-        requerimento_tipos = set(requerimento_fases.values_list('tipo', flat=True))
+        requerimento_tipos = {fase.tipo for fase in requerimento_fases}
         self.assertTrue(requerimento_tipos.issubset({'requerimento', 'ambos'}))
         
         # Check honorários phases only include active ones
@@ -2057,6 +2059,56 @@ class PrecatorioViewTest(TestCase):
         # Should count precatorios that have prioridade requerimentos
         self.assertEqual(context['prioritarios'], 2)  # precatorio3 and precatorio4
     
+    def test_statistics_single_aggregate_query(self):
+        """Test that statistics cost one query regardless of how many precatorios match"""
+        self.client_app.login(username='testuser', password='testpass123')
+        
+        self.client_app.get(self.precatorios_url)  # Load the catalog cache (catalog.py) first
+        with CaptureQueriesContext(connection) as before:
+            response = self.client_app.get(self.precatorios_url)
+        expected_valor = sum(p.valor_de_face for p in Precatorio.objects.all())
+        self.assertAlmostEqual(response.context['total_valor_precatorios'], expected_valor)
+        
+        for i in range(20):
+            Precatorio.objects.create(
+                cnj=f'888{i:04d}-89.2023.8.26.0100',
+                orcamento=2023,
+                origem=f'Tribunal {i}',
+                credito_principal='quitado',
+                honorarios_contratuais='pendente',
+                honorarios_sucumbenciais='pendente',
+                valor_de_face=100.00,
+                ultima_atualizacao=100.00,
+                data_ultima_atualizacao=date(2023, 1, 1),
+                percentual_contratuais_assinado=30.0,
+                percentual_contratuais_apartado=0.0,
+                percentual_sucumbenciais=10.0
+            )
+        
+        with CaptureQueriesContext(connection) as after:
+            response = self.client_app.get(self.precatorios_url)
+        
+        context = response.context
+        self.assertEqual(len(after), len(before))
+        self.assertEqual(context['total_precatorios'], 24)
+        self.assertEqual(context['quitados_principal'], 21)
+        self.assertEqual(context['prioritarios'], 2)
+        self.assertAlmostEqual(context['total_valor_precatorios'], expected_valor + 2000.00)
+        
+        stats_queries = [q['sql'] for q in after if 'pendentes_principal' in q['sql']]
+        self.assertEqual(len(stats_queries), 1)
+    
+    def test_statistics_empty_result(self):
+        """Test that statistics default to zero when no precatorio matches"""
+        self.client_app.login(username='testuser', password='testpass123')
+        
+        response = self.client_app.get(f'{self.precatorios_url}?cnj=nao-existe')
+        context = response.context
+        
+        self.assertEqual(context['total_precatorios'], 0)
+        self.assertEqual(context['prioritarios'], 0)
+        self.assertEqual(context['total_valor_precatorios'], 0)
+    
     def test_statistics_with_filters(self):
         """Test that statistics reflect filtered results"""
         self.client_app.login(username='testuser', password='testpass123')
@@ -2190,9 +2242,9 @@ class PrecatorioViewTest(TestCase):
         """Test that database queries are optimized with prefetch_related"""
         self.client_app.login(username='testuser', password='testpass123')
         
-        # The view makes several queries for statistics calculation
-        # We expect: session, user, statistics (5 counts), tipos, main query, prefetch requerimentos, prefetch fases, pedido queries
-        with self.assertNumQueries(17):  # Adjusted for actual query count including individual PedidoRequerimento queries
+        # We expect: session, user, statistics (1 aggregate), pagination count, tipos, pedidos, fases,
+        # main query, prefetch requerimentos, prefetch fases, pedido queries
+        with self.assertNumQueries(15):  # Statistics come from a single conditional-aggregate query
             response = self.client_app.get(self.precatorios_url)
             precatorios = list(response.context['precatorios'])
             
@@ -2267,7 +2319,7 @@ class PrecatorioViewTest(TestCase):
         
         self.client_app.login(username='testuser', password='testpass123')
         
-        with self.assertNumQueries(17):  # Should remain efficient including statistics and tipos
+        with self.assertNumQueries(12):  # Statistics come from a single conditional-aggregate query
             response = self.client_app.get(self.precatorios_url)
             # Should handle 54 total precatorios efficiently
             self.assertEqual(len(response.context['precatorios']), 54)
@@ -0,0 +1,111 @@
+"""
+Bulk fase transitions for alvarás and requerimentos
+
+Moving records to a new fase one by one goes through Alvara.save and
+Requerimento.save, which validate the whole instance and check the
+cliente-precatório link for every record. A transition only touches the
+fase and its audit fields, so here it is applied to a whole queryset with a
+single UPDATE that also writes the audit fields (when and by whom the fase
+changed). Records already in the target fase are left alone, as save()
+leaves their audit fields untouched.
+
+QuerySet.update() sends no signals; nothing that listens to Alvara or
+Requerimento saves depends on the fase fields.
+"""
+
+import logging
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from .models import Alvara, Fase, FaseHonorariosContratuais, FaseHonorariosSucumbenciais, Requerimento
+
+logger = logging.getLogger(__name__)
+
+
+# Fase field -> (audit timestamp field, audit user field), per model
+FASE_AUDIT_FIELDS = {
+    Alvara: {
+        'fase': ('fase_ultima_alteracao', 'fase_alterada_por'),
+        'fase_honorarios_contratuais': ('fase_honorarios_ultima_alteracao', 'fase_honorarios_alterada_por'),
+        'fase_honorarios_sucumbenciais': (
+            'fase_honorarios_sucumbenciais_ultima_alteracao', 'fase_honorarios_sucumbenciais_alterada_por'
+        ),
+    },
+    Requerimento: {
+        'fase': ('fase_ultima_alteracao', 'fase_alterada_por'),
+    },
+}
+
+
+def get_available_fases(model, field):
+    """
+    Fases a record of model may be moved to through field.
+
+    Args:
+        model: Alvara or Requerimento
+        field (str): One of the fase fields in FASE_AUDIT_FIELDS[model]
+
+    Returns:
+        QuerySet: Active fases of the related model
+    """
+    if field == 'fase':
+        return Fase.get_fases_for_alvara() if model is Alvara else Fase.get_fases_for_requerimento()
+    if field == 'fase_honorarios_contratuais':
+        return FaseHonorariosContratuais.get_fases_ativas()
+    return FaseHonorariosSucumbenciais.get_fases_ativas()
+
+
+def get_user_display_name(user):
+    """Name written to the *_alterada_por audit fields, as Alvara.save does."""
+    if user is not None and hasattr(user, 'get_full_name'):
+        return user.get_full_name() or user.username
+    return "System"
+
+
+def bulk_transition_fase(queryset, fase, field='fase', user=None):
+    """
+    Move every record of queryset to fase with a single UPDATE.
+
+    Args:
+        queryset (QuerySet): Alvarás or requerimentos to move (filters and
+                             joins are kept; ordering and select_related are ignored)
+        fase: Target fase, or None to clear the field
+        field (str): Fase field to change ('fase', or one of the honorários
+                     fases of Alvara)
+        user (User|None): User recorded in the audit fields ("System" when None)
+
+    Returns:
+        int: Number of records whose fase changed
+
+    Raises:
+        ValidationError: If field is not a fase field of the model or fase is
+                         not an active fase available for it
+    """
+    model = queryset.model
+    audit_fields = FASE_AUDIT_FIELDS.get(model, {}).get(field)
+    if audit_fields is None:
+        raise ValidationError(f'Campo de fase inválido para {model._meta.verbose_name}: {field}')
+    available = get_available_fases(model, field)
+    if fase is not None and (
+        not isinstance(fase, available.model) or not available.filter(pk=fase.pk).exists()
+    ):
+        raise ValidationError(f'A fase "{fase}" não está disponível para {model._meta.verbose_name_plural}.')
+
+    timestamp_field, user_field = audit_fields
+    if fase is None:
+        pending = queryset.exclude(**{f'{field}__isnull': True})
+    else:
+        pending = queryset.exclude(**{field: fase})
+
+    user_name = get_user_display_name(user)
+    updated = pending.update(**{
+        field: fase,
+        timestamp_field: timezone.now(),
+        user_field: user_name,
+    })
+    logger.info(
+        f"Bulk fase transition: {updated} {model._meta.verbose_name_plural} moved to "
+        f"{field}={fase.pk if fase else None} by {user_name}"
+    )
+    return updated
@@ -3,8 +3,8 @@ from django.urls import path
 from .views import (
     novoPrec_view, home_view, precatorio_view, precatorio_detalhe_view, delete_precatorio_view,
     clientes_view, cliente_detail_view, novo_cliente_view, delete_cliente_view,
-    alvaras_view, delete_alvara_view,
-    requerimento_list_view, login_view, logout_view,
+    alvaras_view, delete_alvara_view, alvaras_transicao_fase_view,
+    requerimento_list_view, requerimentos_transicao_fase_view, login_view, logout_view,
     fases_view, nova_fase_view, editar_fase_view, deletar_fase_view, ativar_fase_view,
     fases_honorarios_view, nova_fase_honorarios_view, editar_fase_honorarios_view, 
     deletar_fase_honorarios_view, ativar_fase_honorarios_view,
@@ -18,6 +18,9 @@ from .views import (
     deletar_tipo_diligencia_view, ativar_tipo_diligencia_view,
     nova_diligencia_view, editar_diligencia_view, deletar_diligencia_view, marcar_diligencia_concluida_view,
     diligencias_list_view, update_priority_by_age, import_excel_view, export_precatorios_excel, export_clientes_excel,
+    export_jobs_view, export_job_status_view, export_job_download_view,
+    import_jobs_view, import_job_status_view,
+    global_search_view, instrumentation_view, metrics_view,
     download_precatorio_file,
     contas_bancarias_view, nova_conta_bancaria_view, editar_conta_bancaria_view, deletar_conta_bancaria_view,
     novo_recebimento_view, listar_recebimentos_view, editar_recebimento_view, deletar_recebimento_view,
@@ -34,20 +37,30 @@ urlpatterns = [
     path('precatorios/novo/', novoPrec_view, name='novo_precatorio'),
     path('precatorios/', precatorio_view, name='precatorios'),
     path('precatorios/import/', import_excel_view, name='import_excel'),
+    path('importacoes/', import_jobs_view, name='import_jobs'),
+    path('importacoes/<int:job_id>/status/', import_job_status_view, name='import_job_status'),
     path('precatorios/export/', export_precatorios_excel, name='export_precatorios_excel'),
     path('precatorios/<str:precatorio_cnj>/', precatorio_detalhe_view, name='precatorio_detalhe'),
     path('precatorios/<str:precatorio_cnj>/delete/', delete_precatorio_view, name='delete_precatorio'),
     path('precatorios/<str:precatorio_cnj>/download/', download_precatorio_file, name='download_precatorio_file'),
     path('clientes/', clientes_view, name='clientes'),
     path('clientes/export/', export_clientes_excel, name='export_clientes_excel'),
+    path('exportacoes/', export_jobs_view, name='export_jobs'),
+    path('exportacoes/<int:job_id>/status/', export_job_status_view, name='export_job_status'),
+    path('exportacoes/<int:job_id>/download/', export_job_download_view, name='export_job_download'),
     path('clientes/update-priority/', update_priority_by_age, name='update_priority_by_age'),
     path('clientes/novo/', novo_cliente_view, name='novo_cliente'),
     path('clientes/<str:cpf>/', cliente_detail_view, name='cliente_detail'),
     path('clientes/<str:cpf>/delete/', delete_cliente_view, name='delete_cliente'),
     path('alvaras/', alvaras_view, name='alvaras'),
+    path('alvaras/transicao-fase/', alvaras_transicao_fase_view, name='alvaras_transicao_fase'),
     path('alvara/<int:alvara_id>/delete/', delete_alvara_view, name='delete_alvara'),
     path('diligencias/', diligencias_list_view, name='diligencias_list'),
     path('requerimentos/', requerimento_list_view, name='requerimentos'),
+    path('requerimentos/transicao-fase/', requerimentos_transicao_fase_view, name='requerimentos_transicao_fase'),
+    path('busca/', global_search_view, name='global_search'),
+    path('instrumentacao/', instrumentation_view, name='instrumentation'),
+    path('metrics/', metrics_view, name='metrics'),
     
     # Customization Page
     path('customizacao/', customizacao_view, name='customizacao'),
@@ -5,24 +5,31 @@ from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import AuthenticationForm
 from django.views.decorators.http import require_http_methods
-from django.db.models import Q, Sum
+from django.core.exceptions import ValidationError
+from django.db.models import Avg, Count, Exists, FloatField, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from django.core.management import call_command
-from django.core.paginator import Paginator
 from django.urls import reverse
 from django.conf import settings
-import tempfile
 import os
 import logging
 import mimetypes
-from io import StringIO
-from .models import Precatorio, Cliente, Alvara, Requerimento, Fase, Tipo, FaseHonorariosContratuais, FaseHonorariosSucumbenciais, TipoDiligencia, Diligencias, PedidoRequerimento, ContaBancaria, Recebimentos
+from urllib.parse import urlencode
+from .models import Precatorio, Cliente, Alvara, Requerimento, Fase, Tipo, FaseHonorariosContratuais, FaseHonorariosSucumbenciais, TipoDiligencia, Diligencias, PedidoRequerimento, ContaBancaria, Recebimentos, PrecatorioResumo
 from .forms import (
     PrecatorioForm, ClienteForm, PrecatorioSearchForm, 
     ClienteSearchForm, RequerimentoForm, ClienteSimpleForm, 
     AlvaraSimpleForm, FaseForm, TipoForm, FaseHonorariosContratuaisForm, FaseHonorariosSucumbenciaisForm, TipoDiligenciaForm,
     DiligenciasForm, DiligenciasUpdateForm, PedidoRequerimentoForm, ContaBancariaForm, RecebimentosForm
 )
+from .catalog import (
+    fases_for_alvara, fases_for_requerimento, fases_honorarios_contratuais, fases_honorarios_sucumbenciais,
+    pedido_names_containing, pedidos_ativos, tipos_ativos, tipos_diligencia_ativos
+)
+from .dashboard import get_dashboard_statistics
+from .pagination import paginate_queryset
+from .search import code_search_q, text_search_q
+from .transitions import FASE_AUDIT_FIELDS, bulk_transition_fase, get_available_fases
 
 logger = logging.getLogger(__name__)
 
@@ -31,22 +38,12 @@ logger = logging.getLogger(__name__)
 # ===============================
 
 def get_acordo_pedido_names():
-    """Get dynamic list of acordo pedido names from database"""
-    return list(
-        PedidoRequerimento.objects.filter(
-            nome__icontains='Acordo',
-            ativo=True
-        ).values_list('nome', flat=True)
-    )
+    """Get dynamic list of acordo pedido names (from the catalog cache)"""
+    return pedido_names_containing('Acordo')
 
 def get_prioridade_pedido_names():
-    """Get dynamic list of prioridade pedido names from database"""
-    return list(
-        PedidoRequerimento.objects.filter(
-            nome__icontains='Prioridade',
-            ativo=True
-        ).values_list('nome', flat=True)
-    )
+    """Get dynamic list of prioridade pedido names (from the catalog cache)"""
+    return pedido_names_containing('Prioridade')
 
 # ===============================
 # AUTHENTICATION VIEWS
@@ -90,45 +87,7 @@ def logout_view(request):
 
 @login_required
 def home_view(request):
-    """Home view with dashboard statistics"""
-    from django.db.models import Sum, Count
-    
-    # Get counts for dashboard
-    total_precatorios = Precatorio.objects.count()
-    total_clientes = Cliente.objects.count()
-    total_alvaras = Alvara.objects.count()
-    total_requerimentos = Requerimento.objects.count()
-    total_diligencias = Diligencias.objects.count()
-    total_tipos_diligencia = TipoDiligencia.objects.filter(ativo=True).count()
-    
-    # Get financial statistics - using correct field names
-    total_valor_precatorios = Precatorio.objects.aggregate(total=Sum('valor_de_face'))['total'] or 0
-    total_valor_alvaras = Alvara.objects.aggregate(
-        principal=Sum('valor_principal'),
-        contratuais=Sum('honorarios_contratuais'),
-        sucumbenciais=Sum('honorarios_sucumbenciais')
-    )
-    
-    valor_alvaras = (
-        (total_valor_alvaras['principal'] or 0) + 
-        (total_valor_alvaras['contratuais'] or 0) + 
-        (total_valor_alvaras['sucumbenciais'] or 0)
-    )
-    
-    total_valor_requerimentos = Requerimento.objects.aggregate(total=Sum('valor'))['total'] or 0
-    
-    # Get diligencias statistics
-    diligencias_pendentes = Diligencias.objects.filter(concluida=False).count()
-    diligencias_concluidas = Diligencias.objects.filter(concluida=True).count()
-    diligencias_atrasadas = Diligencias.objects.filter(
-        concluida=False,
-        data_final__lt=timezone.now().date()
-    ).count()
-    diligencias_urgentes = Diligencias.objects.filter(
-        concluida=False,
-        urgencia='alta'
-    ).count()
-    
+    """Home view with dashboard statistics (counters cached by precapp.dashboard)"""
     # Get recent activity
     recent_precatorios = Precatorio.objects.prefetch_related('clientes').order_by('cnj')[:5]
     recent_alvaras = Alvara.objects.select_related('cliente', 'precatorio').order_by('-id')[:5]
@@ -136,19 +95,7 @@ def home_view(request):
     recent_diligencias = Diligencias.objects.select_related('cliente', 'tipo', 'responsavel').order_by('-data_criacao')[:5]
     
     context = {
-        'total_precatorios': total_precatorios,
-        'total_clientes': total_clientes,
-        'total_alvaras': total_alvaras,
-        'total_requerimentos': total_requerimentos,
-        'total_diligencias': total_diligencias,
-        'total_tipos_diligencia': total_tipos_diligencia,
-        'total_valor_precatorios': total_valor_precatorios,
-        'valor_alvaras': valor_alvaras,
-        'total_valor_requerimentos': total_valor_requerimentos,
-        'diligencias_pendentes': diligencias_pendentes,
-        'diligencias_concluidas': diligencias_concluidas,
-        'diligencias_atrasadas': diligencias_atrasadas,
-        'diligencias_urgentes': diligencias_urgentes,
+        **get_dashboard_statistics(),
         'recent_precatorios': recent_precatorios,
         'recent_alvaras': recent_alvaras,
         'recent_requerimentos': recent_requerimentos,
@@ -188,6 +135,44 @@ def novoPrec_view(request):
     return render(request, 'precapp/novo_precatorio.html', {'form': form})
     
 
+def get_precatorio_list_statistics(precatorios):
+    """
+    Compute the header statistics of the precatório list in one query.
+
+    Counts per credito_principal status, the number of prioritários
+    (precatórios with a requerimento whose active pedido contains
+    "Prioridade") and the total valor_de_face are all conditional
+    aggregates over the given queryset, so the cost does not depend on
+    how many precatórios match the filters.
+
+    Args:
+        precatorios (QuerySet): Filtered Precatorio queryset
+
+    Returns:
+        dict: total_precatorios, pendentes_principal, quitados_principal,
+              parciais_principal, vendidos_principal, prioritarios and
+              total_valor_precatorios (0 when nothing matches)
+    """
+    tem_prioridade = Exists(
+        Requerimento.objects.filter(
+            precatorio=OuterRef('pk'),
+            pedido__nome__icontains='Prioridade',
+            pedido__ativo=True
+        )
+    )
+    return precatorios.aggregate(
+        total_precatorios=Count('pk'),
+        pendentes_principal=Count('pk', filter=Q(credito_principal='pendente')),
+        quitados_principal=Count('pk', filter=Q(credito_principal='quitado')),
+        parciais_principal=Count('pk', filter=Q(credito_principal='parcial')),
+        vendidos_principal=Count('pk', filter=Q(credito_principal='vendido')),
+        prioritarios=Count('pk', filter=Q(tem_prioridade)),
+        total_valor_precatorios=Coalesce(
+            Sum('valor_de_face'), Value(0.0, output_field=FloatField())
+        ),
+    )
+
+
 @login_required
 def precatorio_view(request):
     """View to display all precatorios with filtering support"""
@@ -205,10 +190,10 @@ def precatorio_view(request):
     status_requerimento_filter = request.GET.get('status_requerimento', '')
     
     if cnj_filter:
-        precatorios = precatorios.filter(cnj__icontains=cnj_filter)
+        precatorios = precatorios.filter(code_search_q('cnj', cnj_filter))
     
     if origem_filter:
-        precatorios = precatorios.filter(origem__icontains=origem_filter)
+        precatorios = precatorios.filter(text_search_q('origem_busca', origem_filter))
     
     if orcamento_filter:
         try:
@@ -250,29 +235,16 @@ def precatorio_view(request):
         ).values_list('precatorio__cnj', flat=True).distinct()
         precatorios = precatorios.filter(cnj__in=precatorios_com_fase)
     
-    # Calculate summary statistics
-    total_precatorios = precatorios.count()
-    
-    # Calculate counts for different payment statuses
-    pendentes_principal = precatorios.filter(credito_principal='pendente').count()
-    quitados_principal = precatorios.filter(credito_principal='quitado').count()
-    parciais_principal = precatorios.filter(credito_principal='parcial').count()
-    vendidos_principal = precatorios.filter(credito_principal='vendido').count()
-    
-    # Calculate prioritarios count (precatorios with prioridade requerimentos)
-    # Get all pedidos that contain "Prioridade" in the name
-    prioridade_pedidos = PedidoRequerimento.objects.filter(
-        nome__icontains='Prioridade', 
-        ativo=True
-    ).values_list('id', flat=True)
-    
-    prioritarios_cnjs = Requerimento.objects.filter(
-        pedido_id__in=prioridade_pedidos
-    ).values_list('precatorio__cnj', flat=True).distinct()
-    prioritarios = precatorios.filter(cnj__in=prioritarios_cnjs).count()
-    
-    # Calculate total value of displayed precatorios (before pagination)
-    total_valor_precatorios = sum(precatorio.valor_de_face or 0 for precatorio in precatorios)
+    # Calculate all summary statistics with a single conditional-aggregate query
+    # over the filtered queryset (prefetches are not evaluated by aggregate)
+    stats = get_precatorio_list_statistics(precatorios)
+    total_precatorios = stats['total_precatorios']
+    pendentes_principal = stats['pendentes_principal']
+    quitados_principal = stats['quitados_principal']
+    parciais_principal = stats['parciais_principal']
+    vendidos_principal = stats['vendidos_principal']
+    prioritarios = stats['prioritarios']
+    total_valor_precatorios = stats['total_valor_precatorios']
     
     # Add pagination
     items_per_page = request.GET.get('per_page', 100)  # Default 100 items per page
@@ -283,28 +255,24 @@ def precatorio_view(request):
     except (ValueError, TypeError):
         items_per_page = 100
     
-    paginator = Paginator(precatorios, items_per_page)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
+    paginator, page_obj, cursor_mode = paginate_queryset(request, precatorios, items_per_page, ('cnj',))
     
     # Update precatorios to use paginated results
     precatorios = page_obj
     
     # Get all active tipos for the filter dropdown
-    tipos = Tipo.get_tipos_ativos()
+    tipos = tipos_ativos()
     
     # Get all active pedidos and fases for dynamic dropdowns
-    all_pedidos = PedidoRequerimento.objects.filter(ativo=True).order_by('nome')
-    all_fases = Fase.objects.filter(
-        ativa=True, 
-        tipo__in=['requerimento', 'ambos']
-    ).order_by('nome')
+    all_pedidos = sorted(pedidos_ativos(), key=lambda pedido: pedido.nome)
+    all_fases = sorted(fases_for_requerimento(), key=lambda fase: fase.nome)
     
     context = {
         'precatorios': precatorios,
         'page_obj': page_obj,
         'paginator': paginator,
         'items_per_page': items_per_page,
+        'cursor_mode': cursor_mode,
         'total_precatorios': total_precatorios,
         'total_valor_precatorios': total_valor_precatorios,
         'pendentes_principal': pendentes_principal,
@@ -344,11 +312,6 @@ def precatorio_detalhe_view(request, precatorio_cnj):
         'cliente', 'fase', 'fase_honorarios_contratuais'
     ).order_by('-id')
     
-    # Calculate alvarás totals
-    alvaras_total_principal = sum(alvara.valor_principal or 0 for alvara in alvaras)
-    alvaras_total_contratuais = sum(alvara.honorarios_contratuais or 0 for alvara in alvaras)
-    alvaras_total_sucumbenciais = sum(alvara.honorarios_sucumbenciais or 0 for alvara in alvaras)
-
     # Get all requerimentos associated with this precatorio
     requerimentos = Requerimento.objects.filter(precatorio=precatorio).select_related(
         'cliente', 'fase', 'pedido'
@@ -733,6 +696,9 @@ def precatorio_detalhe_view(request, precatorio_cnj):
         if 'edit' in request.GET:
             precatorio_form = PrecatorioForm(instance=precatorio)
     
+    # Alvarás totals and record counts come from the materialized summary
+    resumo = PrecatorioResumo.for_precatorio(precatorio)
+    
     context = {
         'precatorio': precatorio,
         'form': precatorio_form,
@@ -745,15 +711,16 @@ def precatorio_detalhe_view(request, precatorio_cnj):
         'clientes': associated_clientes,
         'associated_clientes': associated_clientes,
         'alvaras': alvaras,
-        'alvaras_total_principal': alvaras_total_principal,
-        'alvaras_total_contratuais': alvaras_total_contratuais,
-        'alvaras_total_sucumbenciais': alvaras_total_sucumbenciais,
+        'resumo': resumo,
+        'alvaras_total_principal': resumo.total_principal,
+        'alvaras_total_contratuais': resumo.total_contratuais,
+        'alvaras_total_sucumbenciais': resumo.total_sucumbenciais,
         'requerimentos': requerimentos,
-        'alvara_fases': Fase.get_fases_for_alvara(),
-        'requerimento_fases': Fase.get_fases_for_requerimento(),
-        'fases_honorarios_contratuais': FaseHonorariosContratuais.objects.filter(ativa=True),  # Uses model's default ordering: ['ordem', 'nome']
-        'fases_honorarios_sucumbenciais': FaseHonorariosSucumbenciais.objects.filter(ativa=True),  # Uses model's default ordering: ['ordem', 'nome']
-        'available_pedidos': PedidoRequerimento.get_ativos(),
+        'alvara_fases': fases_for_alvara(),
+        'requerimento_fases': fases_for_requerimento(),
+        'fases_honorarios_contratuais': fases_honorarios_contratuais(),  # Model's default ordering: ['ordem', 'nome']
+        'fases_honorarios_sucumbenciais': fases_honorarios_sucumbenciais(),  # Model's default ordering: ['ordem', 'nome']
+        'available_pedidos': pedidos_ativos(),
         'contas_bancarias': ContaBancaria.objects.all().order_by('banco', 'agencia'),
     }
     
@@ -799,7 +766,7 @@ def delete_precatorio_view(request, precatorio_cnj):
 @login_required
 def clientes_view(request):
     """View to display all clients with filtering support"""
-    clientes = Cliente.objects.all().prefetch_related(
+    clientes = Cliente.objects.with_priority_requerimentos().prefetch_related(
         'precatorios', 
         'precatorios__requerimento_set', 
         'precatorios__requerimento_set__fase'
@@ -818,10 +785,10 @@ def clientes_view(request):
     falecido_filter = request.GET.get('falecido', '')
     
     if nome_filter:
-        clientes = clientes.filter(nome__icontains=nome_filter)
+        clientes = clientes.filter(text_search_q('nome_busca', nome_filter))
     
     if cpf_filter:
-        clientes = clientes.filter(cpf__icontains=cpf_filter)
+        clientes = clientes.filter(code_search_q('cpf', cpf_filter))
     
     # Filter by age
     if idade_filter:
@@ -878,7 +845,7 @@ def clientes_view(request):
             clientes = clientes.exclude(cpf__in=clientes_com_requerimentos)
     
     if precatorio_filter:
-        clientes = clientes.filter(precatorios__cnj__icontains=precatorio_filter).distinct()
+        clientes = clientes.filter(code_search_q('precatorios__cnj', precatorio_filter)).distinct()
     
     # Calculate summary statistics (before pagination)
     total_clientes = clientes.count()
@@ -894,9 +861,9 @@ def clientes_view(request):
     except (ValueError, TypeError):
         items_per_page = 100
     
-    paginator = Paginator(clientes, items_per_page)
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
+    # Same ordering in both modes, so OFFSET pages are deterministic too
+    clientes = clientes.order_by('nome', 'cpf')
+    paginator, page_obj, cursor_mode = paginate_queryset(request, clientes, items_per_page, ('nome', 'cpf'))
     
     # Update clientes to use paginated results
     clientes = page_obj
@@ -906,6 +873,7 @@ def clientes_view(request):
         'page_obj': page_obj,
         'paginator': paginator,
         'items_per_page': items_per_page,
+        'cursor_mode': cursor_mode,
         'total_clientes': total_clientes,
         'clientes_com_prioridade': clientes_com_prioridade,
         'clientes_sem_prioridade': clientes_sem_prioridade,
@@ -1117,33 +1085,35 @@ def update_priority_by_age(request):
 # ===============================
 
 
-@login_required
-def alvaras_view(request):
-    """View to display all alvarás with filtering support"""
-    alvaras = Alvara.objects.all().select_related(
-        'precatorio', 'cliente', 'fase', 'fase_honorarios_contratuais', 'fase_honorarios_sucumbenciais'
-    ).order_by('-id')
+ALVARA_FILTER_PARAMS = ['nome', 'precatorio', 'tipo', 'fase', 'fase_honorarios', 'fase_honorarios_sucumbenciais']
+
+
+def filter_alvaras(alvaras, params):
+    """
+    Apply the alvará list filters.
     
-    # Get available fases for alvara
-    available_fases = Fase.get_fases_for_alvara()
-    # Get available fases for honorários contratuais
-    available_fases_honorarios = FaseHonorariosContratuais.objects.all()  # Uses model's default ordering: ['ordem', 'nome']
-    # Get available fases for honorários sucumbenciais
-    available_fases_honorarios_sucumbenciais = FaseHonorariosSucumbenciais.objects.all()  # Uses model's default ordering: ['ordem', 'nome']
+    Shared by the list and the bulk fase transition, so "apply to every
+    filtered alvará" selects exactly the rows the list shows.
     
-    # Apply filters based on GET parameters
-    nome_filter = request.GET.get('nome', '').strip()
-    precatorio_filter = request.GET.get('precatorio', '').strip()
-    tipo_filter = request.GET.get('tipo', '').strip()
-    fase_filter = request.GET.get('fase', '').strip()
-    fase_honorarios_filter = request.GET.get('fase_honorarios', '').strip()
-    fase_honorarios_sucumbenciais_filter = request.GET.get('fase_honorarios_sucumbenciais', '').strip()
+    Args:
+        alvaras (QuerySet): Alvarás to filter
+        params (QueryDict): Request parameters (see ALVARA_FILTER_PARAMS)
+    
+    Returns:
+        QuerySet: Filtered alvarás
+    """
+    nome_filter = params.get('nome', '').strip()
+    precatorio_filter = params.get('precatorio', '').strip()
+    tipo_filter = params.get('tipo', '').strip()
+    fase_filter = params.get('fase', '').strip()
+    fase_honorarios_filter = params.get('fase_honorarios', '').strip()
+    fase_honorarios_sucumbenciais_filter = params.get('fase_honorarios_sucumbenciais', '').strip()
     
     if nome_filter:
-        alvaras = alvaras.filter(cliente__nome__icontains=nome_filter)
+        alvaras = alvaras.filter(text_search_q('cliente__nome_busca', nome_filter))
     
     if precatorio_filter:
-        alvaras = alvaras.filter(precatorio__cnj__icontains=precatorio_filter)
+        alvaras = alvaras.filter(code_search_q('precatorio__cnj', precatorio_filter))
     
     if tipo_filter:
         alvaras = alvaras.filter(tipo=tipo_filter)  # Exact match for dropdown
@@ -1157,6 +1127,33 @@ def alvaras_view(request):
     if fase_honorarios_sucumbenciais_filter:
         alvaras = alvaras.filter(fase_honorarios_sucumbenciais__nome=fase_honorarios_sucumbenciais_filter)  # Exact match for dropdown
     
+    return alvaras
+
+
+@login_required
+def alvaras_view(request):
+    """View to display all alvarás with filtering support"""
+    alvaras = Alvara.objects.all().select_related(
+        'precatorio', 'cliente', 'fase', 'fase_honorarios_contratuais', 'fase_honorarios_sucumbenciais'
+    ).order_by('-id')
+    
+    # Get available fases for alvara
+    available_fases = fases_for_alvara()
+    # Get available fases for honorários contratuais (inactive ones too, to filter old records)
+    available_fases_honorarios = fases_honorarios_contratuais(active_only=False)
+    # Get available fases for honorários sucumbenciais
+    available_fases_honorarios_sucumbenciais = fases_honorarios_sucumbenciais(active_only=False)
+    
+    # Apply filters based on GET parameters
+    nome_filter = request.GET.get('nome', '').strip()
+    precatorio_filter = request.GET.get('precatorio', '').strip()
+    tipo_filter = request.GET.get('tipo', '').strip()
+    fase_filter = request.GET.get('fase', '').strip()
+    fase_honorarios_filter = request.GET.get('fase_honorarios', '').strip()
+    fase_honorarios_sucumbenciais_filter = request.GET.get('fase_honorarios_sucumbenciais', '').strip()
+    
+    alvaras = filter_alvaras(alvaras, request.GET)
+    
     # Pagination
     items_per_page = request.GET.get('items_per_page', '100')
     try:
@@ -1166,9 +1163,7 @@ def alvaras_view(request):
     except (ValueError, TypeError):
         items_per_page = 100
     
-    paginator = Paginator(alvaras, items_per_page)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator, page_obj, cursor_mode = paginate_queryset(request, alvaras, items_per_page, ('-id',))
     
     # Calculate summary statistics based on filtered results (before pagination)
     total_alvaras = alvaras.count()
@@ -1186,6 +1181,7 @@ def alvaras_view(request):
         'alvaras': page_obj,
         'page_obj': page_obj,
         'items_per_page': items_per_page,
+        'cursor_mode': cursor_mode,
         'total_alvaras': total_alvaras,
         'aguardando_deposito': aguardando_deposito,
         'deposito_judicial': deposito_judicial,
@@ -1205,6 +1201,8 @@ def alvaras_view(request):
         'available_fases': available_fases,
         'available_fases_honorarios': available_fases_honorarios,
         'available_fases_honorarios_sucumbenciais': available_fases_honorarios_sucumbenciais,
+        'transition_targets': get_transition_targets(Alvara),
+        'filter_params': ALVARA_FILTER_PARAMS,
     }
     
     return render(request, 'precapp/alvara_list.html', context)
@@ -1231,6 +1229,44 @@ def delete_alvara_view(request, alvara_id):
 # ===============================
 
 
+REQUERIMENTO_FILTER_PARAMS = ['cliente', 'precatorio', 'cnj_requerimento', 'pedido', 'fase']
+
+
+def filter_requerimentos(requerimentos, params):
+    """
+    Apply the requerimento list filters (shared with the bulk fase transition).
+    
+    Args:
+        requerimentos (QuerySet): Requerimentos to filter
+        params (QueryDict): Request parameters (see REQUERIMENTO_FILTER_PARAMS)
+    
+    Returns:
+        QuerySet: Filtered requerimentos
+    """
+    cliente_filter = params.get('cliente', '').strip()
+    precatorio_filter = params.get('precatorio', '').strip()
+    cnj_requerimento_filter = params.get('cnj_requerimento', '').strip()
+    pedido_filter = params.get('pedido', '').strip()
+    fase_filter = params.get('fase', '').strip()
+    
+    if cliente_filter:
+        requerimentos = requerimentos.filter(text_search_q('cliente__nome_busca', cliente_filter))
+
+    if precatorio_filter:
+        requerimentos = requerimentos.filter(code_search_q('precatorio__cnj', precatorio_filter))
+
+    if cnj_requerimento_filter:
+        requerimentos = requerimentos.filter(code_search_q('cnj', cnj_requerimento_filter))
+
+    if pedido_filter:
+        requerimentos = requerimentos.filter(pedido__id=pedido_filter)
+
+    if fase_filter:
+        requerimentos = requerimentos.filter(fase__nome=fase_filter)
+    
+    return requerimentos
+
+
 @login_required
 def requerimento_list_view(request):
     """View to list all requerimentos with filtering"""
@@ -1246,27 +1282,13 @@ def requerimento_list_view(request):
     fase_filter = request.GET.get('fase', '').strip()
     
     # Apply filters
-    if cliente_filter:
-        requerimentos = requerimentos.filter(cliente__nome__icontains=cliente_filter)
-
-    if precatorio_filter:
-        requerimentos = requerimentos.filter(precatorio__cnj__icontains=precatorio_filter)
-
-    if cnj_requerimento_filter:
-        requerimentos = requerimentos.filter(cnj__icontains=cnj_requerimento_filter)
-
-    if pedido_filter:
-        requerimentos = requerimentos.filter(pedido__id=pedido_filter)
-
-    if fase_filter:
-        requerimentos = requerimentos.filter(fase__nome=fase_filter)
+    requerimentos = filter_requerimentos(requerimentos, request.GET)
     
     # Get available phases for requerimentos
-    from .models import Fase
-    available_fases = Fase.get_fases_for_requerimento()
+    available_fases = fases_for_requerimento()
     
     # Get available pedido requerimento types
-    available_pedidos = PedidoRequerimento.get_ativos()
+    available_pedidos = pedidos_ativos()
     
     # Pagination
     items_per_page = request.GET.get('items_per_page', '100')
@@ -1277,13 +1299,12 @@ def requerimento_list_view(request):
     except (ValueError, TypeError):
         items_per_page = 100
     
-    paginator = Paginator(requerimentos, items_per_page)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator, page_obj, cursor_mode = paginate_queryset(request, requerimentos, items_per_page, ('-id',))
     
-    # Calculate financial statistics based on filtered results
-    valor_total = sum(r.valor for r in requerimentos if r.valor)
-    desagio_medio = sum(r.desagio for r in requerimentos if r.desagio) / requerimentos.count() if requerimentos.count() > 0 else 0
+    # Calculate financial statistics based on filtered results (one aggregate query)
+    totals = requerimentos.aggregate(valor_total=Sum('valor'), desagio_medio=Avg('desagio'))
+    valor_total = totals['valor_total'] or 0
+    desagio_medio = totals['desagio_medio'] or 0
     
     # Handle requerimento deletion
     if request.method == 'POST' and 'delete_requerimento' in request.POST:
@@ -1301,6 +1322,7 @@ def requerimento_list_view(request):
         'requerimentos': page_obj,
         'page_obj': page_obj,
         'items_per_page': items_per_page,
+        'cursor_mode': cursor_mode,
         'available_fases': available_fases,
         'available_pedidos': available_pedidos,
         'valor_total': valor_total,
@@ -1311,10 +1333,104 @@ def requerimento_list_view(request):
         'current_cnj_requerimento': cnj_requerimento_filter,
         'current_pedido': pedido_filter,
         'current_fase': fase_filter,
+        'transition_targets': get_transition_targets(Requerimento),
+        'filter_params': REQUERIMENTO_FILTER_PARAMS,
     }
     return render(request, 'precapp/requerimento_list.html', context)
 
 
+# ===============================
+# BULK FASE TRANSITIONS
+# ===============================
+
+FASE_FIELD_LABELS = {
+    'fase': 'Fase principal',
+    'fase_honorarios_contratuais': 'Fase hon. contratuais',
+    'fase_honorarios_sucumbenciais': 'Fase hon. sucumbenciais',
+}
+
+
+def get_transition_targets(model):
+    """
+    Target fases offered by the bulk transition form of a list page.
+    
+    Returns:
+        list: (field, label, fases) for each fase field of the model
+    """
+    if model is Alvara:
+        fases = {
+            'fase': fases_for_alvara(),
+            'fase_honorarios_contratuais': fases_honorarios_contratuais(),
+            'fase_honorarios_sucumbenciais': fases_honorarios_sucumbenciais(),
+        }
+    else:
+        fases = {'fase': fases_for_requerimento()}
+    return [(field, FASE_FIELD_LABELS[field], fases[field]) for field in FASE_AUDIT_FIELDS[model]]
+
+
+def _bulk_fase_transition(request, model, filter_function, filter_params, list_url_name):
+    """
+    Handle the bulk fase transition form of the alvará and requerimento lists.
+    
+    POST parameters:
+        destino: "<fase field>:<fase id>"
+        escopo: "selecionados" (default) applies to the checked rows;
+                "filtro" applies to every row matching the list filters
+        selecionados: Ids of the checked rows
+        <filter params>: Current list filters, also used for the redirect
+    """
+    verbose_name_plural = model._meta.verbose_name_plural.lower()
+    filtros = {key: request.POST[key] for key in filter_params if request.POST.get(key)}
+    redirect_url = reverse(list_url_name) + (f'?{urlencode(filtros)}' if filtros else '')
+    
+    campo, _, fase_id = request.POST.get('destino', '').partition(':')
+    fase = None
+    if campo in FASE_AUDIT_FIELDS[model] and fase_id.isdigit():
+        fase = get_available_fases(model, campo).filter(pk=fase_id).first()
+    if fase is None:
+        messages.error(request, 'Selecione uma fase de destino válida.')
+        return redirect(redirect_url)
+    
+    queryset = model.objects.all()
+    if request.POST.get('escopo') == 'filtro':
+        queryset = filter_function(queryset, request.POST)
+    else:
+        ids = [pk for pk in request.POST.getlist('selecionados') if pk.isdigit()]
+        if not ids:
+            messages.error(request, 'Selecione ao menos um item para alterar a fase.')
+            return redirect(redirect_url)
+        queryset = queryset.filter(pk__in=ids)
+    
+    try:
+        updated = bulk_transition_fase(queryset, fase, field=campo, user=request.user)
+    except ValidationError as e:
+        messages.error(request, ' '.join(e.messages))
+        return redirect(redirect_url)
+    
+    messages.success(
+        request,
+        f'{updated} {verbose_name_plural} movido{"s" if updated != 1 else ""} para '
+        f'"{fase.nome}" ({FASE_FIELD_LABELS[campo].lower()}).'
+    )
+    return redirect(redirect_url)
+
+
+@login_required
+@require_http_methods(["POST"])
+def alvaras_transicao_fase_view(request):
+    """Move the selected (or all filtered) alvarás to a fase with a single UPDATE"""
+    return _bulk_fase_transition(request, Alvara, filter_alvaras, ALVARA_FILTER_PARAMS, 'alvaras')
+
+
+@login_required
+@require_http_methods(["POST"])
+def requerimentos_transicao_fase_view(request):
+    """Move the selected (or all filtered) requerimentos to a fase with a single UPDATE"""
+    return _bulk_fase_transition(
+        request, Requerimento, filter_requerimentos, REQUERIMENTO_FILTER_PARAMS, 'requerimentos'
+    )
+
+
 # ===============================
 # FASE MANAGEMENT VIEWS
 # ===============================
@@ -2285,8 +2401,8 @@ def diligencias_list_view(request):
     
     if search_query:
         diligencias = diligencias.filter(
-            Q(cliente__nome__icontains=search_query) |
-            Q(cliente__cpf__icontains=search_query) |
+            text_search_q('cliente__nome_busca', search_query) |
+            code_search_q('cliente__cpf', search_query) |
             Q(tipo__nome__icontains=search_query) |
             Q(descricao__icontains=search_query) |
             Q(responsavel__username__icontains=search_query) |
@@ -2320,9 +2436,9 @@ def diligencias_list_view(request):
     except (ValueError, TypeError):
         items_per_page = 100
     
-    paginator = Paginator(diligencias, items_per_page)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator, page_obj, cursor_mode = paginate_queryset(
+        request, diligencias, items_per_page, ('-data_criacao', '-id')
+    )
     
     # Statistics
     total_diligencias = Diligencias.objects.count()
@@ -2334,7 +2450,7 @@ def diligencias_list_view(request):
     ).count()
     
     # Get filter options
-    tipos_diligencia = TipoDiligencia.get_ativos()
+    tipos_diligencia = tipos_diligencia_ativos()
     urgencia_choices = Diligencias.URGENCIA_CHOICES
     
     # Get users who are assigned as responsavel (active users who have diligencias assigned)
@@ -2348,6 +2464,7 @@ def diligencias_list_view(request):
         'page_obj': page_obj,
         'diligencias': page_obj,
         'items_per_page': items_per_page,
+        'cursor_mode': cursor_mode,
         'total_diligencias': total_diligencias,
         'pendentes_diligencias': pendentes_diligencias,
         'concluidas_diligencias': concluidas_diligencias,
@@ -2373,7 +2490,14 @@ def diligencias_list_view(request):
 
 @login_required
 def import_excel_view(request):
-    """View to handle Excel file upload and import precatorios"""
+    """
+    Handle the Excel upload form of the precatórios list.
+    
+    The file is validated and stored as an ImportJob; the import itself runs
+    in the background worker and its progress is shown on import_jobs_view.
+    """
+    from .imports import enqueue_import
+    
     if request.method == 'POST':
         uploaded_file = request.FILES.get('excel_file')
         
@@ -2392,90 +2516,176 @@ def import_excel_view(request):
             return redirect('precatorios')
         
         try:
-            # Save uploaded file temporarily
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as temp_file:
-                # Write uploaded file content to temporary file
-                for chunk in uploaded_file.chunks():
-                    temp_file.write(chunk)
-                temp_file_path = temp_file.name
-            
-            try:
-                # Capture command output
-                output = StringIO()
-                
-                # Call the import_excel management command
-                call_command('import_excel', '--file', temp_file_path, stdout=output, stderr=output)
-                
-                # Get the output
-                command_output = output.getvalue()
-                
-                # Parse the output to get statistics
-                imported_stats = {
-                    'precatorios': 0,
-                    'clientes': 0,
-                    'requerimentos': 0
-                }
-                
-                # Extract statistics from output
-                lines = command_output.split('\n')
-                for line in lines:
-                    if 'Precatorios:' in line:
-                        try:
-                            imported_stats['precatorios'] = int(line.split(':')[1].strip())
-                        except:
-                            pass
-                    elif 'Clientes:' in line:
-                        try:
-                            imported_stats['clientes'] = int(line.split(':')[1].strip())
-                        except:
-                            pass
-                    elif 'Requerimentos:' in line:
-                        try:
-                            imported_stats['requerimentos'] = int(line.split(':')[1].strip())
-                        except:
-                            pass
-                
-                # Success message with statistics
-                total_imported = sum(imported_stats.values())
-                if total_imported > 0:
-                    stats_msg = []
-                    if imported_stats['precatorios'] > 0:
-                        stats_msg.append(f"{imported_stats['precatorios']} precatório(s)")
-                    if imported_stats['clientes'] > 0:
-                        stats_msg.append(f"{imported_stats['clientes']} cliente(s)")
-                    if imported_stats['requerimentos'] > 0:
-                        stats_msg.append(f"{imported_stats['requerimentos']} requerimento(s)")
-                    
-                    message = f"Importação concluída com sucesso! Importados: {', '.join(stats_msg)}."
-                    messages.success(request, message)
-                else:
-                    messages.warning(request, 'Nenhum dado novo foi importado. Os dados podem já existir no sistema.')
-                
-            except Exception as e:
-                # Error in command execution
-                error_msg = str(e)
-                if 'already exists' in error_msg.lower():
-                    messages.warning(request, 'Alguns dados já existem no sistema e foram ignorados.')
-                else:
-                    messages.error(request, f'Erro durante a importação: {error_msg}')
-                    
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
-                    
+            # The import runs in the background worker (process_import_jobs)
+            job = enqueue_import(uploaded_file, request.user)
         except Exception as e:
             messages.error(request, f'Erro ao processar o arquivo: {str(e)}')
+            return redirect('precatorios')
         
-        return redirect('precatorios')
+        messages.success(
+            request,
+            f'Planilha "{job.nome_arquivo}" enviada. A importação será processada em segundo plano; '
+            f'acompanhe o progresso abaixo.'
+        )
+        return redirect('import_jobs')
     
     # For GET requests, redirect to precatorios list
     return redirect('precatorios')
 
 
+def _visible_import_jobs(user):
+    """Import jobs a user may follow: all for superusers, otherwise their own uploads."""
+    from .models import ImportJob
+    
+    jobs = ImportJob.objects.select_related('solicitado_por')
+    if not user.is_superuser:
+        jobs = jobs.filter(solicitado_por=user)
+    return jobs
+
+
+@login_required
+def import_jobs_view(request):
+    """
+    List the background import jobs with their progress and result.
+    
+    Unfinished jobs are polled by the page through import_job_status_view.
+    """
+    jobs = _visible_import_jobs(request.user)[:50]
+    
+    context = {
+        'jobs': jobs,
+        'has_pending_jobs': any(not job.finalizado for job in jobs),
+    }
+    return render(request, 'precapp/import_jobs.html', context)
+
+
+@login_required
+def import_job_status_view(request, job_id):
+    """
+    Return the progress of an import job as JSON for polling.
+    
+    Returns:
+        JsonResponse: status, progress counters, throughput and the final
+        result (records imported per model and row error messages)
+    """
+    from django.http import JsonResponse
+    
+    job = get_object_or_404(_visible_import_jobs(request.user), pk=job_id)
+    return JsonResponse({
+        'id': job.pk,
+        'nome_arquivo': job.nome_arquivo,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'finalizado': job.finalizado,
+        'total_linhas': job.total_linhas,
+        'linhas_processadas': job.linhas_processadas,
+        'linhas_com_erro': job.linhas_com_erro,
+        'linhas_por_segundo': job.linhas_por_segundo,
+        'progresso': job.progresso,
+        'resultado': job.resultado,
+        'erros': job.erros,
+        'mensagem_erro': job.mensagem_erro,
+    })
+
+
+# ===============================
+# GLOBAL SEARCH
+# ===============================
+
+@login_required
+def global_search_view(request):
+    """
+    Search precatórios, clientes, requerimentos, alvarás and recebimentos at once.
+    
+    GET parameters:
+        q: Search text (at least MIN_QUERY_LENGTH characters)
+        limit: Results per entity, capped at GLOBAL_SEARCH_MAX_LIMIT
+    
+    Returns:
+        JsonResponse: Ranked, typed results plus per-entity counts, the
+        entities skipped because the latency budget ran out, and elapsed_ms
+    """
+    from django.http import JsonResponse
+    from .search import global_search, MIN_QUERY_LENGTH
+    from .search.unified import get_search_limit, get_search_max_limit
+    
+    try:
+        limit = int(request.GET.get('limit', get_search_limit()))
+    except (ValueError, TypeError):
+        limit = get_search_limit()
+    limit = max(1, min(limit, get_search_max_limit()))
+    
+    resultado = global_search(request.GET.get('q', ''), limit=limit)
+    resultado['min_length'] = MIN_QUERY_LENGTH
+    return JsonResponse(resultado)
+
+
+# ===============================
+# REQUEST INSTRUMENTATION
+# ===============================
+
+@login_required
+def instrumentation_view(request):
+    """
+    Show the per-view figures collected by InstrumentationMiddleware.
+    
+    Restricted to staff. Merges the samples of every worker process and
+    lists, for each view, the latency percentiles, query counts, database
+    and rendering time, response size and the most repeated statement.
+    A POST discards the collected samples.
+    """
+    from . import instrumentation
+    
+    if not request.user.is_staff:
+        messages.error(request, 'Acesso negado. Apenas a equipe pode ver a instrumentação.')
+        return redirect('home')
+    
+    if request.method == 'POST':
+        instrumentation.store.reset()
+        messages.success(request, 'Medições descartadas.')
+        return redirect('instrumentation')
+    
+    samples, processes = instrumentation.store.collect()
+    context = {
+        'enabled': instrumentation.is_enabled(),
+        'views': instrumentation.summarize(samples),
+        'processes': processes,
+        'slow_request_ms': instrumentation.get_setting('SLOW_REQUEST_MS', 1000),
+        'slow_query_count': instrumentation.get_setting('SLOW_QUERY_COUNT', 50),
+        'duplicate_query_threshold': instrumentation.get_setting('DUPLICATE_QUERY_THRESHOLD', 5),
+    }
+    return render(request, 'precapp/instrumentation.html', context)
+
+
+def metrics_view(request):
+    """
+    Expose the Prometheus metrics of every worker process.
+    
+    Not behind login_required: the scraper authenticates with the
+    METRICS_TOKEN bearer token. Staff sessions may also read the page.
+    Returns 404 while METRICS_ENABLED is off.
+    """
+    from django.http import Http404
+    from django.utils.crypto import constant_time_compare
+    from . import metrics
+    
+    if not metrics.is_enabled():
+        raise Http404("Métricas desativadas")
+    
+    token = metrics.get_setting('TOKEN', '')
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    authorized = request.user.is_authenticated and request.user.is_staff
+    if not authorized and token:
+        authorized = constant_time_compare(authorization, f'Bearer {token}')
+    if not authorized:
+        return HttpResponse('Acesso negado', status=403, content_type='text/plain; charset=utf-8')
+    
+    return HttpResponse(
+        metrics.render(metrics.collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
 # ===============================
 # EXCEL EXPORT FUNCTIONALITY
 # ===============================
@@ -2493,602 +2703,41 @@ def export_precatorios_excel(request):
     - Diligencias (legal tasks) data with status tracking
     - Requerimentos (legal requests) with financial data
     - Alvarás (payment authorizations) with multiple fee types
+    - Recebimentos (receipts) registered for the alvarás
     - Statistical summary with comprehensive metrics
     
-    Features:
-    - Multiple worksheets for organized data presentation
-    - Professional formatting with headers and color coding
-    - Conditional formatting for status visualization
-    - Brazilian date and currency formatting
-    - Comprehensive relationship data
-    - Business intelligence analytics
-    
-    Worksheets included:
-    1. Precatórios: Main documents with client associations
-    2. Clientes: Client summaries with aggregated data
-    3. Diligências: Legal tasks with completion tracking
-    4. Requerimentos: Legal requests with financial analysis
-    5. Alvarás: Payment authorizations with fee breakdown
-    6. Estatísticas: System-wide statistics and report metadata
+    The workbook is built by precapp.exports in write-only mode with shared
+    named styles, spooled to a temporary file and streamed back, so memory
+    use stays flat regardless of the number of rows.
+    
+    A POST request does not build the workbook inside the request: it enqueues
+    an ExportJob processed by the process_export_jobs worker and redirects to
+    the export jobs page, keeping large exports clear of the gunicorn timeout.
+    A GET request still streams the workbook directly.
     
     Returns:
-        HttpResponse: Excel file download response with comprehensive data
+        FileResponse: Streaming Excel file download response (GET)
+        HttpResponseRedirect: Redirect to the export jobs page (POST)
     """
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
-    from django.utils import timezone
-    import io
+    from .exports import build_precatorios_report, enqueue_export
     
     # Check if user is superuser
     if not request.user.is_superuser:
         messages.error(request, 'Acesso negado. Apenas superusuários podem exportar dados.')
-        return redirect('precatorio_view')
-    
-    # Create workbook
-    wb = Workbook()
-    
-    # ==================== PRECATORIOS SHEET ====================
-    ws_precatorios = wb.active
-    ws_precatorios.title = "Precatórios"
-    
-    # Headers for precatorios sheet
-    precatorio_headers = [
-        'CNJ', 'Origem', 'Valor de Face', 'Última Atualização', 'Data Última Atualização',
-        'Crédito Principal', 'Honorários Contratuais', 'Honorários Sucumbenciais',
-        'Cliente Nome', 'Cliente CPF', 'Cliente Nascimento', 'Cliente Prioritário',
-        'Tipo Precatório', 'Orçamento'
-    ]
-    
-    # Write headers
-    for col, header in enumerate(precatorio_headers, 1):
-        cell = ws_precatorios.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-    
-    # Get precatorios data with related information
-    precatorios = Precatorio.objects.prefetch_related('clientes').select_related('tipo').all().order_by('cnj')
-    
-    # Write precatorios data
-    for row, precatorio in enumerate(precatorios, 2):
-        # Get the first client (since it's many-to-many, we'll take the first one for display)
-        primeiro_cliente = precatorio.clientes.first()
-        
-        data = [
-            precatorio.cnj,
-            precatorio.origem,
-            precatorio.valor_de_face,
-            precatorio.ultima_atualizacao,
-            precatorio.data_ultima_atualizacao.strftime('%d/%m/%Y') if precatorio.data_ultima_atualizacao else '',
-            precatorio.get_credito_principal_display(),
-            precatorio.get_honorarios_contratuais_display(),
-            precatorio.get_honorarios_sucumbenciais_display(),
-            primeiro_cliente.nome if primeiro_cliente else 'Não vinculado',
-            primeiro_cliente.cpf if primeiro_cliente else '',
-            primeiro_cliente.nascimento.strftime('%d/%m/%Y') if primeiro_cliente and primeiro_cliente.nascimento else '',
-            'Sim' if primeiro_cliente and primeiro_cliente.prioridade else 'Não',
-            precatorio.tipo.nome if precatorio.tipo else 'Não especificado',
-            precatorio.orcamento
-        ]
-        
-        for col, value in enumerate(data, 1):
-            cell = ws_precatorios.cell(row=row, column=col, value=value)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            
-            # Format currency columns
-            if col in [3, 4]:  # Valor de Face, Última Atualização
-                if value is not None:
-                    cell.number_format = 'R$ #,##0.00'
-    
-    # Auto-adjust column widths
-    for col in range(1, len(precatorio_headers) + 1):
-        ws_precatorios.column_dimensions[get_column_letter(col)].width = 15
-    
-    # ==================== CLIENTES SHEET ====================
-    ws_clientes = wb.create_sheet(title="Clientes")
-    
-    # Headers for clientes sheet
-    cliente_headers = [
-        'Nome', 'CPF', 'Data Nascimento', 'Prioritário',
-        'Total Precatórios', 'Valor Total Precatórios', 'Total Diligências',
-        'Diligências Pendentes', 'Diligências Concluídas'
-    ]
-    
-    # Write headers
-    for col, header in enumerate(cliente_headers, 1):
-        cell = ws_clientes.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="2E7D32", end_color="2E7D32", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-    
-    # Get clientes data with aggregated information
-    clientes = Cliente.objects.prefetch_related('precatorios', 'diligencias').all().order_by('nome')
-    
-    # Write clientes data
-    for row, cliente in enumerate(clientes, 2):
-        # Calculate aggregated data
-        precatorios_count = cliente.precatorios.count()
-        total_valor = sum(p.ultima_atualizacao or 0 for p in cliente.precatorios.all())
-        diligencias_count = cliente.diligencias.count()
-        diligencias_pendentes = cliente.diligencias.filter(concluida=False).count()
-        diligencias_concluidas = cliente.diligencias.filter(concluida=True).count()
-        
-        data = [
-            cliente.nome,
-            cliente.cpf,
-            cliente.nascimento.strftime('%d/%m/%Y') if cliente.nascimento else '',
-            'Sim' if cliente.prioridade else 'Não',
-            precatorios_count,
-            total_valor,
-            diligencias_count,
-            diligencias_pendentes,
-            diligencias_concluidas
-        ]
-        
-        for col, value in enumerate(data, 1):
-            cell = ws_clientes.cell(row=row, column=col, value=value)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            
-            # Format currency column
-            if col == 6:  # Valor Total Precatórios
-                cell.number_format = 'R$ #,##0.00'
-            
-            # Color code priority clients
-            if col == 4 and value == 'Sim':
-                cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-    
-    # Auto-adjust column widths
-    for col in range(1, len(cliente_headers) + 1):
-        ws_clientes.column_dimensions[get_column_letter(col)].width = 18
-    
-    # ==================== DILIGENCIAS SHEET ====================
-    ws_diligencias = wb.create_sheet(title="Diligências")
-    
-    # Headers for diligencias sheet
-    diligencia_headers = [
-        'Cliente Nome', 'Cliente CPF', 'Tipo Diligência', 'Descrição',
-        'Data Final', 'Urgência', 'Status', 'Data Conclusão',
-        'Responsável', 'Criado Por', 'Concluído Por', 'Data Criação'
-    ]
-    
-    # Write headers
-    for col, header in enumerate(diligencia_headers, 1):
-        cell = ws_diligencias.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="D32F2F", end_color="D32F2F", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-    
-    # Get diligencias data with related information
-    diligencias = Diligencias.objects.select_related(
-        'cliente', 'tipo', 'responsavel'
-    ).all().order_by('cliente__nome', 'data_final')
-    
-    # Write diligencias data
-    for row, diligencia in enumerate(diligencias, 2):
-        data = [
-            diligencia.cliente.nome,
-            diligencia.cliente.cpf,
-            diligencia.tipo.nome,
-            diligencia.descricao[:100] + '...' if len(diligencia.descricao or '') > 100 else diligencia.descricao,
-            diligencia.data_final.strftime('%d/%m/%Y') if diligencia.data_final else '',
-            diligencia.get_urgencia_display(),
-            'Concluída' if diligencia.concluida else 'Pendente',
-            diligencia.data_conclusao.strftime('%d/%m/%Y %H:%M') if diligencia.data_conclusao else '',
-            diligencia.responsavel.get_full_name() if diligencia.responsavel else 'Não atribuído',
-            diligencia.criado_por or '',
-            diligencia.concluido_por or '',
-            diligencia.criado_em.strftime('%d/%m/%Y %H:%M') if diligencia.criado_em else ''
-        ]
-        
-        for col, value in enumerate(data, 1):
-            cell = ws_diligencias.cell(row=row, column=col, value=value)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            
-            # Color code status
-            if col == 7:  # Status column
-                if value == 'Concluída':
-                    cell.fill = PatternFill(start_color="D4EDDA", end_color="D4EDDA", fill_type="solid")
-                elif value == 'Pendente':
-                    cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-            
-            # Color code urgency
-            if col == 6:  # Urgência column
-                if value == 'Alta':
-                    cell.fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
-                elif value == 'Média':
-                    cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-    
-    # Auto-adjust column widths
-    for col in range(1, len(diligencia_headers) + 1):
-        ws_diligencias.column_dimensions[get_column_letter(col)].width = 20
-    
-    # ==================== REQUERIMENTOS SHEET ====================
-    ws_requerimentos = wb.create_sheet(title="Requerimentos")
-    
-    # Headers for requerimentos sheet
-    requerimento_headers = [
-        'Cliente Nome', 'Cliente CPF', 'Precatório CNJ', 'Tipo Pedido',
-        'Valor', 'Deságio (%)', 'Fase Atual', 'Data Criação',
-        'Status da Fase', 'Valor com Deságio'
-    ]
-    
-    # Write headers
-    for col, header in enumerate(requerimento_headers, 1):
-        cell = ws_requerimentos.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="FF6F00", end_color="FF6F00", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-    
-    # Get requerimentos data with related information
-    requerimentos = Requerimento.objects.select_related(
-        'cliente', 'precatorio', 'pedido', 'fase'
-    ).all().order_by('cliente__nome', 'precatorio__cnj')
-    
-    # Write requerimentos data
-    for row, requerimento in enumerate(requerimentos, 2):
-        # Calculate valor com deságio - ensure safe calculation
-        try:
-            if requerimento.valor and requerimento.desagio:
-                valor_com_desagio = requerimento.valor * (1 - requerimento.desagio / 100)
-            else:
-                valor_com_desagio = requerimento.valor or 0
-        except (TypeError, ZeroDivisionError):
-            valor_com_desagio = requerimento.valor or 0
-        
-        data = [
-            requerimento.cliente.nome if requerimento.cliente else 'Não vinculado',
-            requerimento.cliente.cpf if requerimento.cliente else '',
-            requerimento.precatorio.cnj if requerimento.precatorio else '',
-            requerimento.pedido.nome if requerimento.pedido else 'Não especificado',
-            requerimento.valor or 0,
-            requerimento.desagio or 0,
-            requerimento.fase.nome if requerimento.fase else 'Sem fase',
-            requerimento.precatorio.data_ultima_atualizacao.strftime('%d/%m/%Y') if requerimento.precatorio and requerimento.precatorio.data_ultima_atualizacao else '',
-            'Ativa' if requerimento.fase and requerimento.fase.ativa else 'Inativa' if requerimento.fase else 'N/A',
-            valor_com_desagio
-        ]
-        
-        for col, value in enumerate(data, 1):
-            cell = ws_requerimentos.cell(row=row, column=col, value=value)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            
-            # Format currency columns
-            if col in [5, 10]:  # Valor and Valor com Deságio
-                if value is not None and value != 0:
-                    cell.number_format = 'R$ #,##0.00'
-            
-            # Format percentage column - simplified approach
-            if col == 6:  # Deságio
-                if value is not None and value != 0:
-                    cell.number_format = '0.00'  # Just show as number with 2 decimals
-                    # Add % symbol manually to the value display
-                    cell.value = f"{value}%"
-            
-            # Color code status
-            if col == 9:  # Status da Fase
-                if value == 'Ativa':
-                    cell.fill = PatternFill(start_color="D4EDDA", end_color="D4EDDA", fill_type="solid")
-                elif value == 'Inativa':
-                    cell.fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
-    
-    # Auto-adjust column widths
-    for col in range(1, len(requerimento_headers) + 1):
-        ws_requerimentos.column_dimensions[get_column_letter(col)].width = 18
-    
-    # ==================== ALVARÁS SHEET ====================
-    ws_alvaras = wb.create_sheet(title="Alvarás")
-    
-    # Headers for alvarás sheet
-    alvara_headers = [
-        'Cliente Nome', 'Cliente CPF', 'Precatório CNJ', 'Valor Principal',
-        'Honorários Contratuais', 'Honorários Sucumbenciais', 'Valor Total',
-        'Tipo Alvará', 'Fase Principal', 'Fase Honorários', 'Status Geral'
-    ]
-    
-    # Write headers
-    for col, header in enumerate(alvara_headers, 1):
-        cell = ws_alvaras.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="7B1FA2", end_color="7B1FA2", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-    
-    # Get alvarás data with related information
-    alvaras = Alvara.objects.select_related(
-        'cliente', 'precatorio', 'fase', 'fase_honorarios_contratuais'
-    ).all().order_by('cliente__nome', 'precatorio__cnj')
-    
-    # Write alvarás data
-    for row, alvara in enumerate(alvaras, 2):
-        # Calculate total value
-        valor_total = (alvara.valor_principal or 0) + (alvara.honorarios_contratuais or 0) + (alvara.honorarios_sucumbenciais or 0)
-        
-        # Determine overall status
-        status_geral = 'N/A'
-        if alvara.fase and alvara.fase_honorarios_contratuais:
-            if alvara.fase.ativa and alvara.fase_honorarios_contratuais.ativa:
-                status_geral = 'Ambas Ativas'
-            elif not alvara.fase.ativa and not alvara.fase_honorarios_contratuais.ativa:
-                status_geral = 'Ambas Inativas'
-            else:
-                status_geral = 'Misto'
-        elif alvara.fase:
-            status_geral = 'Ativa' if alvara.fase.ativa else 'Inativa'
-        elif alvara.fase_honorarios_contratuais:
-            status_geral = 'Hon. Ativa' if alvara.fase_honorarios_contratuais.ativa else 'Hon. Inativa'
-        
-        data = [
-            alvara.cliente.nome,
-            alvara.cliente.cpf,
-            alvara.precatorio.cnj,
-            alvara.valor_principal,
-            alvara.honorarios_contratuais,
-            alvara.honorarios_sucumbenciais,
-            valor_total,
-            alvara.tipo,
-            alvara.fase.nome if alvara.fase else 'Sem fase',
-            alvara.fase_honorarios_contratuais.nome if alvara.fase_honorarios_contratuais else 'Sem fase',
-            status_geral
-        ]
-        
-        for col, value in enumerate(data, 1):
-            cell = ws_alvaras.cell(row=row, column=col, value=value)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            
-            # Format currency columns
-            if col in [4, 5, 6, 7]:  # All monetary values
-                if value is not None:
-                    cell.number_format = 'R$ #,##0.00'
-            
-            # Color code status
-            if col == 11:  # Status Geral
-                if 'Ativa' in value and 'Inativa' not in value:
-                    cell.fill = PatternFill(start_color="D4EDDA", end_color="D4EDDA", fill_type="solid")
-                elif 'Inativa' in value and 'Ativa' not in value:
-                    cell.fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
-                elif 'Misto' in value:
-                    cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-    
-    # Auto-adjust column widths
-    for col in range(1, len(alvara_headers) + 1):
-        ws_alvaras.column_dimensions[get_column_letter(col)].width = 18
-
-    # ==================== RECEBIMENTOS SHEET ====================
-    ws_recebimentos = wb.create_sheet(title="Recebimentos")
-    
-    # Headers for recebimentos sheet
-    recebimento_headers = [
-        'Número Documento', 'Alvará ID', 'Data', 'Conta Bancária', 
-        'Valor', 'Tipo', 'Cliente Nome', 'Cliente CPF',
-        'Precatório CNJ', 'Criado Em', 'Criado Por'
-    ]
-    
-    # Write headers
-    for col, header in enumerate(recebimento_headers, 1):
-        cell = ws_recebimentos.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="795548", end_color="795548", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-    
-    # Get recebimentos data with related information
-    recebimentos = Recebimentos.objects.select_related(
-        'alvara', 'alvara__cliente', 'alvara__precatorio', 'conta_bancaria'
-    ).all().order_by('-data', 'numero_documento')
-    
-    # Write recebimentos data
-    for row, recebimento in enumerate(recebimentos, 2):
-        data = [
-            recebimento.numero_documento,
-            f"ALV-{recebimento.alvara.id}" if recebimento.alvara else '',
-            recebimento.data.strftime('%d/%m/%Y') if recebimento.data else '',
-            f"{recebimento.conta_bancaria.banco} - {recebimento.conta_bancaria.agencia}/{recebimento.conta_bancaria.conta}" if recebimento.conta_bancaria else '',
-            float(recebimento.valor) if recebimento.valor else 0,
-            recebimento.get_tipo_display(),
-            recebimento.alvara.cliente.nome if recebimento.alvara and recebimento.alvara.cliente else '',
-            recebimento.alvara.cliente.cpf if recebimento.alvara and recebimento.alvara.cliente else '',
-            recebimento.alvara.precatorio.cnj if recebimento.alvara and recebimento.alvara.precatorio else '',
-            recebimento.criado_em.strftime('%d/%m/%Y %H:%M') if recebimento.criado_em else '',
-            recebimento.criado_por or ''
-        ]
-        
-        for col, value in enumerate(data, 1):
-            cell = ws_recebimentos.cell(row=row, column=col, value=value)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            
-            # Format currency column
-            if col == 5:  # Valor
-                if value is not None and value != 0:
-                    cell.number_format = 'R$ #,##0.00'
-            
-            # Color code by tipo
-            if col == 6:  # Tipo
-                if 'contratuais' in str(value).lower():
-                    cell.fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
-                elif 'sucumbenciais' in str(value).lower():
-                    cell.fill = PatternFill(start_color="F3E5F5", end_color="F3E5F5", fill_type="solid")
-    
-    # Auto-adjust column widths
-    for col in range(1, len(recebimento_headers) + 1):
-        ws_recebimentos.column_dimensions[get_column_letter(col)].width = 15
-
-    # ==================== STATISTICS SHEET ====================
-    ws_stats = wb.create_sheet(title="Estatísticas")
-    
-    # Calculate statistics
-    total_precatorios = Precatorio.objects.count()
-    total_clientes = Cliente.objects.count()
-    total_diligencias = Diligencias.objects.count()
-    total_requerimentos = Requerimento.objects.count()
-    total_alvaras = Alvara.objects.count()
-    total_recebimentos = Recebimentos.objects.count()
-    clientes_prioritarios = Cliente.objects.filter(prioridade=True).count()
-    diligencias_pendentes = Diligencias.objects.filter(concluida=False).count()
-    diligencias_concluidas = Diligencias.objects.filter(concluida=True).count()
-    valor_total_precatorios = sum(p.ultima_atualizacao or 0 for p in Precatorio.objects.all())
-    valor_total_requerimentos = sum(r.valor or 0 for r in Requerimento.objects.all())
-    valor_total_alvaras = sum((a.valor_principal or 0) + (a.honorarios_contratuais or 0) + (a.honorarios_sucumbenciais or 0) for a in Alvara.objects.all())
-    valor_total_recebimentos = sum(r.valor or 0 for r in Recebimentos.objects.all())
-    
-    # Requerimentos by status
-    requerimentos_com_fase = Requerimento.objects.exclude(fase__isnull=True).count()
-    requerimentos_sem_fase = total_requerimentos - requerimentos_com_fase
-    
-    # Alvarás by type
-    alvaras_aguardando_deposito = Alvara.objects.filter(tipo__icontains='aguardando').count()
-    alvaras_deposito_judicial = Alvara.objects.filter(tipo__icontains='depósito').count()
-    alvaras_recebido_cliente = Alvara.objects.filter(tipo__icontains='recebido').count()
-    
-    # Recebimentos by type
-    recebimentos_contratuais = Recebimentos.objects.filter(tipo='Hon. contratuais').count()
-    recebimentos_sucumbenciais = Recebimentos.objects.filter(tipo='Hon. sucumbenciais').count()
-    valor_recebimentos_contratuais = sum(r.valor or 0 for r in Recebimentos.objects.filter(tipo='Hon. contratuais'))
-    valor_recebimentos_sucumbenciais = sum(r.valor or 0 for r in Recebimentos.objects.filter(tipo='Hon. sucumbenciais'))
-    
-    # Statistics data
-    stats_data = [
-        ['Estatística', 'Valor'],
-        ['', ''],
-        ['### DOCUMENTOS ###', ''],
-        ['Total de Precatórios', total_precatorios],
-        ['Total de Requerimentos', total_requerimentos],
-        ['Total de Alvarás', total_alvaras],
-        ['Total de Recebimentos', total_recebimentos],
-        ['', ''],
-        ['### CLIENTES ###', ''],
-        ['Total de Clientes', total_clientes],
-        ['Clientes Prioritários', clientes_prioritarios],
-        ['', ''],
-        ['### DILIGÊNCIAS ###', ''],
-        ['Total de Diligências', total_diligencias],
-        ['Diligências Pendentes', diligencias_pendentes],
-        ['Diligências Concluídas', diligencias_concluidas],
-        ['', ''],
-        ['### REQUERIMENTOS ###', ''],
-        ['Requerimentos com Fase', requerimentos_com_fase],
-        ['Requerimentos sem Fase', requerimentos_sem_fase],
-        ['', ''],
-        ['### ALVARÁS ###', ''],
-        ['Alvarás - Aguardando Depósito', alvaras_aguardando_deposito],
-        ['Alvarás - Depósito Judicial', alvaras_deposito_judicial],
-        ['Alvarás - Recebido pelo Cliente', alvaras_recebido_cliente],
-        ['', ''],
-        ['### RECEBIMENTOS ###', ''],
-        ['Recebimentos - Hon. Contratuais', recebimentos_contratuais],
-        ['Recebimentos - Hon. Sucumbenciais', recebimentos_sucumbenciais],
-        ['', ''],
-        ['### VALORES FINANCEIROS ###', ''],
-        ['Valor Total dos Precatórios', valor_total_precatorios],
-        ['Valor Total dos Requerimentos', valor_total_requerimentos],
-        ['Valor Total dos Alvarás', valor_total_alvaras],
-        ['Valor Total dos Recebimentos', valor_total_recebimentos],
-        ['Valor Recebimentos Contratuais', valor_recebimentos_contratuais],
-        ['Valor Recebimentos Sucumbenciais', valor_recebimentos_sucumbenciais],
-        ['', ''],
-        ['### RELATÓRIO ###', ''],
-        ['Data do Relatório', timezone.now().strftime('%d/%m/%Y %H:%M')],
-        ['Gerado por', request.user.get_full_name() or request.user.username]
-    ]
-    
-    # Write statistics
-    for row, (label, value) in enumerate(stats_data, 1):
-        # Ensure values are safe for Excel
-        safe_label = str(label) if label is not None else ''
-        safe_value = value if value is not None else ''
-        
-        # Label column
-        cell_label = ws_stats.cell(row=row, column=1, value=safe_label)
-        cell_label.font = Font(bold=True)
-        cell_label.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-        
-        # Value column
-        cell_value = ws_stats.cell(row=row, column=2, value=safe_value)
-        cell_value.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-        
-        # Format currency rows
-        if 'Valor Total' in safe_label and isinstance(safe_value, (int, float)) and safe_value > 0:
-            cell_value.number_format = 'R$ #,##0.00'
-        
-        # Header row formatting
-        if row == 1:
-            cell_label.fill = PatternFill(start_color="4A90E2", end_color="4A90E2", fill_type="solid")
-            cell_label.font = Font(bold=True, color="FFFFFF")
-            cell_value.fill = PatternFill(start_color="4A90E2", end_color="4A90E2", fill_type="solid")
-            cell_value.font = Font(bold=True, color="FFFFFF")
-        
-        # Section header formatting (labels that start with ###)
-        if isinstance(safe_label, str) and safe_label.startswith('###'):
-            cell_label.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
-            cell_label.font = Font(bold=True, color="000000")
-            cell_value.fill = PatternFill(start_color="E0E0E0", end_color="E0E0E0", fill_type="solid")
-    
-    # Auto-adjust column widths
-    ws_stats.column_dimensions['A'].width = 25
-    ws_stats.column_dimensions['B'].width = 20
+        return redirect('precatorios')
     
-    # ==================== PREPARE RESPONSE ====================
+    if request.method == 'POST':
+        job = enqueue_export('precatorios', request.user)
+        messages.success(request, f'Exportação #{job.pk} agendada. O arquivo ficará disponível nesta página quando estiver pronto.')
+        return redirect('export_jobs')
     
-    # Create response
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
+    workbook = build_precatorios_report(request.user)
     
     # Generate filename with timestamp
     timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
     filename = f'relatorio_completo_sistema_{timestamp}.xlsx'
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    
-    # Save workbook to response
-    wb.save(response)
     
-    return response
+    return workbook.as_response(filename)
 
 
 @login_required
@@ -3104,382 +2753,106 @@ def export_clientes_excel(request):
     - Statistical analysis by priority status
     - Financial summary per client
     
-    Features:
-    - Professional formatting with headers and borders
-    - Brazilian date and currency formatting
-    - Color coding for priority clients
-    - Comprehensive relationship data
-    - Client-focused statistics
+    A POST request enqueues a background ExportJob instead, like
+    export_precatorios_excel.
     
     Returns:
-        HttpResponse: Excel file download response
+        FileResponse: Streaming Excel file download response (GET)
+        HttpResponseRedirect: Redirect to the export jobs page (POST)
     """
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
-    from django.utils import timezone
-    from datetime import date, timedelta
-    import io
+    from .exports import build_clientes_report, enqueue_export
     
     # Check if user is superuser
     if not request.user.is_superuser:
         messages.error(request, 'Acesso negado. Apenas superusuários podem exportar dados.')
-        return redirect('clientes_view')
-    
-    # Create workbook
-    wb = Workbook()
-    
-    # ==================== CLIENTES DETALHADO SHEET ====================
-    ws_clientes = wb.active
-    ws_clientes.title = "Clientes Detalhado"
-    
-    # Headers for detailed clients sheet
-    cliente_headers = [
-        'CPF/CNPJ', 'Nome Completo', 'Data Nascimento', 'Idade', 'Cliente Prioritário',
-        'Total Precatórios', 'CNJ Precatórios', 'Valor Total Precatórios',
-        'Total Diligências', 'Diligências Pendentes', 'Diligências Concluídas',
-        'Diligências Atrasadas', 'Última Diligência', 'Próximo Vencimento'
-    ]
-    
-    # Write headers
-    for col, header in enumerate(cliente_headers, 1):
-        cell = ws_clientes.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="2E7D32", end_color="2E7D32", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-    
-    # Get clientes data with all related information
-    clientes = Cliente.objects.prefetch_related(
-        'precatorios', 'diligencias', 'diligencias__tipo'
-    ).all().order_by('nome')
+        return redirect('clientes')
     
-    # Write clientes data
-    for row, cliente in enumerate(clientes, 2):
-        from datetime import date, timedelta
-        
-        # Calculate client data
-        precatorios_list = list(cliente.precatorios.all())
-        precatorios_count = len(precatorios_list)
-        cnj_list = ', '.join([p.cnj for p in precatorios_list[:3]])  # Show first 3 CNJs
-        if len(precatorios_list) > 3:
-            cnj_list += f' (e mais {len(precatorios_list) - 3})'
-        
-        total_valor = sum(p.ultima_atualizacao or p.valor_de_face or 0 for p in precatorios_list)
-        
-        # Diligencias calculations
-        diligencias_all = list(cliente.diligencias.all())
-        diligencias_count = len(diligencias_all)
-        diligencias_pendentes = len([d for d in diligencias_all if not d.concluida])
-        diligencias_concluidas = len([d for d in diligencias_all if d.concluida])
-        
-        # Calculate overdue diligencias
-        today = date.today()
-        diligencias_atrasadas = len([
-            d for d in diligencias_all 
-            if not d.concluida and d.data_final and d.data_final < today
-        ])
-        
-        # Get last diligencia and next due date
-        ultima_diligencia = ''
-        proximo_vencimento = ''
-        
-        if diligencias_all:
-            # Sort by creation date (most recent first)
-            diligencias_ordenadas = sorted(
-                diligencias_all, 
-                key=lambda x: x.criado_em if hasattr(x, 'criado_em') and x.criado_em else date.min,
-                reverse=True
-            )
-            if diligencias_ordenadas:
-                ultima = diligencias_ordenadas[0]
-                ultima_diligencia = f"{ultima.tipo.nome} - {ultima.descricao[:30]}..."
-        
-        # Find next due date from pending diligencias
-        diligencias_pendentes_com_data = [
-            d for d in diligencias_all 
-            if not d.concluida and d.data_final and d.data_final >= today
-        ]
-        if diligencias_pendentes_com_data:
-            proxima = min(diligencias_pendentes_com_data, key=lambda x: x.data_final)
-            proximo_vencimento = proxima.data_final.strftime('%d/%m/%Y')
-        
-        # Calculate age if birth date is available
-        idade = ''
-        if cliente.nascimento:
-            idade_anos = (date.today() - cliente.nascimento).days // 365
-            idade = f"{idade_anos} anos"
-        
-        data = [
-            cliente.cpf,
-            cliente.nome,
-            cliente.nascimento.strftime('%d/%m/%Y') if cliente.nascimento else '',
-            idade,
-            'Sim' if cliente.prioridade else 'Não',
-            precatorios_count,
-            cnj_list if cnj_list else 'Nenhum',
-            total_valor,
-            diligencias_count,
-            diligencias_pendentes,
-            diligencias_concluidas,
-            diligencias_atrasadas,
-            ultima_diligencia if ultima_diligencia else 'Nenhuma',
-            proximo_vencimento if proximo_vencimento else 'Nenhum'
-        ]
-        
-        for col, value in enumerate(data, 1):
-            cell = ws_clientes.cell(row=row, column=col, value=value)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            
-            # Format currency column
-            if col == 8:  # Valor Total Precatórios
-                if isinstance(value, (int, float)):
-                    cell.number_format = 'R$ #,##0.00'
-            
-            # Color code priority clients (entire row)
-            if col == 5 and value == 'Sim':  # Priority column
-                for c in range(1, len(cliente_headers) + 1):
-                    ws_clientes.cell(row=row, column=c).fill = PatternFill(
-                        start_color="FFF3CD", end_color="FFF3CD", fill_type="solid"
-                    )
-            
-            # Color code overdue diligencias
-            if col == 12 and isinstance(value, int) and value > 0:  # Diligências Atrasadas
-                cell.fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
+    if request.method == 'POST':
+        job = enqueue_export('clientes', request.user)
+        messages.success(request, f'Exportação #{job.pk} agendada. O arquivo ficará disponível nesta página quando estiver pronto.')
+        return redirect('export_jobs')
     
-    # Auto-adjust column widths
-    for col in range(1, len(cliente_headers) + 1):
-        ws_clientes.column_dimensions[get_column_letter(col)].width = 20
+    workbook = build_clientes_report(request.user)
     
-    # ==================== RESUMO POR PRIORIDADE SHEET ====================
-    ws_resumo = wb.create_sheet(title="Resumo por Prioridade")
+    # Generate filename with timestamp
+    timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'relatorio_clientes_{timestamp}.xlsx'
     
-    # Calculate priority statistics
-    clientes_prioritarios = clientes.filter(prioridade=True)
-    clientes_normais = clientes.filter(prioridade=False)
+    return workbook.as_response(filename)
+
+
+@login_required
+def export_jobs_view(request):
+    """
+    List the background export jobs with their status and run metrics.
     
-    total_clientes = clientes.count()
-    total_prioritarios = clientes_prioritarios.count()
-    total_normais = clientes_normais.count()
+    Restricted to superusers, like the export views. Unfinished jobs are
+    polled by the page through export_job_status_view.
+    """
+    from .models import ExportJob
     
-    # Calculate financial data
-    valor_prioritarios = sum(
-        sum(p.ultima_atualizacao or p.valor_de_face or 0 for p in c.precatorios.all())
-        for c in clientes_prioritarios
-    )
-    valor_normais = sum(
-        sum(p.ultima_atualizacao or p.valor_de_face or 0 for p in c.precatorios.all())
-        for c in clientes_normais
-    )
+    if not request.user.is_superuser:
+        messages.error(request, 'Acesso negado. Apenas superusuários podem exportar dados.')
+        return redirect('home')
     
-    # Summary data
-    resumo_data = [
-        ['Categoria', 'Quantidade Clientes', 'Percentual', 'Valor Total Precatórios', 'Valor Médio por Cliente'],
-        ['Clientes Prioritários', total_prioritarios, f"{(total_prioritarios/total_clientes*100):.1f}%" if total_clientes > 0 else "0%", valor_prioritarios, valor_prioritarios/total_prioritarios if total_prioritarios > 0 else 0],
-        ['Clientes Normais', total_normais, f"{(total_normais/total_clientes*100):.1f}%" if total_clientes > 0 else "0%", valor_normais, valor_normais/total_normais if total_normais > 0 else 0],
-        ['', '', '', '', ''],
-        ['TOTAL GERAL', total_clientes, '100%', valor_prioritarios + valor_normais, (valor_prioritarios + valor_normais)/total_clientes if total_clientes > 0 else 0]
-    ]
-    
-    # Write summary data
-    for row, data_row in enumerate(resumo_data, 1):
-        for col, value in enumerate(data_row, 1):
-            cell = ws_resumo.cell(row=row, column=col, value=value)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            
-            # Header row formatting
-            if row == 1:
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="4A90E2", end_color="4A90E2", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            # Total row formatting
-            elif row == 5:
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="E9ECEF", end_color="E9ECEF", fill_type="solid")
-            
-            # Priority clients row
-            elif row == 2:
-                cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-            
-            # Format currency columns
-            if col in [4, 5] and row > 1 and isinstance(value, (int, float)):
-                cell.number_format = 'R$ #,##0.00'
-    
-    # Auto-adjust column widths
-    for col in range(1, 6):
-        ws_resumo.column_dimensions[get_column_letter(col)].width = 25
-    
-    # ==================== ESTATÍSTICAS DETALHADAS SHEET ====================
-    ws_stats = wb.create_sheet(title="Estatísticas Detalhadas")
-    
-    # Calculate detailed statistics
-    total_diligencias_sistema = Diligencias.objects.count()
-    diligencias_pendentes_sistema = Diligencias.objects.filter(concluida=False).count()
-    diligencias_concluidas_sistema = Diligencias.objects.filter(concluida=True).count()
-    diligencias_atrasadas_sistema = Diligencias.objects.filter(
-        concluida=False, data_final__lt=date.today()
-    ).count()
+    jobs = ExportJob.objects.select_related('solicitado_por')[:50]
     
-    total_precatorios_sistema = Precatorio.objects.count()
-    valor_total_sistema = sum(p.ultima_atualizacao or p.valor_de_face or 0 for p in Precatorio.objects.all())
-    
-    # Statistics data
-    stats_data = [
-        ['Estatística', 'Valor'],
-        ['### CLIENTES ###', ''],
-        ['Total de Clientes', total_clientes],
-        ['Clientes Prioritários', total_prioritarios],
-        ['Clientes Normais', total_normais],
-        ['Percentual Prioritários', f"{(total_prioritarios/total_clientes*100):.1f}%" if total_clientes > 0 else "0%"],
-        ['', ''],
-        ['### PRECATÓRIOS ###', ''],
-        ['Total de Precatórios no Sistema', total_precatorios_sistema],
-        ['Valor Total dos Precatórios', valor_total_sistema],
-        ['Valor Médio por Precatório', valor_total_sistema/total_precatorios_sistema if total_precatorios_sistema > 0 else 0],
-        ['', ''],
-        ['### DILIGÊNCIAS ###', ''],
-        ['Total de Diligências no Sistema', total_diligencias_sistema],
-        ['Diligências Pendentes', diligencias_pendentes_sistema],
-        ['Diligências Concluídas', diligencias_concluidas_sistema],
-        ['Diligências Atrasadas', diligencias_atrasadas_sistema],
-        ['Taxa de Conclusão', f"{(diligencias_concluidas_sistema/total_diligencias_sistema*100):.1f}%" if total_diligencias_sistema > 0 else "0%"],
-        ['', ''],
-        ['### RELATÓRIO ###', ''],
-        ['Data do Relatório', timezone.now().strftime('%d/%m/%Y %H:%M')],
-        ['Gerado por', request.user.get_full_name() or request.user.username],
-        ['Tipo de Relatório', 'Exportação de Clientes']
-    ]
-    
-    # Write statistics
-    for row, (label, value) in enumerate(stats_data, 1):
-        # Label column
-        cell_label = ws_stats.cell(row=row, column=1, value=label)
-        cell_label.font = Font(bold=True if '===' in str(label) else False)
-        cell_label.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-        
-        # Value column
-        cell_value = ws_stats.cell(row=row, column=2, value=value)
-        cell_value.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-        
-        # Format currency rows
-        if 'Valor' in str(label) and 'Valor' != str(label) and isinstance(value, (int, float)):
-            cell_value.number_format = 'R$ #,##0.00'
-        
-        # Header row formatting
-        if row == 1:
-            cell_label.fill = PatternFill(start_color="4A90E2", end_color="4A90E2", fill_type="solid")
-            cell_label.font = Font(bold=True, color="FFFFFF")
-            cell_value.fill = PatternFill(start_color="4A90E2", end_color="4A90E2", fill_type="solid")
-            cell_value.font = Font(bold=True, color="FFFFFF")
-        
-        # Section headers
-        elif '===' in str(label):
-            cell_label.fill = PatternFill(start_color="E9ECEF", end_color="E9ECEF", fill_type="solid")
-            cell_value.fill = PatternFill(start_color="E9ECEF", end_color="E9ECEF", fill_type="solid")
-    
-    # Auto-adjust column widths
-    ws_stats.column_dimensions['A'].width = 30
-    ws_stats.column_dimensions['B'].width = 25
-
-    # ==================== DILIGENCIAS SHEET ====================
-    ws_diligencias = wb.create_sheet(title="Diligências")
-    
-    # Headers for diligencias sheet
-    diligencia_headers = [
-        'Cliente Nome', 'Cliente CPF', 'Tipo Diligência', 'Descrição',
-        'Data Final', 'Urgência', 'Status', 'Data Conclusão',
-        'Responsável', 'Criado Por', 'Data Criação', 'Observações'
-    ]
-    
-    # Write headers
-    for col, header in enumerate(diligencia_headers, 1):
-        cell = ws_diligencias.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="D32F2F", end_color="D32F2F", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
+    context = {
+        'jobs': jobs,
+        'has_pending_jobs': any(not job.finalizado for job in jobs),
+    }
+    return render(request, 'precapp/export_jobs.html', context)
+
+
+@login_required
+def export_job_status_view(request, job_id):
+    """
+    Return the status of an export job as JSON for polling.
     
-    # Get all diligencias data with related information
-    all_diligencias = Diligencias.objects.select_related(
-        'cliente', 'tipo', 'responsavel'
-    ).all().order_by('cliente__nome', 'data_final')
-    
-    # Write diligencias data
-    for row, diligencia in enumerate(all_diligencias, 2):
-        data = [
-            diligencia.cliente.nome,
-            diligencia.cliente.cpf,
-            diligencia.tipo.nome,
-            diligencia.descricao[:100] + '...' if diligencia.descricao and len(diligencia.descricao) > 100 else diligencia.descricao or '',
-            diligencia.data_final.strftime('%d/%m/%Y') if diligencia.data_final else '',
-            diligencia.get_urgencia_display() if hasattr(diligencia, 'urgencia') and diligencia.urgencia else 'Normal',
-            'Concluída' if diligencia.concluida else 'Pendente',
-            diligencia.data_conclusao.strftime('%d/%m/%Y %H:%M') if diligencia.data_conclusao else '',
-            diligencia.responsavel.get_full_name() if diligencia.responsavel else '',
-            diligencia.criado_por or '',
-            diligencia.criado_em.strftime('%d/%m/%Y %H:%M') if hasattr(diligencia, 'criado_em') and diligencia.criado_em else '',
-            diligencia.observacoes[:50] + '...' if hasattr(diligencia, 'observacoes') and diligencia.observacoes and len(diligencia.observacoes) > 50 else (diligencia.observacoes if hasattr(diligencia, 'observacoes') else '')
-        ]
-        
-        for col, value in enumerate(data, 1):
-            cell = ws_diligencias.cell(row=row, column=col, value=value)
-            cell.border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
-            
-            # Color code by status
-            if col == 7:  # Status column
-                if value == 'Concluída':
-                    cell.fill = PatternFill(start_color="D4EDDA", end_color="D4EDDA", fill_type="solid")
-                elif value == 'Pendente':
-                    # Check if overdue
-                    if diligencia.data_final and diligencia.data_final < date.today():
-                        cell.fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
-                    else:
-                        cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-            
-            # Color code priority clients
-            if diligencia.cliente.prioridade and col == 1:  # Cliente Nome column
-                cell.fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
+    Returns:
+        JsonResponse: status, metrics and download URL once the job is done
+    """
+    from django.http import JsonResponse
+    from .models import ExportJob
     
-    # Auto-adjust column widths
-    for col in range(1, len(diligencia_headers) + 1):
-        ws_diligencias.column_dimensions[get_column_letter(col)].width = 18
+    if not request.user.is_superuser:
+        return JsonResponse({'error': 'Acesso negado'}, status=403)
+    
+    job = get_object_or_404(ExportJob, pk=job_id)
+    data = {
+        'id': job.pk,
+        'tipo': job.tipo,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'finalizado': job.finalizado,
+        'duracao_segundos': job.duracao_segundos,
+        'total_linhas': job.total_linhas,
+        'linhas_por_planilha': job.linhas_por_planilha,
+        'pico_memoria_kb': job.pico_memoria_kb,
+        'mensagem_erro': job.mensagem_erro,
+        'download_url': None,
+    }
+    if job.status == ExportJob.STATUS_CONCLUIDO and job.arquivo:
+        data['download_url'] = reverse('export_job_download', args=[job.pk])
+    return JsonResponse(data)
 
-    # ==================== PREPARE RESPONSE ====================    # Create response
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
+
+@login_required
+def export_job_download_view(request, job_id):
+    """Download the workbook generated by a finished export job"""
+    from django.http import Http404
+    from .models import ExportJob
+    from .storage.utils import handle_large_file_download
     
-    # Generate filename with timestamp
-    timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
-    filename = f'relatorio_clientes_{timestamp}.xlsx'
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    if not request.user.is_superuser:
+        messages.error(request, 'Acesso negado. Apenas superusuários podem exportar dados.')
+        return redirect('home')
     
-    # Save workbook to response
-    wb.save(response)
+    job = get_object_or_404(ExportJob, pk=job_id)
+    if job.status != ExportJob.STATUS_CONCLUIDO or not job.arquivo:
+        raise Http404("Exportação ainda não concluída")
     
-    return response
+    return handle_large_file_download(request, job.arquivo, job.nome_arquivo)
 
 
 # ===============================
@@ -3814,7 +3187,7 @@ def ajuda_view(request):
     """View to display help page with POP document link"""
     context = {
         'title': 'Ajuda - Sistema de Precatórios',
-        'tipos_requerimento': PedidoRequerimento.get_ativos(),
+        'tipos_requerimento': pedidos_ativos(),
     }
     
     return render(request, 'precapp/ajuda.html', context)
\ No newline at end of file
@@ -8,6 +8,7 @@ Multi-environment configuration supporting:
 """
 
 import os
+import tempfile
 from pathlib import Path
 from decouple import config, Csv
 import dj_database_url
@@ -59,6 +60,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'precapp.middleware.UserTrackingMiddleware',
+    'precapp.middleware.InstrumentationMiddleware',
+    'precapp.middleware.MetricsMiddleware',
 ]
 
 ROOT_URLCONF = 'precatorios.urls'
@@ -260,6 +263,58 @@ FILE_UPLOAD_HANDLERS = [
 SESSION_COOKIE_AGE = 7200    # 2 hours for large file uploads
 CSRF_COOKIE_AGE = 7200       # 2 hours for large file uploads
 
+# Excel export settings
+EXPORT_CHUNK_SIZE = 2000  # Rows fetched per query while streaming Excel exports
+EXPORT_JOB_STALE_SECONDS = 60 * 60  # Export jobs processing for longer are marked as failed (dead worker)
+
+# Excel import settings
+IMPORT_BATCH_SIZE = 500  # Rows per batch in the bulk import engine (import_excel --bulk)
+IMPORT_CHUNK_SIZE = 1000  # Rows committed per transaction by import_excel --chunk-size/--resume
+IMPORT_JOB_STALE_SECONDS = 30 * 60  # Import jobs without progress for longer are requeued and resumed (dead worker)
+
+# List pagination settings
+LIST_PAGINATION_MODE = 'offset'  # 'cursor' makes keyset pagination the default for the main list views (?paginacao= overrides)
+PAGINATION_COUNT_CACHE_SECONDS = 60  # How long list totals are cached in cursor pagination mode
+
+# Caches: 'default' is local to each process, 'shared' is seen by every worker on the host
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('SHARED_CACHE_DIR', default=os.path.join(tempfile.gettempdir(), 'precatorios_cache')),
+    },
+}
+
+# Catalog cache settings (fases, tipos, pedidos and tipos de diligência kept in memory)
+CATALOG_CACHE_ALIAS = 'shared'  # Cache holding the version token every worker checks
+CATALOG_VERSION_CHECK_SECONDS = 1  # How long a worker trusts its snapshot before checking the token again
+
+# Dashboard settings
+DASHBOARD_CACHE_SECONDS = 60  # How long the home page counters are cached (0 disables); saves and deletes clear it
+DASHBOARD_CACHE_ALIAS = 'shared'  # Cache holding the counters, so every worker sees the invalidations
+
+# Global search settings
+GLOBAL_SEARCH_LIMIT = 5  # Results per entity returned by /busca/
+GLOBAL_SEARCH_MAX_LIMIT = 20  # Largest ?limit= a request may ask for
+GLOBAL_SEARCH_BUDGET_MS = 500  # Latency budget; entities not reached in time are skipped
+
+# Request instrumentation settings (figures at /instrumentacao/, staff only)
+INSTRUMENTATION_ENABLED = config('INSTRUMENTATION_ENABLED', default=False, cast=bool)
+INSTRUMENTATION_SLOW_REQUEST_MS = 1000  # Requests slower than this are logged
+INSTRUMENTATION_SLOW_QUERY_COUNT = 50  # Requests running this many queries are logged
+INSTRUMENTATION_DUPLICATE_QUERY_THRESHOLD = 5  # Requests repeating a statement this many times are logged (N+1)
+INSTRUMENTATION_SAMPLES_PER_VIEW = 500  # Last requests kept per view for the percentiles
+INSTRUMENTATION_FLUSH_SECONDS = 10  # How often a worker copies its samples to the shared cache
+INSTRUMENTATION_CACHE_ALIAS = 'shared'  # Cache where the samples of every worker are merged
+
+# Prometheus metrics settings (scraped from /metrics/)
+METRICS_ENABLED = config('METRICS_ENABLED', default=False, cast=bool)
+METRICS_DIR = config('METRICS_DIR', default=os.path.join(tempfile.gettempdir(), 'precatorios_metrics'))  # One file per process; clear on deploy
+METRICS_FLUSH_SECONDS = 5  # How often a process writes its values to METRICS_DIR
+METRICS_TOKEN = config('METRICS_TOKEN', default='')  # Bearer token the scraper sends; staff sessions are always allowed
+
 # Authentication settings
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'home'